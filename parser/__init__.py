@@ -1,3 +1,14 @@
 """Parser package for generating dataset_raw.json from annotated texts."""
 
-from .cli import main  # noqa: F401
+# No `from __future__ import annotations` here: the name would shadow the
+# `parser.annotations` submodule.
+
+
+def __getattr__(name: str):
+    # `main` pulls in every parser stage; importing a single helper module
+    # (e.g. `parser.segmentation` from the validator) should not.
+    if name == "main":
+        from .cli import main
+
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
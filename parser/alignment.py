@@ -4,12 +4,20 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from bisect import bisect_left
 from difflib import SequenceMatcher
-from typing import Dict, List, Sequence, Tuple, TYPE_CHECKING
+from typing import Callable, Dict, List, Sequence, Tuple, TYPE_CHECKING
+
+from . import profiling
 
 if TYPE_CHECKING:  # pragma: no cover - hinting only
     from .annotations import Annotation
 
+SimilarityMatcher = Callable[
+    [str, Sequence[str], Dict[str, str], Dict[str, str], int],
+    Tuple[str | None, int | None, float],
+]
+
 _SIMILARITY_THRESHOLD = 0.35
 _SIMILARITY_MIN_ASSIGN = 0.08
 _SIMILARITY_WINDOW = 3
@@ -83,23 +91,84 @@ def _iter_candidate_indices(length: int, last_idx: int):
         yield idx
 
 
+class AnchorIndex:
+    """Normalized source texts plus a char n-gram inverted index.
+
+    Built once per `align_paragraphs` call so each source paragraph is
+    normalized a single time. Anchors are resolved by intersecting with the
+    postings of their rarest n-gram and verifying the substring, instead of
+    rescanning every candidate paragraph.
+    """
+
+    def __init__(self, source_paragraphs: Dict[str, str]) -> None:
+        self._ids = list(source_paragraphs)
+        self._texts = [
+            _strip_accents(text).lower() for text in source_paragraphs.values()
+        ]
+        self._postings: Dict[str, List[int]] = {}
+        self._hits: Dict[str, Tuple[str, ...]] = {}
+        for pos, text in enumerate(self._texts):
+            for idx in range(len(text) - _MIN_ANCHOR_LEN + 1):
+                gram = text[idx:idx + _MIN_ANCHOR_LEN]
+                posting = self._postings.setdefault(gram, [])
+                if not posting or posting[-1] != pos:
+                    posting.append(pos)
+
+    def lookup(self, normalized_anchor: str) -> Tuple[str, ...]:
+        """Return IDs of source paragraphs containing the anchor."""
+
+        profiling.count("sondagens_ancora")
+        hits = self._hits.get(normalized_anchor)
+        if hits is not None:
+            return hits
+        grams = [
+            normalized_anchor[idx:idx + _MIN_ANCHOR_LEN]
+            for idx in range(len(normalized_anchor) - _MIN_ANCHOR_LEN + 1)
+        ]
+        if grams:
+            candidates: Sequence[int] = min(
+                (self._postings.get(gram, ()) for gram in grams), key=len
+            )
+        else:
+            candidates = range(len(self._texts))
+        hits = tuple(
+            self._ids[pos]
+            for pos in candidates
+            if normalized_anchor in self._texts[pos]
+        )
+        self._hits[normalized_anchor] = hits
+        return hits
+
+
 def _match_by_anchor(
     anchors: Sequence[str],
     source_ids: Sequence[str],
-    source_paragraphs: Dict[str, str],
+    anchor_index: AnchorIndex,
+    source_positions: Dict[str, int],
     last_idx: int,
 ) -> Tuple[str, int] | tuple[None, None]:
     if not anchors or not source_ids:
         return None, None
+    window = _search_window(len(source_ids), last_idx)
     for anchor in anchors:
         normalized_anchor = _normalize_anchor(anchor)
         if not normalized_anchor:
             continue
-        for idx in _iter_candidate_indices(len(source_ids), last_idx):
-            source_text = source_paragraphs.get(source_ids[idx], "")
-            normalized_source = _strip_accents(source_text).lower()
-            if normalized_anchor in normalized_source:
-                return source_ids[idx], idx
+        hits = sorted(
+            source_positions[par_id]
+            for par_id in anchor_index.lookup(normalized_anchor)
+            if par_id in source_positions
+        )
+        if not hits:
+            continue
+        # Same preference as scanning `_iter_candidate_indices`: the first
+        # hit inside the window, otherwise the first hit in document order.
+        first_in_window = bisect_left(hits, window[0])
+        if first_in_window < len(hits) and hits[first_in_window] <= window[-1]:
+            idx = hits[first_in_window]
+        else:
+            idx = hits[0]
+        return source_ids[idx], idx
     return None, None
 
 
@@ -117,6 +186,7 @@ def _match_by_similarity(
         return None, None, 0.0
     best_idx = None
     best_ratio = 0.0
+    profiling.count("comparacoes_similaridade", len(source_ids))
     for idx in _iter_candidate_indices(len(source_ids), last_idx):
         candidate_text = source_paragraphs.get(source_ids[idx], "")
         ratio = SequenceMatcher(None, target_text, candidate_text).ratio()
@@ -139,70 +209,132 @@ def _collect_anchor_texts(annotations: Sequence["Annotation"]) -> List[str]:
     return anchors
 
 
+class SectionAligner:
+    """Greedy per-paragraph alignment state, one cursor per section.
+
+    `align_paragraphs` drives it over whole sections; the streaming pipeline
+    feeds it one target paragraph at a time in document order, which yields
+    the same result because each section only depends on its own cursor.
+    """
+
+    def __init__(
+        self,
+        source_sections: Dict[str, List[str]],
+        source_paragraphs: Dict[str, str],
+        similarity_matcher: SimilarityMatcher | None = None,
+        similarity_threshold: float = _SIMILARITY_THRESHOLD,
+    ) -> None:
+        self._source_sections = source_sections
+        self._source_paragraphs = source_paragraphs
+        self._match_by_similarity = similarity_matcher or _match_by_similarity
+        self._similarity_threshold = similarity_threshold
+        self._anchor_index: AnchorIndex | None = None
+        self._last_idx: Dict[str, int] = {}
+        self._section_ids: Dict[str, Tuple[List[str], Dict[str, int]]] = {}
+        self._all_source_ids: List[str] = []
+        seen = set()
+        for ids in source_sections.values():
+            for source_id in ids:
+                if source_id not in seen:
+                    seen.add(source_id)
+                    self._all_source_ids.append(source_id)
+
+    def source_ids(self, section: str) -> List[str]:
+        """Return the source paragraphs searched for ``section``."""
+
+        return self._section(section)[0]
+
+    def cursor(self, section: str) -> int:
+        """Return the index of the last source match in ``section``."""
+
+        return self._last_idx.get(section, -1)
+
+    def set_cursor(self, section: str, idx: int) -> None:
+        self._last_idx[section] = idx
+
+    def _section(self, section: str) -> Tuple[List[str], Dict[str, int]]:
+        cached = self._section_ids.get(section)
+        if cached is None:
+            source_ids = (
+                self._source_sections.get(section) or self._all_source_ids
+            )
+            cached = (
+                source_ids,
+                {source_id: idx for idx, source_id in enumerate(source_ids)},
+            )
+            self._section_ids[section] = cached
+        return cached
+
+    def align(
+        self,
+        section: str,
+        target_id: str,
+        target_clean: Dict[str, str],
+        annotations: Sequence["Annotation"],
+    ) -> Dict[str, object]:
+        """Align one target paragraph and advance its section cursor."""
+
+        source_ids, source_positions = self._section(section)
+        last_idx = self._last_idx.get(section, -1)
+        anchors = _collect_anchor_texts(annotations)
+        if self._anchor_index is None:
+            self._anchor_index = AnchorIndex(self._source_paragraphs)
+        match_id, matched_idx = _match_by_anchor(
+            anchors, source_ids, self._anchor_index, source_positions, last_idx
+        )
+        confident = match_id is not None
+
+        if match_id is None:
+            match_id, matched_idx, best_ratio = self._match_by_similarity(
+                target_id,
+                source_ids,
+                self._source_paragraphs,
+                target_clean,
+                last_idx,
+            )
+            confident = best_ratio >= self._similarity_threshold
+
+        if match_id is None or matched_idx is None:
+            return {
+                "paragrafo_fonte_ids": [],
+                "fonte_alinhamento_confiavel": False,
+            }
+        self._last_idx[section] = matched_idx
+        return {
+            "paragrafo_fonte_ids": [match_id],
+            "fonte_alinhamento_confiavel": confident,
+        }
+
+
 def align_paragraphs(
     source_sections: Dict[str, List[str]],
     target_sections: Dict[str, List[str]],
     source_paragraphs: Dict[str, str],
     target_clean: Dict[str, str],
     annotations_map: Dict[str, List["Annotation"]],
+    similarity_matcher: SimilarityMatcher | None = None,
+    similarity_threshold: float = _SIMILARITY_THRESHOLD,
 ) -> Dict[str, Dict[str, object]]:
-    """Align target paragraphs to source paragraphs via cascaded heuristics."""
-
+    """Align target paragraphs to source paragraphs via cascaded heuristics.
+
+    ``similarity_matcher`` replaces the difflib fallback used when no anchor
+    matches; ``similarity_threshold`` is the score from which its matches are
+    considered confident.
+    """
+
+    aligner = SectionAligner(
+        source_sections,
+        source_paragraphs,
+        similarity_matcher=similarity_matcher,
+        similarity_threshold=similarity_threshold,
+    )
     alignment: Dict[str, Dict[str, object]] = {}
-    last_idx_per_section: Dict[str, int] = {}
-    all_source_ids: List[str] = []
-    for ids in source_sections.values():
-        for source_id in ids:
-            if source_id not in all_source_ids:
-                all_source_ids.append(source_id)
-
     for section, target_ids in target_sections.items():
-        source_ids = source_sections.get(section, [])
-        if not source_ids:
-            source_ids = all_source_ids
-        last_idx = last_idx_per_section.get(section, -1)
         for target_id in target_ids:
-            annotations = annotations_map.get(target_id, [])
-            anchors = _collect_anchor_texts(annotations)
-            match_id, matched_idx = _match_by_anchor(
-                anchors, source_ids, source_paragraphs, last_idx
-            )
-            confident = match_id is not None
-
-            if match_id is None:
-                match_id, matched_idx, best_ratio = _match_by_similarity(
-                    target_id,
-                    source_ids,
-                    source_paragraphs,
-                    target_clean,
-                    last_idx,
-                )
-                confident = best_ratio >= _SIMILARITY_THRESHOLD
-
-            if match_id is not None and matched_idx is not None:
-                alignment[target_id] = {
-                    "paragrafo_fonte_ids": [match_id],
-                    "fonte_alinhamento_confiavel": confident,
-                }
-                last_idx = matched_idx
-            else:
-                alignment[target_id] = {
-                    "paragrafo_fonte_ids": [],
-                    "fonte_alinhamento_confiavel": False,
-                }
-        last_idx_per_section[section] = last_idx
-
-    # Track paragraphs cujas secoes nao existem na fonte
-    for section, target_ids in target_sections.items():
-        if section in source_sections:
-            continue
-        for target_id in target_ids:
-            alignment.setdefault(
+            alignment[target_id] = aligner.align(
+                section,
                 target_id,
-                {
-                    "paragrafo_fonte_ids": [],
-                    "fonte_alinhamento_confiavel": False,
-                },
+                target_clean,
+                annotations_map.get(target_id, []),
             )
-
     return alignment
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+from array import array
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, List, NamedTuple, Tuple
 
 _BLOCK_PATTERN = re.compile(r"\[(?P<inner>.+?)\]", re.DOTALL)
 _HEADER_PATTERN = re.compile(
     r"^(?P<tags>[A-Z]{2,4}\+(?:/[A-Z]{2,4}\+)*)(?P<body>\s+.*)?$",
     re.DOTALL,
 )
+_TOKEN_PATTERN = re.compile(r"\S+")
+_SENTENCE_END = frozenset(".!?")
 
 
 class Annotation(dict):
@@ -41,79 +46,189 @@ def _parse_annotation_block(
     return tags, body
 
 
-def _strip_known_annotation_blocks(text: str) -> str:
-    """Remove valid annotation blocks from text and keep other brackets."""
+class OffsetMap:
+    """Mapping between raw paragraph offsets and cleaned-text offsets.
+
+    Stored as runs of characters copied verbatim from the raw text: two
+    parallel integer arrays hold where each run starts in clean and raw
+    coordinates, so memory grows with the number of runs, not characters.
+    """
+
+    __slots__ = ("_clean_starts", "_raw_starts", "_clean_length")
+
+    def __init__(self) -> None:
+        self._clean_starts = array("l")
+        self._raw_starts = array("l")
+        self._clean_length = 0
+
+    def _append(self, raw_pos: int, length: int) -> None:
+        if (
+            self._raw_starts
+            and raw_pos - self._raw_starts[-1]
+            == self._clean_length - self._clean_starts[-1]
+        ):
+            self._clean_length += length
+            return
+        self._clean_starts.append(self._clean_length)
+        self._raw_starts.append(raw_pos)
+        self._clean_length += length
+
+    def __len__(self) -> int:
+        return len(self._clean_starts)
+
+    def to_raw(self, clean_pos: int) -> int:
+        """Return the raw offset of the clean character at ``clean_pos``."""
+
+        run = bisect_right(self._clean_starts, clean_pos) - 1
+        if run < 0:
+            return 0
+        return self._raw_starts[run] + clean_pos - self._clean_starts[run]
+
+    def to_clean(self, raw_pos: int) -> int:
+        """Return the clean offset of ``raw_pos``.
+
+        Raw characters dropped by cleaning (annotation blocks, collapsed
+        whitespace) map to the next clean character.
+        """
+
+        run = bisect_right(self._raw_starts, raw_pos) - 1
+        if run < 0:
+            return 0
+        run_end = (
+            self._clean_starts[run + 1]
+            if run + 1 < len(self._clean_starts)
+            else self._clean_length
+        )
+        offset = raw_pos - self._raw_starts[run]
+        return self._clean_starts[run] + min(
+            offset, run_end - self._clean_starts[run]
+        )
+
+
+class LexedParagraph(NamedTuple):
+    clean: str
+    annotations: List[Annotation]
+    offsets: OffsetMap
+
+
+def lex_paragraph(par_id: str, text: str) -> LexedParagraph:
+    """Walk one paragraph once, emitting clean text, annotations and offsets.
+
+    The clean text equals `clean_paragraph`. Each annotation's ``trecho_alvo``
+    is the trailing sentence (or last 12 words) of the clean text before the
+    tag, and ``trecho_alvo_inicio``/``trecho_alvo_fim`` locate it there.
+    """
+
+    pieces: List[str] = []
+    offsets = OffsetMap()
+    found: List[Annotation] = []
+    spans: List[Tuple[int, int]] = []
+    length = 0
+    pending_raw = -1  # raw offset of a whitespace run not yet emitted
+    last_char = ""
+    sentence_start = 0
+    words = 0
+    words_before_sentence = 0
+    word_starts: deque[int] = deque(maxlen=12)
+
+    def emit(segment: str, base: int) -> None:
+        nonlocal length, pending_raw, last_char
+        nonlocal sentence_start, words, words_before_sentence
+        previous_end = 0
+        for token in _TOKEN_PATTERN.finditer(segment):
+            if token.start() > previous_end and pending_raw < 0:
+                pending_raw = base + previous_end
+            if not length:
+                words += 1
+                word_starts.append(0)
+            elif pending_raw >= 0:
+                pieces.append(" ")
+                offsets._append(pending_raw, 1)
+                length += 1
+                if last_char in _SENTENCE_END:
+                    sentence_start = length
+                    words_before_sentence = words
+                words += 1
+                word_starts.append(length)
+            pending_raw = -1
+            value = token.group(0)
+            pieces.append(value)
+            offsets._append(base + token.start(), len(value))
+            length += len(value)
+            last_char = value[-1]
+            previous_end = token.end()
+        if previous_end < len(segment) and pending_raw < 0:
+            pending_raw = base + previous_end
 
-    chunks: list[str] = []
     last_end = 0
     for block in _BLOCK_PATTERN.finditer(text):
-        chunks.append(text[last_end:block.start()])
+        emit(text[last_end:block.start()], last_end)
+        last_end = block.end()
         parsed = _parse_annotation_block(block.group("inner"))
         if parsed is None:
-            chunks.append(block.group(0))
+            emit(block.group(0), block.start())
+            continue
+        if pending_raw < 0:
+            pending_raw = block.start()
+        # Target span: trailing sentence before the tag, or the last 12
+        # words when that sentence is shorter than 3 words.
+        if not length:
+            span = (0, 0)
+        elif words - words_before_sentence < 3:
+            span = (word_starts[0], length)
         else:
-            chunks.append(" ")
-        last_end = block.end()
-
-    chunks.append(text[last_end:])
-    return "".join(chunks)
+            span = (sentence_start, length)
+        tags, body = parsed
+        for tag in tags:
+            found.append(
+                Annotation(
+                    {
+                        "tag": tag,
+                        "conteudo_bruto": body,
+                        "paragrafo_alvo_id": par_id,
+                        "posicao_inicio": block.start(),
+                        "posicao_fim": block.end(),
+                    }
+                )
+            )
+            spans.append(span)
+    emit(text[last_end:], last_end)
 
+    clean = "".join(pieces)
+    for annotation, (start, end) in zip(found, spans):
+        annotation["trecho_alvo"] = clean[start:end]
+        annotation["trecho_alvo_inicio"] = start if end > start else None
+        annotation["trecho_alvo_fim"] = end if end > start else None
+    return LexedParagraph(clean, found, offsets)
 
-def _extract_target_span(paragraph_text: str, tag_start: int) -> str:
-    """Grab a short snippet of the target text preceding the tag marker."""
 
-    before = _strip_known_annotation_blocks(paragraph_text[:tag_start]).rstrip()
-    if not before:
-        return ""
+def lex_all(
+    target_paragraphs: Dict[str, str],
+) -> Tuple[Dict[str, str], List[Annotation]]:
+    """Return cleaned paragraphs and annotations from a single lexing pass."""
 
-    # Prefer the trailing sentence fragment when punctuation is available.
-    sentence_parts = re.split(r"(?<=[\.!?])\s+", before)
-    candidate = sentence_parts[-1].strip() if sentence_parts else before
-    if len(candidate.split()) < 3:
-        words = before.split()
-        candidate = " ".join(words[-12:]) if words else before
-    return candidate.strip()
+    cleaned: Dict[str, str] = {}
+    found: List[Annotation] = []
+    for par_id, text in target_paragraphs.items():
+        lexed = lex_paragraph(par_id, text)
+        cleaned[par_id] = lexed.clean
+        found.extend(lexed.annotations)
+    return cleaned, found
 
 
 def extract_annotations(target_paragraphs: Dict[str, str]) -> List[Annotation]:
     """Return a list of annotations extracted from the target paragraphs."""
 
-    annotations: List[Annotation] = []
-    for par_id, text in target_paragraphs.items():
-        for block in _BLOCK_PATTERN.finditer(text):
-            parsed = _parse_annotation_block(block.group("inner"))
-            if parsed is None:
-                continue
-            tags, body = parsed
-            for tag in tags:
-                annotations.append(
-                    Annotation(
-                        {
-                            "tag": tag,
-                            "conteudo_bruto": body,
-                            "paragrafo_alvo_id": par_id,
-                            "posicao_inicio": block.start(),
-                            "posicao_fim": block.end(),
-                            "trecho_alvo": _extract_target_span(
-                                text, block.start()
-                            ),
-                        }
-                    )
-                )
-    return annotations
+    return lex_all(target_paragraphs)[1]
 
 
 def clean_paragraph(paragraph_text: str) -> str:
     """Remove `[TAG+ ...]` blocks from a paragraph while retaining spacing."""
 
-    cleaned = _strip_known_annotation_blocks(paragraph_text)
-    return _collapse_ws(cleaned)
+    return lex_paragraph("", paragraph_text).clean
 
 
 def clean_all(target_paragraphs: Dict[str, str]) -> Dict[str, str]:
     """Return a dict of cleaned paragraphs with the same IDs."""
 
-    return {
-        par_id: clean_paragraph(text)
-        for par_id, text in target_paragraphs.items()
-    }
+    return lex_all(target_paragraphs)[0]
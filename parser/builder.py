@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 from typing import Dict, List
 
 from .schema import AnnotationSample
 
 _REVIEW_TAGS = {"OM+", "PRO+", "RP+"}
+ID_SCHEMES = ("sequential", "content")
 
 
 def _merge_source_text(
@@ -19,6 +21,36 @@ def _merge_source_text(
     return merged or None
 
 
+def _content_sample_id(
+    document_id: str,
+    paragraph_text: str,
+    annotation: dict,
+    id_counts: Dict[str, int],
+) -> str:
+    """Derive a sample ID from what the sample is, not where it sits.
+
+    Hashes the document, the cleaned paragraph, the tag, the target span and
+    the annotation body; ``id_counts`` only separates exact duplicates.
+    """
+
+    paragraph = hashlib.sha256(paragraph_text.encode("utf-8")).hexdigest()
+    content = "\x1f".join(
+        [
+            document_id,
+            paragraph,
+            annotation["tag"],
+            str(annotation.get("trecho_alvo_inicio")),
+            str(annotation.get("trecho_alvo_fim")),
+            annotation.get("conteudo_bruto", ""),
+        ]
+    )
+    id_counts[content] = id_counts.get(content, 0) + 1
+    if id_counts[content] > 1:
+        content = f"{content}\x1f{id_counts[content]}"
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return f"PAT_{digest[:12]}_{annotation['tag'].replace('+', '')}"
+
+
 def _needs_manual_review(
     tag: str, confident_alignment: bool
 ) -> tuple[bool, str | None]:
@@ -35,12 +67,28 @@ def build_samples(
     alignment: Dict[str, Dict[str, object]],
     tag_definitions: Dict[str, Dict[str, str]],
     source_paragraphs: Dict[str, str],
+    start: int = 1,
+    id_scheme: str = "sequential",
+    document_id: str = "",
+    id_counts: Dict[str, int] | None = None,
 ) -> List[AnnotationSample]:
-    """Create `AnnotationSample` objects from raw annotations and metadata."""
+    """Create `AnnotationSample` objects from raw annotations and metadata.
+
+    ``start`` is the sequence number of the first sample, so callers that
+    build samples in batches keep the IDs of a single run. With
+    ``id_scheme="content"`` IDs are derived from ``document_id`` and the
+    annotation content instead, so inserting a tag does not renumber the
+    samples after it; pass the same ``id_counts`` to every call of a
+    batched build so duplicate annotations stay distinct.
+    """
 
+    if id_scheme not in ID_SCHEMES:
+        raise ValueError(f"Esquema de ID desconhecido: {id_scheme}")
     samples: List[AnnotationSample] = []
+    if id_counts is None:
+        id_counts = {}
 
-    for idx, annotation in enumerate(annotations, start=1):
+    for idx, annotation in enumerate(annotations, start=start):
         par_id = annotation["paragrafo_alvo_id"]
         align_info = alignment.get(
             par_id,
@@ -56,8 +104,18 @@ def build_samples(
         confident = bool(align_info["fonte_alinhamento_confiavel"])
         precisa_revisao, motivo = _needs_manual_review(tag, confident)
 
+        if id_scheme == "content":
+            sample_id = _content_sample_id(
+                document_id,
+                target_clean.get(par_id, ""),
+                annotation,
+                id_counts,
+            )
+        else:
+            sample_id = f"PAT_{idx:04d}_{tag.replace('+', '')}"
+
         sample = AnnotationSample(
-            id=f"PAT_{idx:04d}_{tag.replace('+', '')}",
+            id=sample_id,
             tag=tag,
             nome=tag_info.get("nome", tag),
             tipo_nivel=tag_info.get("tipo_nivel", "desconhecido"),
@@ -70,6 +128,8 @@ def build_samples(
                 fonte_ids, source_paragraphs
             ),
             trecho_alvo=annotation.get("trecho_alvo") or None,
+            trecho_alvo_inicio=annotation.get("trecho_alvo_inicio"),
+            trecho_alvo_fim=annotation.get("trecho_alvo_fim"),
             trecho_fonte=annotation.get("conteudo_bruto") or None,
             necessita_revisao_humana=precisa_revisao,
             motivo_revisao=motivo,
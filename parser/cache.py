@@ -0,0 +1,146 @@
+"""Persistent per-paragraph cache for incremental re-parses.
+
+Entries are keyed by content hashes: lexing results by the raw target
+paragraph, alignment decisions by the target paragraph, the source section
+it is searched in, and the section cursor it starts from (the greedy
+aligner is sequential, so the cursor is part of the input). Reusing an
+entry therefore gives exactly what recomputing it would.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from .annotations import Annotation, lex_paragraph
+
+CACHE_VERSION = 1
+
+
+def content_hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def cache_path_for(cache_dir: Path | str, target_path: Path | str) -> Path:
+    """Return the cache file used for one target document."""
+
+    target = Path(target_path).resolve()
+    return Path(cache_dir) / f"{target.stem}-{content_hash(str(target))[:12]}.json"
+
+
+class ParseCache:
+    """Lexing and alignment entries loaded from, and saved to, one file.
+
+    Only entries used by the current run are written back, so the file
+    tracks the latest version of the document instead of growing forever.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._lex: Dict[str, dict] = {}
+        self._align: Dict[str, dict] = {}
+        self._used_lex: Dict[str, dict] = {}
+        self._used_align: Dict[str, dict] = {}
+        self.hits = {"lex": 0, "align": 0}
+        self.misses = {"lex": 0, "align": 0}
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if isinstance(payload, dict) and payload.get("versao") == CACHE_VERSION:
+            self._lex = payload.get("lex") or {}
+            self._align = payload.get("alinhamento") or {}
+
+    def lex(self, par_id: str, text: str) -> Tuple[str, List[Annotation]]:
+        """Return cleaned text and annotations for one target paragraph."""
+
+        key = content_hash(text)
+        entry = self._lex.get(key)
+        if entry is None:
+            self.misses["lex"] += 1
+            lexed = lex_paragraph(par_id, text)
+            entry = {
+                "clean": lexed.clean,
+                "annotations": [
+                    {k: v for k, v in item.items() if k != "paragrafo_alvo_id"}
+                    for item in lexed.annotations
+                ],
+            }
+        else:
+            self.hits["lex"] += 1
+        self._used_lex[key] = entry
+        found = [
+            Annotation({**item, "paragrafo_alvo_id": par_id})
+            for item in entry["annotations"]
+        ]
+        return entry["clean"], found
+
+    @staticmethod
+    def section_hash(
+        source_ids: Sequence[str],
+        source_paragraphs: Dict[str, str],
+    ) -> str:
+        return content_hash(
+            *(
+                f"{source_id}\x1e{source_paragraphs.get(source_id, '')}"
+                for source_id in source_ids
+            )
+        )
+
+    def alignment_key(
+        self,
+        aligner: str,
+        section: str,
+        section_hash: str,
+        target_text: str,
+        cursor: int,
+    ) -> str:
+        return content_hash(
+            aligner, section, section_hash, target_text, str(cursor)
+        )
+
+    def get_alignment(self, key: str) -> dict | None:
+        entry = self._align.get(key)
+        if entry is None:
+            self.misses["align"] += 1
+            return None
+        self.hits["align"] += 1
+        self._used_align[key] = entry
+        return entry
+
+    def put_alignment(self, key: str, entry: dict) -> None:
+        self._used_align[key] = entry
+
+    def hit_rate(self, kind: str) -> float:
+        total = self.hits[kind] + self.misses[kind]
+        return self.hits[kind] / total if total else 0.0
+
+    def summary(self) -> str:
+        parts = []
+        for kind, label in (("lex", "paragrafos"), ("align", "alinhamentos")):
+            total = self.hits[kind] + self.misses[kind]
+            parts.append(
+                f"{label} {self.hits[kind]}/{total} "
+                f"({self.hit_rate(kind):.1%})"
+            )
+        return "Cache incremental: " + ", ".join(parts)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "versao": CACHE_VERSION,
+            "lex": self._used_lex,
+            "alinhamento": self._used_align,
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(payload, ensure_ascii=False), encoding="utf-8"
+        )
+        os.replace(tmp_path, self.path)
@@ -4,15 +4,30 @@ from __future__ import annotations
 
 import argparse
 from collections import defaultdict
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List
 
-from . import alignment, annotations, builder, segmentation, tag_defs
+from . import (
+    alignment,
+    annotations,
+    builder,
+    dp_alignment,
+    paragraph_table,
+    profiling,
+    segmentation,
+    streaming,
+    tag_defs,
+    vector_alignment,
+)
 from .annotations import Annotation
-from .io_utils import write_json
-from .schema import Metadata
+from .cache import ParseCache, cache_path_for
+from .io_utils import write_json, write_jsonl
+from .profiling import StageProfiler, StageProgress
+from .schema import AnnotationSample, Metadata
 
 BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = BASE_DIR / "data" / "parser_cache"
 
 _DEFAULT_TAG_NAMES: Dict[str, Dict[str, str]] = {
     "RF+": {"nome": "Reformulacao", "tipo_nivel": "discurso"},
@@ -28,6 +43,13 @@ _DEFAULT_TAG_NAMES: Dict[str, Dict[str, str]] = {
     "PRO+": {"nome": "Problema", "tipo_nivel": "discurso"},
 }
 
+ALIGNERS = {
+    "heuristic": alignment.align_paragraphs,
+    "tfidf": vector_alignment.align_paragraphs_tfidf,
+    "dp": dp_alignment.align_paragraphs_dp,
+}
+DEFAULT_ALIGNER = "heuristic"
+
 
 def _build_argument_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -58,8 +80,79 @@ def _build_argument_parser() -> argparse.ArgumentParser:
         "--output",
         dest="output_path",
         type=Path,
-        default=BASE_DIR / "dataset_raw.json",
-        help="Arquivo de saída (JSON)",
+        default=None,
+        help=(
+            "Arquivo de saída (JSON; JSONL com --stream). Padrao: "
+            "dataset_raw.json ou dataset_raw.jsonl"
+        ),
+    )
+    parser.add_argument(
+        "--aligner",
+        choices=sorted(ALIGNERS),
+        default=DEFAULT_ALIGNER,
+        help=(
+            "Estrategia de alinhamento: heuristic (difflib, padrao), "
+            "tfidf (similaridade vetorizada, requer scikit-learn) ou "
+            "dp (alinhamento global por programacao dinamica sobre tfidf)"
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Reaproveita limpeza, anotacoes e alinhamento dos paragrafos "
+            "inalterados (cache em data/parser_cache)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Diretorio do cache incremental (implica --incremental)",
+    )
+    parser.add_argument(
+        "--id-scheme",
+        choices=builder.ID_SCHEMES,
+        default="sequential",
+        help=(
+            "Formato dos IDs: sequential (PAT_0001_TAG, padrao) ou content "
+            "(hash do documento, paragrafo, tag e trecho; estavel entre "
+            "reprocessamentos)"
+        ),
+    )
+    parser.add_argument(
+        "--layout",
+        choices=paragraph_table.LAYOUTS,
+        default="inline",
+        help=(
+            "Formato do JSON: inline (textos repetidos em cada amostra, "
+            "padrao) ou v3 (tabela 'paragrafos' referenciada pelas amostras)"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Mede tempo (wall/CPU), pico de memoria e contadores por etapa "
+            "e grava <saida>.profile.json"
+        ),
+    )
+    parser.add_argument(
+        "--profile-trace",
+        type=Path,
+        default=None,
+        help=(
+            "Tambem grava as etapas no formato Chrome trace-event "
+            "(implica --profile)"
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Processa o texto alvo paragrafo a paragrafo e grava uma amostra "
+            "por linha (JSONL), com memoria constante"
+        ),
     )
     return parser
 
@@ -73,13 +166,161 @@ def _load_tag_definitions(tags_path: Path) -> Dict[str, Dict[str, str]]:
     return _DEFAULT_TAG_NAMES
 
 
+def _align_with_cache(
+    cache: ParseCache,
+    source_sections: Dict[str, List[str]],
+    target_sections: Dict[str, List[str]],
+    source_paragraphs: Dict[str, str],
+    target_paragraphs: Dict[str, str],
+    target_clean: Dict[str, str],
+    annotations_map: Dict[str, List[Annotation]],
+) -> Dict[str, Dict[str, object]]:
+    """`alignment.align_paragraphs`, reusing cached per-paragraph decisions."""
+
+    aligner = alignment.SectionAligner(source_sections, source_paragraphs)
+    result: Dict[str, Dict[str, object]] = {}
+    for section, target_ids in target_sections.items():
+        section_hash = cache.section_hash(
+            aligner.source_ids(section), source_paragraphs
+        )
+        for target_id in target_ids:
+            key = cache.alignment_key(
+                DEFAULT_ALIGNER,
+                section,
+                section_hash,
+                target_paragraphs[target_id],
+                aligner.cursor(section),
+            )
+            entry = cache.get_alignment(key)
+            if entry is None:
+                info = aligner.align(
+                    section,
+                    target_id,
+                    target_clean,
+                    annotations_map.get(target_id, []),
+                )
+                entry = {"info": info, "cursor": aligner.cursor(section)}
+                cache.put_alignment(key, entry)
+            else:
+                aligner.set_cursor(section, entry["cursor"])
+            result[target_id] = {
+                "paragrafo_fonte_ids": list(
+                    entry["info"]["paragrafo_fonte_ids"]
+                ),
+                "fonte_alinhamento_confiavel": entry["info"][
+                    "fonte_alinhamento_confiavel"
+                ],
+            }
+    return result
+
+
+def build_pair_samples(
+    source_path: Path | str,
+    target_path: Path | str,
+    tag_definitions: Dict[str, Dict[str, str]],
+    align: Callable[..., Dict[str, Dict[str, object]]] = (
+        alignment.align_paragraphs
+    ),
+    cache: ParseCache | None = None,
+    id_scheme: str = "sequential",
+    document_id: str | None = None,
+) -> List[AnnotationSample]:
+    """Run the batch pipeline for one source/target pair.
+
+    With a ``cache``, lexing results are reused for unchanged target
+    paragraphs and, for the default aligner, so are alignment decisions.
+    Content IDs hash ``document_id`` (default: the target file stem).
+    """
+
+    with profiling.stage("segmentation"):
+        source_paragraphs = segmentation.segment_source(str(source_path))
+        target_paragraphs = segmentation.segment_target(str(target_path))
+    profiling.count("paragrafos_fonte", len(source_paragraphs))
+    profiling.count("paragrafos_alvo", len(target_paragraphs))
+
+    with profiling.stage("lex_all"):
+        if cache is None:
+            target_clean, extracted_annotations = annotations.lex_all(
+                target_paragraphs
+            )
+        else:
+            target_clean = {}
+            extracted_annotations = []
+            for par_id, text in target_paragraphs.items():
+                target_clean[par_id], found = cache.lex(par_id, text)
+                extracted_annotations.extend(found)
+    profiling.count("anotacoes", len(extracted_annotations))
+
+    annotations_by_paragraph: Dict[str, List[Annotation]] = defaultdict(list)
+    for item in extracted_annotations:
+        annotations_by_paragraph[item["paragrafo_alvo_id"]].append(item)
+
+    with profiling.stage("detect_sections"):
+        source_sections = alignment.detect_sections(source_paragraphs)
+        target_sections = alignment.detect_sections(target_paragraphs)
+    with profiling.stage("align_paragraphs"):
+        if cache is not None and align is alignment.align_paragraphs:
+            alignment_info = _align_with_cache(
+                cache,
+                source_sections,
+                target_sections,
+                source_paragraphs,
+                target_paragraphs,
+                target_clean,
+                annotations_by_paragraph,
+            )
+        else:
+            alignment_info = align(
+                source_sections=source_sections,
+                target_sections=target_sections,
+                source_paragraphs=source_paragraphs,
+                target_clean=target_clean,
+                annotations_map=annotations_by_paragraph,
+            )
+
+    with profiling.stage("build_samples"):
+        samples = builder.build_samples(
+            annotations=[dict(item) for item in extracted_annotations],
+            target_clean=target_clean,
+            alignment=alignment_info,
+            tag_definitions=tag_definitions,
+            source_paragraphs=source_paragraphs,
+            id_scheme=id_scheme,
+            document_id=(
+                Path(target_path).stem if document_id is None else document_id
+            ),
+        )
+    profiling.count("amostras", len(samples))
+    return samples
+
+
 def main(
     source_path: Path | str | None = None,
     target_path: Path | str | None = None,
     tags_path: Path | str | None = None,
     output_path: Path | str | None = None,
+    aligner: str | None = None,
+    stream: bool = False,
+    cache_dir: Path | str | None = None,
+    id_scheme: str | None = None,
+    layout: str | None = None,
+    profiler: StageProfiler | None = None,
+    profile_trace: Path | str | None = None,
+    progress: StageProgress | None = None,
 ) -> None:
-    """Generate `dataset_raw.json` by orchestrating all parser modules."""
+    """Generate `dataset_raw.json` by orchestrating all parser modules.
+
+    With ``stream`` the samples are written to ``output_path`` as JSONL while
+    the target is read, instead of being collected into one JSON payload.
+    With ``cache_dir`` unchanged paragraphs are served from a persistent
+    cache and the hit rate is printed. ``layout="v3"`` stores each
+    paragraph text once in a top-level ``paragrafos`` table. With a
+    ``profiler`` (created automatically for ``profile_trace``) each stage is
+    timed and the report is written to ``<output>.profile.json``. A
+    ``progress`` object is told about each stage and can cancel the run
+    (`profiling.ParseCancelled`); the output file is only replaced once the
+    run completes.
+    """
 
     if (
         source_path is None
@@ -91,7 +332,18 @@ def main(
         source_path = args.source_path
         target_path = args.target_path
         tags_path = args.tags_path
-        output_path = args.output_path
+        aligner = aligner or args.aligner
+        stream = stream or args.stream
+        id_scheme = id_scheme or args.id_scheme
+        layout = layout or args.layout
+        if args.profile or args.profile_trace is not None:
+            profiler = profiler or StageProfiler()
+            profile_trace = profile_trace or args.profile_trace
+        if args.cache_dir is not None or args.incremental:
+            cache_dir = cache_dir or args.cache_dir or DEFAULT_CACHE_DIR
+        output_path = args.output_path or BASE_DIR / (
+            "dataset_raw.jsonl" if stream else "dataset_raw.json"
+        )
 
     assert source_path is not None
     assert target_path is not None
@@ -102,44 +354,104 @@ def main(
     target_path = Path(target_path)
     tags_path = Path(tags_path)
     output_path = Path(output_path)
+    align = ALIGNERS.get(aligner or DEFAULT_ALIGNER)
+    if align is None:
+        raise ValueError(f"Alinhador desconhecido: {aligner}")
+    id_scheme = id_scheme or "sequential"
+    if id_scheme not in builder.ID_SCHEMES:
+        raise ValueError(f"Esquema de ID desconhecido: {id_scheme}")
+    layout = layout or "inline"
+    if layout not in paragraph_table.LAYOUTS:
+        raise ValueError(f"Formato desconhecido: {layout}")
+    if stream:
+        if cache_dir is not None:
+            raise ValueError("O modo --stream nao usa o cache incremental.")
+        if layout != "inline":
+            raise ValueError("O modo --stream grava apenas o formato inline.")
+        if align is not alignment.align_paragraphs:
+            raise ValueError(
+                "O modo --stream suporta apenas o alinhador "
+                f"{DEFAULT_ALIGNER}."
+            )
+    if profiler is None and profile_trace is not None:
+        profiler = StageProfiler()
 
-    source_paragraphs = segmentation.segment_source(str(source_path))
-    target_paragraphs = segmentation.segment_target(str(target_path))
+    with progress or nullcontext(), profiler or nullcontext():
+        _generate(
+            source_path,
+            target_path,
+            tags_path,
+            output_path,
+            align,
+            stream,
+            cache_dir,
+            id_scheme,
+            layout,
+        )
+    if profiler is None:
+        return
+    profile_path = profiling.profile_path_for(output_path)
+    profiler.write(profile_path, profile_trace)
+    print(profiler.summary())
+    print(f"Perfil gravado em {profile_path}")
 
-    target_clean = annotations.clean_all(target_paragraphs)
-    extracted_annotations = annotations.extract_annotations(target_paragraphs)
-
-    annotations_by_paragraph: Dict[str, List[Annotation]] = defaultdict(list)
-    for item in extracted_annotations:
-        annotations_by_paragraph[item["paragrafo_alvo_id"]].append(item)
 
-    source_sections = alignment.detect_sections(source_paragraphs)
-    target_sections = alignment.detect_sections(target_paragraphs)
-    alignment_info = alignment.align_paragraphs(
-        source_sections=source_sections,
-        target_sections=target_sections,
-        source_paragraphs=source_paragraphs,
-        target_clean=target_clean,
-        annotations_map=annotations_by_paragraph,
-    )
+def _generate(
+    source_path: Path,
+    target_path: Path,
+    tags_path: Path,
+    output_path: Path,
+    align: Callable[..., Dict[str, Dict[str, object]]],
+    stream: bool,
+    cache_dir: Path | str | None,
+    id_scheme: str,
+    layout: str,
+) -> None:
+    with profiling.stage("load_tag_definitions"):
+        tag_definitions = _load_tag_definitions(tags_path)
 
-    tag_definitions = _load_tag_definitions(tags_path)
+    if stream:
+        samples = streaming.iter_samples(
+            source_path,
+            target_path,
+            tag_definitions,
+            id_scheme=id_scheme,
+        )
+        # Parsing happens lazily while the rows are written.
+        with profiling.stage("stream"):
+            written = write_jsonl(
+                output_path, (sample.to_dict() for sample in samples)
+            )
+        profiling.count("amostras", written)
+        return
 
-    samples = builder.build_samples(
-        annotations=[dict(item) for item in extracted_annotations],
-        target_clean=target_clean,
-        alignment=alignment_info,
-        tag_definitions=tag_definitions,
-        source_paragraphs=source_paragraphs,
+    cache = (
+        ParseCache(cache_path_for(cache_dir, target_path))
+        if cache_dir is not None
+        else None
+    )
+    samples = build_pair_samples(
+        source_path,
+        target_path,
+        tag_definitions,
+        align,
+        cache=cache,
+        id_scheme=id_scheme,
     )
+    if cache is not None:
+        cache.save()
+        print(cache.summary())
 
-    metadata = Metadata()
-    payload = {
-        "metadata": metadata.to_dict(),
-        "amostras": [sample.to_dict() for sample in samples],
-    }
+    with profiling.stage("write_json"):
+        metadata = Metadata()
+        payload = {
+            "metadata": metadata.to_dict(),
+            "amostras": [sample.to_dict() for sample in samples],
+        }
+        if layout == "v3":
+            payload = paragraph_table.pack_dataset(payload)
 
-    write_json(output_path, payload)
+        write_json(output_path, payload)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,352 @@
+"""Corpus mode: parse many source/target pairs into one dataset.
+
+Pairs come from a JSON manifest or are discovered in a directory. Each pair
+is parsed in a `ProcessPoolExecutor` worker; samples are stamped with the
+pair's ``document_id``/``split_group_id`` and sequential IDs are prefixed
+with the document ID (content IDs already hash it), so sample IDs stay
+unique across the merged dataset. A pair that fails is
+reported in the metadata and does not abort the others.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from . import cli
+from .io_utils import write_json
+from .paragraph_table import LAYOUTS, pack_dataset
+from .schema import Metadata
+
+_SOURCE_ROLES = {"st", "fonte", "source"}
+_TARGET_ROLES = {"tt", "alvo", "target"}
+_IGNORED_TOKENS = {"texto", "anotado", "text"}
+_PAIR_SUFFIXES = {".md", ".txt"}
+
+
+class CorpusError(RuntimeError):
+    """Raised when a corpus manifest or directory cannot be used."""
+
+
+@dataclass(frozen=True)
+class CorpusPair:
+    document_id: str
+    source_path: Path
+    target_path: Path
+    split_group_id: str | None = None
+
+
+def load_manifest(path: Path | str) -> List[CorpusPair]:
+    """Read pairs from a JSON manifest.
+
+    Accepts a list of entries or ``{"pairs": [...]}``; each entry needs
+    ``source`` and ``target`` and may set ``document_id`` and
+    ``split_group_id``. Relative paths resolve against the manifest folder.
+    """
+
+    manifest_path = Path(path)
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise CorpusError(f"Manifesto invalido: {manifest_path}") from exc
+    entries = payload.get("pairs") if isinstance(payload, dict) else payload
+    if not isinstance(entries, list):
+        raise CorpusError("Manifesto deve conter uma lista 'pairs'.")
+
+    pairs: List[CorpusPair] = []
+    for index, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict) or not entry.get("source") or not (
+            entry.get("target")
+        ):
+            raise CorpusError(
+                f"Entrada {index} do manifesto sem 'source'/'target'."
+            )
+        source = manifest_path.parent / str(entry["source"])
+        target = manifest_path.parent / str(entry["target"])
+        pairs.append(
+            CorpusPair(
+                document_id=str(entry.get("document_id") or target.stem),
+                source_path=source,
+                target_path=target,
+                split_group_id=entry.get("split_group_id"),
+            )
+        )
+    _check_unique_ids(pairs)
+    return pairs
+
+
+def _role_and_key(path: Path) -> tuple[str | None, str]:
+    tokens = [
+        token for token in re.split(r"[-_\s]+", path.stem.lower()) if token
+    ]
+    role = None
+    key_tokens: List[str] = []
+    for token in tokens:
+        if role is None and token in _SOURCE_ROLES:
+            role = "source"
+        elif role is None and token in _TARGET_ROLES:
+            role = "target"
+        elif token not in _IGNORED_TOKENS:
+            key_tokens.append(token)
+    return role, "-".join(key_tokens)
+
+
+def discover_pairs(directory: Path | str) -> List[CorpusPair]:
+    """Pair files such as ``x_st.md``/``x_tt.md`` or ``texto-fonte-x.txt``.
+
+    Source and target names must share the same key once the role token is
+    removed; a target key that is the prefix of exactly one remaining source
+    key is also accepted (``texto-alvo-v06-04`` + ``texto-fonte-v06-04-26``).
+    """
+
+    root = Path(directory)
+    if not root.is_dir():
+        raise CorpusError(f"Diretorio nao encontrado: {root}")
+    sources: Dict[str, Path] = {}
+    targets: Dict[str, Path] = {}
+    for path in sorted(root.iterdir()):
+        if not path.is_file() or path.suffix.lower() not in _PAIR_SUFFIXES:
+            continue
+        role, key = _role_and_key(path)
+        if role == "source":
+            sources.setdefault(key, path)
+        elif role == "target":
+            targets.setdefault(key, path)
+
+    matched: Dict[str, str] = {
+        key: key for key in targets if key in sources
+    }
+    remaining = [key for key in sources if key not in matched.values()]
+    for key in targets:
+        if key in matched:
+            continue
+        candidates = [
+            source_key
+            for source_key in remaining
+            if source_key.startswith(key) or key.startswith(source_key)
+        ]
+        if len(candidates) == 1:
+            matched[key] = candidates[0]
+            remaining.remove(candidates[0])
+
+    pairs = [
+        CorpusPair(
+            document_id=key,
+            source_path=sources[matched[key]],
+            target_path=targets[key],
+        )
+        for key in targets
+        if key in matched
+    ]
+    _check_unique_ids(pairs)
+    return pairs
+
+
+def _check_unique_ids(pairs: Sequence[CorpusPair]) -> None:
+    seen = set()
+    for pair in pairs:
+        if pair.document_id in seen:
+            raise CorpusError(f"document_id repetido: {pair.document_id}")
+        seen.add(pair.document_id)
+
+
+def parse_pair(
+    pair: CorpusPair,
+    tag_definitions: Dict[str, Dict[str, str]],
+    aligner: str = cli.DEFAULT_ALIGNER,
+    id_scheme: str = "sequential",
+) -> List[dict]:
+    """Parse one pair and return its samples stamped for the corpus."""
+
+    samples = cli.build_pair_samples(
+        pair.source_path,
+        pair.target_path,
+        tag_definitions,
+        cli.ALIGNERS[aligner],
+        id_scheme=id_scheme,
+        document_id=pair.document_id,
+    )
+    rows: List[dict] = []
+    for sample in samples:
+        row = sample.to_dict()
+        if id_scheme == "sequential":
+            row["id"] = f"{pair.document_id}_{row['id']}"
+        row["document_id"] = pair.document_id
+        row["split_group_id"] = pair.split_group_id or pair.document_id
+        rows.append(row)
+    return rows
+
+
+def _timed_parse_pair(
+    pair: CorpusPair,
+    tag_definitions: Dict[str, Dict[str, str]],
+    aligner: str,
+    id_scheme: str,
+) -> tuple[List[dict], float]:
+    started = time.perf_counter()
+    rows = parse_pair(pair, tag_definitions, aligner, id_scheme)
+    return rows, time.perf_counter() - started
+
+
+def build_corpus(
+    pairs: Sequence[CorpusPair],
+    tag_definitions: Dict[str, Dict[str, str]],
+    aligner: str = cli.DEFAULT_ALIGNER,
+    workers: int | None = None,
+    id_scheme: str = "sequential",
+) -> dict:
+    """Parse ``pairs`` in a process pool and merge them in input order."""
+
+    if aligner not in cli.ALIGNERS:
+        raise ValueError(f"Alinhador desconhecido: {aligner}")
+    max_workers = max(1, min(workers or os.cpu_count() or 1, len(pairs) or 1))
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(
+                _timed_parse_pair, pair, tag_definitions, aligner, id_scheme
+            )
+            for pair in pairs
+        ]
+        samples: List[dict] = []
+        documents: List[dict] = []
+        for pair, future in zip(pairs, futures):
+            report = {
+                "document_id": pair.document_id,
+                "source": str(pair.source_path),
+                "target": str(pair.target_path),
+            }
+            try:
+                rows, seconds = future.result()
+            except Exception as exc:  # noqa: BLE001 - isolate failing pairs
+                report.update(
+                    {"status": "erro", "erro": f"{type(exc).__name__}: {exc}"}
+                )
+            else:
+                samples.extend(rows)
+                report.update(
+                    {
+                        "status": "ok",
+                        "amostras": len(rows),
+                        "segundos": round(seconds, 4),
+                    }
+                )
+            documents.append(report)
+
+    metadata = Metadata().to_dict()
+    metadata["corpus"] = {
+        "alinhador": aligner,
+        "workers": max_workers,
+        "segundos": round(time.perf_counter() - started, 4),
+        "documentos": documents,
+    }
+    return {"metadata": metadata, "amostras": samples}
+
+
+def _build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Gera um dataset unico a partir de varios pares de textos."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--manifest",
+        type=Path,
+        help="Manifesto JSON com os pares (source, target, document_id)",
+    )
+    source.add_argument(
+        "--dir",
+        dest="directory",
+        type=Path,
+        help="Diretorio onde os pares sao descobertos pelo nome dos arquivos",
+    )
+    parser.add_argument(
+        "--tags",
+        dest="tags_path",
+        type=Path,
+        default=cli.BASE_DIR / "tab_est.md",
+        help="Caminho para o documento de referencia das tags (tab_est.md)",
+    )
+    parser.add_argument(
+        "--output",
+        dest="output_path",
+        type=Path,
+        default=cli.BASE_DIR / "dataset_corpus.json",
+        help="Arquivo de saida (JSON)",
+    )
+    parser.add_argument(
+        "--aligner",
+        choices=sorted(cli.ALIGNERS),
+        default=cli.DEFAULT_ALIGNER,
+        help="Estrategia de alinhamento (ver parser.cli --aligner)",
+    )
+    parser.add_argument(
+        "--id-scheme",
+        choices=cli.builder.ID_SCHEMES,
+        default="sequential",
+        help="Formato dos IDs (ver parser.cli --id-scheme)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="inline",
+        help="Formato do JSON (ver parser.cli --layout)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processos em paralelo (padrao: numero de CPUs)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_argument_parser().parse_args(argv)
+    try:
+        if args.manifest is not None:
+            pairs = load_manifest(args.manifest)
+        else:
+            pairs = discover_pairs(args.directory)
+    except CorpusError as exc:
+        print(exc)
+        return 2
+    if not pairs:
+        print("Nenhum par fonte/alvo encontrado.")
+        return 2
+
+    payload = build_corpus(
+        pairs,
+        cli._load_tag_definitions(args.tags_path),
+        aligner=args.aligner,
+        workers=args.workers,
+        id_scheme=args.id_scheme,
+    )
+    write_json(
+        args.output_path,
+        pack_dataset(payload) if args.layout == "v3" else payload,
+    )
+
+    corpus = payload["metadata"]["corpus"]
+    failures = [
+        item for item in corpus["documentos"] if item["status"] != "ok"
+    ]
+    print("Corpus")
+    print("-" * 6)
+    print(f"pares: {len(pairs)} (falhas: {len(failures)})")
+    print(f"amostras: {len(payload['amostras'])}")
+    print(f"workers: {corpus['workers']} em {corpus['segundos']:.2f}s")
+    for item in failures:
+        print(f"  {item['document_id']}: {item['erro']}")
+    print(f"saida: {args.output_path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
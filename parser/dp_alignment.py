@@ -0,0 +1,318 @@
+"""Global paragraph alignment via banded dynamic programming.
+
+Each section is solved as a monotone path through the target x source score
+matrix (Needleman-Wunsch/DTW style) instead of the greedy cursor used by
+`alignment.align_paragraphs`. Allowed moves are 1:0 and 0:1 skips, 1:1
+matches, and 1:2 / 2:1 merges. Only cells within ``band`` of the diagonal are
+evaluated, so time and memory grow with ``n * band``.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Dict, List, Sequence, Tuple, TYPE_CHECKING
+
+from . import alignment
+from .vector_alignment import TfidfSimilarityIndex, _TFIDF_THRESHOLD
+
+if TYPE_CHECKING:  # pragma: no cover - hinting only
+    from .annotations import Annotation
+
+_DP_BAND = 8
+_DP_MIN_SCORE = 0.15
+_DP_SKIP_PENALTY = 0.0
+_DP_MERGE_PENALTY = 0.05
+_DP_ANCHOR_SCORE = 0.90
+_DP_CHUNK_ROWS = 256
+
+# Backpointer codes.
+_START, _SKIP_TARGET, _SKIP_SOURCE, _MATCH, _SPLIT, _MERGE = range(6)
+_NEG_INF = float("-inf")
+
+
+def _merged_score(
+    a: float,
+    b: float,
+    norm_a: float,
+    norm_b: float,
+    between: float,
+) -> float:
+    """Cosine against the sum of two L2-normalized vectors."""
+
+    squared = norm_a + norm_b + 2.0 * between
+    if squared <= 0.0:
+        return 0.0
+    return (a + b) / math.sqrt(squared)
+
+
+class _BandScores:
+    """Per-target score slices over the band, computed in row chunks."""
+
+    def __init__(
+        self,
+        index: TfidfSimilarityIndex,
+        target_ids: Sequence[str],
+        source_ids: Sequence[str],
+        bounds: List[Tuple[int, int]],
+    ) -> None:
+        self._index = index
+        self._target_ids = target_ids
+        self._source_ids = source_ids
+        self._bounds = bounds
+        self._rows: Dict[int, Tuple[int, List[float]]] = {}
+
+    def _columns(self, target: int) -> Tuple[int, int]:
+        # Target ``t`` is scored from rows ``t + 1`` (1:1, 1:2) and
+        # ``t + 2`` (2:1), always against source column ``j - 1`` or ``j - 2``.
+        last = min(target + 2, len(self._bounds) - 1)
+        lo = max(0, self._bounds[target + 1][0] - 2)
+        hi = min(len(self._source_ids), self._bounds[last][1])
+        return lo, max(lo, hi)
+
+    def row(self, target: int) -> Tuple[int, List[float]]:
+        cached = self._rows.get(target)
+        if cached is not None:
+            return cached
+        stop = min(len(self._target_ids), target + _DP_CHUNK_ROWS)
+        spans = [self._columns(pos) for pos in range(target, stop)]
+        lo = min(span[0] for span in spans)
+        hi = max(span[1] for span in spans)
+        block = self._index.pairwise(
+            self._target_ids[target:stop], self._source_ids[lo:hi]
+        )
+        for offset, (row_lo, row_hi) in enumerate(spans):
+            values = block[offset, row_lo - lo:row_hi - lo].tolist()
+            self._rows[target + offset] = (row_lo, values)
+        return self._rows[target]
+
+    def release_before(self, target: int) -> None:
+        for pos in [pos for pos in self._rows if pos < target]:
+            del self._rows[pos]
+
+
+def _band_bounds(n: int, m: int, band: int) -> List[Tuple[int, int]]:
+    """Inclusive source-column range evaluated for each DP row ``0..n``."""
+
+    # Wide enough that consecutive rows overlap and (n, m) stays reachable.
+    width = max(0, band) + (math.ceil(m / n) if n else m)
+    bounds: List[Tuple[int, int]] = []
+    for row in range(n + 1):
+        center = round(row * m / n) if n else 0
+        bounds.append((max(0, center - width), min(m, center + width)))
+    return bounds
+
+
+def _anchor_positions(
+    target_ids: Sequence[str],
+    source_positions: Dict[str, int],
+    anchor_index: alignment.AnchorIndex,
+    annotations_map: Dict[str, List["Annotation"]],
+) -> List[frozenset]:
+    anchored: List[frozenset] = []
+    for target_id in target_ids:
+        hits = set()
+        anchors = alignment._collect_anchor_texts(
+            annotations_map.get(target_id, [])
+        )
+        for anchor in anchors:
+            normalized = alignment._normalize_anchor(anchor)
+            if not normalized:
+                continue
+            for par_id in anchor_index.lookup(normalized):
+                pos = source_positions.get(par_id)
+                if pos is not None:
+                    hits.add(pos)
+        anchored.append(frozenset(hits))
+    return anchored
+
+
+def _solve_section(
+    target_ids: Sequence[str],
+    source_ids: Sequence[str],
+    index: TfidfSimilarityIndex,
+    anchor_index: alignment.AnchorIndex,
+    annotations_map: Dict[str, List["Annotation"]],
+    band: int,
+) -> Dict[str, Dict[str, object]]:
+    n, m = len(target_ids), len(source_ids)
+    source_positions = {par_id: idx for idx, par_id in enumerate(source_ids)}
+    anchored = _anchor_positions(
+        target_ids, source_positions, anchor_index, annotations_map
+    )
+    source_norm = index.has_text(source_ids, "source").astype(float).tolist()
+    target_norm = index.has_text(target_ids, "target").astype(float).tolist()
+    source_adj = index.adjacent(source_ids, "source").tolist()
+    target_adj = index.adjacent(target_ids, "target").tolist()
+    bounds = _band_bounds(n, m, band)
+    scores = _BandScores(index, target_ids, source_ids, bounds)
+
+    def pair_score(target: int, source: int) -> float:
+        row_lo, values = scores.row(target)
+        value = values[source - row_lo]
+        if source in anchored[target]:
+            return max(value, _DP_ANCHOR_SCORE)
+        return value
+
+    def split_score(target: int, source: int) -> float:
+        """Target ``target`` against sources ``source`` and ``source + 1``."""
+
+        merged = _merged_score(
+            pair_score(target, source),
+            pair_score(target, source + 1),
+            source_norm[source],
+            source_norm[source + 1],
+            source_adj[source],
+        )
+        if anchored[target] & {source, source + 1}:
+            return max(merged, _DP_ANCHOR_SCORE)
+        return merged
+
+    def merge_score(target: int, source: int) -> float:
+        """Targets ``target`` and ``target + 1`` against ``source``."""
+
+        merged = _merged_score(
+            pair_score(target, source),
+            pair_score(target + 1, source),
+            target_norm[target],
+            target_norm[target + 1],
+            target_adj[target],
+        )
+        if source in anchored[target] or source in anchored[target + 1]:
+            return max(merged, _DP_ANCHOR_SCORE)
+        return merged
+
+    # Two previous score rows feed the recurrence; every row keeps its
+    # backpointers and the score of the move that reached each cell.
+    rows: List[Tuple[int, List[float]]] = []
+    back: List[Tuple[int, bytearray, array]] = []
+
+    def cell(row: int, col: int) -> float:
+        if row < 0:
+            return _NEG_INF
+        lo, values = rows[row]
+        if col < lo or col - lo >= len(values):
+            return _NEG_INF
+        return values[col - lo]
+
+    for i in range(n + 1):
+        lo, hi = bounds[i]
+        values = [_NEG_INF] * (hi - lo + 1)
+        pointers = bytearray(hi - lo + 1)
+        move_scores = array("f", bytes(4 * (hi - lo + 1)))
+        for j in range(lo, hi + 1):
+            best = 0.0 if i == 0 and j == 0 else _NEG_INF
+            move, move_score = _START, 0.0
+            candidates = []
+            if i >= 1 and j >= 1 and cell(i - 1, j - 1) > _NEG_INF:
+                candidates.append(
+                    (cell(i - 1, j - 1), pair_score(i - 1, j - 1), 0.0,
+                     _MATCH)
+                )
+            if i >= 1 and j >= 2 and cell(i - 1, j - 2) > _NEG_INF:
+                candidates.append(
+                    (cell(i - 1, j - 2), split_score(i - 1, j - 2),
+                     _DP_MERGE_PENALTY, _SPLIT)
+                )
+            if i >= 2 and j >= 1 and cell(i - 2, j - 1) > _NEG_INF:
+                candidates.append(
+                    (cell(i - 2, j - 1), merge_score(i - 2, j - 1),
+                     _DP_MERGE_PENALTY, _MERGE)
+                )
+            for prev, score, penalty, code in candidates:
+                total = prev + score - _DP_MIN_SCORE - penalty
+                if total > best:
+                    best, move, move_score = total, code, score
+            if i >= 1:
+                total = cell(i - 1, j) - _DP_SKIP_PENALTY
+                if total > best:
+                    best, move, move_score = total, _SKIP_TARGET, 0.0
+            if j > lo:
+                total = values[j - 1 - lo] - _DP_SKIP_PENALTY
+                if total > best:
+                    best, move, move_score = total, _SKIP_SOURCE, 0.0
+            values[j - lo] = best
+            pointers[j - lo] = move
+            move_scores[j - lo] = move_score
+        rows.append((lo, values))
+        back.append((lo, pointers, move_scores))
+        if i >= 2:
+            rows[i - 2] = (lo, [])
+            scores.release_before(i - 1)
+
+    result: Dict[str, Dict[str, object]] = {}
+
+    def assign(target: int, sources: List[int], score: float) -> None:
+        result[target_ids[target]] = {
+            "paragrafo_fonte_ids": [source_ids[pos] for pos in sources],
+            "fonte_alinhamento_confiavel": bool(
+                sources and score >= _TFIDF_THRESHOLD
+            ),
+            "pontuacao_alinhamento": round(float(score), 4),
+        }
+
+    i, j = n, m
+    while i > 0 or j > 0:
+        lo, pointers, move_scores = back[i]
+        move = pointers[j - lo]
+        score = move_scores[j - lo]
+        if move == _MATCH:
+            assign(i - 1, [j - 1], score)
+            i, j = i - 1, j - 1
+        elif move == _SPLIT:
+            assign(i - 1, [j - 2, j - 1], score)
+            i, j = i - 1, j - 2
+        elif move == _MERGE:
+            assign(i - 2, [j - 1], score)
+            assign(i - 1, [j - 1], score)
+            i, j = i - 2, j - 1
+        elif move == _SKIP_TARGET:
+            assign(i - 1, [], 0.0)
+            i -= 1
+        elif move == _SKIP_SOURCE:
+            j -= 1
+        else:  # pragma: no cover - unreachable with a connected band
+            break
+    return result
+
+
+def align_paragraphs_dp(
+    source_sections: Dict[str, List[str]],
+    target_sections: Dict[str, List[str]],
+    source_paragraphs: Dict[str, str],
+    target_clean: Dict[str, str],
+    annotations_map: Dict[str, List["Annotation"]],
+    band: int = _DP_BAND,
+) -> Dict[str, Dict[str, object]]:
+    """Align each section globally with a banded DP over TF-IDF scores.
+
+    Besides the usual keys, every entry carries ``pontuacao_alinhamento``:
+    the cosine of the target against its (possibly merged) source span, or
+    ``_DP_ANCHOR_SCORE`` when an annotation anchor confirms the pair.
+    """
+
+    index = TfidfSimilarityIndex(source_paragraphs, target_clean)
+    anchor_index = alignment.AnchorIndex(source_paragraphs)
+
+    all_source_ids: List[str] = []
+    seen = set()
+    for ids in source_sections.values():
+        for source_id in ids:
+            if source_id not in seen:
+                seen.add(source_id)
+                all_source_ids.append(source_id)
+
+    result: Dict[str, Dict[str, object]] = {}
+    for section, target_ids in target_sections.items():
+        source_ids = source_sections.get(section) or all_source_ids
+        result.update(
+            _solve_section(
+                target_ids,
+                source_ids,
+                index,
+                anchor_index,
+                annotations_map,
+                band,
+            )
+        )
+    return result
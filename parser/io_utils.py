@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterable
 
 def read_text(path: str | Path) -> str:
     """Read a text file using UTF-8 encoding."""
@@ -10,8 +11,44 @@ def read_text(path: str | Path) -> str:
 
 
 def write_json(path: str | Path, data: dict) -> None:
-    """Write a JSON file with UTF-8 encoding and pretty formatting."""
+    """Write a JSON file with UTF-8 encoding and pretty formatting.
+
+    The file is written next to ``path`` under a unique temporary name and
+    moved into place, so an interrupted run never leaves a truncated
+    dataset behind and concurrent writers never share the temporary file.
+    """
+    import json
+    import os
+    import tempfile
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    mode = target.stat().st_mode & 0o777 if target.exists() else 0o644
+    fd, temp_name = tempfile.mkstemp(
+        dir=target.parent, prefix=target.name + ".", suffix=".tmp"
+    )
+    temp = Path(temp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(data, ensure_ascii=False, indent=2))
+        # mkstemp creates the file owner-only; keep the dataset's mode.
+        os.chmod(temp, mode)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    os.replace(temp, target)
+
+
+def write_jsonl(path: str | Path, rows: Iterable[dict]) -> int:
+    """Write one JSON object per line, flushing as rows arrive."""
     import json
 
     Path(path).parent.mkdir(parents=True, exist_ok=True)
-    Path(path).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    count = 0
+    with Path(path).open("w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, ensure_ascii=False))
+            handle.write("\n")
+            handle.flush()
+            count += 1
+    return count
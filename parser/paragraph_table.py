@@ -0,0 +1,134 @@
+"""Dataset layout v3: paragraph texts stored once in a top-level table.
+
+In the inline layout every sample repeats the full target paragraph and the
+merged source text, so a paragraph with eight tags is stored eight times.
+The v3 layout moves those texts to ``paragrafos`` (``alvo``/``fonte``
+tables keyed by document and paragraph IDs) and leaves a ``<field>_ref``
+key in each sample. Packing is lossless: a text that does not match the
+entry already stored under its key gets a key of its own, and values that
+are not non-empty strings stay inline.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+LAYOUT_VERSION = 3
+LAYOUTS = ("inline", "v3")
+
+# Inline text field -> paragraph table, for legacy and canonical v2 rows.
+TEXT_FIELDS = {
+    "texto_paragrafo_alvo": "alvo",
+    "target_text": "alvo",
+    "texto_paragrafo_fonte": "fonte",
+    "source_text": "fonte",
+}
+REF_FIELDS = {f"{field}_ref": table for field, table in TEXT_FIELDS.items()}
+_ID_FIELDS = {
+    "alvo": ("target_paragraph_id", "paragrafo_alvo_id"),
+    "fonte": ("source_paragraph_ids", "paragrafo_fonte_ids"),
+}
+
+
+class ParagraphTableError(ValueError):
+    """Raised when a v3 dataset references a missing paragraph."""
+
+
+def is_packed(payload: object) -> bool:
+    return isinstance(payload, dict) and isinstance(
+        payload.get("paragrafos"), dict
+    )
+
+
+def _base_key(row: dict, table: str) -> str:
+    value = None
+    for field in _ID_FIELDS[table]:
+        if row.get(field):
+            value = row[field]
+            break
+    if isinstance(value, list):
+        value = "+".join(str(item) for item in value)
+    key = str(value) if value else "?"
+    document_id = row.get("document_id")
+    return f"{document_id}/{key}" if document_id else key
+
+
+def pack_dataset(payload: dict) -> dict:
+    """Return a v3 copy of an inline dataset payload (``amostras`` rows)."""
+
+    if is_packed(payload):
+        return payload
+    tables: Dict[str, Dict[str, str]] = {"alvo": {}, "fonte": {}}
+    # (table, text) -> key, so equal texts always share one entry.
+    keys: Dict[tuple, str] = {}
+    rows: List[dict] = []
+    for raw in payload.get("amostras", []):
+        if not isinstance(raw, dict):
+            rows.append(raw)
+            continue
+        row = {}
+        for field, text in raw.items():
+            table_name = TEXT_FIELDS.get(field)
+            if table_name is None or not isinstance(text, str) or not text:
+                row[field] = text
+                continue
+            table = tables[table_name]
+            key = keys.get((table_name, text))
+            if key is None:
+                base = key = _base_key(raw, table_name)
+                suffix = 1
+                while key in table:
+                    suffix += 1
+                    key = f"{base}#{suffix}"
+                table[key] = text
+                keys[(table_name, text)] = key
+            row[f"{field}_ref"] = key
+        rows.append(row)
+
+    packed = {
+        name: value
+        for name, value in payload.items()
+        if name != "amostras"
+    }
+    packed["versao_layout"] = LAYOUT_VERSION
+    packed["paragrafos"] = tables
+    packed["amostras"] = rows
+    return packed
+
+
+def unpack_row(raw: dict, tables: Dict[str, Dict[str, str]]) -> dict:
+    """Return ``raw`` with its ``*_ref`` keys replaced by the texts."""
+
+    row = {}
+    for name, value in raw.items():
+        table_name = REF_FIELDS.get(name)
+        if table_name is None:
+            row[name] = value
+            continue
+        try:
+            row[name[: -len("_ref")]] = tables[table_name][value]
+        except (KeyError, TypeError) as exc:
+            raise ParagraphTableError(
+                f"Paragrafo {table_name} nao encontrado: {value}"
+            ) from exc
+    return row
+
+
+def unpack_dataset(payload: dict) -> dict:
+    """Return an inline copy of a v3 payload; inline payloads pass through."""
+
+    if not is_packed(payload):
+        return payload
+    tables = payload["paragrafos"]
+    rows: List[dict] = [
+        unpack_row(raw, tables) if isinstance(raw, dict) else raw
+        for raw in payload.get("amostras", [])
+    ]
+
+    unpacked = {
+        name: value
+        for name, value in payload.items()
+        if name not in {"paragrafos", "versao_layout", "amostras"}
+    }
+    unpacked["amostras"] = rows
+    return unpacked
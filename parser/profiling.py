@@ -0,0 +1,232 @@
+"""Per-stage timing, memory and counter instrumentation for the parser.
+
+A `StageProfiler` times named stages (wall clock, process CPU time and the
+`tracemalloc` peak reached inside the stage) and collects counters. Code
+deep in the pipeline reports counters through the module-level `count`
+and stages through `stage`; both are no-ops unless a profiler is active,
+so unprofiled runs pay one global lookup per call. Stages are not meant
+to nest (each one resets the tracemalloc peak). Memory tracing slows
+allocations down, so compare profiled timings with profiled runs only.
+
+A `StageProgress` hooks into the same calls without timing anything: it
+reports each stage as it starts and lets another thread cancel the run,
+which then raises `ParseCancelled` at the next stage or counter.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterator, List
+
+_ACTIVE: List["StageProfiler"] = []
+_PROGRESS: List["StageProgress"] = []
+
+
+class ParseCancelled(RuntimeError):
+    """Raised inside a run whose `StageProgress` was cancelled."""
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add ``amount`` to counter ``name`` of the active profiler, if any."""
+
+    if _ACTIVE:
+        counters = _ACTIVE[-1].counters
+        counters[name] = counters.get(name, 0) + amount
+    if _PROGRESS:
+        _PROGRESS[-1].check()
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time stage ``name`` in the active profiler, if any."""
+
+    if _PROGRESS:
+        _PROGRESS[-1].started(name)
+    if _ACTIVE:
+        return _ACTIVE[-1].stage(name)
+    return nullcontext()
+
+
+def profile_path_for(output_path: Path | str) -> Path:
+    """Return the JSON sidecar written next to ``output_path``."""
+
+    output = Path(output_path)
+    return output.with_name(f"{output.stem}.profile.json")
+
+
+class StageProgress:
+    """Reports stage starts and carries a cancel flag for one run."""
+
+    def __init__(self, on_stage: Callable[[str], None] | None = None) -> None:
+        self.on_stage = on_stage
+        self.cancelled = False
+
+    def __enter__(self) -> "StageProgress":
+        _PROGRESS.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _PROGRESS.remove(self)
+
+    def cancel(self) -> None:
+        """Ask the run to stop; safe to call from another thread."""
+
+        self.cancelled = True
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise ParseCancelled("Execucao do parser cancelada.")
+
+    def started(self, name: str) -> None:
+        self.check()
+        if self.on_stage is not None:
+            self.on_stage(name)
+
+
+class StageProfiler:
+    """Collects stage timings and counters for one parser run."""
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self.counters: Dict[str, int] = {}
+        self._stages: Dict[str, dict] = {}
+        self._events: List[dict] = []
+        self._origin = time.perf_counter()
+        self._started_tracing = False
+
+    def __enter__(self) -> "StageProfiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _ACTIVE.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _ACTIVE.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time one stage; repeated stages with the same name accumulate."""
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - started
+            cpu = time.process_time() - cpu_started
+            peak = 0
+            if tracing:
+                _, peak_total = tracemalloc.get_traced_memory()
+                peak = max(0, peak_total - base)
+            entry = self._stages.setdefault(
+                name,
+                {
+                    "etapa": name,
+                    "chamadas": 0,
+                    "wall_segundos": 0.0,
+                    "cpu_segundos": 0.0,
+                    "pico_memoria_bytes": 0,
+                },
+            )
+            entry["chamadas"] += 1
+            entry["wall_segundos"] += wall
+            entry["cpu_segundos"] += cpu
+            entry["pico_memoria_bytes"] = max(
+                entry["pico_memoria_bytes"], peak
+            )
+            self._events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": round((started - self._origin) * 1e6, 1),
+                    "dur": round(wall * 1e6, 1),
+                    "pid": os.getpid(),
+                    "tid": 0,
+                    "args": {
+                        "cpu_ms": round(cpu * 1e3, 3),
+                        "pico_memoria_bytes": peak,
+                    },
+                }
+            )
+
+    def report(self) -> dict:
+        stages = [
+            {
+                **entry,
+                "wall_segundos": round(entry["wall_segundos"], 6),
+                "cpu_segundos": round(entry["cpu_segundos"], 6),
+            }
+            for entry in self._stages.values()
+        ]
+        return {
+            "etapas": stages,
+            "contadores": dict(sorted(self.counters.items())),
+            "total_wall_segundos": round(
+                sum(entry["wall_segundos"] for entry in stages), 6
+            ),
+            "total_cpu_segundos": round(
+                sum(entry["cpu_segundos"] for entry in stages), 6
+            ),
+            "memoria_rastreada": self.trace_memory,
+        }
+
+    def chrome_trace(self) -> dict:
+        """Return the stages as Chrome trace events (chrome://tracing)."""
+
+        events = list(self._events)
+        end = max(
+            (event["ts"] + event["dur"] for event in events), default=0.0
+        )
+        if self.counters:
+            events.append(
+                {
+                    "name": "contadores",
+                    "ph": "C",
+                    "ts": end,
+                    "pid": os.getpid(),
+                    "tid": 0,
+                    "args": dict(sorted(self.counters.items())),
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> str:
+        lines = []
+        for entry in self.report()["etapas"]:
+            lines.append(
+                f"{entry['etapa']}: {entry['wall_segundos']:.3f}s "
+                f"(cpu {entry['cpu_segundos']:.3f}s, "
+                f"pico {entry['pico_memoria_bytes'] / 1e6:.1f} MB)"
+            )
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+    def write(
+        self,
+        path: Path | str,
+        trace_path: Path | str | None = None,
+    ) -> None:
+        """Write the JSON sidecar and, optionally, the Chrome trace."""
+
+        targets = [(Path(path), self.report())]
+        if trace_path is not None:
+            targets.append((Path(trace_path), self.chrome_trace()))
+        for target, payload in targets:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(
+                json.dumps(payload, ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
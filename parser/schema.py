@@ -33,6 +33,8 @@ class AnnotationSample:
     texto_paragrafo_alvo: str = ""
     texto_paragrafo_fonte: Optional[str] = None
     trecho_alvo: Optional[str] = None
+    trecho_alvo_inicio: Optional[int] = None
+    trecho_alvo_fim: Optional[int] = None
     trecho_fonte: Optional[str] = None
     necessita_revisao_humana: bool = True
     motivo_revisao: Optional[str] = None
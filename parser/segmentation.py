@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import re
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
 
 from .io_utils import read_text
 
 _PARAGRAPH_SPLIT_RE = re.compile(r"\n{2,}")
+_READ_CHUNK_CHARS = 1 << 16
 
 
 def _split_paragraphs(text: str) -> list[str]:
@@ -47,3 +49,92 @@ def segment_target(target_path: str) -> Dict[str, str]:
     """Segmenta `patriotismo_tt.md` em parágrafos indexados."""
     text = read_text(target_path)
     return _enumerate_paragraphs(_split_paragraphs(text), prefix="A")
+
+
+def _iter_chunks(path: str | Path) -> Iterator[str]:
+    with Path(path).open("r", encoding="utf-8") as handle:
+        while True:
+            chunk = handle.read(_READ_CHUNK_CHARS)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _scan_newlines(path: str | Path) -> Tuple[bool, bool]:
+    """Return whether the file has any newline and any blank line."""
+
+    has_newline = False
+    tail = ""
+    for chunk in _iter_chunks(path):
+        has_newline = has_newline or "\n" in chunk
+        if "\n\n" in tail + chunk:
+            return True, True
+        tail = chunk[-1:]
+    return has_newline, False
+
+
+def _iter_blocks(path: str | Path) -> Iterator[str]:
+    buffer = ""
+    for chunk in _iter_chunks(path):
+        scan_from = max(0, len(buffer) - 1)
+        buffer += chunk
+        cut = buffer.rfind("\n\n", scan_from)
+        if cut < 0:
+            continue
+        complete, buffer = buffer[:cut], buffer[cut:]
+        for part in _PARAGRAPH_SPLIT_RE.split(complete):
+            if part.strip():
+                yield part.strip()
+    for part in _PARAGRAPH_SPLIT_RE.split(buffer):
+        if part.strip():
+            yield part.strip()
+
+
+def iter_paragraphs(path: str | Path) -> Iterator[str]:
+    """Yield the paragraphs of `_split_paragraphs` without loading the file.
+
+    Files without blank lines are read line by line. Otherwise only the
+    first block is held back, until a second one proves that the
+    single-line fallback does not apply.
+    """
+
+    has_newline, has_blank_line = _scan_newlines(path)
+    if not has_newline:
+        text = read_text(path).strip()
+        if text:
+            yield text
+        return
+    if not has_blank_line:
+        for line in _iter_lines(path):
+            for piece in line.splitlines():
+                if piece.strip():
+                    yield piece.strip()
+        return
+
+    held = None
+    count = 0
+    for part in _iter_blocks(path):
+        count += 1
+        if count == 1:
+            held = part
+            continue
+        if held is not None:
+            yield held
+            held = None
+        yield part
+    if held is not None:
+        # Single block: same line fallback as `_split_paragraphs`.
+        lines = [line.strip() for line in held.splitlines() if line.strip()]
+        yield from (lines if len(lines) > 1 else [held])
+
+
+def _iter_lines(path: str | Path) -> Iterator[str]:
+    with Path(path).open("r", encoding="utf-8") as handle:
+        yield from handle
+
+
+def iter_target(target_path: str | Path) -> Iterator[Tuple[str, str]]:
+    """Yield ``(paragraph_id, text)`` pairs like `segment_target`, lazily."""
+
+    for idx, paragraph in enumerate(iter_paragraphs(target_path), start=1):
+        yield f"A_{idx:03d}", paragraph
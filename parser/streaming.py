@@ -0,0 +1,62 @@
+"""Lazy parser pipeline that yields samples one target paragraph at a time."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterator
+
+from . import alignment, annotations, builder, segmentation
+from .schema import AnnotationSample
+
+
+def iter_samples(
+    source_path: Path | str,
+    target_path: Path | str,
+    tag_definitions: Dict[str, Dict[str, str]],
+    id_scheme: str = "sequential",
+    document_id: str | None = None,
+) -> Iterator[AnnotationSample]:
+    """Yield the samples of the batch pipeline without materializing them.
+
+    The source is loaded once (it is the alignment search space); the target
+    is segmented, lexed, aligned and turned into samples paragraph by
+    paragraph, so memory does not grow with the target length.
+    """
+
+    source_paragraphs = segmentation.segment_source(str(source_path))
+    aligner = alignment.SectionAligner(
+        alignment.detect_sections(source_paragraphs),
+        source_paragraphs,
+    )
+
+    if document_id is None:
+        document_id = Path(target_path).stem
+    id_counts: Dict[str, int] = {}
+    section = "GLOBAL"
+    next_idx = 1
+    for par_id, text in segmentation.iter_target(target_path):
+        lexed = annotations.lex_paragraph(par_id, text)
+        target_clean = {par_id: lexed.clean}
+        align_info: Dict[str, Dict[str, object]] = {}
+        # Same section bookkeeping as `alignment.detect_sections`.
+        if alignment._looks_like_heading(text):
+            section = alignment._canonicalize_heading(text)
+        else:
+            align_info[par_id] = aligner.align(
+                section, par_id, target_clean, lexed.annotations
+            )
+        if not lexed.annotations:
+            continue
+        samples = builder.build_samples(
+            annotations=[dict(item) for item in lexed.annotations],
+            target_clean=target_clean,
+            alignment=align_info,
+            tag_definitions=tag_definitions,
+            source_paragraphs=source_paragraphs,
+            start=next_idx,
+            id_scheme=id_scheme,
+            document_id=document_id,
+            id_counts=id_counts,
+        )
+        next_idx += len(samples)
+        yield from samples
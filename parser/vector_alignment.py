@@ -0,0 +1,232 @@
+"""Vectorized alignment backend based on char n-gram TF-IDF similarity."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple, TYPE_CHECKING
+
+from . import alignment, profiling
+
+if TYPE_CHECKING:  # pragma: no cover - hinting only
+    from .annotations import Annotation
+
+# Char n-gram cosine runs higher than difflib ratios on unrelated paragraphs.
+_TFIDF_THRESHOLD = 0.50
+_TFIDF_MIN_ASSIGN = 0.15
+_NGRAM_RANGE = (3, 5)
+_SCORE_CHUNK_ROWS = 512
+
+
+class AlignerUnavailableError(RuntimeError):
+    """Raised when the optional TF-IDF dependencies are missing."""
+
+
+def _require_vectorizer():
+    try:
+        import numpy  # noqa: F401
+        from sklearn.feature_extraction.text import TfidfVectorizer
+    except Exception as exc:  # pragma: no cover - depends on environment
+        raise AlignerUnavailableError(
+            "Dependencia ausente: instale scikit-learn para usar o "
+            "alinhador tfidf."
+        ) from exc
+    return TfidfVectorizer
+
+
+def _with_zero_row(matrix):
+    from scipy import sparse
+
+    empty = sparse.csr_matrix((1, matrix.shape[1]), dtype=matrix.dtype)
+    return sparse.vstack([matrix, empty], format="csr")
+
+
+class TfidfSimilarityIndex:
+    """Cosine similarity between every target and source paragraph.
+
+    Each paragraph is vectorized once; scores are produced by sparse matrix
+    products over chunks of target rows, so memory stays bounded by
+    ``_SCORE_CHUNK_ROWS`` x number of source paragraphs.
+    """
+
+    def __init__(
+        self,
+        source_paragraphs: Dict[str, str],
+        target_clean: Dict[str, str],
+    ) -> None:
+        vectorizer_cls = _require_vectorizer()
+        import numpy as np
+
+        self._np = np
+        self._source_pos = {
+            par_id: pos for pos, par_id in enumerate(source_paragraphs)
+        }
+        self._target_pos = {
+            par_id: pos for pos, par_id in enumerate(target_clean)
+        }
+        self._column_cache: Dict[Tuple[str, ...], object] = {}
+        self._chunk_start = -1
+        self._chunk_scores = None
+
+        source_texts = list(source_paragraphs.values())
+        target_texts = [text.strip() for text in target_clean.values()]
+        vectorizer = vectorizer_cls(
+            analyzer="char_wb",
+            ngram_range=_NGRAM_RANGE,
+            strip_accents="unicode",
+            sublinear_tf=True,
+            dtype=np.float32,
+        )
+        try:
+            matrix = vectorizer.fit_transform(source_texts + target_texts)
+        except ValueError:
+            # Empty vocabulary: nothing to compare, every score is zero.
+            self._source_matrix = None
+            self._target_matrix = None
+            return
+        # A trailing zero row stands in for unknown paragraph IDs.
+        split = len(source_texts)
+        self._source_matrix = _with_zero_row(matrix[:split])
+        self._target_matrix = _with_zero_row(matrix[split:])
+
+    def row(self, target_id: str):
+        """Return scores of ``target_id`` against every source paragraph.
+
+        The trailing extra column is the zero score of unknown source IDs.
+        """
+
+        np = self._np
+        pos = self._target_pos.get(target_id)
+        if pos is None or self._target_matrix is None:
+            return np.zeros(len(self._source_pos) + 1, dtype=np.float32)
+        start = pos - pos % _SCORE_CHUNK_ROWS
+        if start != self._chunk_start:
+            chunk = self._target_matrix[start:start + _SCORE_CHUNK_ROWS]
+            self._chunk_scores = (chunk @ self._source_matrix.T).toarray()
+            self._chunk_start = start
+        return self._chunk_scores[pos - start]
+
+    def _rows(self, matrix, positions, par_ids: Sequence[str]):
+        missing = matrix.shape[0] - 1
+        return matrix[[positions.get(par_id, missing) for par_id in par_ids]]
+
+    def pairwise(
+        self,
+        target_ids: Sequence[str],
+        source_ids: Sequence[str],
+    ):
+        """Return the dense ``len(target_ids) x len(source_ids)`` block."""
+
+        np = self._np
+        if self._target_matrix is None or not target_ids or not source_ids:
+            return np.zeros((len(target_ids), len(source_ids)), np.float32)
+        profiling.count(
+            "comparacoes_similaridade", len(target_ids) * len(source_ids)
+        )
+        targets = self._rows(self._target_matrix, self._target_pos, target_ids)
+        sources = self._rows(self._source_matrix, self._source_pos, source_ids)
+        return (targets @ sources.T).toarray()
+
+    def adjacent(self, par_ids: Sequence[str], side: str):
+        """Return similarities between consecutive paragraphs of one side.
+
+        Item ``k`` is the cosine between ``par_ids[k]`` and
+        ``par_ids[k + 1]``; ``side`` is ``"source"`` or ``"target"``.
+        """
+
+        np = self._np
+        if self._target_matrix is None or len(par_ids) < 2:
+            return np.zeros(max(0, len(par_ids) - 1), np.float32)
+        if side == "source":
+            rows = self._rows(self._source_matrix, self._source_pos, par_ids)
+        else:
+            rows = self._rows(self._target_matrix, self._target_pos, par_ids)
+        return np.asarray(rows[:-1].multiply(rows[1:]).sum(axis=1)).ravel()
+
+    def has_text(self, par_ids: Sequence[str], side: str):
+        """Return a boolean array flagging paragraphs with a non-zero vector."""
+
+        np = self._np
+        if self._target_matrix is None or not par_ids:
+            return np.zeros(len(par_ids), dtype=bool)
+        if side == "source":
+            rows = self._rows(self._source_matrix, self._source_pos, par_ids)
+        else:
+            rows = self._rows(self._target_matrix, self._target_pos, par_ids)
+        return np.diff(rows.indptr) > 0
+
+    def _columns(self, source_ids: Sequence[str]):
+        key = tuple(source_ids)
+        columns = self._column_cache.get(key)
+        if columns is None:
+            columns = self._np.array(
+                [
+                    self._source_pos.get(par_id, len(self._source_pos))
+                    for par_id in source_ids
+                ],
+                dtype=self._np.int64,
+            )
+            self._column_cache[key] = columns
+        return columns
+
+    def scores(self, target_id: str, source_ids: Sequence[str]):
+        """Return scores of ``target_id`` restricted to ``source_ids``."""
+
+        np = self._np
+        columns = self._columns(source_ids)
+        if not len(columns):
+            return np.zeros(0, dtype=np.float32)
+        profiling.count("comparacoes_similaridade", len(columns))
+        return self.row(target_id)[columns]
+
+    def match(
+        self,
+        target_id: str,
+        source_ids: Sequence[str],
+        source_paragraphs: Dict[str, str],
+        target_clean: Dict[str, str],
+        last_idx: int,
+    ) -> Tuple[str, int, float] | tuple[None, None, float]:
+        """Drop-in replacement for `alignment._match_by_similarity`.
+
+        Ties are broken like the difflib path: the search window around
+        ``last_idx`` first, then document order.
+        """
+
+        if not source_ids:
+            return None, None, 0.0
+        if not target_clean.get(target_id, "").strip():
+            return None, None, 0.0
+        scores = self.scores(target_id, source_ids)
+        best_ratio = float(scores.max())
+        if best_ratio <= 0.0:
+            return None, None, 0.0
+        best_idx = None
+        for idx in alignment._search_window(len(source_ids), last_idx):
+            if float(scores[idx]) == best_ratio:
+                best_idx = idx
+                break
+        if best_idx is None:
+            best_idx = int(self._np.argmax(scores))
+        if best_ratio < _TFIDF_MIN_ASSIGN:
+            return None, None, best_ratio
+        return source_ids[best_idx], best_idx, best_ratio
+
+
+def align_paragraphs_tfidf(
+    source_sections: Dict[str, List[str]],
+    target_sections: Dict[str, List[str]],
+    source_paragraphs: Dict[str, str],
+    target_clean: Dict[str, str],
+    annotations_map: Dict[str, List["Annotation"]],
+) -> Dict[str, Dict[str, object]]:
+    """Align paragraphs like `align_paragraphs`, scoring with TF-IDF."""
+
+    index = TfidfSimilarityIndex(source_paragraphs, target_clean)
+    return alignment.align_paragraphs(
+        source_sections=source_sections,
+        target_sections=target_sections,
+        source_paragraphs=source_paragraphs,
+        target_clean=target_clean,
+        annotations_map=annotations_map,
+        similarity_matcher=index.match,
+        similarity_threshold=_TFIDF_THRESHOLD,
+    )
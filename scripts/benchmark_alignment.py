@@ -0,0 +1,232 @@
+"""Benchmark parser alignment backends on the bundled text pairs.
+
+Runs every requested `parser.cli --aligner` backend on the same inputs and
+reports wall time plus agreement with the default difflib heuristic.
+`--scale` repeats each document to emulate book-length pairs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from parser import alignment, annotations, segmentation
+from parser.cli import ALIGNERS, BASE_DIR, DEFAULT_ALIGNER
+from parser.io_utils import read_text
+
+DEFAULT_PAIRS: tuple[tuple[str, Path, Path], ...] = (
+    (
+        "patriotismo",
+        BASE_DIR / "patriotismo_st.md",
+        BASE_DIR / "patriotismo_tt.md",
+    ),
+    (
+        "v06-04",
+        BASE_DIR / "text-pairs" / "texto-fonte-v06-04-26.txt",
+        BASE_DIR / "text-pairs" / "texto-alvo-anotado-v06-04.txt",
+    ),
+    (
+        "v06-04a",
+        BASE_DIR / "text-pairs" / "texto-fonte-v06-04a.txt",
+        BASE_DIR / "text-pairs" / "texto-alvo-v06-04a.txt",
+    ),
+)
+
+
+def _segment(path: Path, prefix: str, scale: int) -> dict[str, str]:
+    paragraphs = segmentation._split_paragraphs(read_text(path))
+    return segmentation._enumerate_paragraphs(
+        paragraphs * max(1, scale),
+        prefix=prefix,
+    )
+
+
+def prepare_alignment_inputs(
+    source_path: Path,
+    target_path: Path,
+    scale: int = 1,
+) -> dict[str, Any]:
+    """Run the parser stages that precede alignment for one pair."""
+
+    source_paragraphs = _segment(source_path, "F", scale)
+    target_paragraphs = _segment(target_path, "A", scale)
+
+    target_clean, extracted = annotations.lex_all(target_paragraphs)
+    annotations_map: dict[str, list] = defaultdict(list)
+    for item in extracted:
+        annotations_map[item["paragrafo_alvo_id"]].append(item)
+
+    return {
+        "source_sections": alignment.detect_sections(source_paragraphs),
+        "target_sections": alignment.detect_sections(target_paragraphs),
+        "source_paragraphs": source_paragraphs,
+        "target_clean": target_clean,
+        "annotations_map": annotations_map,
+    }
+
+
+def _agreement(
+    reference: dict[str, dict[str, object]],
+    candidate: dict[str, dict[str, object]],
+) -> float:
+    if not reference:
+        return 1.0
+    same = sum(
+        1
+        for target_id, info in reference.items()
+        if candidate.get(target_id, {}).get("paragrafo_fonte_ids")
+        == info["paragrafo_fonte_ids"]
+    )
+    return same / len(reference)
+
+
+def _confident_count(result: dict[str, dict[str, object]]) -> int:
+    return sum(
+        1 for info in result.values() if info["fonte_alinhamento_confiavel"]
+    )
+
+
+def benchmark_pair(
+    name: str,
+    source_path: Path,
+    target_path: Path,
+    aligners: list[str],
+    repeat: int = 3,
+    scale: int = 1,
+) -> dict[str, Any]:
+    inputs = prepare_alignment_inputs(source_path, target_path, scale=scale)
+    results: dict[str, dict[str, dict[str, object]]] = {}
+    timings: dict[str, float] = {}
+    for aligner in [DEFAULT_ALIGNER] + [
+        item for item in aligners if item != DEFAULT_ALIGNER
+    ]:
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            results[aligner] = ALIGNERS[aligner](**inputs)
+            best = min(best, time.perf_counter() - started)
+        timings[aligner] = best
+
+    reference = results[DEFAULT_ALIGNER]
+    baseline_seconds = timings[DEFAULT_ALIGNER]
+    return {
+        "pair": name,
+        "source": str(source_path),
+        "target": str(target_path),
+        "scale": scale,
+        "source_paragraphs": len(inputs["source_paragraphs"]),
+        "target_paragraphs": len(inputs["target_clean"]),
+        "aligners": {
+            aligner: {
+                "seconds": round(seconds, 6),
+                "speedup_vs_default": (
+                    round(baseline_seconds / seconds, 2) if seconds else None
+                ),
+                "agreement_with_default": round(
+                    _agreement(reference, results[aligner]), 4
+                ),
+                "confident_alignments": _confident_count(results[aligner]),
+            }
+            for aligner, seconds in timings.items()
+        },
+    }
+
+
+def benchmark_alignment(
+    pairs: list[tuple[str, Path, Path]],
+    aligners: list[str],
+    repeat: int = 3,
+    scale: int = 1,
+) -> dict[str, Any]:
+    return {
+        "repeat": repeat,
+        "scale": scale,
+        "pairs": [
+            benchmark_pair(
+                name,
+                source_path,
+                target_path,
+                aligners=aligners,
+                repeat=repeat,
+                scale=scale,
+            )
+            for name, source_path, target_path in pairs
+            if source_path.exists() and target_path.exists()
+        ],
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark parser alignment backends."
+    )
+    parser.add_argument(
+        "--aligner",
+        dest="aligners",
+        action="append",
+        choices=sorted(ALIGNERS),
+        default=None,
+        help="Backend to compare with the default (repeatable).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per backend; the fastest run is reported.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Repeat each document N times to emulate long pairs.",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    aligners = args.aligners or sorted(ALIGNERS)
+    report = benchmark_alignment(
+        pairs=list(DEFAULT_PAIRS),
+        aligners=aligners,
+        repeat=max(1, args.repeat),
+        scale=max(1, args.scale),
+    )
+
+    print("Alignment benchmark")
+    print("-" * 19)
+    for pair in report["pairs"]:
+        print(
+            f"{pair['pair']}: {pair['source_paragraphs']} source x "
+            f"{pair['target_paragraphs']} target paragraphs"
+        )
+        for aligner, stats in pair["aligners"].items():
+            print(
+                f"  {aligner}: {stats['seconds']:.4f}s "
+                f"speedup={stats['speedup_vs_default']} "
+                f"agreement={stats['agreement_with_default']:.3f} "
+                f"confident={stats['confident_alignments']}"
+            )
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,197 @@
+"""Micro-benchmark for anchor resolution in `parser.alignment`.
+
+Compares the precomputed `AnchorIndex` against the previous strategy of
+re-normalizing every candidate source paragraph for every anchor. Targets
+are synthetic and annotation-dense: each paragraph carries many anchors
+sampled from the source text, so anchor probing dominates the runtime.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+from parser import alignment, segmentation
+from parser.cli import BASE_DIR
+from parser.io_utils import read_text
+
+
+def _scan_anchor(
+    anchors: Sequence[str],
+    source_ids: Sequence[str],
+    source_paragraphs: Dict[str, str],
+    last_idx: int,
+):
+    """Reference implementation: linear scan with per-probe normalization."""
+
+    for anchor in anchors:
+        normalized_anchor = alignment._normalize_anchor(anchor)
+        if not normalized_anchor:
+            continue
+        for idx in alignment._iter_candidate_indices(len(source_ids), last_idx):
+            source_text = source_paragraphs.get(source_ids[idx], "")
+            normalized_source = alignment._strip_accents(source_text).lower()
+            if normalized_anchor in normalized_source:
+                return source_ids[idx], idx
+    return None, None
+
+
+def build_dense_workload(
+    source_path: Path,
+    scale: int = 10,
+    anchors_per_paragraph: int = 12,
+    seed: int = 13,
+) -> tuple[dict[str, str], list[list[str]]]:
+    """Return source paragraphs and per-target anchor lists."""
+
+    paragraphs = segmentation._split_paragraphs(read_text(source_path))
+    source_paragraphs = segmentation._enumerate_paragraphs(
+        paragraphs * max(1, scale),
+        prefix="F",
+    )
+    rng = random.Random(seed)
+    texts = list(source_paragraphs.values())
+    workload: list[list[str]] = []
+    for _ in range(len(texts)):
+        anchors: list[str] = []
+        for _ in range(anchors_per_paragraph):
+            words = rng.choice(texts).split()
+            if rng.random() < 0.25 or len(words) < 4:
+                # Reformulated spans that never occur in the source.
+                anchors.append(f"trecho reformulado {rng.randint(0, 10**6)}")
+                continue
+            size = rng.randint(2, 5)
+            start = rng.randint(0, len(words) - size)
+            anchors.append(" ".join(words[start:start + size]))
+        workload.append(anchors)
+    return source_paragraphs, workload
+
+
+def benchmark_anchor_index(
+    source_path: Path,
+    scale: int = 10,
+    anchors_per_paragraph: int = 12,
+    seed: int = 13,
+) -> dict[str, Any]:
+    source_paragraphs, workload = build_dense_workload(
+        source_path,
+        scale=scale,
+        anchors_per_paragraph=anchors_per_paragraph,
+        seed=seed,
+    )
+    source_ids = list(source_paragraphs)
+    positions = {par_id: idx for idx, par_id in enumerate(source_ids)}
+
+    started = time.perf_counter()
+    expected = []
+    last_idx = -1
+    for anchors in workload:
+        match_id, idx = _scan_anchor(
+            anchors, source_ids, source_paragraphs, last_idx
+        )
+        expected.append((match_id, idx))
+        if idx is not None:
+            last_idx = idx
+    scan_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = alignment.AnchorIndex(source_paragraphs)
+    build_seconds = time.perf_counter() - started
+    observed = []
+    last_idx = -1
+    for anchors in workload:
+        match_id, idx = alignment._match_by_anchor(
+            anchors, source_ids, index, positions, last_idx
+        )
+        observed.append((match_id, idx))
+        if idx is not None:
+            last_idx = idx
+    index_seconds = time.perf_counter() - started
+
+    return {
+        "source": str(source_path),
+        "scale": scale,
+        "source_paragraphs": len(source_ids),
+        "target_paragraphs": len(workload),
+        "anchors_per_paragraph": anchors_per_paragraph,
+        "scan_seconds": round(scan_seconds, 6),
+        "index_seconds": round(index_seconds, 6),
+        "index_build_seconds": round(build_seconds, 6),
+        "speedup": (
+            round(scan_seconds / index_seconds, 2) if index_seconds else None
+        ),
+        "identical_results": expected == observed,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark AnchorIndex against the linear anchor scan."
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=BASE_DIR / "patriotismo_st.md",
+        help="Source text used to build the synthetic workload.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=10,
+        help="Repeat the source N times to emulate long documents.",
+    )
+    parser.add_argument(
+        "--anchors-per-paragraph",
+        type=int,
+        default=12,
+        help="Anchors attached to each synthetic target paragraph.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=13,
+        help="Random seed for the synthetic workload.",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    if not args.source.exists():
+        print(f"Source not found: {args.source}")
+        return 2
+
+    report = benchmark_anchor_index(
+        source_path=args.source,
+        scale=max(1, args.scale),
+        anchors_per_paragraph=max(1, args.anchors_per_paragraph),
+        seed=args.seed,
+    )
+
+    print("Anchor index benchmark")
+    print("-" * 22)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0 if report["identical_results"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
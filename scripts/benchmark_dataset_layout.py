@@ -0,0 +1,153 @@
+"""Size and load-time benchmark for the inline vs v3 dataset layouts.
+
+The input dataset is replicated `--scale` times under distinct
+``document_id`` values, with paragraph texts tagged per replica so they are
+not shared across documents, to emulate a multi-document corpus. Each
+replica is written in both layouts and loaded with
+`validator_app.data_loader`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from parser.cli import BASE_DIR
+from parser.paragraph_table import TEXT_FIELDS, pack_dataset, unpack_dataset
+from validator_app.data_loader import load_dataset
+
+
+def _replicate(payload: dict[str, Any], scale: int) -> dict[str, Any]:
+    rows: list[dict[str, Any]] = []
+    for copy in range(scale):
+        for row in payload.get("amostras", []):
+            document_id = f"{row.get('document_id') or 'doc'}_{copy:04d}"
+            replica = {**row, "document_id": document_id}
+            for field in TEXT_FIELDS:
+                if isinstance(row.get(field), str) and row[field]:
+                    replica[field] = f"{row[field]} [{document_id}]"
+            rows.append(replica)
+    return {**payload, "amostras": rows}
+
+
+def _best_load_seconds(path: Path, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        load_dataset(path)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark_dataset_layout(
+    dataset_path: Path,
+    scales: list[int],
+    repeats: int = 3,
+) -> dict[str, Any]:
+    base = unpack_dataset(
+        json.loads(dataset_path.read_text(encoding="utf-8"))
+    )
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for scale in scales:
+            inline = _replicate(base, scale)
+            layouts = {"inline": inline, "v3": pack_dataset(inline)}
+            row: dict[str, Any] = {
+                "scale": scale,
+                "samples": len(inline["amostras"]),
+                "paragraphs": sum(
+                    len(table)
+                    for table in layouts["v3"]["paragrafos"].values()
+                ),
+            }
+            for layout, payload in layouts.items():
+                path = workdir / f"{layout}_x{scale}.json"
+                path.write_text(
+                    json.dumps(payload, ensure_ascii=False, indent=2),
+                    encoding="utf-8",
+                )
+                row[f"{layout}_bytes"] = path.stat().st_size
+                row[f"{layout}_load_seconds"] = round(
+                    _best_load_seconds(path, repeats), 4
+                )
+            row["size_ratio"] = round(
+                row["v3_bytes"] / max(1, row["inline_bytes"]), 4
+            )
+            rows.append(row)
+    return {"dataset": str(dataset_path), "runs": rows}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare dataset size and load time, inline vs v3."
+    )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=BASE_DIR / "dataset_raw.json",
+        help="Dataset to replicate (either layout).",
+    )
+    parser.add_argument(
+        "--scale",
+        dest="scales",
+        type=int,
+        action="append",
+        default=None,
+        help="Replication factor (repeatable; default 1, 10, 100).",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Loads per file; the best time is reported.",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    if not args.dataset.exists():
+        print(f"File not found: {args.dataset}")
+        return 2
+
+    report = benchmark_dataset_layout(
+        dataset_path=args.dataset,
+        scales=[max(1, scale) for scale in args.scales or [1, 10, 100]],
+        repeats=max(1, args.repeats),
+    )
+
+    print("Dataset layout benchmark")
+    print("-" * 24)
+    for row in report["runs"]:
+        print(
+            f"x{row['scale']} ({row['samples']} samples): "
+            f"inline={row['inline_bytes']:,}B "
+            f"({row['inline_load_seconds']:.3f}s) "
+            f"v3={row['v3_bytes']:,}B "
+            f"({row['v3_load_seconds']:.3f}s) "
+            f"ratio={row['size_ratio']:.2f}"
+        )
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+"""Per-edit cost of VAEST list filtering at growing dataset sizes.
+
+Synthetic samples are loaded into `SampleListModel` behind
+`SampleFilterModel` with the "Necessita revisar" status filter and a search
+active, then review flags are toggled on spread-out rows so edited rows
+leave and re-enter the filtered list. The incremental path (one
+``dataChanged`` per edit, re-filtered row by row by the proxy) is timed
+against a full ``invalidateFilter()`` per edit, the former behaviour.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from validator_app.models import AnnotationSample
+from validator_app.view import SampleFilterModel, SampleListModel
+
+
+def _synthetic_samples(count: int) -> list[AnnotationSample]:
+    samples = []
+    for index in range(count):
+        paragraph = index // 8
+        samples.append(
+            AnnotationSample(
+                id=f"PAT_{index:06d}_SL+",
+                tag=("SL+", "RF+", "OM+")[index % 3],
+                nome="Simplificacao",
+                tipo_nivel="lexical",
+                contexto_anotacao=f"contexto da anotacao {index}",
+                paragrafo_alvo_id=f"A_{paragraph:05d}",
+                paragrafo_fonte_ids=[f"F_{paragraph:05d}"],
+                fonte_alinhamento_confiavel=True,
+                texto_paragrafo_alvo=f"paragrafo alvo {paragraph} texto",
+                texto_paragrafo_fonte=f"paragrafo fonte {paragraph} texto",
+                trecho_alvo=f"trecho {index}",
+                trecho_fonte=None,
+                necessita_revisao_humana=index % 2 == 0,
+                motivo_revisao=None,
+            )
+        )
+    return samples
+
+
+def _mean_edit_seconds(
+    count: int, edits: int, full_invalidate: bool
+) -> float:
+    samples = _synthetic_samples(count)
+    list_model = SampleListModel(samples)
+    filter_model = SampleFilterModel()
+    filter_model.setSourceModel(list_model)
+    filter_model.set_status_filter("revisar")
+    filter_model.set_search_text("texto")
+    # The proxy builds its row mapping lazily; do it before timing.
+    filter_model.rowCount()
+
+    started = time.perf_counter()
+    for edit in range(edits):
+        row = (edit * 7919) % count
+        sample = samples[row]
+        sample.necessita_revisao_humana = not sample.necessita_revisao_humana
+        sample.reviewer = f"revisor {edit}"
+        list_model.refresh_row(row)
+        if full_invalidate:
+            filter_model.invalidateFilter()
+    return (time.perf_counter() - started) / max(1, edits)
+
+
+def benchmark_filter_updates(
+    sizes: list[int],
+    edits: int = 200,
+    full_edits: int = 10,
+) -> dict[str, Any]:
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        incremental = _mean_edit_seconds(size, edits, full_invalidate=False)
+        full = _mean_edit_seconds(size, full_edits, full_invalidate=True)
+        rows.append(
+            {
+                "samples": size,
+                "incremental_ms": round(incremental * 1e3, 4),
+                "full_invalidate_ms": round(full * 1e3, 4),
+                "speedup": round(full / max(incremental, 1e-9), 1),
+            }
+        )
+    return {"edits": edits, "full_edits": full_edits, "runs": rows}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time VAEST per-edit filter updates by dataset size."
+    )
+    parser.add_argument(
+        "--size",
+        dest="sizes",
+        type=int,
+        action="append",
+        default=None,
+        help="Number of samples (repeatable; default 1000, 10000, 100000).",
+    )
+    parser.add_argument(
+        "--edits",
+        type=int,
+        default=200,
+        help="Edits timed on the incremental path.",
+    )
+    parser.add_argument(
+        "--full-edits",
+        type=int,
+        default=10,
+        help="Edits timed with a full invalidateFilter() each.",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    report = benchmark_filter_updates(
+        sizes=[max(1, size) for size in args.sizes or [1000, 10000, 100000]],
+        edits=max(1, args.edits),
+        full_edits=max(1, args.full_edits),
+    )
+
+    print("Filter update benchmark")
+    print("-" * 23)
+    for row in report["runs"]:
+        print(
+            f"{row['samples']} samples: "
+            f"incremental={row['incremental_ms']:.3f}ms/edit "
+            f"full={row['full_invalidate_ms']:.3f}ms/edit "
+            f"speedup={row['speedup']:.1f}x"
+        )
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+"""Quality-gate evaluation time against the number of worker processes.
+
+A synthetic JSONL dataset (random Portuguese-like paragraphs, a share of
+repeated supervised keys and groups spread over the three splits, with
+matching split files) is written to a temporary directory and evaluated
+by `validate_training_dataset.evaluate_dataset` once per worker count.
+Each run reports seconds and speedup over one worker, and whether its gate
+results equal the single-process ones. Speedup is bounded by the CPUs
+available; on a single CPU the extra workers only add start-up cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from .validate_training_dataset import evaluate_dataset
+
+_TAGS = ["SL+", "RF+", "OM+", "RD+", "IN+", "MOD+"]
+_SPLITS = ("train", "validation", "test")
+
+
+def _synthetic_rows(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    vocabulary = [f"palavra{index}" for index in range(5_000)]
+    rows: list[dict[str, Any]] = []
+    for index in range(count):
+        group = f"DOC{rng.randrange(max(1, count // 20)):05d}"
+        text = " ".join(rng.choice(vocabulary) for _ in range(40))
+        rows.append(
+            {
+                "sample_id": f"S{index:07d}",
+                "document_id": group,
+                "split_group_id": group,
+                "tag_code": rng.choice(_TAGS),
+                "label_scope": "automatic",
+                "target_paragraph_id": f"A_{index % 997:03d}",
+                "target_text": text,
+                "target_span_text": text[:20],
+                "target_span_start": 0,
+                "target_span_end": 20,
+                "source_paragraph_ids": [f"F_{index % 997:03d}"],
+                "source_text": text,
+                "alignment_confidence": rng.random(),
+                "human_validated": rng.random() < 0.5,
+            }
+        )
+    return rows
+
+
+def _write_dataset(directory: Path, rows: list[dict[str, Any]]) -> Path:
+    dataset_path = directory / "dataset_raw.jsonl"
+    handles = {
+        split: (directory / f"{split}.jsonl").open("w", encoding="utf-8")
+        for split in _SPLITS
+    }
+    with dataset_path.open("w", encoding="utf-8") as dataset:
+        for row in rows:
+            line = json.dumps(row, ensure_ascii=False) + "\n"
+            dataset.write(line)
+            digit = int(row["split_group_id"][-1])
+            split = _SPLITS[0 if digit < 7 else 1 if digit < 9 else 2]
+            handles[split].write(line)
+    for handle in handles.values():
+        handle.close()
+    return dataset_path
+
+
+def benchmark_gate_workers(
+    rows: int,
+    workers: list[int],
+    seed: int = 0,
+    min_part_bytes: int = 1 << 20,
+) -> dict[str, Any]:
+    runs: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        dataset_path = _write_dataset(directory, _synthetic_rows(rows, seed))
+        options = {
+            "dataset_card": directory / "dataset_card.md",
+            "train_jsonl": directory / "train.jsonl",
+            "validation_jsonl": directory / "validation.jsonl",
+            "test_jsonl": directory / "test.jsonl",
+            "min_part_bytes": min_part_bytes,
+        }
+        baseline_results = None
+        baseline_seconds = None
+        for count in [1] + [count for count in workers if count != 1]:
+            started = time.perf_counter()
+            report = evaluate_dataset(dataset_path, workers=count, **options)
+            seconds = time.perf_counter() - started
+            if baseline_results is None:
+                baseline_results = report.gate_results
+                baseline_seconds = seconds
+            if count not in workers:
+                continue
+            runs.append(
+                {
+                    "workers": count,
+                    "seconds": round(seconds, 3),
+                    "speedup": round(baseline_seconds / seconds, 2),
+                    "matches_single": (
+                        report.gate_results == baseline_results
+                    ),
+                }
+            )
+        size = dataset_path.stat().st_size
+    return {
+        "rows": rows,
+        "dataset_bytes": size,
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark gate evaluation across worker processes."
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=200_000,
+        help="Synthetic samples written to the JSONL dataset.",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        action="append",
+        default=None,
+        help="Worker count (repeatable; default 1, 2, 4, 8).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for the synthetic dataset.",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    report = benchmark_gate_workers(
+        rows=max(1, args.rows),
+        workers=[max(1, count) for count in args.workers or [1, 2, 4, 8]],
+        seed=args.seed,
+    )
+
+    print("Gate worker benchmark")
+    print("-" * 21)
+    print(
+        f"rows: {report['rows']} ({report['dataset_bytes']} bytes), "
+        f"cpus: {report['cpu_count']}"
+    )
+    for row in report["runs"]:
+        print(
+            f"{row['workers']} workers: {row['seconds']:.2f}s "
+            f"speedup={row['speedup']:.2f}x "
+            f"match={row['matches_single']}"
+        )
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
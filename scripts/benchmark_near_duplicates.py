@@ -0,0 +1,195 @@
+"""MinHash/LSH near-duplicate lookup against all-pairs comparison.
+
+Synthetic target paragraphs (random words) are generated with a share of
+edited copies (a few words replaced), as left by a passage reused across
+text pairs. `near_duplicates.NearDuplicateIndex` clusters them; the report
+gives time, candidate comparisons and the share of planted copies found.
+Up to ``--max-brute-force`` paragraphs, every pair's exact shingle
+Jaccard is also computed, for the cost LSH avoids and the true pairs at
+the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+from .near_duplicates import (
+    DEFAULT_NUM_PERM,
+    DEFAULT_THRESHOLD,
+    NearDuplicateIndex,
+    lsh_bands,
+    shingle_hashes,
+)
+
+
+def _synthetic_paragraphs(
+    count: int, copy_share: float = 0.02, edits: int = 2, seed: int = 0
+) -> tuple[list[str], list[tuple[int, int]]]:
+    rng = random.Random(seed)
+    vocabulary = [f"palavra{index}" for index in range(5_000)]
+    originals = max(1, int(count * (1 - copy_share)))
+    texts = [
+        " ".join(rng.choice(vocabulary) for _ in range(60))
+        for _ in range(originals)
+    ]
+    planted: list[tuple[int, int]] = []
+    while len(texts) < count:
+        original = rng.randrange(originals)
+        words = texts[original].split()
+        for _ in range(edits):
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        planted.append((original, len(texts)))
+        texts.append(" ".join(words))
+    return texts, planted
+
+
+def _brute_force_pairs(
+    texts: list[str], threshold: float
+) -> tuple[set[tuple[int, int]], float]:
+    started = time.perf_counter()
+    shingles = [shingle_hashes(text) for text in texts]
+    pairs = set()
+    for first in range(len(texts)):
+        for second in range(first + 1, len(texts)):
+            union = len(shingles[first] | shingles[second])
+            common = len(shingles[first] & shingles[second])
+            if union and common / union >= threshold:
+                pairs.add((first, second))
+    return pairs, time.perf_counter() - started
+
+
+def benchmark_near_duplicates(
+    sizes: list[int],
+    threshold: float = DEFAULT_THRESHOLD,
+    max_brute_force: int = 1_000,
+    seed: int = 0,
+) -> dict[str, Any]:
+    rows: list[dict[str, Any]] = []
+    for count in sizes:
+        texts, planted = _synthetic_paragraphs(count, seed=seed)
+        index = NearDuplicateIndex(threshold=threshold)
+        started = time.perf_counter()
+        for key, text in enumerate(texts):
+            index.add(key, text)
+        clusters = index.clusters()
+        seconds = time.perf_counter() - started
+
+        clustered: dict[int, int] = {}
+        for number, cluster in enumerate(clusters):
+            for key in cluster:
+                clustered[key] = number
+        found = sum(
+            1
+            for first, second in planted
+            if first in clustered
+            and clustered[first] == clustered.get(second)
+        )
+        row: dict[str, Any] = {
+            "paragraphs": count,
+            "lsh_ms": round(seconds * 1e3, 2),
+            "lsh_comparisons": index.comparisons,
+            "all_pairs": count * (count - 1) // 2,
+            "planted_copies": len(planted),
+            "planted_found": found,
+            "clusters": len(clusters),
+            "brute_force_ms": None,
+            "true_pairs": None,
+            "true_pairs_found": None,
+        }
+        if count <= max_brute_force:
+            pairs, brute_seconds = _brute_force_pairs(texts, threshold)
+            row["brute_force_ms"] = round(brute_seconds * 1e3, 2)
+            row["true_pairs"] = len(pairs)
+            row["true_pairs_found"] = sum(
+                1
+                for first, second in pairs
+                if first in clustered
+                and clustered[first] == clustered.get(second)
+            )
+        rows.append(row)
+    bands, rows_per_band = lsh_bands(DEFAULT_NUM_PERM, threshold)
+    return {
+        "threshold": threshold,
+        "bands": bands,
+        "rows_per_band": rows_per_band,
+        "runs": rows,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark MinHash/LSH near-duplicate detection."
+    )
+    parser.add_argument(
+        "--paragraphs",
+        dest="sizes",
+        type=int,
+        action="append",
+        default=None,
+        help="Paragraph count (repeatable; default 1000, 10000, 100000).",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Estimated Jaccard similarity for near duplicates.",
+    )
+    parser.add_argument(
+        "--max-brute-force",
+        type=int,
+        default=1_000,
+        help="Largest paragraph count also compared pair by pair.",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    report = benchmark_near_duplicates(
+        sizes=args.sizes or [1_000, 10_000, 100_000],
+        threshold=args.threshold,
+        max_brute_force=args.max_brute_force,
+    )
+
+    print("Near-duplicate benchmark")
+    print("-" * 24)
+    print(
+        f"threshold: {report['threshold']} "
+        f"(bands={report['bands']}, rows={report['rows_per_band']})"
+    )
+    for row in report["runs"]:
+        line = (
+            f"{row['paragraphs']} paragraphs: lsh={row['lsh_ms']:.0f}ms "
+            f"comparisons={row['lsh_comparisons']}/{row['all_pairs']} "
+            f"planted={row['planted_found']}/{row['planted_copies']}"
+        )
+        if row["brute_force_ms"] is not None:
+            line += (
+                f" brute_force={row['brute_force_ms']:.0f}ms "
+                f"true_pairs={row['true_pairs_found']}/{row['true_pairs']}"
+            )
+        print(line)
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+"""Split-assignment solver against exhaustive search.
+
+Synthetic split groups (skewed row counts, one to three labels each, a few
+rare labels held by a single group) are assigned to train/validation/test
+by `build_supervised_exports._solve_assignment`. Up to ``--max-exhaustive``
+groups the exhaustive search runs too, and both objective values
+``(holdout shortfall, train labels missing, ratio error, transitions)``
+are reported side by side; larger cases report the solver alone.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+from .build_supervised_exports import (
+    _assignment_score,
+    _group_bucket,
+    _search_assignment,
+    _solve_assignment,
+    _split_targets,
+)
+
+_LABELS = ["SL+", "RF+", "OM+", "RD+", "IN+", "MOD+", "DL+", "PRO+"]
+
+
+def _synthetic_groups(
+    count: int, seed: int = 0
+) -> tuple[dict[str, int], dict[str, set[str]]]:
+    rng = random.Random(seed)
+    sizes: dict[str, int] = {}
+    labels: dict[str, set[str]] = {}
+    for index in range(count):
+        group = f"G{index:05d}"
+        sizes[group] = max(1, int(rng.paretovariate(1.5) * 3))
+        labels[group] = set(rng.sample(_LABELS[:5], rng.randint(1, 3)))
+    for offset, label in enumerate(_LABELS[5:]):
+        labels[f"G{(offset * 7) % count:05d}"].add(label)
+    return sizes, labels
+
+
+def _timed_solve(
+    solver: Any, options: dict[str, Any]
+) -> tuple[dict[str, str], float]:
+    started = time.perf_counter()
+    assignments = solver(**options)
+    return assignments, time.perf_counter() - started
+
+
+def benchmark_split_solver(
+    sizes: list[int],
+    max_exhaustive: int = 12,
+    seed: int = 0,
+    min_holdout_rows: int = 5,
+) -> dict[str, Any]:
+    rows: list[dict[str, Any]] = []
+    for count in sizes:
+        group_sizes, group_labels = _synthetic_groups(count, seed)
+        ordered = sorted(group_sizes, key=_group_bucket)
+        all_labels = set().union(*group_labels.values())
+        options = {
+            "ordered_groups": ordered,
+            "group_sizes": group_sizes,
+            "group_labels": group_labels,
+            "all_labels": all_labels,
+            "train_ratio": 0.70,
+            "validation_ratio": 0.15,
+            "min_validation_rows": min_holdout_rows,
+            "min_test_rows": min_holdout_rows,
+        }
+        targets = _split_targets(
+            sum(group_sizes.values()), 0.70, 0.15
+        )
+
+        def _score(assignments: dict[str, str]) -> list[int] | None:
+            score = _assignment_score(
+                ordered,
+                tuple(assignments[group] for group in ordered),
+                group_sizes,
+                group_labels,
+                all_labels,
+                targets,
+                min_holdout_rows,
+                min_holdout_rows,
+            )
+            return list(score) if score is not None else None
+
+        solved, solver_seconds = _timed_solve(
+            _solve_assignment, {**options, "seed": seed}
+        )
+        row: dict[str, Any] = {
+            "groups": count,
+            "rows": sum(group_sizes.values()),
+            "solver_ms": round(solver_seconds * 1e3, 2),
+            "solver_score": _score(solved),
+            "exhaustive_ms": None,
+            "exhaustive_score": None,
+            "matches_exhaustive": None,
+        }
+        if count <= max_exhaustive:
+            exact, exact_seconds = _timed_solve(
+                _search_assignment, {**options, "max_groups": count}
+            )
+            row["exhaustive_ms"] = round(exact_seconds * 1e3, 2)
+            row["exhaustive_score"] = _score(exact)
+            row["matches_exhaustive"] = (
+                row["solver_score"] == row["exhaustive_score"]
+            )
+        rows.append(row)
+    return {
+        "seed": seed,
+        "min_holdout_rows": min_holdout_rows,
+        "runs": rows,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare the split solver with exhaustive search."
+    )
+    parser.add_argument(
+        "--groups",
+        dest="sizes",
+        type=int,
+        action="append",
+        default=None,
+        help=(
+            "Number of split groups (repeatable; default 6, 8, 10, 12, "
+            "100, 1000, 5000)."
+        ),
+    )
+    parser.add_argument(
+        "--max-exhaustive",
+        type=int,
+        default=12,
+        help="Largest group count also solved by exhaustive search.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for the synthetic groups and the solver.",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    report = benchmark_split_solver(
+        sizes=[
+            max(3, size)
+            for size in args.sizes or [6, 8, 10, 12, 100, 1000, 5000]
+        ],
+        max_exhaustive=args.max_exhaustive,
+        seed=args.seed,
+    )
+
+    print("Split solver benchmark")
+    print("-" * 22)
+    for row in report["runs"]:
+        line = (
+            f"{row['groups']} groups: solver={row['solver_ms']:.1f}ms "
+            f"score={row['solver_score']}"
+        )
+        if row["exhaustive_ms"] is not None:
+            line += (
+                f" exhaustive={row['exhaustive_ms']:.1f}ms "
+                f"score={row['exhaustive_score']} "
+                f"match={row['matches_exhaustive']}"
+            )
+        print(line)
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
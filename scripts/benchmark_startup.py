@@ -0,0 +1,237 @@
+"""Cold-start cost of the VAEST window.
+
+Each run starts a fresh interpreter that imports `validator_app.view`,
+builds `MainWindow` on a synthetic dataset and stops at the first paint
+event, reporting the import, construction and first-paint times measured
+inside the child plus the whole process wall time. A separate
+``python -X importtime`` pass lists the slowest modules imported by the
+view, to spot a heavy dependency creeping back into startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from scripts.benchmark_filter_updates import _synthetic_samples
+from validator_app.data_loader import save_dataset
+from validator_app.models import Metadata
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Time-to-first-paint budget for the window, in milliseconds.
+FIRST_PAINT_TARGET_MS = 1000.0
+
+_CHILD = """
+import time
+started = time.perf_counter()
+import json
+import sys
+from pathlib import Path
+
+from validator_app import view
+
+imported = time.perf_counter()
+from PySide6.QtCore import QEvent, QObject, QTimer
+
+# Keep the benchmark away from the user's saved project state.
+view.save_project_state = lambda state: None
+marks = {}
+
+
+class _FirstPaint(QObject):
+    def eventFilter(self, watched, event):  # noqa: N802
+        if event.type() == QEvent.Type.Paint and "painted" not in marks:
+            marks["painted"] = time.perf_counter()
+            QTimer.singleShot(0, window.close)
+            QTimer.singleShot(0, app.quit)
+        return False
+
+
+app = view.QApplication.instance() or view.QApplication([])
+window = view.MainWindow(dataset_path=Path(sys.argv[1]))
+built = time.perf_counter()
+watcher = _FirstPaint()
+app.installEventFilter(watcher)
+window.show()
+QTimer.singleShot(30000, app.quit)
+app.exec()
+painted = marks.get("painted", time.perf_counter())
+print(json.dumps({
+    "import_ms": (imported - started) * 1e3,
+    "window_ms": (built - imported) * 1e3,
+    "first_paint_ms": (painted - started) * 1e3,
+}))
+"""
+
+
+def _child_env() -> dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(
+        part for part in (str(BASE_DIR), env.get("PYTHONPATH")) if part
+    )
+    return env
+
+
+def _startup_run(dataset_path: Path) -> dict[str, float]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(dataset_path)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=BASE_DIR,
+        env=_child_env(),
+    )
+    process_ms = (time.perf_counter() - started) * 1e3
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = process_ms
+    return result
+
+
+def slowest_imports(
+    module: str = "validator_app.view", top: int = 10
+) -> list[dict[str, Any]]:
+    """Return the ``top`` modules with the largest self import time."""
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=BASE_DIR,
+        env=_child_env(),
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        rows.append(
+            {
+                "module": fields[2].strip(),
+                "self_ms": round(int(fields[0]) / 1e3, 2),
+                "cumulative_ms": round(int(fields[1]) / 1e3, 2),
+            }
+        )
+    rows.sort(key=lambda row: row["self_ms"], reverse=True)
+    return rows[:top]
+
+
+def benchmark_startup(
+    runs: int = 5,
+    samples: int = 1000,
+    target_ms: float = FIRST_PAINT_TARGET_MS,
+    top: int = 10,
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_path = Path(tmp) / "dataset.json"
+        save_dataset(
+            dataset_path,
+            Metadata("Benchmark", "1", "pt", ""),
+            _synthetic_samples(samples),
+        )
+        results = [_startup_run(dataset_path) for _ in range(runs)]
+
+    medians = {
+        key: round(statistics.median(run[key] for run in results), 1)
+        for key in ("import_ms", "window_ms", "first_paint_ms", "process_ms")
+    }
+    return {
+        "runs": runs,
+        "samples": samples,
+        "target_first_paint_ms": target_ms,
+        "median": medians,
+        "meets_target": medians["first_paint_ms"] <= target_ms,
+        "slowest_imports": slowest_imports(top=top),
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time VAEST imports and time-to-first-paint."
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Fresh interpreters started (medians are reported).",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=1000,
+        help="Samples in the synthetic dataset opened at startup.",
+    )
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=FIRST_PAINT_TARGET_MS,
+        help="Time-to-first-paint budget; exit code 1 when exceeded.",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Slowest imports to list.",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    report = benchmark_startup(
+        runs=max(1, args.runs),
+        samples=max(1, args.samples),
+        target_ms=args.target_ms,
+        top=max(0, args.top),
+    )
+
+    median = report["median"]
+    print("Startup benchmark")
+    print("-" * 17)
+    print(
+        f"import={median['import_ms']:.1f}ms "
+        f"window={median['window_ms']:.1f}ms "
+        f"first_paint={median['first_paint_ms']:.1f}ms "
+        f"process={median['process_ms']:.1f}ms"
+    )
+    print(
+        f"target first_paint<={report['target_first_paint_ms']:.0f}ms: "
+        f"{'ok' if report['meets_target'] else 'EXCEEDED'}"
+    )
+    for row in report["slowest_imports"]:
+        print(
+            f"  {row['module']}: self={row['self_ms']:.1f}ms "
+            f"cumulative={row['cumulative_ms']:.1f}ms"
+        )
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0 if report["meets_target"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
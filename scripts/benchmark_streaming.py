@@ -0,0 +1,146 @@
+"""Peak-memory benchmark for `parser.cli` batch vs `--stream` runs.
+
+The target text is repeated `--scale` times (the source stays fixed), so
+batch peaks should grow with the scale while streamed peaks stay flat.
+Peaks are measured with `tracemalloc` (Python allocations only).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from parser import cli
+from parser.io_utils import read_text
+
+
+def _measure(run: Callable[[], None]) -> tuple[float, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        run()
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def benchmark_streaming(
+    source_path: Path,
+    target_path: Path,
+    tags_path: Path,
+    scales: list[int],
+) -> dict[str, Any]:
+    target_text = read_text(target_path).strip()
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for scale in scales:
+            scaled_target = workdir / f"target_x{scale}.md"
+            scaled_target.write_text(
+                "\n\n".join([target_text] * scale), encoding="utf-8"
+            )
+            row: dict[str, Any] = {
+                "scale": scale,
+                "target_bytes": scaled_target.stat().st_size,
+            }
+            for mode, stream in (("batch", False), ("stream", True)):
+                output = workdir / f"out_{mode}_x{scale}.json"
+                seconds, peak = _measure(
+                    lambda: cli.main(
+                        source_path=source_path,
+                        target_path=scaled_target,
+                        tags_path=tags_path,
+                        output_path=output,
+                        stream=stream,
+                    )
+                )
+                row[f"{mode}_seconds"] = round(seconds, 4)
+                row[f"{mode}_peak_bytes"] = peak
+                row[f"{mode}_output_bytes"] = output.stat().st_size
+            rows.append(row)
+    return {
+        "source": str(source_path),
+        "target": str(target_path),
+        "runs": rows,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare parser peak memory in batch and --stream modes."
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=cli.BASE_DIR / "patriotismo_st.md",
+    )
+    parser.add_argument(
+        "--target",
+        type=Path,
+        default=cli.BASE_DIR / "patriotismo_tt.md",
+    )
+    parser.add_argument(
+        "--tags",
+        type=Path,
+        default=cli.BASE_DIR / "tab_est.md",
+    )
+    parser.add_argument(
+        "--scale",
+        dest="scales",
+        type=int,
+        action="append",
+        default=None,
+        help="Target repetition factor (repeatable; default 1, 5, 20).",
+    )
+    parser.add_argument(
+        "--report-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the benchmark report JSON.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    for path in (args.source, args.target):
+        if not path.exists():
+            print(f"File not found: {path}")
+            return 2
+
+    report = benchmark_streaming(
+        source_path=args.source,
+        target_path=args.target,
+        tags_path=args.tags,
+        scales=[max(1, scale) for scale in args.scales or [1, 5, 20]],
+    )
+
+    print("Streaming benchmark")
+    print("-" * 19)
+    for row in report["runs"]:
+        print(
+            f"x{row['scale']}: batch peak={row['batch_peak_bytes']:,}B "
+            f"({row['batch_seconds']:.2f}s) "
+            f"stream peak={row['stream_peak_bytes']:,}B "
+            f"({row['stream_seconds']:.2f}s)"
+        )
+
+    if args.report_json is not None:
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
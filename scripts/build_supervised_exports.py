@@ -2,8 +2,11 @@
 
 Phase 3 artifact builder:
 - filters in-scope automatic rows
-- deduplicates supervised keys
-- creates deterministic split JSONL files by split_group_id
+- deduplicates supervised keys (and, with ``--near-dedupe-threshold``,
+  annotations repeated on near-duplicate passages across documents)
+- creates deterministic split JSONL files by split_group_id, streamed row
+  by row into optionally sharded (``--shard-rows``) and gzipped (``.gz``
+  paths) files
 """
 
 from __future__ import annotations
@@ -12,11 +15,16 @@ import argparse
 import hashlib
 import itertools
 import json
+import random
 from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from parser.paragraph_table import unpack_dataset
+
+from .jsonl_shards import ShardedJsonlWriter
+from .near_duplicates import near_duplicate_clusters
 from .validate_training_dataset import IN_SCOPE_TAGS
 
 
@@ -86,6 +94,62 @@ def _resolve_group_id(row: dict[str, Any], group_field: str) -> str:
     return "__ungrouped__"
 
 
+def _near_duplicate_text(row: dict[str, Any]) -> str:
+    return str(
+        row.get("target_text")
+        or row.get("texto_paragrafo_alvo")
+        or row.get("target_span_text")
+        or ""
+    )
+
+
+def _near_dedupe(
+    rows: list[dict[str, Any]], group_field: str, threshold: float
+) -> tuple[list[dict[str, Any]], dict[str, str], int]:
+    """Drop annotations repeated on near-duplicate passages.
+
+    Rows whose target texts are near duplicates (`near_duplicates`) form a
+    cluster; within a cluster only the first row per (tag, span) is kept,
+    and the split groups of the remaining rows are merged into the
+    smallest one so the passage cannot land in two splits. Returns the
+    kept rows, ``{group: merged group}`` and the number of removed rows.
+    """
+
+    removed: set[int] = set()
+    parent: dict[str, str] = {}
+
+    def _root(group: str) -> str:
+        while parent.get(group, group) != group:
+            group = parent[group]
+        return group
+
+    for cluster in near_duplicate_clusters(
+        ((index, _near_duplicate_text(row)) for index, row in enumerate(rows)),
+        threshold=threshold,
+    ):
+        seen: set[tuple[str, str]] = set()
+        roots: set[str] = set()
+        for index in cluster:
+            row = rows[index]
+            key = (
+                str(row.get("tag_code") or "").strip(),
+                _normalize_ws(str(row.get("target_span_text") or "")).lower(),
+            )
+            if key in seen:
+                removed.add(index)
+                continue
+            seen.add(key)
+            roots.add(_root(_resolve_group_id(row, group_field)))
+        target = min(roots) if roots else None
+        for root in roots:
+            if target is not None and root != target:
+                parent[root] = target
+
+    aliases = {group: _root(group) for group in parent}
+    kept = [row for index, row in enumerate(rows) if index not in removed]
+    return kept, aliases, len(removed)
+
+
 def _split_row_counts(
     assignments: dict[str, str],
     group_sizes: dict[str, int],
@@ -121,6 +185,75 @@ def _transition_penalty(order: tuple[str, ...]) -> int:
     return switches
 
 
+SPLIT_NAMES = ("train", "validation", "test")
+# Up to this many groups every assignment is enumerated (3**8 = 6561);
+# larger inputs use the local-search solver.
+EXHAUSTIVE_MAX_GROUPS = 8
+# Move pairs (a quadratic neighbourhood) are searched up to this many groups.
+CHAIN_MAX_GROUPS = 60
+
+
+def _split_targets(
+    total_rows: int, train_ratio: float, validation_ratio: float
+) -> tuple[int, int, int]:
+    train_target = int(round(train_ratio * total_rows))
+    validation_target = int(round(validation_ratio * total_rows))
+    return (
+        train_target,
+        validation_target,
+        total_rows - train_target - validation_target,
+    )
+
+
+def _assignment_score(
+    ordered_groups: list[str],
+    combo: tuple[str, ...],
+    group_sizes: dict[str, int],
+    group_labels: dict[str, set[str]],
+    all_labels: set[str],
+    targets: tuple[int, int, int],
+    min_validation_rows: int,
+    min_test_rows: int,
+) -> tuple[int, int, int, int] | None:
+    """Score ``combo`` (lower is better); None if a split has no group.
+
+    Holdout shortfall below the minimums comes first, then labels missing
+    from train, then the distance to the target row counts and finally
+    the number of split changes along the bucket order.
+    """
+
+    assignments = dict(zip(ordered_groups, combo, strict=False))
+    group_counts = _split_group_counts(assignments)
+    if any(group_counts[split] == 0 for split in SPLIT_NAMES):
+        return None
+
+    row_counts = _split_row_counts(assignments, group_sizes)
+    validation_shortfall = max(
+        0,
+        min_validation_rows - row_counts["validation"],
+    )
+    test_shortfall = max(0, min_test_rows - row_counts["test"])
+
+    support_penalty = validation_shortfall + test_shortfall
+    train_labels: set[str] = set()
+    for group, split in assignments.items():
+        if split == "train":
+            train_labels.update(group_labels.get(group, set()))
+    label_missing_penalty = len(all_labels - train_labels)
+
+    ratio_penalty = sum(
+        abs(row_counts[split] - target)
+        for split, target in zip(SPLIT_NAMES, targets, strict=False)
+    )
+    shape_penalty = _transition_penalty(combo)
+    return (
+        support_penalty,
+        label_missing_penalty,
+        ratio_penalty,
+        shape_penalty,
+    )
+
+
 def _search_assignment(
     ordered_groups: list[str],
     group_sizes: dict[str, int],
@@ -130,58 +263,404 @@ def _search_assignment(
     validation_ratio: float,
     min_validation_rows: int,
     min_test_rows: int,
+    max_groups: int = EXHAUSTIVE_MAX_GROUPS,
 ) -> dict[str, str] | None:
-    # Exhaustive search is deterministic and robust for tiny group counts.
-    if len(ordered_groups) > 12:
+    """Return the best assignment by enumeration, or None if too many."""
+
+    if len(ordered_groups) > max_groups:
         return None
 
     total_rows = sum(group_sizes[group] for group in ordered_groups)
-    train_target = int(round(train_ratio * total_rows))
-    validation_target = int(round(validation_ratio * total_rows))
-    test_target = total_rows - train_target - validation_target
+    targets = _split_targets(total_rows, train_ratio, validation_ratio)
 
     best_assignment: dict[str, str] | None = None
     best_score: tuple[int, int, int, int] | None = None
 
-    split_names = ("train", "validation", "test")
-    for combo in itertools.product(split_names, repeat=len(ordered_groups)):
-        assignments = dict(zip(ordered_groups, combo, strict=False))
-        group_counts = _split_group_counts(assignments)
-        if any(group_counts[split] == 0 for split in split_names):
+    for combo in itertools.product(SPLIT_NAMES, repeat=len(ordered_groups)):
+        score = _assignment_score(
+            ordered_groups,
+            combo,
+            group_sizes,
+            group_labels,
+            all_labels,
+            targets,
+            min_validation_rows,
+            min_test_rows,
+        )
+        if score is None:
             continue
+        if best_score is None or score < best_score:
+            best_score = score
+            best_assignment = dict(zip(ordered_groups, combo, strict=False))
+
+    return best_assignment
+
 
-        row_counts = _split_row_counts(assignments, group_sizes)
-        validation_shortfall = max(
-            0,
-            min_validation_rows - row_counts["validation"],
+class _SplitState:
+    """Split assignment with its score kept up to date move by move."""
+
+    def __init__(
+        self,
+        sizes: list[int],
+        labels: list[tuple[str, ...]],
+        all_labels: set[str],
+        targets: tuple[int, int, int],
+        min_validation_rows: int,
+        min_test_rows: int,
+    ) -> None:
+        self.sizes = sizes
+        self.labels = labels
+        self.targets = targets
+        self.minimums = (0, min_validation_rows, min_test_rows)
+        self.split = [0] * len(sizes)
+        self.rows = [sum(sizes), 0, 0]
+        self.groups = [len(sizes), 0, 0]
+        self.train_labels: Counter[str] = Counter()
+        for group_labels in labels:
+            self.train_labels.update(group_labels)
+        self.missing = sum(
+            1 for label in all_labels if not self.train_labels[label]
         )
-        test_shortfall = max(0, min_test_rows - row_counts["test"])
-
-        support_penalty = validation_shortfall + test_shortfall
-        train_labels: set[str] = set()
-        for group, split in assignments.items():
-            if split == "train":
-                train_labels.update(group_labels.get(group, set()))
-        label_missing_penalty = len(all_labels - train_labels)
-
-        ratio_penalty = (
-            abs(row_counts["train"] - train_target)
-            + abs(row_counts["validation"] - validation_target)
-            + abs(row_counts["test"] - test_target)
+        self.transitions = 0
+
+    def _score(
+        self, rows: list[int], missing: int, transitions: int
+    ) -> tuple[int, int, int, int]:
+        targets = self.targets
+        return (
+            max(0, self.minimums[1] - rows[1])
+            + max(0, self.minimums[2] - rows[2]),
+            missing,
+            abs(rows[0] - targets[0])
+            + abs(rows[1] - targets[1])
+            + abs(rows[2] - targets[2]),
+            transitions,
         )
-        shape_penalty = _transition_penalty(combo)
-        score = (
-            support_penalty,
-            label_missing_penalty,
-            ratio_penalty,
-            shape_penalty,
+
+    def score(self) -> tuple[int, int, int, int]:
+        return self._score(self.rows, self.missing, self.transitions)
+
+    def _edges(self, index: int, split: int) -> int:
+        edges = 0
+        if index > 0 and self.split[index - 1] != split:
+            edges += 1
+        if index + 1 < len(self.split) and self.split[index + 1] != split:
+            edges += 1
+        return edges
+
+    def score_if_moved(
+        self, index: int, split: int
+    ) -> tuple[int, int, int, int]:
+        """Return the score after moving group ``index``, without moving."""
+
+        old = self.split[index]
+        size = self.sizes[index]
+        rows = list(self.rows)
+        rows[old] -= size
+        rows[split] += size
+        missing = self.missing
+        train_labels = self.train_labels
+        if old == 0:
+            missing += sum(
+                1 for label in self.labels[index] if train_labels[label] == 1
+            )
+        elif split == 0:
+            missing -= sum(
+                1 for label in self.labels[index] if not train_labels[label]
+            )
+        transitions = (
+            self.transitions
+            + self._edges(index, split)
+            - self._edges(index, old)
         )
+        return self._score(rows, missing, transitions)
 
-        if best_score is None or score < best_score:
+    def move(self, index: int, split: int) -> int:
+        """Put group ``index`` in ``split``; return its previous split."""
+
+        old = self.split[index]
+        if old == split:
+            return old
+        self.transitions += self._edges(index, split) - self._edges(
+            index, old
+        )
+        size = self.sizes[index]
+        self.rows[old] -= size
+        self.rows[split] += size
+        self.groups[old] -= 1
+        self.groups[split] += 1
+        if old == 0:
+            for label in self.labels[index]:
+                self.train_labels[label] -= 1
+                if not self.train_labels[label]:
+                    self.missing += 1
+        if split == 0:
+            for label in self.labels[index]:
+                if not self.train_labels[label]:
+                    self.missing -= 1
+                self.train_labels[label] += 1
+        self.split[index] = split
+        return old
+
+
+def _greedy_start(state: _SplitState, all_labels: set[str]) -> None:
+    """Cover every label with train groups, then fill the holdouts."""
+
+    count = len(state.sizes)
+    cover: set[int] = set()
+    uncovered = set(all_labels)
+    while uncovered:
+        gain, chosen = max(
+            (
+                (len(uncovered.intersection(state.labels[index])), index)
+                for index in range(count)
+                if index not in cover
+            ),
+            key=lambda item: (item[0], -state.sizes[item[1]], -item[1]),
+            default=(0, -1),
+        )
+        if gain == 0:
+            break
+        cover.add(chosen)
+        uncovered.difference_update(state.labels[chosen])
+
+    # Deal the other groups, largest first, to the split furthest below
+    # its target row count (holdouts count their minimum as target).
+    wanted = (
+        state.targets[0],
+        max(state.targets[1], state.minimums[1]),
+        max(state.targets[2], state.minimums[2]),
+    )
+    filled = [sum(state.sizes[index] for index in cover), 0, 0]
+    others = sorted(
+        (index for index in range(count) if index not in cover),
+        key=lambda index: (-state.sizes[index], index),
+    )
+    for index in others:
+        split = max(range(3), key=lambda k: (wanted[k] - filled[k], -k))
+        filled[split] += state.sizes[index]
+        state.move(index, split)
+    for split in (1, 2):
+        if state.groups[split] == 0:
+            # Prefer donors outside the label cover.
+            donors = [
+                index
+                for index in range(count)
+                if state.groups[state.split[index]] > 1
+            ]
+            state.move(
+                min(
+                    donors,
+                    key=lambda index: (
+                        index in cover,
+                        state.sizes[index],
+                        index,
+                    ),
+                ),
+                split,
+            )
+
+
+def _improve_by_moves(
+    state: _SplitState, rng: random.Random, best_only: bool
+) -> bool:
+    """Move groups to better splits.
+
+    With ``best_only`` a single move, the best one, is made per call;
+    otherwise every group takes its first improving move in a seeded
+    order, which is much faster on large inputs.
+    """
+
+    improved = False
+    best = state.score()
+    best_move: tuple[int, int] | None = None
+    order = list(range(len(state.sizes)))
+    rng.shuffle(order)
+    for index in order:
+        old = state.split[index]
+        if state.groups[old] == 1:
+            continue
+        for split in (0, 1, 2):
+            if split == old:
+                continue
+            score = state.score_if_moved(index, split)
+            if score < best:
+                best = score
+                if best_only:
+                    best_move = (index, split)
+                    continue
+                state.move(index, split)
+                improved = True
+                break
+    if best_move is not None:
+        state.move(*best_move)
+        improved = True
+    return improved
+
+
+def _improve_by_swaps(
+    state: _SplitState, rng: random.Random, max_pairs: int
+) -> bool:
+    count = len(state.sizes)
+    if count * (count - 1) // 2 <= max_pairs:
+        pairs = [
+            (first, second)
+            for first in range(count)
+            for second in range(first + 1, count)
+        ]
+        rng.shuffle(pairs)
+    else:
+        pairs = [
+            (rng.randrange(count), rng.randrange(count))
+            for _ in range(max_pairs)
+        ]
+    improved = False
+    best = state.score()
+    for first, second in pairs:
+        split_a, split_b = state.split[first], state.split[second]
+        if split_a == split_b:
+            continue
+        state.move(first, split_b)
+        state.move(second, split_a)
+        score = state.score()
+        if score < best:
+            best = score
+            improved = True
+        else:
+            state.move(second, split_b)
+            state.move(first, split_a)
+    return improved
+
+
+def _improve_by_chains(state: _SplitState) -> bool:
+    """Try pairs of moves whose first step alone is not allowed/better.
+
+    Catches cases such as pulling a label-carrying group back into train
+    while another group refills the holdout it leaves.
+    """
+
+    count = len(state.sizes)
+    best = state.score()
+    for first in range(count):
+        first_old = state.split[first]
+        for first_split in (0, 1, 2):
+            if first_split == first_old:
+                continue
+            state.move(first, first_split)
+            for second in range(count):
+                second_old = state.split[second]
+                if second == first:
+                    continue
+                for second_split in (0, 1, 2):
+                    if second_split == second_old:
+                        continue
+                    groups = list(state.groups)
+                    groups[second_old] -= 1
+                    groups[second_split] += 1
+                    if min(groups) == 0:
+                        continue
+                    if state.score_if_moved(second, second_split) < best:
+                        state.move(second, second_split)
+                        return True
+            state.move(first, first_old)
+    return False
+
+
+def _local_search(
+    state: _SplitState,
+    rng: random.Random,
+    max_pairs: int,
+    max_rounds: int = 25,
+) -> tuple[int, int, int, int]:
+    """Apply improving moves, then swaps, then move pairs (small inputs).
+
+    Stops at a local optimum or after ``max_rounds`` rounds; late rounds
+    on large inputs only trim the split-transition tie-break.
+    """
+
+    small = len(state.sizes) <= CHAIN_MAX_GROUPS
+    for _ in range(max_rounds):
+        if not (
+            _improve_by_moves(state, rng, best_only=small)
+            or _improve_by_swaps(state, rng, max_pairs)
+            or (small and _improve_by_chains(state))
+        ):
+            break
+    return state.score()
+
+
+def _solve_assignment(
+    ordered_groups: list[str],
+    group_sizes: dict[str, int],
+    group_labels: dict[str, set[str]],
+    all_labels: set[str],
+    train_ratio: float,
+    validation_ratio: float,
+    min_validation_rows: int,
+    min_test_rows: int,
+    seed: int = 0,
+    restarts: int | None = None,
+) -> dict[str, str]:
+    """Minimise the `_assignment_score` objective for any group count.
+
+    Starts from a greedy assignment (train covers every label, holdouts
+    filled largest group first), then runs local search over single-group
+    moves and pair swaps (all pairs for small inputs, a seeded sample
+    otherwise) and, up to `CHAIN_MAX_GROUPS` groups, pairs of moves. Then
+    ``restarts`` perturb-and-search rounds (by default 32 up to 50 groups,
+    then ``1600 // groups``, at least one) keep the best result. The same
+    ``seed`` always gives the same assignment. Needs at least three groups.
+    """
+
+    sizes = [int(group_sizes[group]) for group in ordered_groups]
+    labels = [
+        tuple(sorted(group_labels.get(group, set())))
+        for group in ordered_groups
+    ]
+    targets = _split_targets(sum(sizes), train_ratio, validation_ratio)
+    state = _SplitState(
+        sizes,
+        labels,
+        all_labels,
+        targets,
+        min_validation_rows,
+        min_test_rows,
+    )
+    _greedy_start(state, all_labels)
+
+    count = len(sizes)
+    rng = random.Random(seed)
+    max_pairs = max(2_000, 2 * count)
+    best_score = _local_search(state, rng, max_pairs)
+    best_split = list(state.split)
+    kicks = max(3, min(count // 4, 50))
+    if restarts is None:
+        restarts = max(1, min(32, 1600 // count))
+    for _ in range(restarts):
+        for _ in range(kicks):
+            index = rng.randrange(count)
+            if state.groups[state.split[index]] > 1:
+                state.move(index, rng.randrange(3))
+        score = _local_search(state, rng, max_pairs)
+        if score < best_score:
             best_score = score
-            best_assignment = assignments
+            best_split = list(state.split)
+        else:
+            for index, split in enumerate(best_split):
+                state.move(index, split)
+
+    return {
+        group: SPLIT_NAMES[split]
+        for group, split in zip(ordered_groups, best_split, strict=False)
+    }
 
-    return best_assignment
+
+def _split_solver_name(group_count: int) -> str:
+    if group_count < 3:
+        return "hash_buckets"
+    if group_count <= EXHAUSTIVE_MAX_GROUPS:
+        return "exhaustive"
+    return "local_search"
 
 
 def _assign_splits(
@@ -193,48 +672,28 @@ def _assign_splits(
     validation_ratio: float,
     min_validation_rows: int,
     min_test_rows: int,
+    seed: int = 0,
 ) -> dict[str, str]:
     assignments: dict[str, str] = {}
     ordered = sorted(groups, key=_group_bucket)
 
-    # For tiny-but-multi-group datasets, force one group per split and
-    # optimize row-level support on holdouts when possible.
+    # With three or more groups, force one group per split and optimize
+    # holdout support, train label coverage and split ratios.
     if len(ordered) >= 3:
-        searched = _search_assignment(
-            ordered_groups=ordered,
-            group_sizes=group_sizes,
-            group_labels=group_labels,
-            all_labels=all_labels,
-            train_ratio=train_ratio,
-            validation_ratio=validation_ratio,
-            min_validation_rows=max(1, min_validation_rows),
-            min_test_rows=max(1, min_test_rows),
-        )
+        options = {
+            "ordered_groups": ordered,
+            "group_sizes": group_sizes,
+            "group_labels": group_labels,
+            "all_labels": all_labels,
+            "train_ratio": train_ratio,
+            "validation_ratio": validation_ratio,
+            "min_validation_rows": max(1, min_validation_rows),
+            "min_test_rows": max(1, min_test_rows),
+        }
+        searched = _search_assignment(**options)
         if searched is not None:
             return searched
-
-        group_count = len(ordered)
-
-        valid_start = max(1, int(round(train_ratio * group_count)))
-        test_start = max(
-            valid_start + 1,
-            int(round((train_ratio + validation_ratio) * group_count)),
-        )
-
-        if test_start >= group_count:
-            test_start = group_count - 1
-        if valid_start >= test_start:
-            valid_start = max(1, test_start - 1)
-
-        for index, group in enumerate(ordered):
-            if index < valid_start:
-                assignments[group] = "train"
-            elif index < test_start:
-                assignments[group] = "validation"
-            else:
-                assignments[group] = "test"
-
-        return assignments
+        return _solve_assignment(**options, seed=seed)
 
     train_cut = train_ratio
     valid_cut = train_ratio + validation_ratio
@@ -268,8 +727,11 @@ def build_supervised_exports(
     group_field: str = "split_group_id",
     min_validation_rows: int = 1,
     min_test_rows: int = 1,
+    split_seed: int = 0,
+    shard_rows: int = 0,
+    near_dedupe_threshold: float | None = None,
 ) -> dict[str, Any]:
-    payload = _read_json(dataset_path)
+    payload = unpack_dataset(_read_json(dataset_path))
     metadata = payload.get("metadata", {})
     rows = payload.get("amostras", [])
     if not isinstance(rows, list):
@@ -296,13 +758,21 @@ def build_supervised_exports(
         seen_keys.add(key)
         deduped.append(row)
 
-    group_sizes: Counter[str] = Counter(
-        _resolve_group_id(row, group_field) for row in deduped
-    )
+    near_duplicates_removed = 0
+    group_aliases: dict[str, str] = {}
+    if near_dedupe_threshold is not None:
+        deduped, group_aliases, near_duplicates_removed = _near_dedupe(
+            deduped, group_field, near_dedupe_threshold
+        )
+    row_groups = [
+        group_aliases.get(group, group)
+        for group in (_resolve_group_id(row, group_field) for row in deduped)
+    ]
+
+    group_sizes: Counter[str] = Counter(row_groups)
     group_labels: dict[str, set[str]] = {}
     all_labels: set[str] = set()
-    for row in deduped:
-        group = _resolve_group_id(row, group_field)
+    for row, group in zip(deduped, row_groups, strict=True):
         label = str(row.get("tag_code") or "").strip()
         if not label:
             continue
@@ -319,19 +789,39 @@ def build_supervised_exports(
         validation_ratio=validation_ratio,
         min_validation_rows=min_validation_rows,
         min_test_rows=min_test_rows,
+        seed=split_seed,
     )
-
-    split_rows: dict[str, list[dict[str, Any]]] = {
-        "train": [],
-        "validation": [],
-        "test": [],
-    }
-    for row in deduped:
-        group = _resolve_group_id(row, group_field)
-        split = assignments.get(group, "train")
+    split_objective = None
+    if len(groups) >= 3:
+        ordered = sorted(groups, key=_group_bucket)
+        score = _assignment_score(
+            ordered,
+            tuple(assignments[group] for group in ordered),
+            dict(group_sizes),
+            group_labels,
+            all_labels,
+            _split_targets(len(deduped), train_ratio, validation_ratio),
+            max(1, min_validation_rows),
+            max(1, min_test_rows),
+        )
+        if score is not None:
+            split_objective = dict(
+                zip(
+                    (
+                        "holdout_shortfall",
+                        "train_labels_missing",
+                        "ratio_error_rows",
+                        "split_transitions",
+                    ),
+                    score,
+                    strict=False,
+                )
+            )
+
+    for row, group in zip(deduped, row_groups, strict=True):
         row["split_group_id"] = group
-        row["split"] = split
-        split_rows[split].append(row)
+        row["split"] = assignments.get(group, "train")
+    split_counts = Counter(row["split"] for row in deduped)
 
     out_metadata = dict(metadata) if isinstance(metadata, dict) else {}
     out_metadata["phase3_generated_at"] = _utc_now_iso()
@@ -340,31 +830,35 @@ def build_supervised_exports(
     out_metadata["split_group_field"] = group_field
 
     output_dataset.parent.mkdir(parents=True, exist_ok=True)
-    output_dataset.write_text(
-        json.dumps(
+    with output_dataset.open("w", encoding="utf-8") as handle:
+        json.dump(
             {
                 "metadata": out_metadata,
                 "amostras": deduped,
             },
+            handle,
             ensure_ascii=False,
             indent=2,
-        ),
-        encoding="utf-8",
-    )
-
-    train_jsonl.parent.mkdir(parents=True, exist_ok=True)
-    validation_jsonl.parent.mkdir(parents=True, exist_ok=True)
-    test_jsonl.parent.mkdir(parents=True, exist_ok=True)
+        )
 
-    for split, path in (
-        ("train", train_jsonl),
-        ("validation", validation_jsonl),
-        ("test", test_jsonl),
-    ):
-        content = "\n".join(
-            json.dumps(row, ensure_ascii=False) for row in split_rows[split]
+    writers = {
+        split: ShardedJsonlWriter(path, split_counts[split], shard_rows)
+        for split, path in (
+            ("train", train_jsonl),
+            ("validation", validation_jsonl),
+            ("test", test_jsonl),
         )
-        path.write_text((content + "\n") if content else "", encoding="utf-8")
+    }
+    train_labels: set[str] = set()
+    for row in deduped:
+        writers[row["split"]].write(row)
+        if row["split"] == "train":
+            label = str(row.get("tag_code") or "").strip()
+            if label:
+                train_labels.add(label)
+    split_files = {
+        split: writer.close() for split, writer in writers.items()
+    }
 
     summary = {
         "dataset": str(dataset_path),
@@ -372,29 +866,28 @@ def build_supervised_exports(
         "input_rows": len(rows),
         "filtered_supervised_rows": len(filtered),
         "deduped_supervised_rows": len(deduped),
-        "removed_duplicates": len(filtered) - len(deduped),
+        "removed_duplicates": (
+            len(filtered) - len(deduped) - near_duplicates_removed
+        ),
+        "near_dedupe_threshold": near_dedupe_threshold,
+        "removed_near_duplicates": near_duplicates_removed,
+        "merged_near_duplicate_groups": len(group_aliases),
         "group_field": group_field,
         "group_count": len(groups),
         "min_validation_rows": min_validation_rows,
         "min_test_rows": min_test_rows,
+        "split_solver": _split_solver_name(len(groups)),
+        "split_seed": split_seed,
+        "split_objective": split_objective,
         "split_counts": {
-            split: len(items) for split, items in split_rows.items()
+            split: split_counts[split] for split in SPLIT_NAMES
         },
+        "shard_rows": shard_rows,
+        "split_files": split_files,
         "train_label_coverage": {
-            "covered": len({
-                str(row.get("tag_code") or "").strip()
-                for row in split_rows["train"]
-                if str(row.get("tag_code") or "").strip()
-            }),
+            "covered": len(train_labels),
             "total": len(all_labels),
-            "missing_labels": sorted(
-                all_labels
-                - {
-                    str(row.get("tag_code") or "").strip()
-                    for row in split_rows["train"]
-                    if str(row.get("tag_code") or "").strip()
-                }
-            ),
+            "missing_labels": sorted(all_labels - train_labels),
         },
         "tag_counts": dict(Counter(row.get("tag_code") for row in deduped)),
     }
@@ -429,7 +922,7 @@ def _parse_args() -> argparse.Namespace:
         "--train-jsonl",
         type=Path,
         default=Path("train.jsonl"),
-        help="Train split JSONL path.",
+        help="Train split JSONL path (a .gz suffix compresses it).",
     )
     parser.add_argument(
         "--validation-jsonl",
@@ -482,6 +975,34 @@ def _parse_args() -> argparse.Namespace:
         default=1,
         help="Minimum target rows for test split when feasible.",
     )
+    parser.add_argument(
+        "--split-seed",
+        type=int,
+        default=0,
+        help=(
+            "Seed for the split solver used above "
+            f"{EXHAUSTIVE_MAX_GROUPS} groups."
+        ),
+    )
+    parser.add_argument(
+        "--near-dedupe-threshold",
+        type=float,
+        default=None,
+        help=(
+            "Enable near-duplicate dedupe: drop repeated annotations on "
+            "target texts at or above this estimated Jaccard similarity "
+            "(for example 0.8) and keep their split groups together."
+        ),
+    )
+    parser.add_argument(
+        "--shard-rows",
+        type=int,
+        default=0,
+        help=(
+            "Maximum rows per split shard (for example train-00000-of-"
+            "00008.jsonl.gz); 0 writes one file per split."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -503,6 +1024,9 @@ def main() -> int:
         group_field=args.group_field,
         min_validation_rows=max(1, args.min_validation_rows),
         min_test_rows=max(1, args.min_test_rows),
+        split_seed=args.split_seed,
+        shard_rows=max(0, args.shard_rows),
+        near_dedupe_threshold=args.near_dedupe_threshold,
     )
 
     print("Phase 3 export summary")
@@ -511,9 +1035,19 @@ def main() -> int:
     print(f"filtered_supervised_rows: {summary['filtered_supervised_rows']}")
     print(f"deduped_supervised_rows: {summary['deduped_supervised_rows']}")
     print(f"removed_duplicates: {summary['removed_duplicates']}")
+    if summary["near_dedupe_threshold"] is not None:
+        print(
+            "removed_near_duplicates: "
+            f"{summary['removed_near_duplicates']} "
+            f"(merged groups: {summary['merged_near_duplicate_groups']})"
+        )
     print(f"group_field: {summary['group_field']}")
     print(f"group_count: {summary['group_count']}")
+    print(f"split_solver: {summary['split_solver']}")
+    print(f"split_objective: {summary['split_objective']}")
     print(f"split_counts: {summary['split_counts']}")
+    for split, shards in summary["split_files"].items():
+        print(f"{split}_files: {len(shards)}")
 
     return 0
 
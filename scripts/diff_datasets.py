@@ -0,0 +1,341 @@
+"""Diff two dataset JSON files and carry review state onto a fresh parse.
+
+Samples are matched through a hash map, so the diff is linear in the number
+of rows. By default rows are matched on a content fingerprint (document,
+tag, target span and annotation context), which survives the renumbering
+of positional ``PAT_0001_TAG`` IDs and edits elsewhere in the paragraph;
+``--match id`` matches on the sample ID instead. Rows left unmatched are
+paired again without the tag, so a tag a reviewer corrected in VAEST does
+not lose the sample's review state. Carrying copies every field VAEST lets
+a reviewer edit. Both legacy (``dataset_raw.json``) and canonical v2
+(``dataset_curated.json``) rows are accepted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+from parser.paragraph_table import unpack_dataset
+from validator_app.review_journal import REVIEW_STATE_FIELDS
+
+MATCH_MODES = ("content", "id")
+
+# Fields a reviewer can change in VAEST, in both the legacy and the
+# canonical v2 layout.
+REVIEW_FIELDS = REVIEW_STATE_FIELDS + (
+    "tag_code",
+    "human_validated",
+    "reviewer_id",
+    "review_notes",
+    "history",
+)
+ID_FIELDS = ("id", "sample_id")
+
+
+def _text(value: Any) -> str:
+    if not isinstance(value, str):
+        return ""
+    return " ".join(value.split())
+
+
+def _first(row: dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        if row.get(key) is not None:
+            return row[key]
+    return None
+
+
+def sample_id(row: dict[str, Any]) -> str:
+    return str(_first(row, "sample_id", "id") or "")
+
+
+def _fingerprint(row: dict[str, Any], with_tag: bool) -> str:
+    diagnostics = row.get("diagnostics")
+    if not isinstance(diagnostics, dict):
+        diagnostics = {}
+    parts = [
+        _text(row.get("document_id")),
+        _text(_first(row, "target_span_text", "trecho_alvo")),
+        _text(
+            row.get("contexto_anotacao")
+            or diagnostics.get("contexto_anotacao")
+        ),
+    ]
+    if with_tag:
+        parts.insert(1, _text(_first(row, "tag_code", "tag")))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def sample_fingerprint(row: dict[str, Any]) -> str:
+    """Hash what a sample is, independent of its ID and review state.
+
+    The target paragraph is left out, so editing it elsewhere keeps the
+    fingerprints of its annotations; `_keyed` tells repeated spans apart
+    by their order of appearance.
+    """
+
+    return _fingerprint(row, with_tag=True)
+
+
+def span_fingerprint(row: dict[str, Any]) -> str:
+    """`sample_fingerprint` without the tag, which a reviewer can change."""
+
+    return _fingerprint(row, with_tag=False)
+
+
+def _keyed(
+    rows: list[dict[str, Any]],
+    indices: list[int],
+    key: Callable[[dict[str, Any]], str],
+) -> dict[tuple[str, int], int]:
+    """Key row indices by ``key`` plus an ordinal for exact repeats."""
+
+    seen: dict[str, int] = {}
+    keyed: dict[tuple[str, int], int] = {}
+    for index in indices:
+        base = key(rows[index])
+        seen[base] = seen.get(base, 0) + 1
+        keyed[(base, seen[base])] = index
+    return keyed
+
+
+def match_rows(
+    old_rows: list[dict[str, Any]],
+    new_rows: list[dict[str, Any]],
+    match: str = "content",
+) -> dict[int, int]:
+    """Return ``{new index: old index}`` for the rows that correspond.
+
+    With ``match="content"`` rows are paired on `sample_fingerprint`
+    first; rows left over are then paired on `span_fingerprint`, so a
+    sample whose tag a reviewer corrected still finds its fresh parse.
+    """
+
+    if match not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode: {match}")
+    keys = [sample_fingerprint, span_fingerprint]
+    if match == "id":
+        keys = [sample_id]
+    pairs: dict[int, int] = {}
+    old_left = list(range(len(old_rows)))
+    new_left = list(range(len(new_rows)))
+    for key in keys:
+        old_keyed = _keyed(old_rows, old_left, key)
+        for keyed, new_index in _keyed(new_rows, new_left, key).items():
+            if keyed in old_keyed:
+                pairs[new_index] = old_keyed[keyed]
+        matched_old = set(pairs.values())
+        old_left = [index for index in old_left if index not in matched_old]
+        new_left = [index for index in new_left if index not in pairs]
+    return pairs
+
+
+def _changed_fields(
+    old: dict[str, Any], new: dict[str, Any], match: str
+) -> dict[str, dict[str, Any]]:
+    # IDs are renumbered by design when matching on content; the pair's
+    # IDs are reported as id_antigo/id_novo instead.
+    ignored = REVIEW_FIELDS + (ID_FIELDS if match == "content" else ())
+    changed: dict[str, dict[str, Any]] = {}
+    for key in old.keys() | new.keys():
+        if key in ignored:
+            continue
+        if old.get(key) != new.get(key):
+            changed[key] = {"antes": old.get(key), "depois": new.get(key)}
+    return dict(sorted(changed.items()))
+
+
+def diff_datasets(
+    old_rows: list[dict[str, Any]],
+    new_rows: list[dict[str, Any]],
+    match: str = "content",
+) -> dict[str, Any]:
+    """Return the added, removed and changed samples between two datasets.
+
+    Review fields are ignored when comparing, so validating a sample does
+    not make it "changed".
+    """
+
+    pairs = match_rows(old_rows, new_rows, match)
+    matched_old = set(pairs.values())
+
+    added = [row for index, row in enumerate(new_rows) if index not in pairs]
+    removed = [
+        sample_id(row)
+        for index, row in enumerate(old_rows)
+        if index not in matched_old
+    ]
+    changed: list[dict[str, Any]] = []
+    unchanged = 0
+    for new_index, old_index in sorted(pairs.items()):
+        old, new = old_rows[old_index], new_rows[new_index]
+        fields = _changed_fields(old, new, match)
+        if not fields:
+            unchanged += 1
+            continue
+        changed.append(
+            {
+                "id_antigo": sample_id(old),
+                "id_novo": sample_id(new),
+                "campos": fields,
+            }
+        )
+    return {
+        "match": match,
+        "resumo": {
+            "antigas": len(old_rows),
+            "novas": len(new_rows),
+            "inalteradas": unchanged,
+            "alteradas": len(changed),
+            "adicionadas": len(added),
+            "removidas": len(removed),
+        },
+        "adicionadas": added,
+        "removidas": removed,
+        "alteradas": changed,
+    }
+
+
+def _was_reviewed(row: dict[str, Any]) -> bool:
+    return bool(
+        row.get("history")
+        or row.get("validado")
+        or row.get("human_validated")
+        or row.get("reviewer")
+        or row.get("reviewer_id")
+    )
+
+
+def carry_review_state(
+    old_rows: list[dict[str, Any]],
+    new_rows: list[dict[str, Any]],
+    match: str = "content",
+) -> tuple[list[dict[str, Any]], int]:
+    """Copy review fields from matched old rows onto copies of new rows.
+
+    Only old rows a reviewer touched (history, validation or reviewer)
+    pass their state on, including a corrected tag; other rows keep the
+    fresh parser output. Returns the new rows and how many of them
+    received review state.
+    """
+
+    pairs = match_rows(old_rows, new_rows, match)
+    carried = 0
+    result: list[dict[str, Any]] = []
+    for index, row in enumerate(new_rows):
+        row = dict(row)
+        old = old_rows[pairs[index]] if index in pairs else None
+        if old is not None and _was_reviewed(old):
+            row.update(
+                {field: old[field] for field in REVIEW_FIELDS if field in old}
+            )
+            carried += 1
+        result.append(row)
+    return result, carried
+
+
+def _read_dataset(path: Path) -> dict[str, Any]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload, dict) or not isinstance(
+        payload.get("amostras"), list
+    ):
+        raise ValueError(f"{path} has no 'amostras' list.")
+    return unpack_dataset(payload)
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Diff two dataset JSON files and optionally carry review state "
+            "from the old one onto the new one."
+        )
+    )
+    parser.add_argument(
+        "--old",
+        type=Path,
+        required=True,
+        help="Previous dataset (usually the reviewed one).",
+    )
+    parser.add_argument(
+        "--new",
+        type=Path,
+        required=True,
+        help="Fresh dataset, e.g. a new parser run.",
+    )
+    parser.add_argument(
+        "--match",
+        choices=MATCH_MODES,
+        default="content",
+        help="Match samples by content fingerprint (default) or by ID.",
+    )
+    parser.add_argument(
+        "--patch-json",
+        type=Path,
+        default=None,
+        help="Optional path to write the added/removed/changed patch.",
+    )
+    parser.add_argument(
+        "--carry-review-output",
+        type=Path,
+        default=None,
+        help=(
+            "Optional path to write the new dataset with validado/history/"
+            "reviewer carried over from matched old samples."
+        ),
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    for path in (args.old, args.new):
+        if not path.exists():
+            print(f"Dataset not found: {path}", file=sys.stderr)
+            return 2
+    try:
+        old_payload = _read_dataset(args.old)
+        new_payload = _read_dataset(args.new)
+    except (ValueError, json.JSONDecodeError) as exc:
+        print(f"Invalid dataset: {exc}", file=sys.stderr)
+        return 2
+
+    old_rows = old_payload["amostras"]
+    new_rows = new_payload["amostras"]
+    patch = diff_datasets(old_rows, new_rows, match=args.match)
+
+    print("Dataset diff summary")
+    print("-" * 20)
+    for key, value in patch["resumo"].items():
+        print(f"{key}: {value}")
+
+    if args.patch_json is not None:
+        _write_json(args.patch_json, patch)
+        print(f"patch: {args.patch_json}")
+
+    if args.carry_review_output is not None:
+        rows, carried = carry_review_state(
+            old_rows, new_rows, match=args.match
+        )
+        _write_json(
+            args.carry_review_output, {**new_payload, "amostras": rows}
+        )
+        print(f"review_state_carried: {carried}")
+        print(f"output: {args.carry_review_output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
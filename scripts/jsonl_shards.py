@@ -0,0 +1,248 @@
+"""Sharded, optionally gzip-compressed JSONL split files.
+
+`ShardedJsonlWriter` writes rows one at a time into shards of at most
+``shard_rows`` lines named after the requested path
+(``train.jsonl.gz`` -> ``train-00000-of-00004.jsonl.gz``) and reports each
+shard's row count and sha256. A path ending in ``.gz`` is compressed with a
+fixed gzip timestamp, so identical rows always hash the same.
+
+`read_jsonl_rows` is the matching reader: it accepts a plain or gzip file,
+a glob such as ``train-*.jsonl.gz``, or a path whose shards were written
+by the writer. `jsonl_parts` and `read_jsonl_range` split the same input
+into byte ranges for parallel readers.
+"""
+
+from __future__ import annotations
+
+import glob
+import gzip
+import hashlib
+import io
+import json
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+_GLOB_CHARS = set("*?[")
+
+
+def _split_suffix(path: Path) -> tuple[str, str]:
+    """Return ``(stem, suffix)`` with ``.jsonl``/``.gz`` kept together."""
+
+    name = path.name
+    for suffix in (".jsonl.gz", ".json.gz", ".jsonl", ".gz"):
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[: -len(suffix)], suffix
+    return path.stem, path.suffix
+
+
+def shard_path(path: Path, index: int, count: int) -> Path:
+    stem, suffix = _split_suffix(path)
+    return path.with_name(f"{stem}-{index:05d}-of-{count:05d}{suffix}")
+
+
+def shard_glob(path: Path) -> str:
+    """Return the glob matching every shard written for ``path``."""
+
+    stem, suffix = _split_suffix(path)
+    return str(path.with_name(f"{stem}-?????-of-?????{suffix}"))
+
+
+def resolve_jsonl_paths(path: Path | str) -> list[Path]:
+    """Return the files behind ``path`` in read order.
+
+    An existing file is returned as is; a glob expands to its sorted
+    matches; otherwise the shards written for ``path`` are looked up.
+    An empty list means nothing was found. A file that also has shards
+    next to it is ambiguous (one of them is left from an earlier export)
+    and raises ValueError.
+    """
+
+    path = Path(path)
+    if path.is_file():
+        if glob.glob(shard_glob(path)):
+            raise ValueError(
+                f"{path} and its shards ({shard_glob(path)}) both exist; "
+                "remove the stale export."
+            )
+        return [path]
+    if _GLOB_CHARS & set(str(path)):
+        return [Path(item) for item in sorted(glob.glob(str(path)))]
+    return [Path(item) for item in sorted(glob.glob(shard_glob(path)))]
+
+
+def is_gzip(path: Path) -> bool:
+    with path.open("rb") as probe:
+        return probe.read(2) == b"\x1f\x8b"
+
+
+def open_jsonl(path: Path) -> IO[str]:
+    """Open ``path`` for text reading, decompressing gzip files."""
+
+    if is_gzip(path):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def jsonl_parts(
+    path: Path | str, parts: int, min_bytes: int = 1 << 20
+) -> list[tuple[Path, int, int | None]]:
+    """Cut the files behind ``path`` into ``(file, start, end)`` parts.
+
+    Plain files are cut into about ``parts`` byte ranges of at least
+    ``min_bytes`` (pass them to `read_jsonl_range`); gzip files cannot be
+    entered mid-stream and stay whole, with ``end`` None.
+    """
+
+    files = resolve_jsonl_paths(path)
+    plain = [item for item in files if not is_gzip(item)]
+    total = sum(item.stat().st_size for item in plain)
+    step = max(min_bytes, -(-total // max(1, parts)))
+    ranges: list[tuple[Path, int, int | None]] = []
+    for item in files:
+        if item not in plain:
+            ranges.append((item, 0, None))
+            continue
+        size = item.stat().st_size
+        ranges.extend(
+            (item, start, min(start + step, size))
+            for start in range(0, max(size, 1), step)
+        )
+    return ranges
+
+
+def read_jsonl_range(
+    path: Path, start: int = 0, end: int | None = None
+) -> Iterator[tuple[int, Any]]:
+    """Yield ``(byte_offset, row)`` for lines starting in ``[start, end)``.
+
+    A range starting mid-line skips to the next line, which the previous
+    range owns, so adjacent ranges read every line exactly once. With
+    ``end`` None the whole file (plain or gzip) is read.
+    """
+
+    if end is None:
+        for line_number, row in read_jsonl_rows(path):
+            yield line_number, row
+        return
+    with path.open("rb") as handle:
+        position = start
+        if start > 0:
+            handle.seek(start - 1)
+            position = start - 1 + len(handle.readline())
+        while position < end:
+            line = handle.readline()
+            if not line:
+                break
+            offset = position
+            position += len(line)
+            stripped = line.strip()
+            if stripped:
+                yield offset, json.loads(stripped.decode("utf-8"))
+
+
+def read_jsonl_rows(path: Path | str) -> Iterator[tuple[int, Any]]:
+    """Yield ``(line_number, row)`` for every non-blank line.
+
+    Line numbers continue across shards, so they stay unique per split.
+    """
+
+    line_number = 0
+    for item in resolve_jsonl_paths(path):
+        with open_jsonl(item) as handle:
+            for line in handle:
+                line_number += 1
+                stripped = line.strip()
+                if stripped:
+                    yield line_number, json.loads(stripped)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ShardedJsonlWriter:
+    """Write JSONL rows into size-capped, optionally gzipped shards.
+
+    ``total_rows`` fixes the shard count up front so names can carry it;
+    ``shard_rows=0`` writes a single file at ``path`` itself.
+    """
+
+    def __init__(
+        self, path: Path, total_rows: int, shard_rows: int = 0
+    ) -> None:
+        self.path = path
+        self.compress = path.name.endswith(".gz")
+        self.shard_rows = shard_rows if shard_rows > 0 else 0
+        if self.shard_rows:
+            self.shard_count = max(1, -(-total_rows // self.shard_rows))
+        else:
+            self.shard_count = 1
+        self.shards: list[dict[str, Any]] = []
+        self._handle: IO[str] | None = None
+        self._raw: IO[bytes] | None = None
+        self._rows_in_shard = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Drop what an earlier export with another layout left behind, so
+        # readers never see both.
+        for stale in resolve_jsonl_paths(shard_glob(path)):
+            stale.unlink()
+        if self.shard_rows:
+            path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ShardedJsonlWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _shard_path(self, index: int) -> Path:
+        if not self.shard_rows:
+            return self.path
+        return shard_path(self.path, index, self.shard_count)
+
+    def _open_next(self) -> None:
+        self._close_current()
+        path = self._shard_path(len(self.shards))
+        self._raw = path.open("wb")
+        stream: IO[bytes] = self._raw
+        if self.compress:
+            stream = gzip.GzipFile(
+                filename="", mode="wb", fileobj=self._raw, mtime=0
+            )
+        self._handle = io.TextIOWrapper(stream, encoding="utf-8")
+        self._rows_in_shard = 0
+        self.shards.append({"path": str(path), "rows": 0, "sha256": None})
+
+    def _close_current(self) -> None:
+        if self._handle is None:
+            return
+        self._handle.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+        shard = self.shards[-1]
+        shard["rows"] = self._rows_in_shard
+        shard["sha256"] = file_sha256(Path(shard["path"]))
+        self._handle = None
+        self._raw = None
+
+    def write(self, row: dict[str, Any]) -> None:
+        if self._handle is None or (
+            self.shard_rows and self._rows_in_shard >= self.shard_rows
+        ):
+            self._open_next()
+        assert self._handle is not None
+        self._handle.write(json.dumps(row, ensure_ascii=False))
+        self._handle.write("\n")
+        self._rows_in_shard += 1
+
+    def close(self) -> list[dict[str, Any]]:
+        """Finish the open shard and pad out empty ones; return shards."""
+
+        while len(self.shards) < self.shard_count:
+            self._open_next()
+        self._close_current()
+        return self.shards
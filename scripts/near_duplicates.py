@@ -0,0 +1,230 @@
+"""Near-duplicate text clusters with MinHash signatures and LSH banding.
+
+Texts are lowercased, whitespace-collapsed and cut into character
+shingles. Each text gets a MinHash signature built with one-permutation
+hashing: every shingle is hashed once (CRC-32, seeded, so signatures are
+stable across processes) and the hash range is split into
+``num_perm`` bins, each keeping its minimum (empty bins borrow from the
+next filled bin). The share of equal bins between two signatures estimates
+the Jaccard similarity of their shingle sets.
+
+Signatures are cut into LSH bands; texts sharing any band are candidates,
+so a lookup touches only the buckets of its own bands instead of every
+earlier text. Candidates at or above the threshold are merged into
+clusters (union-find), and identical normalized texts are merged before
+any hashing.
+"""
+
+from __future__ import annotations
+
+import zlib
+from array import array
+from typing import Hashable, Iterable, Sequence
+
+DEFAULT_THRESHOLD = 0.80
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5
+
+_HASH_BITS = 32
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
+
+def shingle_hashes(
+    text: str, size: int = DEFAULT_SHINGLE_SIZE, seed: int = 0
+) -> set[int]:
+    """Return 32-bit hashes of the character ``size``-grams of ``text``."""
+
+    normalized = normalize_text(text)
+    if not normalized:
+        return set()
+    # UTF-32 gives every character four bytes, so shingles are fixed-width
+    # byte slices and need no per-shingle encoding.
+    encoded = normalized.encode("utf-32-le")
+    width = 4 * min(size, len(normalized))
+    crc32 = zlib.crc32
+    return {
+        crc32(encoded[start : start + width], seed)
+        for start in range(0, len(encoded) - width + 1, 4)
+    }
+
+
+def minhash_signature(
+    text: str,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    seed: int = 0,
+) -> tuple[int, ...]:
+    """Return the one-permutation MinHash signature of ``text``."""
+
+    bins: list[int | None] = [None] * num_perm
+    # Descending order leaves each bin holding its smallest hash.
+    for value in sorted(
+        shingle_hashes(text, shingle_size, seed), reverse=True
+    ):
+        bins[(value * num_perm) >> _HASH_BITS] = value
+    if all(value is None for value in bins):
+        return tuple([0] * num_perm)
+
+    signature: list[int] = []
+    for index, value in enumerate(bins):
+        if value is not None:
+            signature.append(value)
+            continue
+        # Densify: borrow the next filled bin to the right (wrapping) and
+        # tag it with the distance, so borrowed values only match texts
+        # with the same gap.
+        distance = 1
+        while bins[(index + distance) % num_perm] is None:
+            distance += 1
+        borrowed = bins[(index + distance) % num_perm]
+        assert borrowed is not None
+        signature.append(borrowed + (distance << _HASH_BITS))
+    return tuple(signature)
+
+
+def estimated_similarity(
+    first: Sequence[int], second: Sequence[int]
+) -> float:
+    if not first:
+        return 0.0
+    same = sum(1 for left, right in zip(first, second) if left == right)
+    return same / len(first)
+
+
+def lsh_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """Return ``(bands, rows)`` whose S-curve midpoint is near threshold.
+
+    The midpoint ``(1 / bands) ** (1 / rows)`` is kept at or below the
+    threshold so pairs just above it are still likely to collide.
+    """
+
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash/LSH index that clusters near-duplicate texts."""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 0,
+    ) -> None:
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+        self._keys: list[Hashable] = []
+        self._parent: list[int] = []
+        self._by_text: dict[str, int] = {}
+        # Signatures are stored as 64-bit arrays and bands as their hash,
+        # which keeps per-text memory near 1 KB.
+        self._signatures: list[array | None] = []
+        self._buckets: list[dict[int, list[int]]] = [
+            {} for _ in range(self.bands)
+        ]
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _find(self, item: int) -> int:
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def _union(self, first: int, second: int) -> None:
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            self._parent[max(first, second)] = min(first, second)
+
+    def _new_item(self, key: Hashable) -> int:
+        item = len(self._keys)
+        self._keys.append(key)
+        self._parent.append(item)
+        self._signatures.append(None)
+        return item
+
+    def add(self, key: Hashable, text: str) -> None:
+        item = self._new_item(key)
+        normalized = normalize_text(text)
+        if not normalized:
+            return
+        original = self._by_text.get(normalized)
+        if original is not None:
+            self._union(original, item)
+            return
+        self._by_text[normalized] = item
+        self._insert(
+            item,
+            minhash_signature(
+                normalized, self.num_perm, self.shingle_size, self.seed
+            ),
+        )
+
+    def add_signature(self, key: Hashable, signature: Sequence[int]) -> None:
+        """Add a text by its precomputed `minhash_signature`.
+
+        Identical texts are not merged here; callers pass each text once.
+        """
+
+        self._insert(self._new_item(key), signature)
+
+    def _insert(self, item: int, signature: Sequence[int]) -> None:
+        packed = signature
+        if not isinstance(packed, array):
+            packed = array("Q", signature)
+        self._signatures[item] = packed
+        checked: set[int] = set()
+        for band, buckets in enumerate(self._buckets):
+            start = band * self.rows
+            bucket = buckets.setdefault(
+                hash(tuple(packed[start : start + self.rows])), []
+            )
+            for other in bucket:
+                if other in checked or self._find(other) == self._find(item):
+                    continue
+                checked.add(other)
+                self.comparisons += 1
+                other_signature = self._signatures[other]
+                assert other_signature is not None
+                similarity = estimated_similarity(packed, other_signature)
+                if similarity >= self.threshold:
+                    self._union(other, item)
+            bucket.append(item)
+
+    def clusters(self, min_size: int = 2) -> list[list[Hashable]]:
+        """Return clusters of ``min_size`` or more keys, in insertion order."""
+
+        grouped: dict[int, list[Hashable]] = {}
+        for item, key in enumerate(self._keys):
+            grouped.setdefault(self._find(item), []).append(key)
+        return [keys for keys in grouped.values() if len(keys) >= min_size]
+
+
+def near_duplicate_clusters(
+    items: Iterable[tuple[Hashable, str]],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+) -> list[list[Hashable]]:
+    """Cluster ``(key, text)`` items whose texts are near duplicates."""
+
+    index = NearDuplicateIndex(threshold, num_perm, shingle_size)
+    for key, text in items:
+        index.add(key, text)
+    return index.clusters()
@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from parser.paragraph_table import unpack_dataset
+
 from .validate_training_dataset import IN_SCOPE_TAGS, OUT_OF_SCOPE_TAGS
 
 AUTOMATIC_SCOPE = "automatic"
@@ -111,6 +113,7 @@ def canonicalize_dataset_samples(
 ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
     if not isinstance(payload, dict):
         raise ValueError("Dataset payload must be a JSON object.")
+    payload = unpack_dataset(payload)
 
     metadata = payload.get("metadata")
     if not isinstance(metadata, dict):
@@ -228,8 +231,13 @@ def canonicalize_dataset_samples(
             "diagnostics": diagnostics,
         }
 
-        target_span_start = _as_int_or_none(row.get("target_span_start"))
-        target_span_end = _as_int_or_none(row.get("target_span_end"))
+        # Parser rows carry the span offsets computed by the lexer.
+        target_span_start = _as_int_or_none(
+            row.get("target_span_start", row.get("trecho_alvo_inicio"))
+        )
+        target_span_end = _as_int_or_none(
+            row.get("target_span_end", row.get("trecho_alvo_fim"))
+        )
         source_span_start = _as_int_or_none(row.get("source_span_start"))
         source_span_end = _as_int_or_none(row.get("source_span_end"))
         source_span_text = _nullable_str(
@@ -24,6 +24,8 @@ from sklearn.model_selection import KFold
 from sklearn.model_selection import StratifiedKFold
 from sklearn.pipeline import Pipeline
 
+from .jsonl_shards import read_jsonl_rows
+
 
 @dataclass
 class SampleRecord:
@@ -115,39 +117,31 @@ def _compose_feature_text(row: dict[str, Any]) -> str:
 
 
 def _read_jsonl_samples(path: Path, split: str) -> list[SampleRecord]:
-    if not path.exists():
-        return []
-
     records: list[SampleRecord] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line_number, line in enumerate(handle, start=1):
-            stripped = line.strip()
-            if not stripped:
-                continue
-            item = json.loads(stripped)
-            if not isinstance(item, dict):
-                continue
-
-            label = str(item.get("tag_code") or item.get("tag") or "").strip()
-            if not label:
-                continue
-
-            sample_id = str(
-                item.get("sample_id")
-                or item.get("id")
-                or f"{split}_{line_number}"
-            ).strip()
-            if not sample_id:
-                sample_id = f"{split}_{line_number}"
-
-            records.append(
-                SampleRecord(
-                    sample_id=sample_id,
-                    label=label,
-                    text=_compose_feature_text(item),
-                    split=split,
-                )
+    for line_number, item in read_jsonl_rows(path):
+        if not isinstance(item, dict):
+            continue
+
+        label = str(item.get("tag_code") or item.get("tag") or "").strip()
+        if not label:
+            continue
+
+        sample_id = str(
+            item.get("sample_id")
+            or item.get("id")
+            or f"{split}_{line_number}"
+        ).strip()
+        if not sample_id:
+            sample_id = f"{split}_{line_number}"
+
+        records.append(
+            SampleRecord(
+                sample_id=sample_id,
+                label=label,
+                text=_compose_feature_text(item),
+                split=split,
             )
+        )
 
     return records
 
@@ -804,19 +798,19 @@ def _parse_args() -> argparse.Namespace:
         "--train-jsonl",
         type=Path,
         default=None,
-        help="Train split JSONL path.",
+        help="Train split JSONL path (plain, .gz or shard glob).",
     )
     parser.add_argument(
         "--validation-jsonl",
         type=Path,
         default=None,
-        help="Validation split JSONL path.",
+        help="Validation split JSONL path (plain, .gz or shard glob).",
     )
     parser.add_argument(
         "--test-jsonl",
         type=Path,
         default=None,
-        help="Test split JSONL path.",
+        help="Test split JSONL path (plain, .gz or shard glob).",
     )
     parser.add_argument(
         "--release-manifest",
@@ -1,20 +1,43 @@
 """Dataset quality gate for NET_TMA training data specification v2.
 
 This script enforces the hard gates defined in docs/training_data_spec_v2.md.
-It validates a dataset JSON file and returns a non-zero exit code on failure.
+It validates a dataset JSON file (or a JSONL file, gzip file or shard glob
+with one sample per line) and returns a non-zero exit code on failure.
+
+Each gate is a `GateAccumulator` that sees every sample once; `GateSuite`
+runs them all in a single pass and merges suites built over separate parts
+of the input.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import re
 import sys
+from array import array
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from parser.paragraph_table import unpack_dataset
+
+from .jsonl_shards import (
+    jsonl_parts,
+    read_jsonl_range,
+    read_jsonl_rows,
+    resolve_jsonl_paths,
+)
+from .near_duplicates import (
+    DEFAULT_THRESHOLD,
+    NearDuplicateIndex,
+    minhash_signature,
+    normalize_text,
+)
 
 IN_SCOPE_TAGS = {
     "RF+",
@@ -142,10 +165,101 @@ def _read_json(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def _canonicalize_samples(
-    dataset_path: Path,
-) -> tuple[dict[str, Any], list[CanonicalSample]]:
+def _canonical_sample(
+    item: dict[str, Any], index: int, default_document: str
+) -> CanonicalSample:
+    tag_code = str(item.get("tag_code") or item.get("tag") or "").strip()
+    label_scope = item.get("label_scope")
+
+    document_id = str(item.get("document_id") or default_document).strip()
+    split_group_id = str(
+        item.get("split_group_id") or document_id or default_document
+    ).strip()
+
+    return CanonicalSample(
+        sample_id=str(
+            item.get("sample_id") or item.get("id") or f"row_{index}"
+        ).strip(),
+        document_id=document_id,
+        split_group_id=split_group_id,
+        tag_code=tag_code,
+        label_scope=(
+            str(label_scope).strip()
+            if label_scope is not None
+            else None
+        ),
+        target_paragraph_id=str(
+            item.get("target_paragraph_id")
+            or item.get("paragrafo_alvo_id")
+            or ""
+        ).strip(),
+        target_text=str(
+            item.get("target_text")
+            or item.get("texto_paragrafo_alvo")
+            or ""
+        ),
+        target_span_text=str(
+            item.get("target_span_text") or item.get("trecho_alvo") or ""
+        ),
+        target_span_start=_int_or_none(item.get("target_span_start")),
+        target_span_end=_int_or_none(item.get("target_span_end")),
+        source_paragraph_ids=_ensure_list_of_str(
+            item.get("source_paragraph_ids")
+            or item.get("paragrafo_fonte_ids")
+        ),
+        source_text=str(
+            item.get("source_text")
+            or item.get("texto_paragrafo_fonte")
+            or ""
+        ),
+        alignment_confidence=_as_float_confidence(
+            item.get("alignment_confidence")
+            if item.get("alignment_confidence") is not None
+            else item.get("fonte_alinhamento_confiavel")
+        ),
+        human_validated=_as_bool(
+            item.get("human_validated")
+            if item.get("human_validated") is not None
+            else item.get("validado")
+        ),
+        split=(
+            str(item.get("split")).strip()
+            if item.get("split") is not None
+            else None
+        ),
+    )
+
+
+def _is_jsonl_input(dataset_path: Path) -> bool:
+    return dataset_path.name.endswith((".jsonl", ".jsonl.gz")) or bool(
+        set("*?[") & set(str(dataset_path))
+    )
+
+
+def dataset_exists(dataset_path: Path) -> bool:
+    if _is_jsonl_input(dataset_path):
+        return bool(resolve_jsonl_paths(dataset_path))
+    return dataset_path.exists()
+
+
+def iter_dataset_samples(dataset_path: Path) -> Iterator[CanonicalSample]:
+    """Yield the dataset's samples one at a time.
+
+    A ``.jsonl``/``.jsonl.gz`` path or shard glob is read line by line
+    (one sample per line, as written by ``parser.cli --stream``); any
+    other path is read as a dataset JSON document with ``amostras``.
+    """
+
+    if _is_jsonl_input(dataset_path):
+        default_document = dataset_path.name.split(".")[0]
+        for index, item in read_jsonl_rows(dataset_path):
+            if isinstance(item, dict):
+                yield _canonical_sample(item, index - 1, default_document)
+        return
+
     payload = _read_json(dataset_path)
+    if isinstance(payload, dict):
+        payload = unpack_dataset(payload)
     metadata = payload.get("metadata", {}) if isinstance(payload, dict) else {}
     raw_samples = (
         payload.get("amostras", []) if isinstance(payload, dict) else []
@@ -156,211 +270,201 @@ def _canonicalize_samples(
         or metadata.get("projeto")
         or dataset_path.stem
     )
-
-    samples: list[CanonicalSample] = []
     for index, item in enumerate(raw_samples):
-        if not isinstance(item, dict):
-            continue
-
-        tag_code = str(item.get("tag_code") or item.get("tag") or "").strip()
-        label_scope = item.get("label_scope")
-
-        document_id = str(item.get("document_id") or default_document).strip()
-        split_group_id = str(
-            item.get("split_group_id") or document_id or default_document
-        ).strip()
-
-        sample = CanonicalSample(
-            sample_id=str(
-                item.get("sample_id") or item.get("id") or f"row_{index}"
-            ).strip(),
-            document_id=document_id,
-            split_group_id=split_group_id,
-            tag_code=tag_code,
-            label_scope=(
-                str(label_scope).strip()
-                if label_scope is not None
-                else None
-            ),
-            target_paragraph_id=str(
-                item.get("target_paragraph_id")
-                or item.get("paragrafo_alvo_id")
-                or ""
-            ).strip(),
-            target_text=str(
-                item.get("target_text")
-                or item.get("texto_paragrafo_alvo")
-                or ""
-            ),
-            target_span_text=str(
-                item.get("target_span_text") or item.get("trecho_alvo") or ""
-            ),
-            target_span_start=_int_or_none(item.get("target_span_start")),
-            target_span_end=_int_or_none(item.get("target_span_end")),
-            source_paragraph_ids=_ensure_list_of_str(
-                item.get("source_paragraph_ids")
-                or item.get("paragrafo_fonte_ids")
-            ),
-            source_text=str(
-                item.get("source_text")
-                or item.get("texto_paragrafo_fonte")
-                or ""
-            ),
-            alignment_confidence=_as_float_confidence(
-                item.get("alignment_confidence")
-                if item.get("alignment_confidence") is not None
-                else item.get("fonte_alinhamento_confiavel")
-            ),
-            human_validated=_as_bool(
-                item.get("human_validated")
-                if item.get("human_validated") is not None
-                else item.get("validado")
-            ),
-            split=(
-                str(item.get("split")).strip()
-                if item.get("split") is not None
-                else None
-            ),
-        )
-        samples.append(sample)
+        if isinstance(item, dict):
+            yield _canonical_sample(item, index, default_document)
 
-    return metadata, samples
 
+def _iter_part_samples(
+    part: tuple[Path, int, int | None], default_document: str
+) -> Iterator[CanonicalSample]:
+    path, start, end = part
+    for index, item in read_jsonl_range(path, start, end):
+        if isinstance(item, dict):
+            yield _canonical_sample(item, index, default_document)
 
-def _gate_source_grounding(
-    samples: list[CanonicalSample],
-    min_coverage: float,
-) -> GateResult:
-    eligible = [sample for sample in samples if sample.in_scope]
-    if not eligible:
-        return GateResult(
-            name="source_grounding_coverage",
-            passed=False,
-            observed="0/0",
-            threshold=f">={min_coverage:.2f}",
-            details="No in-scope samples were found.",
-        )
 
-    grounded = [
-        sample
-        for sample in eligible
-        if sample.source_paragraph_ids and _is_non_empty(sample.source_text)
-    ]
-    coverage = len(grounded) / len(eligible)
-    return GateResult(
-        name="source_grounding_coverage",
-        passed=coverage >= min_coverage,
-        observed=f"{coverage:.3f} ({len(grounded)}/{len(eligible)})",
-        threshold=f">={min_coverage:.2f}",
-        details="Share of in-scope rows with source ids and source text.",
-    )
+class GateAccumulator:
+    """One quality gate evaluated over a stream of samples.
 
+    `update` sees each sample once, `merge` folds in the state of the same
+    gate run over another part of the input, and `result` turns the state
+    into a `GateResult`. State grows with distinct keys, not with rows.
+    """
 
-def _gate_confident_or_validated(
-    samples: list[CanonicalSample],
-    min_coverage: float,
-) -> GateResult:
-    eligible = [sample for sample in samples if sample.in_scope]
-    if not eligible:
-        return GateResult(
-            name="confident_or_validated_coverage",
-            passed=False,
-            observed="0/0",
-            threshold=f">={min_coverage:.2f}",
-            details="No in-scope samples were found.",
-        )
+    def update(self, sample: CanonicalSample) -> None:
+        pass
 
-    accepted = [
-        sample
-        for sample in eligible
-        if sample.alignment_confidence >= 0.80 or sample.human_validated
-    ]
-    coverage = len(accepted) / len(eligible)
-    return GateResult(
-        name="confident_or_validated_coverage",
-        passed=coverage >= min_coverage,
-        observed=f"{coverage:.3f} ({len(accepted)}/{len(eligible)})",
-        threshold=f">={min_coverage:.2f}",
-        details="Rows with confidence >= 0.80 or explicit human validation.",
-    )
+    def merge(self, other: GateAccumulator) -> None:
+        pass
 
+    def result(self) -> GateResult:
+        raise NotImplementedError
 
-def _gate_out_of_scope_labels(
-    samples: list[CanonicalSample],
-    expect_supervised_export: bool,
-) -> GateResult:
-    out_of_scope = [
-        sample
-        for sample in samples
-        if sample.tag_code in OUT_OF_SCOPE_TAGS
-        and sample.label_scope != "diagnostic"
-    ]
-    if not expect_supervised_export:
+
+class _CoverageGate(GateAccumulator):
+    """Share of in-scope rows accepted by `accepts`."""
+
+    name = ""
+    details = ""
+
+    def __init__(self, min_coverage: float) -> None:
+        self.min_coverage = min_coverage
+        self.eligible = 0
+        self.accepted = 0
+
+    def accepts(self, sample: CanonicalSample) -> bool:
+        raise NotImplementedError
+
+    def update(self, sample: CanonicalSample) -> None:
+        if sample.in_scope:
+            self.eligible += 1
+            if self.accepts(sample):
+                self.accepted += 1
+
+    def merge(self, other: GateAccumulator) -> None:
+        assert isinstance(other, _CoverageGate)
+        self.eligible += other.eligible
+        self.accepted += other.accepted
+
+    def result(self) -> GateResult:
+        if not self.eligible:
+            return GateResult(
+                name=self.name,
+                passed=False,
+                observed="0/0",
+                threshold=f">={self.min_coverage:.2f}",
+                details="No in-scope samples were found.",
+            )
+        coverage = self.accepted / self.eligible
         return GateResult(
-            name="out_of_scope_labels",
-            passed=True,
-            observed=f"{len(out_of_scope)}",
-            threshold="informational",
-            details=(
-                "Check skipped because supervised export was not required."
-            ),
+            name=self.name,
+            passed=coverage >= self.min_coverage,
+            observed=f"{coverage:.3f} ({self.accepted}/{self.eligible})",
+            threshold=f">={self.min_coverage:.2f}",
+            details=self.details,
         )
 
-    return GateResult(
-        name="out_of_scope_labels",
-        passed=len(out_of_scope) == 0,
-        observed=str(len(out_of_scope)),
-        threshold="==0",
-        details="OM+ and PRO+ must not appear in supervised export files.",
-    )
 
+class _SourceGroundingGate(_CoverageGate):
+    name = "source_grounding_coverage"
+    details = "Share of in-scope rows with source ids and source text."
 
-def _gate_parse_coverage(
-    samples: list[CanonicalSample],
-    min_coverage: float,
-    target_markdown: Path | None,
-) -> GateResult:
-    if target_markdown is None:
-        return GateResult(
-            name="parse_coverage",
-            passed=False,
-            observed="n/a",
-            threshold=f">={min_coverage:.2f}",
-            details="Missing --target-markdown input.",
+    def accepts(self, sample: CanonicalSample) -> bool:
+        return bool(sample.source_paragraph_ids) and _is_non_empty(
+            sample.source_text
         )
-    if not target_markdown.exists():
+
+
+class _ConfidentOrValidatedGate(_CoverageGate):
+    name = "confident_or_validated_coverage"
+    details = "Rows with confidence >= 0.80 or explicit human validation."
+
+    def accepts(self, sample: CanonicalSample) -> bool:
+        return sample.alignment_confidence >= 0.80 or sample.human_validated
+
+
+class _OutOfScopeLabelsGate(GateAccumulator):
+    def __init__(self, expect_supervised_export: bool) -> None:
+        self.expect_supervised_export = expect_supervised_export
+        self.out_of_scope = 0
+
+    def update(self, sample: CanonicalSample) -> None:
+        if (
+            sample.tag_code in OUT_OF_SCOPE_TAGS
+            and sample.label_scope != "diagnostic"
+        ):
+            self.out_of_scope += 1
+
+    def merge(self, other: GateAccumulator) -> None:
+        assert isinstance(other, _OutOfScopeLabelsGate)
+        self.out_of_scope += other.out_of_scope
+
+    def result(self) -> GateResult:
+        if not self.expect_supervised_export:
+            return GateResult(
+                name="out_of_scope_labels",
+                passed=True,
+                observed=f"{self.out_of_scope}",
+                threshold="informational",
+                details=(
+                    "Check skipped because supervised export was not "
+                    "required."
+                ),
+            )
+
         return GateResult(
-            name="parse_coverage",
-            passed=False,
-            observed="n/a",
-            threshold=f">={min_coverage:.2f}",
-            details=f"Target markdown file was not found: {target_markdown}",
+            name="out_of_scope_labels",
+            passed=self.out_of_scope == 0,
+            observed=str(self.out_of_scope),
+            threshold="==0",
+            details="OM+ and PRO+ must not appear in supervised export files.",
         )
 
-    content = target_markdown.read_text(encoding="utf-8")
-    observed_markers = len(TAG_MARKER_RE.findall(content))
-    parsed_samples = len([sample for sample in samples if sample.tag_code])
 
-    if observed_markers <= 0:
+class _ParseCoverageGate(GateAccumulator):
+    def __init__(
+        self, min_coverage: float, target_markdown: Path | None
+    ) -> None:
+        self.min_coverage = min_coverage
+        self.target_markdown = target_markdown
+        self.parsed_samples = 0
+
+    def update(self, sample: CanonicalSample) -> None:
+        if sample.tag_code:
+            self.parsed_samples += 1
+
+    def merge(self, other: GateAccumulator) -> None:
+        assert isinstance(other, _ParseCoverageGate)
+        self.parsed_samples += other.parsed_samples
+
+    def result(self) -> GateResult:
+        min_coverage = self.min_coverage
+        target_markdown = self.target_markdown
+        if target_markdown is None:
+            return GateResult(
+                name="parse_coverage",
+                passed=False,
+                observed="n/a",
+                threshold=f">={min_coverage:.2f}",
+                details="Missing --target-markdown input.",
+            )
+        if not target_markdown.exists():
+            return GateResult(
+                name="parse_coverage",
+                passed=False,
+                observed="n/a",
+                threshold=f">={min_coverage:.2f}",
+                details=(
+                    f"Target markdown file was not found: {target_markdown}"
+                ),
+            )
+
+        content = target_markdown.read_text(encoding="utf-8")
+        observed_markers = len(TAG_MARKER_RE.findall(content))
+
+        if observed_markers <= 0:
+            return GateResult(
+                name="parse_coverage",
+                passed=False,
+                observed="0 observed markers",
+                threshold=f">={min_coverage:.2f}",
+                details="No tag markers were found in target markdown.",
+            )
+
+        coverage = self.parsed_samples / observed_markers
         return GateResult(
             name="parse_coverage",
-            passed=False,
-            observed="0 observed markers",
+            passed=coverage >= min_coverage,
+            observed=(
+                f"{coverage:.3f} ({self.parsed_samples}/{observed_markers})"
+            ),
             threshold=f">={min_coverage:.2f}",
-            details="No tag markers were found in target markdown.",
+            details=(
+                "Parsed rows divided by observed tag markers in target text."
+            ),
         )
 
-    coverage = parsed_samples / observed_markers
-    return GateResult(
-        name="parse_coverage",
-        passed=coverage >= min_coverage,
-        observed=(
-            f"{coverage:.3f} ({parsed_samples}/{observed_markers})"
-        ),
-        threshold=f">={min_coverage:.2f}",
-        details="Parsed rows divided by observed tag markers in target text.",
-    )
-
 
 def _dedupe_key(
     sample: CanonicalSample,
@@ -384,199 +488,468 @@ def _dedupe_key(
     )
 
 
-def _gate_duplicate_keys(samples: list[CanonicalSample]) -> GateResult:
-    eligible = [sample for sample in samples if sample.in_scope]
-    keys = [_dedupe_key(sample) for sample in eligible]
-    counter = Counter(keys)
-    duplicate_count = sum(count - 1 for count in counter.values() if count > 1)
-    return GateResult(
-        name="duplicate_supervised_keys",
-        passed=duplicate_count == 0,
-        observed=str(duplicate_count),
-        threshold="==0",
-        details=(
-            "Key: document_id + target_paragraph_id + target_span + tag_code."
-        ),
-    )
+class _DuplicateKeysGate(GateAccumulator):
+    """Counts per `_dedupe_key`, stored as 16-byte digests."""
+
+    def __init__(self) -> None:
+        self.keys: Counter[bytes] = Counter()
+
+    def update(self, sample: CanonicalSample) -> None:
+        if sample.in_scope:
+            key = "\x1f".join(str(part) for part in _dedupe_key(sample))
+            digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16)
+            self.keys[digest.digest()] += 1
+
+    def merge(self, other: GateAccumulator) -> None:
+        assert isinstance(other, _DuplicateKeysGate)
+        self.keys.update(other.keys)
+
+    def result(self) -> GateResult:
+        duplicate_count = sum(
+            count - 1 for count in self.keys.values() if count > 1
+        )
+        return GateResult(
+            name="duplicate_supervised_keys",
+            passed=duplicate_count == 0,
+            observed=str(duplicate_count),
+            threshold="==0",
+            details=(
+                "Key: document_id + target_paragraph_id + target_span + "
+                "tag_code."
+            ),
+        )
 
 
-def _gate_critical_fields(samples: list[CanonicalSample]) -> GateResult:
-    eligible = [sample for sample in samples if sample.in_scope]
-    if not eligible:
+_CRITICAL_TEXT_FIELDS = (
+    "sample_id",
+    "document_id",
+    "split_group_id",
+    "tag_code",
+    "target_paragraph_id",
+    "target_text",
+    "target_span_text",
+    "source_text",
+)
+
+
+class _CriticalFieldsGate(GateAccumulator):
+    def __init__(self) -> None:
+        self.eligible = 0
+        self.rows_with_missing = 0
+
+    def update(self, sample: CanonicalSample) -> None:
+        if not sample.in_scope:
+            return
+        self.eligible += 1
+        if not sample.source_paragraph_ids or not all(
+            _is_non_empty(getattr(sample, field))
+            for field in _CRITICAL_TEXT_FIELDS
+        ):
+            self.rows_with_missing += 1
+
+    def merge(self, other: GateAccumulator) -> None:
+        assert isinstance(other, _CriticalFieldsGate)
+        self.eligible += other.eligible
+        self.rows_with_missing += other.rows_with_missing
+
+    def result(self) -> GateResult:
+        if not self.eligible:
+            return GateResult(
+                name="critical_fields_non_empty",
+                passed=False,
+                observed="0/0",
+                threshold="==0 missing rows",
+                details="No in-scope samples were found.",
+            )
         return GateResult(
             name="critical_fields_non_empty",
-            passed=False,
-            observed="0/0",
+            passed=self.rows_with_missing == 0,
+            observed=(
+                f"{self.rows_with_missing}/{self.eligible} "
+                "rows with missing fields"
+            ),
             threshold="==0 missing rows",
-            details="No in-scope samples were found.",
+            details="Checks required fields for supervised in-scope rows.",
         )
 
-    rows_with_missing = 0
-    for sample in eligible:
-        missing = []
-        if not _is_non_empty(sample.sample_id):
-            missing.append("sample_id")
-        if not _is_non_empty(sample.document_id):
-            missing.append("document_id")
-        if not _is_non_empty(sample.split_group_id):
-            missing.append("split_group_id")
-        if not _is_non_empty(sample.tag_code):
-            missing.append("tag_code")
-        if not _is_non_empty(sample.target_paragraph_id):
-            missing.append("target_paragraph_id")
-        if not _is_non_empty(sample.target_text):
-            missing.append("target_text")
-        if not _is_non_empty(sample.target_span_text):
-            missing.append("target_span_text")
-        if not sample.source_paragraph_ids:
-            missing.append("source_paragraph_ids")
-        if not _is_non_empty(sample.source_text):
-            missing.append("source_text")
-        if missing:
-            rows_with_missing += 1
-
-    return GateResult(
-        name="critical_fields_non_empty",
-        passed=rows_with_missing == 0,
-        observed=(
-            f"{rows_with_missing}/{len(eligible)} "
-            "rows with missing fields"
-        ),
-        threshold="==0 missing rows",
-        details="Checks required fields for supervised in-scope rows.",
-    )
-
 
 def _load_split_groups_from_jsonl(path: Path) -> set[str]:
     groups: set[str] = set()
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            stripped = line.strip()
-            if not stripped:
-                continue
-            payload = json.loads(stripped)
-            group = str(payload.get("split_group_id") or "").strip()
-            if group:
-                groups.add(group)
+    for _, payload in read_jsonl_rows(path):
+        group = str(payload.get("split_group_id") or "").strip()
+        if group:
+            groups.add(group)
     return groups
 
 
-def _gate_split_leakage(
-    samples: list[CanonicalSample],
-    train_jsonl: Path | None,
-    validation_jsonl: Path | None,
-    test_jsonl: Path | None,
-) -> GateResult:
-    provided = all(
-        path is not None
-        for path in (train_jsonl, validation_jsonl, test_jsonl)
-    )
+SPLITS = ("train", "validation", "test")
+
+
+class SplitArtifacts:
+    """Split JSONL inputs, read once when a gate first needs them."""
+
+    def __init__(
+        self,
+        train_jsonl: Path | None,
+        validation_jsonl: Path | None,
+        test_jsonl: Path | None,
+    ) -> None:
+        self.paths = dict(
+            zip(SPLITS, (train_jsonl, validation_jsonl, test_jsonl))
+        )
+        self._groups: dict[str, set[str]] | None = None
 
-    if provided:
-        assert train_jsonl is not None
-        assert validation_jsonl is not None
-        assert test_jsonl is not None
+    @property
+    def provided(self) -> bool:
+        return all(path is not None for path in self.paths.values())
+
+    def missing(self) -> Path | None:
+        for path in self.paths.values():
+            if path is not None and not resolve_jsonl_paths(path):
+                return path
+        return None
 
-        for path in (train_jsonl, validation_jsonl, test_jsonl):
-            if not path.exists():
+    def groups(self) -> dict[str, set[str]]:
+        """Return ``{split: split_group_ids}`` for the given files."""
+
+        if self._groups is None:
+            self._groups = {
+                split: _load_split_groups_from_jsonl(path)
+                for split, path in self.paths.items()
+                if path is not None
+            }
+        return self._groups
+
+    def preload(self, groups: dict[str, set[str]]) -> None:
+        """Use ``groups`` (as returned by `groups`) instead of reading."""
+
+        self._groups = groups
+
+    def split_by_group(self) -> dict[str, str]:
+        split_by_group: dict[str, str] = {}
+        for split, groups in self.groups().items():
+            for group in groups:
+                split_by_group.setdefault(group, split)
+        return split_by_group
+
+
+class _SplitLeakageGate(GateAccumulator):
+    def __init__(self, artifacts: SplitArtifacts) -> None:
+        self.artifacts = artifacts
+        # Splits seen per split_group_id in the rows' own split field.
+        self.by_group: dict[str, set[str]] = {}
+
+    def update(self, sample: CanonicalSample) -> None:
+        if sample.split in SPLITS:
+            self.by_group.setdefault(sample.split_group_id, set()).add(
+                sample.split
+            )
+
+    def merge(self, other: GateAccumulator) -> None:
+        assert isinstance(other, _SplitLeakageGate)
+        for group, splits in other.by_group.items():
+            self.by_group.setdefault(group, set()).update(splits)
+
+    def result(self) -> GateResult:
+        if self.artifacts.provided:
+            missing = self.artifacts.missing()
+            if missing is not None:
                 return GateResult(
                     name="split_leakage",
                     passed=False,
                     observed="n/a",
                     threshold="==0 overlapping groups",
-                    details=f"Split artifact not found: {path}",
+                    details=f"Split artifact not found: {missing}",
                 )
 
-        train_groups = _load_split_groups_from_jsonl(train_jsonl)
-        valid_groups = _load_split_groups_from_jsonl(validation_jsonl)
-        test_groups = _load_split_groups_from_jsonl(test_jsonl)
-
-        overlaps = (
-            len(train_groups & valid_groups)
-            + len(train_groups & test_groups)
-            + len(valid_groups & test_groups)
-        )
+            groups = self.artifacts.groups()
+            train_groups = groups["train"]
+            valid_groups = groups["validation"]
+            test_groups = groups["test"]
+            overlaps = (
+                len(train_groups & valid_groups)
+                + len(train_groups & test_groups)
+                + len(valid_groups & test_groups)
+            )
+
+            return GateResult(
+                name="split_leakage",
+                passed=overlaps == 0,
+                observed=str(overlaps),
+                threshold="==0 overlapping groups",
+                details=(
+                    "Intersections across train/validation/test "
+                    "split_group_id sets."
+                ),
+            )
+
+        split_values = set().union(*self.by_group.values())
+        if split_values == set(SPLITS):
+            overlapping = sum(
+                1 for values in self.by_group.values() if len(values) > 1
+            )
+            return GateResult(
+                name="split_leakage",
+                passed=overlapping == 0,
+                observed=str(overlapping),
+                threshold="==0 overlapping groups",
+                details="Uses sample-level split values from the dataset.",
+            )
 
         return GateResult(
             name="split_leakage",
-            passed=overlaps == 0,
-            observed=str(overlaps),
+            passed=False,
+            observed="n/a",
             threshold="==0 overlapping groups",
             details=(
-                "Intersections across train/validation/test "
-                "split_group_id sets."
+                "Missing split inputs. Provide --train-jsonl, "
+                "--validation-jsonl, --test-jsonl or include split field "
+                "in dataset rows."
             ),
         )
 
-    split_values = {
-        sample.split
-        for sample in samples
-        if sample.split in {"train", "validation", "test"}
-    }
-    if split_values == {"train", "validation", "test"}:
-        by_group: dict[str, set[str]] = {}
-        for sample in samples:
-            if sample.split not in {"train", "validation", "test"}:
+
+def _near_duplicate_text(sample: CanonicalSample) -> str:
+    return sample.target_text or sample.target_span_text
+
+
+class _NearDuplicateLeakageGate(GateAccumulator):
+    """Near-duplicate clusters of in-scope rows that span several splits.
+
+    Each distinct normalized text is kept once (by digest) with its MinHash
+    signature, row count and the ``(split_group_id, split)`` pairs of its
+    rows; LSH clustering runs over the distinct texts in `result`.
+    """
+
+    def __init__(
+        self,
+        artifacts: SplitArtifacts,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        self.artifacts = artifacts
+        self.threshold = threshold
+        self.texts: dict[bytes, list[Any]] = {}
+
+    def update(self, sample: CanonicalSample) -> None:
+        if not sample.in_scope:
+            return
+        normalized = normalize_text(_near_duplicate_text(sample))
+        if not normalized:
+            return
+        digest = hashlib.blake2b(
+            normalized.encode("utf-8"), digest_size=16
+        ).digest()
+        entry = self.texts.get(digest)
+        if entry is None:
+            entry = self.texts[digest] = [
+                array("Q", minhash_signature(normalized)),
+                0,
+                set(),
+            ]
+        entry[1] += 1
+        entry[2].add((sample.split_group_id, sample.split))
+
+    def merge(self, other: GateAccumulator) -> None:
+        assert isinstance(other, _NearDuplicateLeakageGate)
+        for digest, (signature, rows, sides) in other.texts.items():
+            entry = self.texts.get(digest)
+            if entry is None:
+                self.texts[digest] = [signature, rows, set(sides)]
+            else:
+                entry[1] += rows
+                entry[2].update(sides)
+
+    def result(self) -> GateResult:
+        split_by_group = self.artifacts.split_by_group()
+        entries = list(self.texts.values())
+        index = NearDuplicateIndex(threshold=self.threshold)
+        for number, (signature, _, _) in enumerate(entries):
+            index.add_signature(number, signature)
+
+        leaked_clusters = 0
+        leaked_rows = 0
+        for cluster in index.clusters(min_size=1):
+            rows = sum(entries[number][1] for number in cluster)
+            if rows < 2:
                 continue
-            by_group.setdefault(sample.split_group_id, set()).add(sample.split)
-        overlapping = sum(1 for values in by_group.values() if len(values) > 1)
+            sides = {
+                split_by_group.get(group) or split or f"group:{group}"
+                for number in cluster
+                for group, split in entries[number][2]
+            }
+            if len(sides) > 1:
+                leaked_clusters += 1
+                leaked_rows += rows
+
         return GateResult(
-            name="split_leakage",
-            passed=overlapping == 0,
-            observed=str(overlapping),
-            threshold="==0 overlapping groups",
-            details="Uses sample-level split values from the dataset.",
+            name="near_duplicate_leakage",
+            passed=leaked_clusters == 0,
+            observed=f"{leaked_clusters} clusters ({leaked_rows} rows)",
+            threshold="==0 clusters across splits",
+            details=(
+                "MinHash/LSH over target_text (target_span_text when "
+                f"empty), char shingle Jaccard >= {self.threshold:.2f}; "
+                "rows without a known split are compared by "
+                "split_group_id."
+            ),
         )
 
-    return GateResult(
-        name="split_leakage",
-        passed=False,
-        observed="n/a",
-        threshold="==0 overlapping groups",
-        details=(
-            "Missing split inputs. Provide --train-jsonl, --validation-jsonl, "
-            "--test-jsonl or include split field in dataset rows."
-        ),
-    )
-
 
 def _has_keyword(content: str, options: set[str]) -> bool:
     return any(option in content for option in options)
 
 
-def _gate_dataset_card(dataset_card_path: Path) -> GateResult:
-    if not dataset_card_path.exists():
+class _DatasetCardGate(GateAccumulator):
+    def __init__(self, dataset_card_path: Path) -> None:
+        self.dataset_card_path = dataset_card_path
+
+    def result(self) -> GateResult:
+        dataset_card_path = self.dataset_card_path
+        if not dataset_card_path.exists():
+            return GateResult(
+                name="dataset_card_completeness",
+                passed=False,
+                observed="missing",
+                threshold="version+provenance+limitations",
+                details=f"Dataset card not found: {dataset_card_path}",
+            )
+
+        content = dataset_card_path.read_text(encoding="utf-8").lower()
+        version_ok = _has_keyword(content, {"version", "versao"})
+        provenance_ok = _has_keyword(
+            content,
+            {"provenance", "proveniencia", "proveniência", "origem", "source"},
+        )
+        limits_ok = _has_keyword(
+            content,
+            {"limitations", "limitacoes", "limitações", "known limitations"},
+        )
+
+        passed = version_ok and provenance_ok and limits_ok
+        observed = (
+            f"version={version_ok}, provenance={provenance_ok}, "
+            f"limitations={limits_ok}"
+        )
         return GateResult(
             name="dataset_card_completeness",
-            passed=False,
-            observed="missing",
-            threshold="version+provenance+limitations",
-            details=f"Dataset card not found: {dataset_card_path}",
+            passed=passed,
+            observed=observed,
+            threshold="all true",
+            details="Checks required sections in dataset card text.",
         )
 
-    content = dataset_card_path.read_text(encoding="utf-8").lower()
-    version_ok = _has_keyword(content, {"version", "versao"})
-    provenance_ok = _has_keyword(
-        content,
-        {"provenance", "proveniencia", "proveniência", "origem", "source"},
-    )
-    limits_ok = _has_keyword(
-        content,
-        {"limitations", "limitacoes", "limitações", "known limitations"},
-    )
 
-    passed = version_ok and provenance_ok and limits_ok
-    observed = (
-        f"version={version_ok}, provenance={provenance_ok}, "
-        f"limitations={limits_ok}"
-    )
-    return GateResult(
-        name="dataset_card_completeness",
-        passed=passed,
-        observed=observed,
-        threshold="all true",
-        details="Checks required sections in dataset card text.",
-    )
+class GateSuite:
+    """Every gate of the report, updated together in one pass.
+
+    Suites built with the same options can be merged, so separate parts of
+    a dataset can be evaluated independently and combined.
+    """
+
+    def __init__(
+        self,
+        min_source_grounding: float = 0.95,
+        min_confident_or_validated: float = 0.90,
+        min_parse_coverage: float = 0.98,
+        target_markdown: Path | None = None,
+        dataset_card: Path | None = None,
+        train_jsonl: Path | None = None,
+        validation_jsonl: Path | None = None,
+        test_jsonl: Path | None = None,
+        expect_supervised_export: bool = True,
+        near_duplicate_threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        artifacts = SplitArtifacts(train_jsonl, validation_jsonl, test_jsonl)
+        self.artifacts = artifacts
+        self.sample_count = 0
+        self.in_scope_count = 0
+        # Report order.
+        self.gates: list[GateAccumulator] = [
+            _SourceGroundingGate(min_source_grounding),
+            _ConfidentOrValidatedGate(min_confident_or_validated),
+            _OutOfScopeLabelsGate(expect_supervised_export),
+            _ParseCoverageGate(min_parse_coverage, target_markdown),
+            _DuplicateKeysGate(),
+            _CriticalFieldsGate(),
+            _SplitLeakageGate(artifacts),
+            _NearDuplicateLeakageGate(artifacts, near_duplicate_threshold),
+            _DatasetCardGate(dataset_card or Path("docs/dataset_card.md")),
+        ]
+
+    def update(self, sample: CanonicalSample) -> None:
+        self.sample_count += 1
+        if sample.in_scope:
+            self.in_scope_count += 1
+        for gate in self.gates:
+            gate.update(sample)
+
+    def merge(self, other: GateSuite) -> None:
+        self.sample_count += other.sample_count
+        self.in_scope_count += other.in_scope_count
+        for gate, partial in zip(self.gates, other.gates, strict=True):
+            gate.merge(partial)
+
+    def results(self) -> list[GateResult]:
+        return [gate.result() for gate in self.gates]
+
+
+def _evaluate_part(
+    part: tuple[Path, int, int | None],
+    default_document: str,
+    options: dict[str, Any],
+) -> GateSuite:
+    suite = GateSuite(**options)
+    for sample in _iter_part_samples(part, default_document):
+        suite.update(sample)
+    return suite
+
+
+def _split_groups_part(split: str, path: Path) -> tuple[str, set[str]]:
+    return split, _load_split_groups_from_jsonl(path)
+
+
+def _evaluate_parallel(
+    dataset_path: Path,
+    options: dict[str, Any],
+    workers: int,
+    min_part_bytes: int,
+) -> GateSuite:
+    """Evaluate JSONL parts in worker processes and merge their suites.
+
+    Workers also read the split JSONL files, one file per task. Partial
+    suites are merged in input order, so the report matches a single pass.
+    """
+
+    suite = GateSuite(**options)
+    default_document = dataset_path.name.split(".")[0]
+    parts = jsonl_parts(dataset_path, workers * 4, min_part_bytes)
+    split_files = [
+        (split, path)
+        for split, given in suite.artifacts.paths.items()
+        if given is not None
+        for path in resolve_jsonl_paths(given)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partial_suites = [
+            executor.submit(_evaluate_part, part, default_document, options)
+            for part in parts
+        ]
+        split_groups = [
+            executor.submit(_split_groups_part, split, path)
+            for split, path in split_files
+        ]
+        for future in partial_suites:
+            suite.merge(future.result())
+        groups: dict[str, set[str]] = {
+            split: set()
+            for split, given in suite.artifacts.paths.items()
+            if given is not None
+        }
+        for future in split_groups:
+            split, found = future.result()
+            groups[split].update(found)
+    suite.artifacts.preload(groups)
+    return suite
 
 
 def evaluate_dataset(
@@ -590,32 +963,45 @@ def evaluate_dataset(
     validation_jsonl: Path | None = None,
     test_jsonl: Path | None = None,
     expect_supervised_export: bool = True,
+    near_duplicate_threshold: float = DEFAULT_THRESHOLD,
+    workers: int = 1,
+    min_part_bytes: int = 1 << 20,
 ) -> ValidationReport:
-    _, samples = _canonicalize_samples(dataset_path)
-    in_scope_count = len([sample for sample in samples if sample.in_scope])
-
-    gate_results = [
-        _gate_source_grounding(samples, min_source_grounding),
-        _gate_confident_or_validated(samples, min_confident_or_validated),
-        _gate_out_of_scope_labels(samples, expect_supervised_export),
-        _gate_parse_coverage(samples, min_parse_coverage, target_markdown),
-        _gate_duplicate_keys(samples),
-        _gate_critical_fields(samples),
-        _gate_split_leakage(
-            samples,
-            train_jsonl,
-            validation_jsonl,
-            test_jsonl,
-        ),
-        _gate_dataset_card(dataset_card or Path("docs/dataset_card.md")),
-    ]
+    """Run every gate over ``dataset_path`` and build the report.
+
+    With ``workers`` > 1 a JSONL input is cut into byte ranges (gzip files
+    and shards stay whole) evaluated in a process pool; a JSON document is
+    always evaluated in this process.
+    """
+
+    options: dict[str, Any] = {
+        "min_source_grounding": min_source_grounding,
+        "min_confident_or_validated": min_confident_or_validated,
+        "min_parse_coverage": min_parse_coverage,
+        "target_markdown": target_markdown,
+        "dataset_card": dataset_card,
+        "train_jsonl": train_jsonl,
+        "validation_jsonl": validation_jsonl,
+        "test_jsonl": test_jsonl,
+        "expect_supervised_export": expect_supervised_export,
+        "near_duplicate_threshold": near_duplicate_threshold,
+    }
+    if workers > 1 and _is_jsonl_input(dataset_path):
+        suite = _evaluate_parallel(
+            dataset_path, options, workers, min_part_bytes
+        )
+    else:
+        suite = GateSuite(**options)
+        for sample in iter_dataset_samples(dataset_path):
+            suite.update(sample)
 
+    gate_results = suite.results()
     passed = all(result.passed for result in gate_results)
     return ValidationReport(
         dataset_path=str(dataset_path),
         generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
-        sample_count=len(samples),
-        in_scope_count=in_scope_count,
+        sample_count=suite.sample_count,
+        in_scope_count=suite.in_scope_count,
         gate_results=gate_results,
         passed=passed,
     )
@@ -649,7 +1035,10 @@ def _parse_args() -> argparse.Namespace:
         "--dataset",
         type=Path,
         default=Path("dataset_raw.json"),
-        help="Path to dataset JSON file (default: dataset_raw.json)",
+        help=(
+            "Path to dataset JSON file, or JSONL/.jsonl.gz file or shard "
+            "glob (default: dataset_raw.json)"
+        ),
     )
     parser.add_argument(
         "--target-markdown",
@@ -667,19 +1056,28 @@ def _parse_args() -> argparse.Namespace:
         "--train-jsonl",
         type=Path,
         default=None,
-        help="Path to train split JSONL for split leakage checks.",
+        help=(
+            "Path to train split JSONL (plain, .gz or shard glob) "
+            "for split leakage checks."
+        ),
     )
     parser.add_argument(
         "--validation-jsonl",
         type=Path,
         default=None,
-        help="Path to validation split JSONL for split leakage checks.",
+        help=(
+            "Path to validation split JSONL (plain, .gz or shard glob) "
+            "for split leakage checks."
+        ),
     )
     parser.add_argument(
         "--test-jsonl",
         type=Path,
         default=None,
-        help="Path to test split JSONL for split leakage checks.",
+        help=(
+            "Path to test split JSONL (plain, .gz or shard glob) "
+            "for split leakage checks."
+        ),
     )
     parser.add_argument(
         "--min-source-grounding",
@@ -699,6 +1097,15 @@ def _parse_args() -> argparse.Namespace:
         default=0.98,
         help="Minimum required parse coverage ratio.",
     )
+    parser.add_argument(
+        "--near-duplicate-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=(
+            "Estimated Jaccard similarity at which rows in different "
+            "splits count as leaked near duplicates."
+        ),
+    )
     parser.add_argument(
         "--expect-supervised-export",
         action=argparse.BooleanOptionalAction,
@@ -708,6 +1115,15 @@ def _parse_args() -> argparse.Namespace:
             "Disable for mixed diagnostic+automatic curated files."
         ),
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Worker processes for JSONL input (byte ranges of plain files, "
+            "whole gzip files/shards); JSON documents use one process."
+        ),
+    )
     parser.add_argument(
         "--report-json",
         type=Path,
@@ -720,23 +1136,28 @@ def _parse_args() -> argparse.Namespace:
 def main() -> int:
     args = _parse_args()
 
-    if not args.dataset.exists():
-        print(f"Dataset not found: {args.dataset}", file=sys.stderr)
+    try:
+        if not dataset_exists(args.dataset):
+            print(f"Dataset not found: {args.dataset}", file=sys.stderr)
+            return 2
+        report = evaluate_dataset(
+            dataset_path=args.dataset,
+            min_source_grounding=args.min_source_grounding,
+            min_confident_or_validated=args.min_confident_or_validated,
+            min_parse_coverage=args.min_parse_coverage,
+            target_markdown=args.target_markdown,
+            dataset_card=args.dataset_card,
+            train_jsonl=args.train_jsonl,
+            validation_jsonl=args.validation_jsonl,
+            test_jsonl=args.test_jsonl,
+            expect_supervised_export=args.expect_supervised_export,
+            near_duplicate_threshold=args.near_duplicate_threshold,
+            workers=max(1, args.workers),
+        )
+    except ValueError as exc:
+        print(f"Dataset validation failed: {exc}", file=sys.stderr)
         return 2
 
-    report = evaluate_dataset(
-        dataset_path=args.dataset,
-        min_source_grounding=args.min_source_grounding,
-        min_confident_or_validated=args.min_confident_or_validated,
-        min_parse_coverage=args.min_parse_coverage,
-        target_markdown=args.target_markdown,
-        dataset_card=args.dataset_card,
-        train_jsonl=args.train_jsonl,
-        validation_jsonl=args.validation_jsonl,
-        test_jsonl=args.test_jsonl,
-        expect_supervised_export=args.expect_supervised_export,
-    )
-
     _print_report(report)
 
     if args.report_json is not None:
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from collections import defaultdict
 
+import pytest
+
 from parser import alignment, annotations, segmentation
 
 
@@ -74,3 +76,157 @@ def test_alignment_falls_back_to_similarity() -> None:
 
     assert result["A_001"]["paragrafo_fonte_ids"] == ["F_002"]
     assert result["A_001"]["fonte_alinhamento_confiavel"] is True
+
+
+def test_tfidf_aligner_matches_heuristic_structure(
+    source_fixture_path, target_fixture_path
+):
+    pytest.importorskip("sklearn")
+    from parser import vector_alignment
+
+    inputs = _prepare_alignment_inputs(
+        str(source_fixture_path), str(target_fixture_path)
+    )
+    (
+        source_sections,
+        target_sections,
+        source_paragraphs,
+        target_clean,
+        annotations_map,
+    ) = inputs
+
+    expected = alignment.align_paragraphs(*inputs)
+    result = vector_alignment.align_paragraphs_tfidf(
+        source_sections=source_sections,
+        target_sections=target_sections,
+        source_paragraphs=source_paragraphs,
+        target_clean=target_clean,
+        annotations_map=annotations_map,
+    )
+
+    assert result.keys() == expected.keys()
+    for info in result.values():
+        assert set(info) == {
+            "paragrafo_fonte_ids",
+            "fonte_alinhamento_confiavel",
+        }
+    assert result["A_002"] == expected["A_002"]
+
+
+def test_tfidf_aligner_falls_back_to_vector_similarity() -> None:
+    pytest.importorskip("sklearn")
+    from parser import vector_alignment
+
+    result = vector_alignment.align_paragraphs_tfidf(
+        source_sections={"GLOBAL": ["F_001", "F_002"]},
+        target_sections={"GLOBAL": ["A_001"]},
+        source_paragraphs={
+            "F_001": "Introducao padrao",
+            "F_002": "Conteudo raro com expressao distinta e unica",
+        },
+        target_clean={
+            "A_001": "Conteudo raro com expressao distinta e unica",
+        },
+        annotations_map=defaultdict(list),
+    )
+
+    assert result["A_001"]["paragrafo_fonte_ids"] == ["F_002"]
+    assert result["A_001"]["fonte_alinhamento_confiavel"] is True
+
+
+def test_anchor_index_keeps_window_first_preference() -> None:
+    source_paragraphs = {
+        "F_001": "Uma expressão rara aparece aqui.",
+        "F_002": "Texto neutro sem relacao.",
+        "F_003": "Outra vez a EXPRESSAO   rara, agora perto.",
+    }
+    source_ids = list(source_paragraphs)
+    positions = {par_id: idx for idx, par_id in enumerate(source_ids)}
+    index = alignment.AnchorIndex(source_paragraphs)
+
+    assert index.lookup("expressao rara") == ("F_001",)
+    assert alignment._match_by_anchor(
+        ["expressão rara"], source_ids, index, positions, last_idx=-1
+    ) == ("F_001", 0)
+    assert alignment._match_by_anchor(
+        ["ausente", "agora perto"], source_ids, index, positions, last_idx=2
+    ) == ("F_003", 2)
+    assert alignment._match_by_anchor(
+        ["rara"], source_ids, index, positions, last_idx=2
+    ) == ("F_003", 2)
+
+
+def test_dp_aligner_handles_splits_merges_and_skips() -> None:
+    pytest.importorskip("sklearn")
+    from parser import dp_alignment
+
+    source_paragraphs = {
+        "F_001": "O cerrado ocupa o planalto central do pais.",
+        "F_002": "As chuvas de verao enchem os rios da regiao.",
+        "F_003": "Os rios correm para tres grandes bacias.",
+        "F_004": "Nota editorial sem relacao com o texto.",
+        "F_005": "A fauna inclui o lobo guara e o tamandua bandeira, "
+        "especies tipicas das savanas brasileiras.",
+    }
+    target_clean = {
+        "A_001": "O cerrado ocupa o planalto central do pais.",
+        "A_002": "As chuvas de verao enchem os rios da regiao. "
+        "Os rios correm para tres grandes bacias.",
+        "A_003": "Frase inserida pelo revisor sem equivalente.",
+        "A_004": "A fauna inclui o lobo guara e o tamandua bandeira,",
+        "A_005": "especies tipicas das savanas brasileiras.",
+    }
+    result = dp_alignment.align_paragraphs_dp(
+        source_sections={"GLOBAL": list(source_paragraphs)},
+        target_sections={"GLOBAL": list(target_clean)},
+        source_paragraphs=source_paragraphs,
+        target_clean=target_clean,
+        annotations_map=defaultdict(list),
+    )
+
+    assert result["A_001"]["paragrafo_fonte_ids"] == ["F_001"]
+    assert result["A_002"]["paragrafo_fonte_ids"] == ["F_002", "F_003"]
+    assert result["A_003"]["paragrafo_fonte_ids"] == []
+    assert result["A_004"]["paragrafo_fonte_ids"] == ["F_005"]
+    assert result["A_005"]["paragrafo_fonte_ids"] == ["F_005"]
+    assert result["A_001"]["fonte_alinhamento_confiavel"] is True
+    assert result["A_003"]["fonte_alinhamento_confiavel"] is False
+    for info in result.values():
+        assert 0.0 <= info["pontuacao_alinhamento"] <= 1.0
+
+
+def test_dp_aligner_is_monotonic_despite_misleading_anchor() -> None:
+    pytest.importorskip("sklearn")
+    from parser import dp_alignment
+
+    topics = [
+        "Capitulo sobre agricultura familiar e cooperativas rurais.",
+        "Historia das ferrovias e do transporte de cargas no sul.",
+        "Migracoes internas durante o seculo vinte no nordeste.",
+        "Industria textil paulista e o trabalho nas fabricas.",
+        "Urbanizacao acelerada e crescimento das periferias.",
+        "Politicas de saude publica e campanhas de vacinacao.",
+    ]
+    source_paragraphs = {
+        f"F_{idx:03d}": text for idx, text in enumerate(topics, start=1)
+    }
+    target_clean = {
+        f"A_{idx:03d}": text for idx, text in enumerate(topics, start=1)
+    }
+    # The anchor of A_002 also occurs in the last source paragraph only.
+    annotations_map = defaultdict(list)
+    annotations_map["A_002"].append(
+        {"tag": "RF+", "conteudo_bruto": "campanhas de vacinacao"}
+    )
+    result = dp_alignment.align_paragraphs_dp(
+        source_sections={"GLOBAL": list(source_paragraphs)},
+        target_sections={"GLOBAL": list(target_clean)},
+        source_paragraphs=source_paragraphs,
+        target_clean=target_clean,
+        annotations_map=annotations_map,
+        band=1,
+    )
+
+    assert [
+        result[target_id]["paragrafo_fonte_ids"] for target_id in target_clean
+    ] == [[source_id] for source_id in source_paragraphs]
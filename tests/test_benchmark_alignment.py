@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from scripts import benchmark_alignment as bench
+
+
+def test_benchmark_pair_reports_timing_and_agreement(
+    source_fixture_path, target_fixture_path
+) -> None:
+    pytest.importorskip("sklearn")
+
+    report = bench.benchmark_pair(
+        "fixture",
+        source_fixture_path,
+        target_fixture_path,
+        aligners=["tfidf"],
+        repeat=1,
+        scale=2,
+    )
+
+    assert report["source_paragraphs"] == 12
+    assert set(report["aligners"]) == {"heuristic", "tfidf"}
+    heuristic = report["aligners"]["heuristic"]
+    assert heuristic["agreement_with_default"] == 1.0
+    assert 0.0 <= report["aligners"]["tfidf"]["agreement_with_default"] <= 1
+    assert report["aligners"]["tfidf"]["seconds"] >= 0.0
+
+
+def test_anchor_index_benchmark_matches_linear_scan(
+    source_fixture_path,
+) -> None:
+    from scripts import benchmark_anchor_index
+
+    report = benchmark_anchor_index.benchmark_anchor_index(
+        source_fixture_path,
+        scale=4,
+        anchors_per_paragraph=6,
+    )
+
+    assert report["source_paragraphs"] == 24
+    assert report["identical_results"] is True
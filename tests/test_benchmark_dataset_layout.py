@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+
+from scripts import benchmark_dataset_layout as bench
+
+
+def test_benchmark_dataset_layout_reports_both_layouts(tmp_path) -> None:
+    paragraph = "Um paragrafo alvo longo o bastante para pesar. " * 20
+    rows = [
+        {
+            "id": f"PAT_{idx:04d}_SL",
+            "tag": "SL+",
+            "paragrafo_alvo_id": "A_001",
+            "paragrafo_fonte_ids": ["F_001"],
+            "texto_paragrafo_alvo": paragraph,
+            "texto_paragrafo_fonte": paragraph.upper(),
+        }
+        for idx in range(1, 5)
+    ]
+    dataset_path = tmp_path / "dataset_raw.json"
+    dataset_path.write_text(
+        json.dumps({"metadata": {}, "amostras": rows}), encoding="utf-8"
+    )
+
+    report = bench.benchmark_dataset_layout(
+        dataset_path, scales=[1, 3], repeats=1
+    )
+
+    assert [row["scale"] for row in report["runs"]] == [1, 3]
+    assert [row["samples"] for row in report["runs"]] == [4, 12]
+    assert [row["paragraphs"] for row in report["runs"]] == [2, 6]
+    for row in report["runs"]:
+        assert 0 < row["v3_bytes"] < row["inline_bytes"]
+        assert row["size_ratio"] < 0.5
+        assert row["v3_load_seconds"] >= 0
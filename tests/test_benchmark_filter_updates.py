@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts import benchmark_filter_updates as bench  # noqa: E402
+
+
+def _proxy_rows(filter_model) -> list[int]:
+    return [
+        filter_model.mapToSource(filter_model.index(row, 0)).row()
+        for row in range(filter_model.rowCount())
+    ]
+
+
+def test_row_local_updates_match_a_full_refilter() -> None:
+    samples = bench._synthetic_samples(40)
+    list_model = bench.SampleListModel(samples)
+    filter_model = bench.SampleFilterModel()
+    filter_model.setSourceModel(list_model)
+    filter_model.set_status_filter("revisar")
+    filter_model.set_search_text("zebra")
+    assert filter_model.rowCount() == 0
+
+    for row in (2, 3, 8):
+        samples[row].motivo_revisao = "Zébra no trecho"
+        list_model.refresh_row(row)
+    samples[8].necessita_revisao_humana = False
+    list_model.refresh_row(8)
+
+    incremental = _proxy_rows(filter_model)
+    filter_model.invalidateFilter()
+    assert incremental == _proxy_rows(filter_model) == [2]
+
+
+def test_benchmark_filter_updates_reports_each_size() -> None:
+    report = bench.benchmark_filter_updates(
+        sizes=[50, 200], edits=5, full_edits=2
+    )
+
+    assert [row["samples"] for row in report["runs"]] == [50, 200]
+    for row in report["runs"]:
+        assert row["incremental_ms"] > 0
+        assert row["full_invalidate_ms"] > 0
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from scripts import benchmark_gate_workers as bench
+
+
+def test_benchmark_gate_workers_matches_single_process() -> None:
+    report = bench.benchmark_gate_workers(
+        rows=300, workers=[1, 2], min_part_bytes=4_096
+    )
+
+    assert [row["workers"] for row in report["runs"]] == [1, 2]
+    assert report["runs"][0]["speedup"] == 1.0
+    for row in report["runs"]:
+        assert row["matches_single"]
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from scripts import benchmark_near_duplicates as bench
+
+
+def test_benchmark_near_duplicates_finds_planted_copies() -> None:
+    report = bench.benchmark_near_duplicates(
+        sizes=[150, 400], max_brute_force=150
+    )
+
+    small, large = report["runs"]
+    assert small["true_pairs_found"] == small["true_pairs"] > 0
+    assert large["brute_force_ms"] is None
+    for row in report["runs"]:
+        assert row["planted_found"] == row["planted_copies"]
+        assert row["lsh_comparisons"] < row["paragraphs"]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from scripts import benchmark_split_solver as bench
+
+
+def test_benchmark_split_solver_matches_exhaustive_on_small_cases() -> None:
+    report = bench.benchmark_split_solver(sizes=[6, 8, 40], max_exhaustive=8)
+
+    small, medium, large = report["runs"]
+    for row in (small, medium):
+        assert row["matches_exhaustive"] is True
+        assert row["solver_score"] == row["exhaustive_score"]
+    assert large["exhaustive_ms"] is None
+    assert large["matches_exhaustive"] is None
+    assert large["solver_score"][:2] == [0, 0]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts import benchmark_startup as bench  # noqa: E402
+
+
+def test_view_import_leaves_parser_and_converters_unloaded() -> None:
+    probe = (
+        "import sys, validator_app.view; "
+        "print(sorted(name for name in ('parser.cli', 'parser.alignment', "
+        "'scripts.convert_inputs', 'validator_app.export_utils') "
+        "if name in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=bench.BASE_DIR,
+        env=bench._child_env(),
+    )
+
+    assert completed.stdout.strip() == "[]"
+
+
+def test_benchmark_startup_reports_first_paint() -> None:
+    report = bench.benchmark_startup(runs=1, samples=20, top=3)
+
+    median = report["median"]
+    assert 0 < median["import_ms"] < median["first_paint_ms"]
+    assert median["first_paint_ms"] < median["process_ms"]
+    assert report["meets_target"] == (
+        median["first_paint_ms"] <= report["target_first_paint_ms"]
+    )
+    assert len(report["slowest_imports"]) == 3
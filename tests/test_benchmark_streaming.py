@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from scripts import benchmark_streaming as bench
+
+
+def test_benchmark_streaming_reports_both_modes(
+    source_fixture_path, target_fixture_path, tab_fixture_path
+) -> None:
+    report = bench.benchmark_streaming(
+        source_fixture_path,
+        target_fixture_path,
+        tab_fixture_path,
+        scales=[1, 3],
+    )
+
+    assert [row["scale"] for row in report["runs"]] == [1, 3]
+    for row in report["runs"]:
+        assert row["batch_peak_bytes"] > 0
+        assert row["stream_peak_bytes"] > 0
+        assert row["stream_output_bytes"] > 0
@@ -4,6 +4,8 @@ import json
 from pathlib import Path
 
 from scripts import build_supervised_exports as exports
+from scripts import run_baseline_training as baseline
+from scripts import validate_training_dataset as gate
 
 
 def _write_json(path: Path, payload: dict) -> None:
@@ -370,3 +372,153 @@ def test_build_supervised_exports_prioritizes_train_label_coverage(
     coverage = summary["train_label_coverage"]
     assert coverage["covered"] == coverage["total"]
     assert coverage["missing_labels"] == []
+
+
+def test_split_solver_is_seeded_and_scales_past_exhaustive_search() -> None:
+    group_sizes = {f"G{index:03d}": 1 + index % 7 for index in range(200)}
+    group_labels = {
+        group: {("SL+", "RF+", "OM+")[index % 3]}
+        for index, group in enumerate(group_sizes)
+    }
+    group_labels["G017"].add("MOD+")
+    ordered = sorted(group_sizes, key=exports._group_bucket)
+    options = {
+        "ordered_groups": ordered,
+        "group_sizes": group_sizes,
+        "group_labels": group_labels,
+        "all_labels": {"SL+", "RF+", "OM+", "MOD+"},
+        "train_ratio": 0.70,
+        "validation_ratio": 0.15,
+        "min_validation_rows": 10,
+        "min_test_rows": 10,
+    }
+
+    assert exports._split_solver_name(len(ordered)) == "local_search"
+    assert exports._search_assignment(**options) is None
+    first = exports._solve_assignment(**options, seed=3)
+    assert first == exports._solve_assignment(**options, seed=3)
+
+    assert first["G017"] == "train"
+    targets = exports._split_targets(sum(group_sizes.values()), 0.70, 0.15)
+    score = exports._assignment_score(
+        ordered,
+        tuple(first[group] for group in ordered),
+        group_sizes,
+        group_labels,
+        options["all_labels"],
+        targets,
+        10,
+        10,
+    )
+    assert score is not None
+    assert score[:3] == (0, 0, 0)
+
+
+def test_build_supervised_exports_writes_gzip_shards(tmp_path: Path) -> None:
+    dataset_path = tmp_path / "dataset_curated.json"
+    rows = [
+        {
+            "sample_id": f"S{index:03d}",
+            "document_id": "DOC1",
+            "split_group_id": f"G{index % 12:02d}",
+            "tag_code": ("SL+", "RF+", "RD+")[index % 3],
+            "label_scope": "automatic",
+            "target_paragraph_id": f"A_{index:03d}",
+            "target_span_text": f"span-{index}",
+            "source_paragraph_ids": [f"F_{index:03d}"],
+            "source_text": f"fonte-{index}",
+        }
+        for index in range(60)
+    ]
+    _write_json(dataset_path, {"metadata": {}, "amostras": rows})
+    paths = {
+        split: tmp_path / "splits" / f"{split}.jsonl.gz"
+        for split in ("train", "validation", "test")
+    }
+
+    summary = exports.build_supervised_exports(
+        dataset_path=dataset_path,
+        output_dataset=tmp_path / "dataset_supervised.json",
+        train_jsonl=paths["train"],
+        validation_jsonl=paths["validation"],
+        test_jsonl=paths["test"],
+        report_json=None,
+        shard_rows=8,
+    )
+
+    for split, shards in summary["split_files"].items():
+        counts = [shard["rows"] for shard in shards]
+        assert sum(counts) == summary["split_counts"][split]
+        assert max(counts) <= 8
+        assert len(shards) == max(1, -(-sum(counts) // 8))
+        assert all(len(shard["sha256"]) == 64 for shard in shards)
+        assert Path(shards[0]["path"]).name.startswith(
+            f"{split}-00000-of-{len(shards):05d}"
+        )
+    train = baseline._read_jsonl_samples(
+        tmp_path / "splits" / "train-*.jsonl.gz", split="train"
+    )
+    assert len(train) == summary["split_counts"]["train"]
+    leakage = gate._SplitLeakageGate(
+        gate.SplitArtifacts(paths["train"], paths["validation"], paths["test"])
+    ).result()
+    assert leakage.passed
+    assert leakage.observed == "0"
+
+
+def test_build_supervised_exports_near_dedupe_keeps_passages_together(
+    tmp_path: Path,
+) -> None:
+    dataset_path = tmp_path / "dataset_curated.json"
+    passage = (
+        "O patriotismo e um sentimento de amor e dedicacao a patria, "
+        "aos seus simbolos e ao seu povo."
+    )
+    reused = passage.replace("dedicacao", "devocao")
+    specs = [
+        ("DOC1", passage, "SL+", "patriotismo"),
+        ("DOC1", passage, "RF+", "sentimento de amor"),
+        ("DOC2", reused, "SL+", "patriotismo"),
+        ("DOC2", reused, "RD+", "povo"),
+    ]
+    specs += [
+        (f"DOC{index}", f"Paragrafo {index} sobre o tema {index}.", tag, "x")
+        for index, tag in zip(range(3, 12), ["SL+", "RF+", "RD+"] * 3)
+    ]
+    rows = [
+        {
+            "sample_id": f"S{index:03d}",
+            "document_id": group,
+            "split_group_id": group,
+            "tag_code": tag,
+            "label_scope": "automatic",
+            "target_paragraph_id": f"A_{index:03d}",
+            "target_text": text,
+            "target_span_text": span,
+            "source_paragraph_ids": ["F_001"],
+            "source_text": "fonte",
+        }
+        for index, (group, text, tag, span) in enumerate(specs)
+    ]
+    _write_json(dataset_path, {"metadata": {}, "amostras": rows})
+
+    summary = exports.build_supervised_exports(
+        dataset_path=dataset_path,
+        output_dataset=tmp_path / "dataset_supervised.json",
+        train_jsonl=tmp_path / "train.jsonl",
+        validation_jsonl=tmp_path / "validation.jsonl",
+        test_jsonl=tmp_path / "test.jsonl",
+        report_json=None,
+        near_dedupe_threshold=0.8,
+    )
+
+    assert summary["removed_duplicates"] == 0
+    assert summary["removed_near_duplicates"] == 1
+    assert summary["merged_near_duplicate_groups"] == 1
+    supervised = json.loads(
+        (tmp_path / "dataset_supervised.json").read_text(encoding="utf-8")
+    )
+    kept = {row["sample_id"]: row for row in supervised["amostras"]}
+    assert "S002" not in kept
+    assert kept["S003"]["split_group_id"] == "DOC1"
+    assert kept["S003"]["split"] == kept["S000"]["split"]
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import json
 
+import pytest
+
 from parser import cli
+from parser.schema import Metadata
 
 
 def test_cli_generates_dataset(
@@ -32,3 +35,337 @@ def test_cli_generates_dataset(
     assert first_sample["tag"] in {"SL+", "RD+", "OM+"}
     assert first_sample["texto_paragrafo_alvo"]
     assert "trecho_alvo" in first_sample
+
+
+def test_cli_accepts_tfidf_aligner(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    pytest.importorskip("sklearn")
+    default_path = tmp_path / "dataset_default.json"
+    tfidf_path = tmp_path / "dataset_tfidf.json"
+
+    for aligner, output_path in (
+        ("heuristic", default_path),
+        ("tfidf", tfidf_path),
+    ):
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_fixture_path,
+            tags_path=tab_fixture_path,
+            output_path=output_path,
+            aligner=aligner,
+        )
+
+    default_rows = json.loads(default_path.read_text(encoding="utf-8"))
+    tfidf_rows = json.loads(tfidf_path.read_text(encoding="utf-8"))
+    assert [row["id"] for row in tfidf_rows["amostras"]] == [
+        row["id"] for row in default_rows["amostras"]
+    ]
+
+
+def test_cli_accepts_dp_aligner(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    pytest.importorskip("sklearn")
+    output_path = tmp_path / "dataset_dp.json"
+
+    cli.main(
+        source_path=source_fixture_path,
+        target_path=target_fixture_path,
+        tags_path=tab_fixture_path,
+        output_path=output_path,
+        aligner="dp",
+    )
+
+    rows = json.loads(output_path.read_text(encoding="utf-8"))["amostras"]
+    assert rows
+    assert all(isinstance(row["paragrafo_fonte_ids"], list) for row in rows)
+
+
+def test_cli_rejects_unknown_aligner(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    with pytest.raises(ValueError):
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_fixture_path,
+            tags_path=tab_fixture_path,
+            output_path=tmp_path / "out.json",
+            aligner="nope",
+        )
+
+
+def test_cli_stream_matches_batch_after_reserialization(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    batch_path = tmp_path / "dataset.json"
+    stream_path = tmp_path / "dataset.jsonl"
+    for output_path, stream in ((batch_path, False), (stream_path, True)):
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_fixture_path,
+            tags_path=tab_fixture_path,
+            output_path=output_path,
+            stream=stream,
+        )
+
+    rows = [
+        json.loads(line)
+        for line in stream_path.read_text(encoding="utf-8").splitlines()
+    ]
+    reserialized = json.dumps(
+        {"metadata": Metadata().to_dict(), "amostras": rows},
+        ensure_ascii=False,
+        indent=2,
+    )
+    assert rows
+    assert reserialized == batch_path.read_text(encoding="utf-8")
+
+
+def test_cli_stream_rejects_global_aligners(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    with pytest.raises(ValueError):
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_fixture_path,
+            tags_path=tab_fixture_path,
+            output_path=tmp_path / "out.jsonl",
+            aligner="dp",
+            stream=True,
+        )
+
+
+def test_cli_incremental_cache_reuses_unchanged_paragraphs(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+    capsys,
+) -> None:
+    target_path = tmp_path / "alvo.md"
+    target_path.write_text(
+        target_fixture_path.read_text(encoding="utf-8"), encoding="utf-8"
+    )
+    cache_dir = tmp_path / "cache"
+
+    def run(name: str, **kwargs) -> str:
+        output_path = tmp_path / name
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_path,
+            tags_path=tab_fixture_path,
+            output_path=output_path,
+            **kwargs,
+        )
+        return output_path.read_text(encoding="utf-8")
+
+    cold = run("cold.json", cache_dir=cache_dir)
+    assert "paragrafos 0/" in capsys.readouterr().out
+    warm = run("warm.json", cache_dir=cache_dir)
+    assert "(100.0%), alinhamentos" in capsys.readouterr().out
+    assert warm == cold == run("plain.json")
+
+    paragraphs = target_path.read_text(encoding="utf-8").split("\n\n")
+    paragraphs[-1] = paragraphs[-1] + " Frase nova."
+    target_path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+    edited = run("edited.json", cache_dir=cache_dir)
+    summary = capsys.readouterr().out
+    total = len(paragraphs)
+    assert f"paragrafos {total - 1}/{total}" in summary
+    assert edited == run("edited_plain.json")
+
+
+def test_cli_content_ids_survive_tag_insertion(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    target_path = tmp_path / "alvo.md"
+    text = target_fixture_path.read_text(encoding="utf-8")
+    target_path.write_text(text, encoding="utf-8")
+
+    def run(name: str) -> list[dict]:
+        output_path = tmp_path / name
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_path,
+            tags_path=tab_fixture_path,
+            output_path=output_path,
+            id_scheme="content",
+        )
+        payload = json.loads(output_path.read_text(encoding="utf-8"))
+        return payload["amostras"]
+
+    before = run("before.json")
+    assert all(row["id"].startswith("PAT_") for row in before)
+    assert len({row["id"] for row in before}) == len(before)
+    assert [row["id"] for row in run("again.json")] == [
+        row["id"] for row in before
+    ]
+
+    target_path.write_text(
+        text.replace("INTRODUCAO\n\n", "INTRODUCAO\n\n[MOD+ Nova frase.]\n\n"),
+        encoding="utf-8",
+    )
+    after = run("after.json")
+    assert len(after) == len(before) + 1
+    assert {row["id"] for row in before} < {row["id"] for row in after}
+
+
+def test_cli_rejects_unknown_id_scheme(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    with pytest.raises(ValueError):
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_fixture_path,
+            tags_path=tab_fixture_path,
+            output_path=tmp_path / "dataset.json",
+            id_scheme="uuid",
+        )
+
+
+def test_cli_v3_layout_round_trips_to_inline(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    from parser import paragraph_table
+
+    paths = {}
+    for layout in paragraph_table.LAYOUTS:
+        paths[layout] = tmp_path / f"dataset_{layout}.json"
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_fixture_path,
+            tags_path=tab_fixture_path,
+            output_path=paths[layout],
+            layout=layout,
+        )
+    inline = json.loads(paths["inline"].read_text(encoding="utf-8"))
+    packed = json.loads(paths["v3"].read_text(encoding="utf-8"))
+
+    assert packed["versao_layout"] == paragraph_table.LAYOUT_VERSION
+    assert all(
+        "texto_paragrafo_alvo" not in row for row in packed["amostras"]
+    )
+    assert paragraph_table.unpack_dataset(packed) == inline
+
+
+def test_cli_profile_writes_sidecar_and_chrome_trace(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    from parser import profiling
+
+    output_path = tmp_path / "dataset.json"
+    trace_path = tmp_path / "trace.json"
+    profiler = profiling.StageProfiler()
+    cli.main(
+        source_path=source_fixture_path,
+        target_path=target_fixture_path,
+        tags_path=tab_fixture_path,
+        output_path=output_path,
+        profiler=profiler,
+        profile_trace=trace_path,
+    )
+
+    report = json.loads(
+        profiling.profile_path_for(output_path).read_text(encoding="utf-8")
+    )
+    assert [stage["etapa"] for stage in report["etapas"]] == [
+        "load_tag_definitions",
+        "segmentation",
+        "lex_all",
+        "detect_sections",
+        "align_paragraphs",
+        "build_samples",
+        "write_json",
+    ]
+    samples = json.loads(output_path.read_text(encoding="utf-8"))["amostras"]
+    counters = report["contadores"]
+    assert counters["amostras"] == counters["anotacoes"] == len(samples)
+    assert counters["paragrafos_alvo"] > 0
+    assert counters["sondagens_ancora"] > 0
+    assert counters["comparacoes_similaridade"] > 0
+
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert len(spans) == len(report["etapas"])
+    assert all(event["dur"] >= 0 for event in spans)
+    assert profiling._ACTIVE == []
+
+
+def test_cli_progress_reports_stages_and_cancels_without_writing(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    from parser import profiling
+
+    output_path = tmp_path / "dataset.json"
+    output_path.write_text('{"anterior": true}', encoding="utf-8")
+    stages: list[str] = []
+    progress = profiling.StageProgress(stages.append)
+
+    def _run() -> None:
+        cli.main(
+            source_path=source_fixture_path,
+            target_path=target_fixture_path,
+            tags_path=tab_fixture_path,
+            output_path=output_path,
+            progress=progress,
+        )
+
+    _run()
+    assert stages == [
+        "load_tag_definitions",
+        "segmentation",
+        "lex_all",
+        "detect_sections",
+        "align_paragraphs",
+        "build_samples",
+        "write_json",
+    ]
+    assert "amostras" in json.loads(output_path.read_text(encoding="utf-8"))
+    assert not profiling.profile_path_for(output_path).exists()
+
+    output_path.write_text('{"anterior": true}', encoding="utf-8")
+    stages.clear()
+
+    def _cancel_during_alignment(name: str) -> None:
+        stages.append(name)
+        if name == "align_paragraphs":
+            progress.cancel()
+
+    progress.on_stage = _cancel_during_alignment
+    with pytest.raises(profiling.ParseCancelled):
+        _run()
+
+    assert stages[-1] == "align_paragraphs"
+    assert output_path.read_text(encoding="utf-8") == '{"anterior": true}'
+    assert profiling._PROGRESS == []
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from validator_app.context_utils import build_highlighted_html
+from validator_app.context_utils import (
+    ContextRenderer,
+    build_highlighted_html,
+    paragraph_number,
+)
+from validator_app.models import AnnotationSample
 
 
 def test_build_highlighted_html_marks_excerpt_when_found() -> None:
@@ -40,3 +45,94 @@ def test_build_highlighted_html_handles_empty_context() -> None:
 
     assert has_focus is False
     assert "Sem contexto disponivel." in html
+
+
+def _sample(**overrides) -> AnnotationSample:
+    fields = {
+        "id": "T_0001",
+        "tag": "SL+",
+        "nome": "Simplificacao",
+        "tipo_nivel": "lexical",
+        "contexto_anotacao": "",
+        "paragrafo_alvo_id": "A_050",
+        "paragrafo_fonte_ids": ["F_010", "F_011"],
+        "fonte_alinhamento_confiavel": True,
+        "texto_paragrafo_alvo": "",
+        "texto_paragrafo_fonte": None,
+        "trecho_alvo": "marca",
+        "trecho_fonte": None,
+        "necessita_revisao_humana": False,
+        "motivo_revisao": None,
+    }
+    fields.update(overrides)
+    return AnnotationSample(**fields)
+
+
+def _document(prefix: str, count: int) -> str:
+    return "\n\n".join(
+        f"{prefix} {index} marca" for index in range(1, count + 1)
+    )
+
+
+def test_build_highlighted_html_prefers_match_after_search_from() -> None:
+    text = "trecho antes. trecho depois."
+    html, _ = build_highlighted_html(text, "trecho", search_from=10)
+
+    assert html.index("focus") > html.index("antes")
+
+
+def test_paragraph_number_reads_trailing_index() -> None:
+    assert paragraph_number("A_007") == 6
+    assert paragraph_number("DOC/F_120") == 119
+    assert paragraph_number("") is None
+    assert paragraph_number("A_000") is None
+
+
+def test_renderer_windows_fallback_document_around_aligned_paragraph() -> None:
+    renderer = ContextRenderer(window=2)
+    renderer.set_documents(_document("fonte", 200), _document("alvo", 200))
+
+    target_html, focus = renderer.render("alvo", _sample())
+    source_html, _ = renderer.render("fonte", _sample())
+
+    assert focus is True
+    assert "alvo 48 marca" in target_html and "alvo 52 marca" in target_html
+    assert "alvo 47 " not in target_html and "alvo 53 " not in target_html
+    # The highlight lands in the aligned paragraph, not in a neighbour.
+    assert target_html.index("alvo 50") < target_html.index("focus")
+    assert target_html.index("focus") < target_html.index("alvo 51")
+    assert "fonte 8 " in source_html and "fonte 13 " in source_html
+    assert "fonte 14 " not in source_html
+
+
+def test_renderer_caches_fragments_in_an_lru() -> None:
+    renderer = ContextRenderer(cache_size=3)
+    renderer.set_documents(_document("fonte", 20), _document("alvo", 20))
+
+    def render(number: int):
+        return renderer.render(
+            "alvo", _sample(paragrafo_alvo_id=f"A_{number:03d}")
+        )
+
+    first = render(1)
+    assert render(1) is first
+    renderer.prefetch(_sample(paragrafo_alvo_id="A_002"))
+    assert render(1) is first
+    render(3)  # evicts the prefetched source window
+    assert render(1) is first
+    for number in (4, 5, 6):
+        render(number)
+    again = render(1)
+    assert again == first and again is not first
+
+
+def test_renderer_uses_sample_paragraph_text_when_present() -> None:
+    renderer = ContextRenderer()
+    renderer.set_documents(None, _document("alvo", 5))
+
+    html, focus = renderer.render(
+        "alvo", _sample(texto_paragrafo_alvo="proprio marca")
+    )
+
+    assert focus is True
+    assert "proprio" in html and "alvo 1" not in html
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import shutil
+
+import pytest
+
+from parser import cli, corpus
+
+
+def test_discover_pairs_matches_roles_and_key_prefixes(tmp_path) -> None:
+    for name in (
+        "patriotismo_st.md",
+        "patriotismo_tt.md",
+        "texto-fonte-v06-04-26.txt",
+        "texto-alvo-anotado-v06-04.txt",
+        "texto-fonte-v06-04a.txt",
+        "texto-alvo-v06-04a.txt",
+        "tabela_alinhamento_new_source.md",
+    ):
+        (tmp_path / name).write_text("x", encoding="utf-8")
+
+    pairs = {
+        pair.document_id: pair for pair in corpus.discover_pairs(tmp_path)
+    }
+
+    assert set(pairs) == {"patriotismo", "v06-04", "v06-04a"}
+    assert pairs["v06-04"].source_path.name == "texto-fonte-v06-04-26.txt"
+    assert pairs["v06-04a"].source_path.name == "texto-fonte-v06-04a.txt"
+
+
+def test_build_corpus_stamps_documents_and_isolates_failures(
+    tmp_path,
+    source_fixture_path,
+    target_fixture_path,
+    tab_fixture_path,
+) -> None:
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        shutil.copy(source_fixture_path, tmp_path / folder / "fonte.md")
+        shutil.copy(target_fixture_path, tmp_path / folder / "alvo.md")
+    manifest = tmp_path / "manifest.json"
+    entries = [
+        {
+            "document_id": "doc_a",
+            "source": "a/fonte.md",
+            "target": "a/alvo.md",
+        },
+        {"document_id": "ausente", "source": "a/fonte.md", "target": "x.md"},
+        {
+            "document_id": "doc_b",
+            "source": "b/fonte.md",
+            "target": "b/alvo.md",
+            "split_group_id": "grupo_b",
+        },
+    ]
+    manifest.write_text(json.dumps({"pairs": entries}), encoding="utf-8")
+
+    payload = corpus.build_corpus(
+        corpus.load_manifest(manifest),
+        cli._load_tag_definitions(tab_fixture_path),
+        workers=2,
+    )
+
+    documents = payload["metadata"]["corpus"]["documentos"]
+    assert [item["status"] for item in documents] == ["ok", "erro", "ok"]
+    assert "FileNotFoundError" in documents[1]["erro"]
+
+    rows = payload["amostras"]
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids))
+    assert {row["document_id"] for row in rows} == {"doc_a", "doc_b"}
+    assert {
+        row["split_group_id"] for row in rows if row["document_id"] == "doc_b"
+    } == {"grupo_b"}
+
+    single = cli.build_pair_samples(
+        source_fixture_path,
+        target_fixture_path,
+        cli._load_tag_definitions(tab_fixture_path),
+    )
+    assert len(rows) == 2 * len(single)
+
+
+def test_load_manifest_rejects_duplicate_document_ids(tmp_path) -> None:
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            [
+                {"document_id": "x", "source": "a.md", "target": "b.md"},
+                {"document_id": "x", "source": "c.md", "target": "d.md"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(corpus.CorpusError):
+        corpus.load_manifest(manifest)
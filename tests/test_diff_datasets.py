@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import json
+
+from scripts import diff_datasets
+
+
+def _row(sample_id: str, tag: str, span: str, **extra) -> dict:
+    row = {
+        "id": sample_id,
+        "tag": tag,
+        "document_id": "doc",
+        "texto_paragrafo_alvo": f"Paragrafo com {span}.",
+        "trecho_alvo": span,
+        "contexto_anotacao": f"[{tag} {span}]",
+        "paragrafo_fonte_ids": ["F_001"],
+        "validado": False,
+        "history": [],
+    }
+    row.update(extra)
+    return row
+
+
+def test_diff_matches_renumbered_rows_by_content() -> None:
+    old = [_row("PAT_0001_SL", "SL+", "a"), _row("PAT_0002_OM", "OM+", "b")]
+    new = [
+        _row("PAT_0001_IN", "IN+", "novo"),
+        _row("PAT_0002_SL", "SL+", "a"),
+        _row("PAT_0003_OM", "OM+", "b", paragrafo_fonte_ids=["F_002"]),
+    ]
+
+    patch = diff_datasets.diff_datasets(old, new)
+
+    assert patch["resumo"] == {
+        "antigas": 2,
+        "novas": 3,
+        "inalteradas": 1,
+        "alteradas": 1,
+        "adicionadas": 1,
+        "removidas": 0,
+    }
+    assert [row["id"] for row in patch["adicionadas"]] == ["PAT_0001_IN"]
+    # Renumbering alone is not a change; the IDs are reported per pair.
+    (item,) = patch["alteradas"]
+    assert (item["id_antigo"], item["id_novo"]) == (
+        "PAT_0002_OM",
+        "PAT_0003_OM",
+    )
+    assert set(item["campos"]) == {"paragrafo_fonte_ids"}
+
+
+def test_diff_by_id_reports_removed_rows_and_ignores_review_fields() -> None:
+    old = [
+        _row("PAT_0001_SL", "SL+", "a", validado=True, reviewer="ana"),
+        _row("PAT_0002_OM", "OM+", "b"),
+    ]
+    new = [_row("PAT_0001_SL", "SL+", "a")]
+
+    patch = diff_datasets.diff_datasets(old, new, match="id")
+
+    assert patch["removidas"] == ["PAT_0002_OM"]
+    assert patch["resumo"]["inalteradas"] == 1
+    assert patch["alteradas"] == []
+
+
+def test_carry_review_state_onto_fresh_parse() -> None:
+    history = [{"timestamp": "t", "action": "validado", "reviewer": "ana"}]
+    old = [
+        _row(
+            "PAT_0001_SL",
+            "SL+",
+            "a",
+            validado=True,
+            reviewer="ana",
+            updated_at="t",
+            history=history,
+        ),
+        _row("PAT_0001_SL", "SL+", "a"),
+    ]
+    new = [
+        _row("PAT_0001_IN", "IN+", "novo"),
+        _row("PAT_0002_SL", "SL+", "a"),
+        _row("PAT_0003_SL", "SL+", "a"),
+    ]
+
+    rows, carried = diff_datasets.carry_review_state(old, new)
+
+    # Only the reviewed row passes its state on.
+    assert carried == 1
+    assert [row["id"] for row in rows] == [
+        "PAT_0001_IN",
+        "PAT_0002_SL",
+        "PAT_0003_SL",
+    ]
+    assert rows[1]["validado"] is True
+    assert rows[1]["reviewer"] == "ana"
+    assert rows[1]["history"] == history
+    assert rows[2]["validado"] is False
+    assert "reviewer" not in rows[0]
+    assert new[1]["validado"] is False
+
+
+def test_paragraph_edit_keeps_review_state_of_its_samples() -> None:
+    paragraph = "Paragrafo com a e b."
+    old = [
+        _row("PAT_0001_SL", "SL+", "a", texto_paragrafo_alvo=paragraph),
+        _row(
+            "PAT_0002_OM",
+            "OM+",
+            "b",
+            texto_paragrafo_alvo=paragraph,
+            validado=True,
+        ),
+    ]
+    edited = "Paragrafo revisto com a e b."
+    new = [
+        _row("PAT_0001_SL", "SL+", "a", texto_paragrafo_alvo=edited),
+        _row("PAT_0002_OM", "OM+", "b", texto_paragrafo_alvo=edited),
+    ]
+
+    rows, carried = diff_datasets.carry_review_state(old, new)
+    patch = diff_datasets.diff_datasets(old, new)
+
+    assert carried == 1
+    assert [row["validado"] for row in rows] == [False, True]
+    assert patch["resumo"]["alteradas"] == 2
+    assert patch["resumo"]["adicionadas"] == patch["resumo"]["removidas"] == 0
+
+
+def test_carry_keeps_every_field_a_reviewer_edits() -> None:
+    old = [
+        _row(
+            "PAT_0001_SL",
+            "SL+",
+            "a",
+            validado=True,
+            low_confidence=True,
+            necessita_revisao_humana=False,
+            motivo_revisao="duvida",
+            history=[{"action": "validado"}],
+        )
+    ]
+    new = [_row("PAT_0001_SL", "SL+", "a", necessita_revisao_humana=True)]
+
+    rows, carried = diff_datasets.carry_review_state(old, new)
+
+    assert carried == 1
+    assert rows[0]["validado"] is True
+    assert rows[0]["low_confidence"] is True
+    assert rows[0]["necessita_revisao_humana"] is False
+    assert rows[0]["motivo_revisao"] == "duvida"
+
+
+def test_carry_follows_a_tag_corrected_by_the_reviewer() -> None:
+    old = [
+        _row(
+            "PAT_0001_SL",
+            "RF+",
+            "a",
+            nome="Reformulacao",
+            tipo_nivel="sintatico",
+            contexto_anotacao="nota",
+            validado=True,
+            history=[{"action": "TAG alterada (SL+->RF+)"}],
+        ),
+        _row("PAT_0002_OM", "OM+", "b", contexto_anotacao="nota"),
+    ]
+    new = [
+        _row("PAT_0001_IN", "IN+", "novo"),
+        _row("PAT_0002_SL", "SL+", "a", contexto_anotacao="nota"),
+        _row("PAT_0003_OM", "OM+", "b", contexto_anotacao="nota"),
+    ]
+
+    rows, carried = diff_datasets.carry_review_state(old, new)
+    patch = diff_datasets.diff_datasets(old, new)
+
+    assert carried == 1
+    assert rows[1]["tag"] == "RF+"
+    assert rows[1]["nome"] == "Reformulacao"
+    assert rows[1]["tipo_nivel"] == "sintatico"
+    assert rows[1]["validado"] is True
+    assert patch["resumo"]["adicionadas"] == 1
+    assert patch["resumo"]["removidas"] == 0
+
+
+def test_main_writes_patch_and_carried_dataset(tmp_path, monkeypatch) -> None:
+    old_path = tmp_path / "old.json"
+    new_path = tmp_path / "new.json"
+    old_path.write_text(
+        json.dumps(
+            {
+                "metadata": {},
+                "amostras": [
+                    _row("PAT_0001_SL", "SL+", "a", validado=True)
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    new_path.write_text(
+        json.dumps(
+            {
+                "metadata": {"versao": "2"},
+                "amostras": [
+                    _row("PAT_0001_IN", "IN+", "x"),
+                    _row("PAT_0002_SL", "SL+", "a"),
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    patch_path = tmp_path / "patch.json"
+    output_path = tmp_path / "carried.json"
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "diff_datasets.py",
+            "--old",
+            str(old_path),
+            "--new",
+            str(new_path),
+            "--patch-json",
+            str(patch_path),
+            "--carry-review-output",
+            str(output_path),
+        ],
+    )
+
+    assert diff_datasets.main() == 0
+
+    patch = json.loads(patch_path.read_text(encoding="utf-8"))
+    assert patch["resumo"]["adicionadas"] == 1
+    carried = json.loads(output_path.read_text(encoding="utf-8"))
+    assert carried["metadata"] == {"versao": "2"}
+    assert carried["amostras"][1]["validado"] is True
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from validator_app import data_loader
+from validator_app.history import (
+    ARCHIVE_ACTION,
+    archive_history,
+    coalesce_history,
+    read_history_archive,
+)
+from validator_app.models import AnnotationSample, Metadata
+from validator_app.review_journal import ReviewJournal
+
+_START = datetime(2026, 1, 1, 9, 0, 0)
+
+
+def _sample(index: int = 1) -> AnnotationSample:
+    return AnnotationSample(
+        id=f"T_{index:04d}",
+        tag="SL+",
+        nome="Simplificacao",
+        tipo_nivel="lexical",
+        contexto_anotacao="texto",
+        paragrafo_alvo_id="A_001",
+        paragrafo_fonte_ids=["F_001"],
+        fonte_alinhamento_confiavel=True,
+        texto_paragrafo_alvo="alvo",
+        texto_paragrafo_fonte="fonte",
+        trecho_alvo="alvo",
+        trecho_fonte="fonte",
+        necessita_revisao_humana=False,
+        motivo_revisao=None,
+    )
+
+
+def _at(seconds: int) -> str:
+    return (_START + timedelta(seconds=seconds)).isoformat()
+
+
+def _type_notes(sample: AnnotationSample, text: str, window: float) -> None:
+    for position in range(1, len(text) + 1):
+        sample.log_change(
+            "Notas atualizadas", "ana", text[:position], _at(position), window
+        )
+
+
+def test_log_change_merges_bursts_of_the_same_action() -> None:
+    sample = _sample()
+    _type_notes(sample, "trecho ambiguo", window=300)
+    sample.log_change("Marcado como validado", "ana", None, _at(20), 300)
+    sample.log_change("Marcado como validado", "bia", None, _at(21), 300)
+    sample.log_change("Marcado como validado", "bia", None, _at(900), 300)
+
+    assert [entry["action"] for entry in sample.history] == [
+        "Notas atualizadas",
+        "Marcado como validado",
+        "Marcado como validado",
+        "Marcado como validado",
+    ]
+    notes = sample.history[0]
+    assert notes["notes"] == "trecho ambiguo"
+    assert notes["ocorrencias"] == len("trecho ambiguo")
+    assert (notes["inicio"], notes["timestamp"]) == (_at(1), _at(14))
+
+
+def test_merged_entry_never_spans_more_than_one_window() -> None:
+    sample = _sample()
+    for seconds in (0, 200, 400):
+        sample.log_change(
+            "Notas atualizadas", "ana", "nota", _at(seconds), 300
+        )
+
+    assert [
+        (entry.get("inicio", entry["timestamp"]), entry["timestamp"])
+        for entry in sample.history
+    ] == [(_at(0), _at(200)), (_at(400), _at(400))]
+    assert coalesce_history(sample.history) == sample.history
+
+
+def test_coalescing_shrinks_saved_history_tenfold() -> None:
+    text = "Alinhamento duvidoso: fonte cobre dois paragrafos do alvo."
+    plain, merged = _sample(), _sample()
+    _type_notes(plain, text, window=0)
+    _type_notes(merged, text, window=300)
+
+    plain_size = len(json.dumps(plain.history))
+    merged_size = len(json.dumps(merged.history))
+    assert plain_size > 10 * merged_size
+    assert coalesce_history(plain.history) == merged.history
+
+
+def test_archive_history_moves_old_entries_to_the_sidecar(
+    tmp_path: Path,
+) -> None:
+    sample = _sample()
+    for index in range(6):
+        sample.log_change(f"acao {index}", "ana", None, _at(index))
+    archive_path = tmp_path / "dataset.history.jsonl"
+
+    assert archive_history([sample], archive_path, keep_last=2) == (1, 4)
+    for index in range(6, 9):
+        sample.log_change(f"acao {index}", "ana", None, _at(index))
+    assert archive_history([sample], archive_path, keep_last=2) == (1, 3)
+
+    marker = sample.history[0]
+    assert marker["action"] == ARCHIVE_ACTION
+    assert marker["arquivadas"] == 7
+    assert [entry["action"] for entry in sample.history[1:]] == [
+        "acao 7",
+        "acao 8",
+    ]
+    archived = read_history_archive(archive_path)["T_0001"]
+    assert [entry["action"] for entry in archived] == [
+        f"acao {index}" for index in range(7)
+    ]
+
+
+def test_journal_replays_coalesced_entries(tmp_path: Path) -> None:
+    path = tmp_path / "dataset.json"
+    data_loader.save_dataset(path, Metadata("P", "1", "pt", ""), [_sample()])
+    _, samples = data_loader.load_dataset(path)
+    journal = ReviewJournal(path)
+    for text in ("a", "ab", "abc"):
+        samples[0].motivo_revisao = text
+        samples[0].log_change("Notas atualizadas", "ana", text, _at(1), 300)
+        journal.append(0, samples[0], "notes_changed")
+    journal.close()
+
+    _, reloaded = data_loader.load_dataset(path)
+
+    assert reloaded[0].history == samples[0].history
+    assert reloaded[0].history[0]["ocorrencias"] == 3
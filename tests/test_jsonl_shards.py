@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts import jsonl_shards as shards
+
+
+def _rows(count: int) -> list[dict]:
+    return [
+        {"sample_id": f"S{index:03d}", "texto": "é"} for index in range(count)
+    ]
+
+
+def test_writer_caps_shards_and_reports_counts_and_hashes(
+    tmp_path: Path,
+) -> None:
+    target = tmp_path / "train.jsonl.gz"
+    with shards.ShardedJsonlWriter(target, 7, shard_rows=3) as writer:
+        for row in _rows(7):
+            writer.write(row)
+    written = writer.close()
+
+    assert [Path(item["path"]).name for item in written] == [
+        "train-00000-of-00003.jsonl.gz",
+        "train-00001-of-00003.jsonl.gz",
+        "train-00002-of-00003.jsonl.gz",
+    ]
+    assert [item["rows"] for item in written] == [3, 3, 1]
+    for item in written:
+        assert item["sha256"] == shards.file_sha256(Path(item["path"]))
+    with gzip.open(written[-1]["path"], "rt", encoding="utf-8") as handle:
+        assert json.loads(handle.read()) == _rows(7)[-1]
+    assert not target.exists()
+
+
+def test_compressed_shards_hash_the_same_across_runs(tmp_path: Path) -> None:
+    hashes = []
+    for _ in range(2):
+        writer = shards.ShardedJsonlWriter(tmp_path / "test.jsonl.gz", 4, 2)
+        for row in _rows(4):
+            writer.write(row)
+        hashes.append([item["sha256"] for item in writer.close()])
+
+    assert hashes[0] == hashes[1]
+
+
+def test_writer_pads_empty_splits_and_drops_stale_shards(
+    tmp_path: Path,
+) -> None:
+    target = tmp_path / "validation.jsonl"
+    writer = shards.ShardedJsonlWriter(target, total_rows=5, shard_rows=1)
+    for row in _rows(5):
+        writer.write(row)
+    writer.close()
+
+    written = shards.ShardedJsonlWriter(target, 0, shard_rows=2).close()
+
+    assert [item["rows"] for item in written] == [0]
+    assert shards.resolve_jsonl_paths(target) == [
+        tmp_path / "validation-00000-of-00001.jsonl"
+    ]
+
+
+def test_reader_accepts_plain_gzip_glob_and_shard_paths(
+    tmp_path: Path,
+) -> None:
+    plain = tmp_path / "plain.jsonl"
+    plain.write_text('{"a": 1}\n\n{"a": 2}\n', encoding="utf-8")
+    packed = tmp_path / "packed.jsonl"
+    with gzip.open(packed, "wt", encoding="utf-8") as handle:
+        handle.write('{"a": 3}\n')
+    writer = shards.ShardedJsonlWriter(tmp_path / "split.jsonl.gz", 3, 2)
+    for index in range(3):
+        writer.write({"a": index})
+    writer.close()
+
+    assert list(shards.read_jsonl_rows(plain)) == [
+        (1, {"a": 1}),
+        (3, {"a": 2}),
+    ]
+    assert list(shards.read_jsonl_rows(packed)) == [(1, {"a": 3})]
+    by_glob = [row for _, row in shards.read_jsonl_rows(tmp_path / "split-*")]
+    by_path = [
+        row for _, row in shards.read_jsonl_rows(tmp_path / "split.jsonl.gz")
+    ]
+    assert by_glob == by_path == [{"a": 0}, {"a": 1}, {"a": 2}]
+    assert list(shards.read_jsonl_rows(tmp_path / "missing.jsonl")) == []
+
+
+def test_byte_ranges_read_every_line_once(tmp_path: Path) -> None:
+    plain = tmp_path / "rows-00000-of-00002.jsonl"
+    packed = tmp_path / "rows-00001-of-00002.jsonl"
+    plain.write_text(
+        "".join(json.dumps(row) + "\n\n" for row in _rows(40)),
+        encoding="utf-8",
+    )
+    with gzip.open(packed, "wt", encoding="utf-8") as handle:
+        for row in _rows(5):
+            handle.write(json.dumps(row) + "\n")
+
+    parts = shards.jsonl_parts(tmp_path / "rows.jsonl", 8, min_bytes=64)
+    read = [
+        row["sample_id"]
+        for path, start, end in parts
+        for _, row in shards.read_jsonl_range(path, start, end)
+    ]
+
+    assert len([part for part in parts if part[0] == plain]) > 2
+    assert [part for part in parts if part[0] == packed] == [(packed, 0, None)]
+    assert read == [row["sample_id"] for row in _rows(40) + _rows(5)]
+
+
+def test_reexport_with_another_shard_layout_replaces_the_old_files(
+    tmp_path: Path,
+) -> None:
+    target = tmp_path / "train.jsonl.gz"
+    with shards.ShardedJsonlWriter(target, 2) as writer:
+        for row in _rows(2):
+            writer.write(row)
+    with shards.ShardedJsonlWriter(target, 3, shard_rows=2) as writer:
+        for row in _rows(3):
+            writer.write({**row, "texto": "novo"})
+
+    assert not target.exists()
+    rows = [row for _, row in shards.read_jsonl_rows(target)]
+    assert [row["texto"] for row in rows] == ["novo"] * 3
+
+    with shards.ShardedJsonlWriter(target, 1) as writer:
+        writer.write({"sample_id": "S999"})
+
+    assert [row for _, row in shards.read_jsonl_rows(target)] == [
+        {"sample_id": "S999"}
+    ]
+
+
+def test_file_next_to_its_shards_is_ambiguous(tmp_path: Path) -> None:
+    target = tmp_path / "train.jsonl"
+    target.write_text('{"sample_id": "velho"}\n', encoding="utf-8")
+    shards.shard_path(target, 0, 1).write_text(
+        '{"sample_id": "novo"}\n', encoding="utf-8"
+    )
+
+    with pytest.raises(ValueError, match="both exist"):
+        shards.resolve_jsonl_paths(target)
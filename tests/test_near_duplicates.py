@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import random
+
+from scripts import near_duplicates as nd
+
+
+def _paragraph(rng: random.Random, words: list[str]) -> str:
+    return " ".join(rng.choice(words) for _ in range(50))
+
+
+def test_signature_similarity_tracks_jaccard() -> None:
+    text = "O patriotismo e um sentimento de amor e dedicacao a patria."
+    edited = text.replace("dedicacao", "devocao")
+    first = nd.minhash_signature(text)
+    second = nd.minhash_signature(edited)
+    left, right = nd.shingle_hashes(text), nd.shingle_hashes(edited)
+    exact = len(left & right) / len(left | right)
+
+    assert nd.minhash_signature("  " + text.upper() + "\n") == first
+    assert abs(nd.estimated_similarity(first, second) - exact) < 0.15
+    assert nd.estimated_similarity(first, nd.minhash_signature("xyz")) < 0.1
+
+
+def test_lsh_bands_put_the_curve_midpoint_below_the_threshold() -> None:
+    bands, rows = nd.lsh_bands(128, 0.8)
+
+    assert bands * rows == 128
+    assert (1 / bands) ** (1 / rows) <= 0.8
+
+
+def test_index_clusters_edited_copies_without_comparing_all_pairs() -> None:
+    rng = random.Random(3)
+    words = [f"w{index}" for index in range(2000)]
+    texts = [_paragraph(rng, words) for _ in range(2000)]
+    copies = {}
+    for original in range(0, 40, 2):
+        tokens = texts[original].split()
+        tokens[rng.randrange(len(tokens))] = "editado"
+        copies[original] = len(texts)
+        texts.append(" ".join(tokens))
+    texts.append(texts[1].upper())
+
+    index = nd.NearDuplicateIndex(threshold=0.8)
+    for key, text in enumerate(texts):
+        index.add(key, text)
+    clusters = {tuple(sorted(cluster)) for cluster in index.clusters()}
+
+    found = sum(
+        1 for original, copy in copies.items() if (original, copy) in clusters
+    )
+    assert found >= len(copies) - 1
+    assert (1, len(texts) - 1) in clusters
+    assert all(len(cluster) == 2 for cluster in clusters)
+    assert index.comparisons < len(texts)
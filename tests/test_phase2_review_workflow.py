@@ -5,6 +5,7 @@ from pathlib import Path
 
 import pytest
 
+from parser.paragraph_table import pack_dataset
 from scripts import phase2_review_workflow as phase2
 
 
@@ -139,3 +140,36 @@ def test_phase2_rejects_decisions_with_unknown_sample_id(
             decisions={"MISSING_SAMPLE": {"decision": "validate"}},
             timestamp="2026-04-01T00:00:00+00:00",
         )
+
+
+def test_phase2_canonicalize_uses_parser_span_offsets(tmp_path: Path) -> None:
+    payload = _legacy_payload()
+    payload["amostras"][0]["trecho_alvo_inicio"] = 0
+    payload["amostras"][0]["trecho_alvo_fim"] = 13
+
+    _, canonical = phase2.canonicalize_dataset_samples(
+        payload, tmp_path / "dataset_raw.json"
+    )
+
+    assert canonical[0]["target_span_start"] == 0
+    assert canonical[0]["target_span_end"] == 13
+    assert "target_span_start" not in canonical[1]
+
+
+def test_phase2_reads_v3_paragraph_table_layout(tmp_path: Path) -> None:
+    inline_path = tmp_path / "dataset_raw.json"
+    packed_path = tmp_path / "dataset_raw_v3.json"
+    _write_json(inline_path, _legacy_payload())
+    _write_json(packed_path, pack_dataset(_legacy_payload()))
+
+    inline = phase2.run_phase2_workflow(dataset_path=inline_path)
+    packed = phase2.run_phase2_workflow(dataset_path=packed_path)
+
+    def strip(samples: list[dict]) -> list[dict]:
+        return [
+            {k: v for k, v in row.items() if k != "created_at"}
+            for row in samples
+        ]
+
+    assert strip(packed["samples"]) == strip(inline["samples"])
+    assert packed["samples"][0]["target_text"] == "Texto alvo um"
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import pytest
+
+from parser import profiling
+
+
+def test_counters_and_stages_are_noops_without_profiler() -> None:
+    profiling.count("amostras", 3)
+    with profiling.stage("segmentation"):
+        pass
+    assert profiling._ACTIVE == []
+
+
+def test_stage_profiler_accumulates_repeated_stages() -> None:
+    profiler = profiling.StageProfiler()
+    with profiler:
+        for _ in range(3):
+            with profiling.stage("lex_all"):
+                _ = [str(idx) for idx in range(10_000)]
+            profiling.count("paragrafos_alvo")
+        with profiler.stage("write_json"):
+            pass
+
+    assert not tracemalloc.is_tracing()
+    report = profiler.report()
+    lex, write = report["etapas"]
+    assert lex["etapa"] == "lex_all"
+    assert lex["chamadas"] == 3
+    assert lex["pico_memoria_bytes"] > 0
+    assert write["chamadas"] == 1
+    assert report["contadores"] == {"paragrafos_alvo": 3}
+    assert "lex_all:" in profiler.summary()
+
+    trace = profiler.chrome_trace()["traceEvents"]
+    assert [event["ph"] for event in trace] == ["X"] * 4 + ["C"]
+    assert trace[-1]["args"] == {"paragrafos_alvo": 3}
+
+
+def test_stage_profiler_without_memory_tracing() -> None:
+    profiler = profiling.StageProfiler(trace_memory=False)
+    with profiler, profiler.stage("align_paragraphs"):
+        assert not tracemalloc.is_tracing()
+
+    (stage,) = profiler.report()["etapas"]
+    assert stage["pico_memoria_bytes"] == 0
+    assert profiler.report()["memoria_rastreada"] is False
+
+
+def test_stage_progress_cancels_at_next_counter() -> None:
+    stages: list[str] = []
+    progress = profiling.StageProgress(stages.append)
+    with pytest.raises(profiling.ParseCancelled), progress:
+        with profiling.stage("lex_all"):
+            profiling.count("anotacoes")
+        progress.cancel()
+        profiling.count("anotacoes")
+
+    assert stages == ["lex_all"]
+    assert profiling._PROGRESS == []
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+from validator_app import data_loader
+from validator_app.review_journal import (
+    ReviewJournal,
+    journal_path_for,
+    read_journal,
+)
+
+
+def _write_dataset(tmp_path: Path, count: int = 3) -> Path:
+    rows = [
+        {
+            "id": f"T_{index:04d}",
+            "tag": "SL+",
+            "nome": "Simplificacao",
+            "tipo_nivel": "lexical",
+            "contexto_anotacao": "texto",
+            "paragrafo_alvo_id": f"A_{index:03d}",
+            "paragrafo_fonte_ids": [f"F_{index:03d}"],
+            "fonte_alinhamento_confiavel": True,
+            "texto_paragrafo_alvo": f"alvo {index}",
+            "texto_paragrafo_fonte": f"fonte {index}",
+            "trecho_alvo": "alvo",
+            "trecho_fonte": "fonte",
+            "necessita_revisao_humana": False,
+            "motivo_revisao": None,
+        }
+        for index in range(1, count + 1)
+    ]
+    path = tmp_path / "dataset.json"
+    path.write_text(
+        json.dumps({"metadata": {"projeto": "Teste"}, "amostras": rows}),
+        encoding="utf-8",
+    )
+    return path
+
+
+def _review(journal: ReviewJournal, samples, row: int, notes: str) -> None:
+    sample = samples[row]
+    sample.validado = True
+    sample.reviewer = "ana"
+    sample.motivo_revisao = notes
+    sample.log_change("validado", "ana", notes, "2026-01-01T00:00:00")
+    journal.append(row, sample, "validated")
+
+
+def test_load_dataset_replays_journal(tmp_path: Path) -> None:
+    path = _write_dataset(tmp_path)
+    _, samples = data_loader.load_dataset(path)
+    journal = ReviewJournal(path)
+    _review(journal, samples, 1, "ok")
+    _review(journal, samples, 1, "revisto")
+    journal.close()
+
+    metadata, reloaded = data_loader.load_dataset(path)
+
+    assert getattr(metadata, "_journal_replayed") == 2
+    assert reloaded[1].validado is True
+    assert reloaded[1].motivo_revisao == "revisto"
+    assert [entry["notes"] for entry in reloaded[1].history] == [
+        "ok",
+        "revisto",
+    ]
+    assert reloaded[0].validado is False
+    _, untouched = data_loader.load_dataset(path, replay_journal=False)
+    assert untouched[1].validado is False
+
+
+def test_torn_last_line_is_skipped_and_appends_continue(
+    tmp_path: Path,
+) -> None:
+    path = _write_dataset(tmp_path)
+    _, samples = data_loader.load_dataset(path)
+    journal = ReviewJournal(path)
+    _review(journal, samples, 0, "primeiro")
+    journal.close()
+    with journal_path_for(path).open("ab") as handle:
+        handle.write(b'{"row": 2, "id": "T_00')
+
+    journal = ReviewJournal(path)
+    _review(journal, samples, 2, "depois")
+    journal.close()
+
+    assert [record["row"] for record in read_journal(journal.path)] == [0, 2]
+    _, reloaded = data_loader.load_dataset(path)
+    assert reloaded[0].validado and reloaded[2].validado
+
+
+def test_compaction_folds_journal_and_replay_is_idempotent(
+    tmp_path: Path,
+) -> None:
+    path = _write_dataset(tmp_path)
+    _, samples = data_loader.load_dataset(path)
+    journal = ReviewJournal(path)
+    _review(journal, samples, 0, "ok")
+    leftover = tmp_path / "leftover.jsonl"
+    shutil.copy(journal.path, leftover)
+
+    data_loader.compact_journal(path, samples, journal=journal)
+
+    assert not journal.path.exists()
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    assert raw["amostras"][0]["validado"] is True
+    # A crash between the dataset write and the journal truncation leaves
+    # the folded records behind; replaying them changes nothing.
+    shutil.copy(leftover, journal.path)
+    _, reloaded = data_loader.load_dataset(path)
+    assert len(reloaded[0].history) == 1
+
+
+def test_compaction_leaves_untouched_rows_byte_for_byte(
+    tmp_path: Path,
+) -> None:
+    path = _write_dataset(tmp_path, count=4)
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    for raw in payload["amostras"]:
+        raw["necessita_revisao_humana"] = True
+        raw["low_confidence"] = True
+    path.write_text(
+        json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    _, samples = data_loader.load_dataset(path)
+    # VAEST shows untouched rows neutral; that state must stay in memory.
+    for sample in samples:
+        sample.necessita_revisao_humana = False
+        sample.low_confidence = False
+    journal = ReviewJournal(path)
+    _review(journal, samples, 1, "ok")
+
+    data_loader.compact_journal(path, samples, journal=journal)
+
+    written = json.loads(path.read_text(encoding="utf-8"))
+    assert written["amostras"][1]["validado"] is True
+    assert written["amostras"][1]["history"][0]["notes"] == "ok"
+    payload["amostras"][1] = written["amostras"][1]
+    assert path.read_text(encoding="utf-8") == json.dumps(
+        payload, ensure_ascii=False, indent=2
+    )
+    flags = [raw["necessita_revisao_humana"] for raw in written["amostras"]]
+    assert flags == [True, False, True, True]
+
+
+def test_discard_until_keeps_records_after_the_offset(tmp_path: Path) -> None:
+    path = _write_dataset(tmp_path)
+    _, samples = data_loader.load_dataset(path)
+    journal = ReviewJournal(path)
+    _review(journal, samples, 0, "antes")
+    offset = journal.offset()
+    _review(journal, samples, 1, "durante")
+
+    journal.discard_until(offset)
+
+    assert journal.pending == 1
+    assert [record["row"] for record in read_journal(journal.path)] == [1]
+
+
+def test_chunked_load_replays_and_skips_foreign_records(
+    tmp_path: Path,
+) -> None:
+    path = _write_dataset(tmp_path, count=5)
+    _, samples = data_loader.load_dataset(path)
+    journal = ReviewJournal(path)
+    _review(journal, samples, 3, "ok")
+    samples[4].id = "OUTRO"
+    _review(journal, samples, 4, "outro dataset")
+    journal.close()
+
+    chunks = list(
+        data_loader.iter_dataset_chunks(path, chunk_size=2, first_chunk_size=1)
+    )
+    loaded = [sample for chunk in chunks for sample in chunk.samples]
+
+    assert getattr(chunks[-1].metadata, "_journal_replayed") == 1
+    assert loaded[3].validado is True
+    assert loaded[4].validado is False
+
+
+def test_replay_skips_records_of_a_reparsed_dataset(tmp_path: Path) -> None:
+    path = _write_dataset(tmp_path)
+    _, samples = data_loader.load_dataset(path)
+    journal = ReviewJournal(path)
+    _review(journal, samples, 1, "ok")
+    journal.close()
+    # Parsed again outside VAEST: T_0002 now names another annotation.
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload["amostras"][1]["trecho_alvo"] = "outro trecho"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+    metadata, reloaded = data_loader.load_dataset(path)
+    chunks = list(data_loader.iter_dataset_chunks(path))
+    data_loader.compact_journal(path, samples, journal=journal)
+
+    assert getattr(metadata, "_journal_replayed") == 0
+    assert reloaded[1].validado is False
+    assert chunks[-1].samples[1].validado is False
+    raw = json.loads(path.read_text(encoding="utf-8"))["amostras"][1]
+    assert raw.get("validado") is None
+    assert raw["trecho_alvo"] == "outro trecho"
+
+
+def test_dataset_writes_use_their_own_temporary_file(tmp_path: Path) -> None:
+    path = _write_dataset(tmp_path)
+    path.chmod(0o640)
+    # Another writer (the parser) is halfway through its own temp file.
+    foreign = path.with_name(path.name + ".tmp")
+    foreign.write_text("{", encoding="utf-8")
+
+    data_loader.write_dataset_payload(path, {"metadata": {}, "amostras": []})
+
+    assert foreign.read_text(encoding="utf-8") == "{"
+    assert sorted(item.name for item in tmp_path.iterdir()) == [
+        "dataset.json",
+        "dataset.json.tmp",
+    ]
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert json.loads(path.read_text(encoding="utf-8"))["amostras"] == []
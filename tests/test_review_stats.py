@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from validator_app.models import AnnotationSample
+from validator_app.review_stats import (
+    ReviewStats,
+    review_status,
+    stats_key,
+)
+from validator_app.row_index import NavigationIndex
+
+
+def _sample(index: int, tag: str) -> AnnotationSample:
+    return AnnotationSample(
+        id=f"T_{index:04d}",
+        tag=tag,
+        nome="Simplificacao",
+        tipo_nivel="lexical",
+        contexto_anotacao="texto",
+        paragrafo_alvo_id="A_001",
+        paragrafo_fonte_ids=["F_001"],
+        fonte_alinhamento_confiavel=True,
+        texto_paragrafo_alvo="alvo",
+        texto_paragrafo_fonte="fonte",
+        trecho_alvo="alvo",
+        trecho_fonte="fonte",
+        necessita_revisao_humana=index % 4 == 0,
+        motivo_revisao=None,
+    )
+
+
+def _samples(count: int = 12) -> list[AnnotationSample]:
+    return [
+        _sample(index, ("SL+", "RF+")[index % 2]) for index in range(count)
+    ]
+
+
+def test_review_stats_follow_edits_like_a_recount() -> None:
+    samples = _samples()
+    stats = ReviewStats()
+    stats.extend(samples[:5])
+    stats.extend(samples[5:])
+
+    for row, reviewer in ((1, "ana"), (2, "bia"), (4, None)):
+        samples[row].validado = True
+        samples[row].reviewer = reviewer
+        stats.update(row, samples[row])
+    samples[3].tag = "OM+"
+    samples[3].necessita_revisao_humana = True
+    stats.update(3, samples[3])
+
+    assert stats._counts == Counter(stats_key(sample) for sample in samples)
+    assert stats.progress() == (3, 12)
+    assert stats.count(tag="SL+", status="pendente") == 2
+    assert stats.count(reviewer="ana") == 1
+    assert stats.by_tag()["OM+"] == {
+        "validado": 0,
+        "revisar": 1,
+        "pendente": 0,
+    }
+    assert stats.by_reviewer()["bia"]["validado"] == 1
+    assert review_status(samples[8]) == "revisar"
+
+
+def test_navigation_finds_unresolved_rows_of_a_tag_and_wraps() -> None:
+    samples = _samples()
+    index = NavigationIndex()
+    index.rebuild(samples)
+    for row in (2, 6):
+        samples[row].validado = True
+        index.update(row, samples[row])
+
+    assert index.next_status_row(0, tag="SL+") == 4
+    assert index.next_status_row(4, statuses=("revisar",)) == 8
+    assert index.next_status_row(10, tag="SL+") == 0
+    assert index.next_status_row(3, statuses=("validado",), tag="RF+") is None
+    assert index.next_status_row(-1, statuses=("validado",)) == 2
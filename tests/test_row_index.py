@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from validator_app.models import AnnotationSample
+from validator_app.row_index import (
+    LOW_CONFIDENCE,
+    NEEDS_REVIEW,
+    UNVALIDATED,
+    NavigationIndex,
+    SortedRows,
+)
+
+
+def _sample(index: int) -> AnnotationSample:
+    return AnnotationSample(
+        id=f"T_{index:04d}",
+        tag=("SL+", "RF+", "OM+")[index % 3],
+        nome="Simplificacao",
+        tipo_nivel="lexical",
+        contexto_anotacao="texto",
+        paragrafo_alvo_id="A_001",
+        paragrafo_fonte_ids=["F_001"],
+        fonte_alinhamento_confiavel=True,
+        texto_paragrafo_alvo="alvo",
+        texto_paragrafo_fonte="fonte",
+        trecho_alvo="alvo",
+        trecho_fonte="fonte",
+        necessita_revisao_humana=index % 5 == 0,
+        motivo_revisao=None,
+        low_confidence=index == 7,
+    )
+
+
+def test_sorted_rows_step_both_ways_and_wrap() -> None:
+    rows = SortedRows([9, 3, 6, 3])
+    rows.add(12)
+    rows.add(1)
+    rows.discard(6)
+
+    assert list(rows) == [1, 3, 9, 12]
+    assert rows.next_after(3) == 9
+    assert rows.next_after(12) == 1
+    assert rows.next_after(12, wrap=False) is None
+    assert rows.previous_before(9) == 3
+    assert rows.previous_before(1) == 12
+    assert rows.previous_before(-1) == 12
+    assert 9 in rows and 6 not in rows
+
+
+def test_navigation_index_matches_a_rebuild_after_edits() -> None:
+    samples = [_sample(index) for index in range(20)]
+    index = NavigationIndex()
+    index.extend(samples[:8])
+    index.extend(samples[8:])
+
+    samples[5].validado = True
+    samples[5].necessita_revisao_humana = False
+    samples[7].low_confidence = False
+    samples[12].low_confidence = True
+    samples[3].tag = "SL+"
+    for row in (5, 7, 12, 3):
+        index.update(row, samples[row])
+
+    rebuilt = NavigationIndex()
+    rebuilt.rebuild(samples)
+    for key in (NEEDS_REVIEW, LOW_CONFIDENCE, UNVALIDATED, ("tag", "SL+")):
+        assert list(index.rows(key)) == list(rebuilt.rows(key))
+
+    assert index.next_row(NEEDS_REVIEW, 0) == 10
+    assert index.previous_row(NEEDS_REVIEW, 10) == 0
+    assert index.next_row(LOW_CONFIDENCE, 12) == 12
+    assert index.next_row(UNVALIDATED, 4) == 6
+    assert index.next_row(("tag", "SL+"), 0) == 3
+    assert index.next_row(("tag", "XX+"), 0) is None
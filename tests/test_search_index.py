@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from validator_app.models import AnnotationSample
+from validator_app.search_index import SearchIndex, fold_text, tokenize
+
+
+def _sample(index: int, **overrides) -> AnnotationSample:
+    fields = {
+        "id": f"T_{index:04d}",
+        "tag": "SL+",
+        "nome": "Simplificacao",
+        "tipo_nivel": "lexical",
+        "contexto_anotacao": "",
+        "paragrafo_alvo_id": f"A_{index:03d}",
+        "paragrafo_fonte_ids": [],
+        "fonte_alinhamento_confiavel": True,
+        "texto_paragrafo_alvo": "",
+        "texto_paragrafo_fonte": None,
+        "trecho_alvo": None,
+        "trecho_fonte": None,
+        "necessita_revisao_humana": False,
+        "motivo_revisao": None,
+    }
+    fields.update(overrides)
+    return AnnotationSample(**fields)
+
+
+def test_fold_text_ignores_case_and_accents() -> None:
+    assert fold_text("Revisão ÁGUA") == "revisao agua"
+    assert tokenize("Pátria, amada!") == ["patria", "amada"]
+
+
+def test_search_matches_all_terms_by_prefix_across_fields() -> None:
+    index = SearchIndex()
+    index.rebuild(
+        [
+            _sample(0, contexto_anotacao="O patriotismo é uma virtude"),
+            _sample(1, texto_paragrafo_alvo="Amor à pátria", reviewer="Ana"),
+            _sample(2, texto_paragrafo_fonte="Pátria amada", trecho_alvo="x"),
+            _sample(3, motivo_revisao="Conferir alinhamento"),
+        ]
+    )
+
+    assert index.search("") is None
+    assert index.search("PATRI") == {0, 1, 2}
+    assert index.search("patria ana") == {1}
+    assert index.search("alinham") == {3}
+    assert index.search("inexistente") == set()
+
+
+def test_update_and_extend_keep_the_index_current() -> None:
+    samples = [_sample(0, trecho_alvo="simples"), _sample(1)]
+    index = SearchIndex()
+    index.rebuild(samples)
+
+    samples[1].motivo_revisao = "Revisar trecho"
+    samples[0].trecho_alvo = "claro"
+    index.update(1, samples[1])
+    index.update(0, samples[0])
+    index.extend([_sample(2, reviewer="revisora")])
+
+    assert index.search("revis") == {1, 2}
+    assert index.search("simples") == set()
+    assert index.search("claro") == {0}
+    assert len(index) == 3
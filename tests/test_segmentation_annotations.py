@@ -54,3 +54,51 @@ def test_extract_annotations_supports_composite_and_bodyless_tags():
     assert "[RF+" not in cleaned["A_001"]
     assert "[DL+]" not in cleaned["A_001"]
     assert "[IN+]" not in cleaned["A_001"]
+
+
+def test_lex_paragraph_maps_spans_and_offsets():
+    text = "Primeira frase.  Texto [nota] alvo aqui [RF+ corpo]\nfim [OM+]."
+
+    lexed = annotations.lex_paragraph("A_001", text)
+
+    assert lexed.clean == "Primeira frase. Texto [nota] alvo aqui fim ."
+    first, second = lexed.annotations
+    assert first["trecho_alvo"] == "Texto [nota] alvo aqui"
+    assert (
+        lexed.clean[first["trecho_alvo_inicio"]:first["trecho_alvo_fim"]]
+        == first["trecho_alvo"]
+    )
+    assert second["trecho_alvo"] == "Texto [nota] alvo aqui fim"
+
+    for clean_pos, char in enumerate(lexed.clean):
+        raw_pos = lexed.offsets.to_raw(clean_pos)
+        if char != " ":
+            assert text[raw_pos] == char
+        assert lexed.offsets.to_clean(raw_pos) == clean_pos
+    # Offsets inside a removed block map to the next clean character.
+    assert lexed.offsets.to_clean(text.index("[RF+") + 2) == lexed.clean.index(
+        "fim"
+    )
+
+
+def test_iter_paragraphs_matches_batch_segmentation(
+    tmp_path, source_fixture_path, target_fixture_path, monkeypatch
+):
+    monkeypatch.setattr(segmentation, "_READ_CHUNK_CHARS", 5)
+    one_per_line = tmp_path / "linhas.md"
+    one_per_line.write_text("Primeira linha\nSegunda linha\n", encoding="utf-8")
+    single_block = tmp_path / "bloco.md"
+    single_block.write_text("Linha um\nLinha dois\n\n\n", encoding="utf-8")
+
+    for path in (
+        source_fixture_path,
+        target_fixture_path,
+        one_per_line,
+        single_block,
+    ):
+        expected = segmentation._split_paragraphs(path.read_text("utf-8"))
+        assert list(segmentation.iter_paragraphs(path)) == expected
+
+    assert dict(segmentation.iter_target(target_fixture_path)) == (
+        segmentation.segment_target(str(target_fixture_path))
+    )
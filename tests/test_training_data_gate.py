@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gzip
 import json
 from pathlib import Path
 
@@ -245,3 +246,156 @@ def test_quality_gate_fails_on_blocking_issues(tmp_path: Path) -> None:
     assert status["parse_coverage"] is False
     assert status["split_leakage"] is False
     assert status["dataset_card_completeness"] is False
+
+
+def test_near_duplicate_gate_flags_reused_passages_across_splits(
+    tmp_path: Path,
+) -> None:
+    dataset_path = tmp_path / "dataset_curated.json"
+    passage = (
+        "O patriotismo e um sentimento de amor e dedicacao a patria, "
+        "aos seus simbolos e ao seu povo."
+    )
+    rows = []
+    for index, (group, text) in enumerate(
+        [
+            ("DOC1", passage),
+            ("DOC2", passage.replace("dedicacao", "devocao")),
+            ("DOC3", "Outro paragrafo sem relacao com os demais textos."),
+        ]
+    ):
+        rows.append(
+            {
+                "sample_id": f"S{index}",
+                "document_id": group,
+                "split_group_id": group,
+                "tag_code": "SL+",
+                "label_scope": "automatic",
+                "target_text": text,
+                "target_span_text": "patriotismo",
+            }
+        )
+    _write_json(dataset_path, {"metadata": _base_metadata(), "amostras": rows})
+    split_paths = {}
+    for split, groups in (
+        ("train", ["DOC1", "DOC3"]),
+        ("validation", []),
+        ("test", ["DOC2"]),
+    ):
+        split_paths[split] = tmp_path / f"{split}.jsonl"
+        _write_jsonl(
+            split_paths[split], [{"split_group_id": g} for g in groups]
+        )
+
+    def _near_duplicate_gate(**options) -> gate.GateResult:
+        report = gate.evaluate_dataset(dataset_path=dataset_path, **options)
+        return next(
+            result
+            for result in report.gate_results
+            if result.name == "near_duplicate_leakage"
+        )
+
+    leaked = _near_duplicate_gate(
+        train_jsonl=split_paths["train"],
+        validation_jsonl=split_paths["validation"],
+        test_jsonl=split_paths["test"],
+    )
+    assert leaked.passed is False
+    assert leaked.observed == "1 clusters (2 rows)"
+
+    strict = _near_duplicate_gate(near_duplicate_threshold=0.99)
+    assert strict.passed is True
+
+
+def _mixed_rows() -> list[dict]:
+    rows = []
+    for index in range(30):
+        rows.append(
+            {
+                "sample_id": f"S{index:03d}",
+                "document_id": f"DOC{index % 4}",
+                "split_group_id": f"DOC{index % 4}",
+                "tag_code": ("SL+", "RF+", "OM+", "RD+")[index % 4],
+                "label_scope": "automatic",
+                "target_paragraph_id": f"A_{index % 7:03d}",
+                "target_text": f"Paragrafo alvo numero {index % 7} do texto.",
+                "target_span_text": f"trecho {index % 2}",
+                "source_paragraph_ids": [] if index % 6 == 0 else ["F_001"],
+                "source_text": "fonte",
+                "alignment_confidence": (index % 10) / 10,
+                "human_validated": index % 3 == 0,
+                "split": ("train", "validation", "test")[index % 3],
+            }
+        )
+    return rows
+
+
+def test_gate_suite_merges_partial_runs_into_the_single_pass_result(
+    tmp_path: Path,
+) -> None:
+    dataset_path = tmp_path / "dataset_curated.json"
+    rows = _mixed_rows()
+    _write_json(dataset_path, {"metadata": _base_metadata(), "amostras": rows})
+    samples = list(gate.iter_dataset_samples(dataset_path))
+
+    whole = gate.GateSuite(dataset_card=tmp_path / "missing.md")
+    for sample in samples:
+        whole.update(sample)
+    parts = [gate.GateSuite(dataset_card=tmp_path / "missing.md")]
+    for start in range(0, len(samples), 7):
+        part = gate.GateSuite(dataset_card=tmp_path / "missing.md")
+        for sample in samples[start : start + 7]:
+            part.update(sample)
+        parts.append(part)
+    merged = parts[0]
+    for part in reversed(parts[1:]):
+        merged.merge(part)
+
+    assert merged.sample_count == whole.sample_count == 30
+    assert merged.results() == whole.results()
+    observed = {result.name: result.observed for result in whole.results()}
+    assert observed["duplicate_supervised_keys"] != "0"
+    assert observed["split_leakage"] != "0"
+
+
+def test_evaluate_dataset_reads_gzip_jsonl_like_json(tmp_path: Path) -> None:
+    rows = _mixed_rows()
+    json_path = tmp_path / "dataset_raw.json"
+    _write_json(json_path, {"metadata": {}, "amostras": rows})
+    jsonl_path = tmp_path / "dataset_raw.jsonl.gz"
+    with gzip.open(jsonl_path, "wt", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    from_json = gate.evaluate_dataset(json_path)
+    from_jsonl = gate.evaluate_dataset(jsonl_path)
+
+    assert gate.dataset_exists(jsonl_path)
+    assert not gate.dataset_exists(tmp_path / "other.jsonl")
+    assert from_jsonl.sample_count == from_json.sample_count == 30
+    assert from_jsonl.gate_results == from_json.gate_results
+
+
+def test_parallel_evaluation_matches_a_single_process(tmp_path: Path) -> None:
+    rows = _mixed_rows()
+    dataset_path = tmp_path / "dataset_raw.jsonl"
+    _write_jsonl(dataset_path, rows)
+    splits = {}
+    for split in ("train", "validation", "test"):
+        splits[split] = tmp_path / f"{split}.jsonl"
+        _write_jsonl(
+            splits[split], [row for row in rows if row["split"] == split]
+        )
+    options = {
+        "train_jsonl": splits["train"],
+        "validation_jsonl": splits["validation"],
+        "test_jsonl": splits["test"],
+    }
+
+    single = gate.evaluate_dataset(dataset_path, **options)
+    parallel = gate.evaluate_dataset(
+        dataset_path, workers=2, min_part_bytes=256, **options
+    )
+
+    assert parallel.sample_count == single.sample_count == 30
+    assert parallel.gate_results == single.gate_results
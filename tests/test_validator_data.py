@@ -3,6 +3,9 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
+from parser.paragraph_table import pack_dataset
 from validator_app import data_loader
 
 
@@ -249,3 +252,128 @@ def test_save_dataset_roundtrip_syncs_hybrid_mirror_fields(tmp_path):
 
     # Unknown fields are preserved.
     assert row["legacy_only_custom"] == "keep-this"
+
+
+def test_load_and_save_v3_paragraph_table_layout(tmp_path):
+    inline_path = _write_sample_dataset_v2_hybrid(tmp_path)
+    payload = json.loads(inline_path.read_text(encoding="utf-8"))
+    payload["amostras"].append(
+        {**payload["amostras"][0], "sample_id": "S_0002", "id": "LEG_0002"}
+    )
+    packed = pack_dataset(payload)
+    assert packed["paragrafos"] == {
+        "alvo": {"A_001": "alvo"},
+        "fonte": {"F_001": "fonte"},
+    }
+    assert "target_text" not in packed["amostras"][1]
+    packed_path = tmp_path / "dataset_v3.json"
+    packed_path.write_text(json.dumps(packed), encoding="utf-8")
+
+    metadata, samples = data_loader.load_dataset(packed_path)
+    assert [sample.texto_paragrafo_alvo for sample in samples] == [
+        "alvo",
+        "alvo",
+    ]
+    assert samples[1].texto_paragrafo_fonte == "fonte"
+
+    samples[1].validado = True
+    output_path = tmp_path / "out_v3.json"
+    data_loader.save_dataset(output_path, metadata, samples)
+    saved = json.loads(output_path.read_text(encoding="utf-8"))
+    assert saved["paragrafos"] == packed["paragrafos"]
+    assert saved["amostras"][1]["target_text_ref"] == "A_001"
+
+    inline_out = tmp_path / "out_inline.json"
+    data_loader.save_dataset(inline_out, metadata, samples, layout="inline")
+    inline = json.loads(inline_out.read_text(encoding="utf-8"))
+    assert "paragrafos" not in inline
+    assert inline["amostras"][1]["texto_paragrafo_alvo"] == "alvo"
+    assert inline["amostras"][1]["human_validated"] is True
+
+
+def test_load_v3_dataset_with_missing_paragraph_fails(tmp_path):
+    payload = pack_dataset(
+        json.loads(
+            _write_sample_dataset(tmp_path).read_text(encoding="utf-8")
+        )
+    )
+    payload["paragrafos"]["alvo"].clear()
+    path = tmp_path / "broken_v3.json"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+    with pytest.raises(data_loader.DatasetLoadError, match="A_001"):
+        data_loader.load_dataset(path)
+
+
+def _write_many(tmp_path: Path, payload: dict, name: str) -> Path:
+    path = tmp_path / name
+    path.write_text(
+        json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    return path
+
+
+def test_iter_dataset_chunks_matches_load_dataset(tmp_path):
+    base = json.loads(
+        _write_sample_dataset_v2_hybrid(tmp_path).read_text(encoding="utf-8")
+    )
+    rows = [
+        {**base["amostras"][0], "sample_id": f"S_{idx:04d}"}
+        for idx in range(25)
+    ]
+    inline = {"metadata": base["metadata"], "amostras": rows}
+    for name, payload in (
+        ("inline.json", inline),
+        ("v3.json", pack_dataset(inline)),
+    ):
+        path = _write_many(tmp_path, payload, name)
+        metadata, samples = data_loader.load_dataset(path)
+
+        chunks = list(
+            data_loader.iter_dataset_chunks(
+                path, chunk_size=10, first_chunk_size=3
+            )
+        )
+
+        assert [len(chunk.samples) for chunk in chunks] == [3, 10, 10, 2]
+        assert chunks[-1].position == chunks[-1].size
+        assert all(
+            earlier.position <= later.position
+            for earlier, later in zip(chunks, chunks[1:])
+        )
+        loaded = [sample for chunk in chunks for sample in chunk.samples]
+        assert [sample.to_dict() for sample in loaded] == [
+            sample.to_dict() for sample in samples
+        ]
+        assert chunks[-1].metadata == metadata
+        assert getattr(chunks[-1].metadata, "_layout") == getattr(
+            metadata, "_layout"
+        )
+
+
+def test_iter_dataset_chunks_handles_trailing_metadata_and_tables(tmp_path):
+    packed = pack_dataset(
+        json.loads(
+            _write_sample_dataset(tmp_path).read_text(encoding="utf-8")
+        )
+    )
+    reordered = {
+        "amostras": packed["amostras"],
+        "paragrafos": packed["paragrafos"],
+        "metadata": packed["metadata"],
+    }
+    path = _write_many(tmp_path, reordered, "reordered.json")
+
+    chunks = list(data_loader.iter_dataset_chunks(path, first_chunk_size=1))
+
+    samples = [sample for chunk in chunks for sample in chunk.samples]
+    assert [sample.texto_paragrafo_alvo for sample in samples] == ["alvo"]
+    assert chunks[-1].metadata.projeto == "Teste"
+
+
+def test_iter_dataset_chunks_reports_invalid_json(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"metadata": {}, "amostras": [{"id": 1},', "utf-8")
+
+    with pytest.raises(data_loader.DatasetLoadError):
+        list(data_loader.iter_dataset_chunks(path))
@@ -6,7 +6,6 @@ import argparse
 from pathlib import Path
 
 from .data_loader import load_dataset
-from .view import run
 
 
 def _parse_args() -> argparse.Namespace:
@@ -40,6 +39,9 @@ def main() -> None:
         )
         return
 
+    # Imported here so headless runs never load Qt.
+    from .view import run
+
     run(dataset_path=args.dataset_path)
 
 
@@ -3,6 +3,18 @@
 from __future__ import annotations
 
 import html
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from parser.segmentation import _split_paragraphs
+
+from .models import AnnotationSample
+
+# Paragraphs shown on each side of the aligned one in a fallback document.
+CONTEXT_WINDOW = 2
+CONTEXT_CACHE_SIZE = 256
+_PARAGRAPH_NUMBER_RE = re.compile(r"_(\d+)$")
 
 
 EMPTY_CONTEXT_HTML = (
@@ -15,11 +27,13 @@ EMPTY_CONTEXT_HTML = (
 def build_highlighted_html(
     text: str | None,
     excerpt: str | None,
+    search_from: int = 0,
 ) -> tuple[str, bool]:
     """Return HTML for a read-only context box with optional highlight.
 
     Returns a tuple ``(html, has_focus_anchor)``. When ``has_focus_anchor`` is
     True, the HTML includes a ``focus`` anchor that callers can scroll to.
+    The excerpt is looked up from ``search_from`` first, then from the start.
     """
 
     body = text or ""
@@ -28,7 +42,10 @@ def build_highlighted_html(
 
     snippet = (excerpt or "").strip()
     if snippet:
-        start = body.casefold().find(snippet.casefold())
+        folded = body.casefold()
+        start = folded.find(snippet.casefold(), search_from)
+        if start < 0 and search_from:
+            start = folded.find(snippet.casefold())
         if start >= 0:
             end = start + len(snippet)
             before = html.escape(body[:start])
@@ -49,3 +66,118 @@ def build_highlighted_html(
         "</div>"
     )
     return rendered, False
+
+
+def paragraph_number(paragraph_id: str | None) -> Optional[int]:
+    """Return the 0-based position encoded in an ID such as ``A_007``."""
+
+    match = _PARAGRAPH_NUMBER_RE.search(paragraph_id or "")
+    if match is None or int(match.group(1)) < 1:
+        return None
+    return int(match.group(1)) - 1
+
+
+class ContextRenderer:
+    """Renders paragraph-windowed context HTML through an LRU cache.
+
+    Samples that carry their paragraph text render just that text. For
+    samples without it, only the aligned paragraphs of the associated
+    source/target document plus ``window`` neighbours on each side are
+    escaped and rendered, instead of the whole document.
+    """
+
+    def __init__(
+        self,
+        window: int = CONTEXT_WINDOW,
+        cache_size: int = CONTEXT_CACHE_SIZE,
+    ) -> None:
+        self.window = max(0, window)
+        self.cache_size = max(1, cache_size)
+        self._documents: Dict[str, List[str]] = {"fonte": [], "alvo": []}
+        self._cache: "OrderedDict[tuple, Tuple[str, bool]]" = OrderedDict()
+
+    def set_documents(
+        self, source_text: str | None, target_text: str | None
+    ) -> None:
+        self._documents = {
+            "fonte": _split_paragraphs(source_text) if source_text else [],
+            "alvo": _split_paragraphs(target_text) if target_text else [],
+        }
+        self._cache.clear()
+
+    @staticmethod
+    def _fields(
+        kind: str, sample: AnnotationSample
+    ) -> Tuple[str, Sequence[str], str]:
+        if kind == "fonte":
+            return (
+                sample.texto_paragrafo_fonte or "",
+                sample.paragrafo_fonte_ids,
+                sample.trecho_fonte or "",
+            )
+        return (
+            sample.texto_paragrafo_alvo or "",
+            [sample.paragrafo_alvo_id],
+            sample.trecho_alvo or "",
+        )
+
+    def _window_range(
+        self, paragraphs: List[str], ids: Sequence[str], excerpt: str
+    ) -> Tuple[int, int]:
+        positions = [
+            number
+            for number in map(paragraph_number, ids)
+            if number is not None and number < len(paragraphs)
+        ]
+        if not positions and excerpt.strip():
+            needle = excerpt.strip().casefold()
+            positions = [
+                index
+                for index, paragraph in enumerate(paragraphs)
+                if needle in paragraph.casefold()
+            ][:1]
+        if not positions:
+            return 0, 0
+        return min(positions), max(positions) + 1
+
+    def render(self, kind: str, sample: AnnotationSample) -> Tuple[str, bool]:
+        """Return ``(html, has_focus_anchor)`` for the "fonte"/"alvo" box."""
+
+        text, ids, excerpt = self._fields(kind, sample)
+        if text:
+            key: tuple = (kind, tuple(ids), text, excerpt)
+        else:
+            paragraphs = self._documents.get(kind, [])
+            first, last = self._window_range(paragraphs, ids, excerpt)
+            key = (kind, first, last, excerpt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        if text:
+            rendered = build_highlighted_html(text, excerpt)
+        elif last > first or not paragraphs:
+            start = max(0, first - self.window)
+            before = paragraphs[start:first]
+            window_text = "\n\n".join(
+                before + paragraphs[first : last + self.window]
+            )
+            offset = sum(len(part) + 2 for part in before)
+            rendered = build_highlighted_html(window_text, excerpt, offset)
+        else:
+            # No aligned paragraph: show the opening of the document.
+            rendered = build_highlighted_html(
+                "\n\n".join(paragraphs[: 2 * self.window + 1]), excerpt
+            )
+
+        self._cache[key] = rendered
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rendered
+
+    def prefetch(self, sample: AnnotationSample) -> None:
+        """Render ``sample``'s context into the cache ahead of time."""
+
+        self.render("fonte", sample)
+        self.render("alvo", sample)
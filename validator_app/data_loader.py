@@ -3,13 +3,37 @@
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from parser.paragraph_table import (
+    REF_FIELDS,
+    ParagraphTableError,
+    is_packed,
+    pack_dataset,
+    unpack_dataset,
+    unpack_row,
+)
 
 from .models import AnnotationSample, Metadata
+from .review_journal import (
+    REVIEW_STATE_FIELDS,
+    ReviewJournal,
+    apply_record,
+    content_fingerprint,
+    journal_path_for,
+    read_journal,
+    records_by_row,
+    replay_records,
+)
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 DEFAULT_DATASET = BASE_DIR / "dataset_raw.json"
+DEFAULT_CHUNK_SIZE = 1000
+FIRST_CHUNK_SIZE = 100
+_WHITESPACE = " \t\n\r"
 
 
 class DatasetLoadError(RuntimeError):
@@ -196,7 +220,8 @@ def _coerce_sample(raw: dict) -> AnnotationSample:
         )
 
     setattr(sample, "_schema", "canonical_v2" if is_canonical else "legacy")
-    setattr(sample, "_raw_row", dict(raw))
+    # Rows come straight from a decode, so the sample can own them.
+    setattr(sample, "_raw_row", raw)
     return sample
 
 
@@ -332,8 +357,13 @@ def _serialize_sample(sample: AnnotationSample) -> dict:
 
 def load_dataset(
     path: Path | str | None = None,
+    replay_journal: bool = True,
 ) -> Tuple[Metadata, List[AnnotationSample]]:
-    """Load dataset JSON and convert it to domain objects."""
+    """Load dataset JSON and convert it to domain objects.
+
+    Review records left in the dataset journal (see `review_journal`) are
+    replayed on top of the file unless ``replay_journal`` is False.
+    """
 
     target_path = Path(path) if path else DEFAULT_DATASET
     if not target_path.exists():
@@ -344,24 +374,314 @@ def load_dataset(
     except json.JSONDecodeError as exc:  # pragma: no cover - unreproducible
         raise DatasetLoadError(f"JSON invalido em {target_path}") from exc
 
+    layout = "v3" if is_packed(payload) else "inline"
+    try:
+        payload = unpack_dataset(payload)
+    except ParagraphTableError as exc:
+        raise DatasetLoadError(f"{exc} em {target_path}") from exc
+
     metadata = _coerce_metadata(payload.get("metadata", {}))
+    setattr(metadata, "_layout", layout)
     samples = [_coerce_sample(item) for item in payload.get("amostras", [])]
+    replayed = 0
+    if replay_journal:
+        replayed, _ = replay_records(
+            samples, read_journal(journal_path_for(target_path))
+        )
+    setattr(metadata, "_journal_replayed", replayed)
     return metadata, samples
 
 
-def save_dataset(
-    path: Path | str,
+class DatasetChunk(NamedTuple):
+    """One batch of samples from `iter_dataset_chunks`."""
+
+    metadata: Metadata
+    samples: List[AnnotationSample]
+    position: int
+    size: int
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _expect(text: str, pos: int, chars: str) -> Tuple[str, int]:
+    pos = _skip_whitespace(text, pos)
+    if pos >= len(text) or text[pos] not in chars:
+        raise json.JSONDecodeError(f"Esperava {chars!r}", text, pos)
+    return text[pos], pos + 1
+
+
+def _iter_payload(text: str) -> Iterator[Tuple[str, object, int]]:
+    """Yield ``(key, value, end)`` for the top-level object in ``text``.
+
+    ``amostras`` is yielded one row at a time (``key`` stays "amostras"),
+    so rows can be used before the rest of the array is decoded.
+    """
+
+    decoder = json.JSONDecoder()
+    _, pos = _expect(text, 0, "{")
+    if text.startswith("}", _skip_whitespace(text, pos)):
+        return
+    while True:
+        pos = _skip_whitespace(text, pos)
+        key, pos = decoder.raw_decode(text, pos)
+        _, pos = _expect(text, pos, ":")
+        pos = _skip_whitespace(text, pos)
+        if key == "amostras" and text.startswith("[", pos):
+            pos = _skip_whitespace(text, pos + 1)
+            if text.startswith("]", pos):
+                pos += 1
+            else:
+                while True:
+                    row, pos = decoder.raw_decode(text, pos)
+                    yield key, row, pos
+                    char, pos = _expect(text, pos, ",]")
+                    pos = _skip_whitespace(text, pos)
+                    if char == "]":
+                        break
+        else:
+            value, pos = decoder.raw_decode(text, pos)
+            yield key, value, pos
+        char, pos = _expect(text, pos, ",}")
+        if char == "}":
+            return
+
+
+def iter_dataset_chunks(
+    path: Path | str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    first_chunk_size: int = FIRST_CHUNK_SIZE,
+) -> Iterator[DatasetChunk]:
+    """Load a dataset incrementally, ``chunk_size`` samples at a time.
+
+    The ``amostras`` array is decoded row by row, so the first (smaller)
+    chunk is available long before the whole file is parsed. Samples are
+    built exactly as in `load_dataset`; ``metadata`` of the last chunk is
+    authoritative when the file stores it after the samples. The last
+    chunk may be empty. Journal records are replayed as in `load_dataset`,
+    before each sample is yielded.
+    """
+
+    target_path = Path(path) if path else DEFAULT_DATASET
+    if not target_path.exists():
+        raise DatasetLoadError(f"Nao encontrei o arquivo: {target_path}")
+    text = target_path.read_text(encoding="utf-8")
+    pending = records_by_row(read_journal(journal_path_for(target_path)))
+    replayed = 0
+
+    head: dict = {}
+    metadata: Metadata | None = None
+    deferred: List[dict] = []
+    batch: List[AnnotationSample] = []
+    limit = max(1, first_chunk_size)
+    position = 0
+    row_count = 0
+
+    def build_sample(raw: dict) -> AnnotationSample:
+        nonlocal replayed, row_count
+        sample = _coerce_sample(raw)
+        for record in pending.pop(row_count, ()):
+            replayed += apply_record(sample, record)
+        row_count += 1
+        return sample
+
+    def current_metadata() -> Metadata:
+        nonlocal metadata
+        if metadata is None:
+            raw = head.get("metadata")
+            metadata = _coerce_metadata(raw if isinstance(raw, dict) else {})
+            setattr(
+                metadata,
+                "_layout",
+                "v3" if "paragrafos" in head else "inline",
+            )
+        return metadata
+
+    try:
+        for key, value, position in _iter_payload(text):
+            if key != "amostras":
+                head[key] = value
+                if key == "metadata" and metadata is not None:
+                    metadata = None
+                continue
+            if not isinstance(value, dict):
+                continue
+            if deferred or (
+                not isinstance(head.get("paragrafos"), dict)
+                and any(name in REF_FIELDS for name in value)
+            ):
+                # Rows reference a paragraph table stored after them.
+                deferred.append(value)
+                continue
+            if isinstance(head.get("paragrafos"), dict):
+                value = unpack_row(value, head["paragrafos"])
+            batch.append(build_sample(value))
+            if len(batch) >= limit:
+                yield DatasetChunk(
+                    current_metadata(), batch, position, len(text)
+                )
+                batch = []
+                limit = max(1, chunk_size)
+        tables = head.get("paragrafos")
+        for value in deferred:
+            if isinstance(tables, dict):
+                value = unpack_row(value, tables)
+            batch.append(build_sample(value))
+    except json.JSONDecodeError as exc:
+        raise DatasetLoadError(f"JSON invalido em {target_path}") from exc
+    except ParagraphTableError as exc:
+        raise DatasetLoadError(f"{exc} em {target_path}") from exc
+
+    metadata = None
+    setattr(current_metadata(), "_journal_replayed", replayed)
+    yield DatasetChunk(current_metadata(), batch, len(text), len(text))
+
+
+def dataset_payload(
     metadata: Metadata,
     samples: Iterable[AnnotationSample],
-) -> None:
-    """Persist the dataset to disk, preserving the parser schema."""
+    layout: str | None = None,
+) -> dict:
+    """Return the JSON payload `save_dataset` writes.
+
+    ``layout`` defaults to the layout the dataset was loaded from; "v3"
+    stores paragraph texts once in the ``paragrafos`` table.
+    """
 
     payload = {
         "metadata": _serialize_metadata(metadata),
         "amostras": [_serialize_sample(sample) for sample in samples],
     }
+    if (layout or getattr(metadata, "_layout", "inline")) == "v3":
+        payload = pack_dataset(payload)
+    return payload
+
+
+def write_dataset_payload(path: Path | str, payload: dict) -> None:
+    """Write ``payload`` through a temporary file and an atomic rename.
+
+    The temporary file name is unique, so writers racing on one dataset
+    (a compaction and the parser) never share it.
+    """
+
     target_path = Path(path)
     target_path.parent.mkdir(parents=True, exist_ok=True)
-    target_path.write_text(
-        json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
+    mode = 0o644
+    if target_path.exists():
+        mode = target_path.stat().st_mode & 0o777
+    fd, temp_name = tempfile.mkstemp(
+        dir=target_path.parent, prefix=target_path.name + ".", suffix=".tmp"
     )
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(payload, ensure_ascii=False, indent=2))
+            handle.flush()
+            os.fsync(handle.fileno())
+        # mkstemp creates the file owner-only; keep the dataset's mode.
+        os.chmod(temp_path, mode)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    os.replace(temp_path, target_path)
+
+
+def save_dataset(
+    path: Path | str,
+    metadata: Metadata,
+    samples: Iterable[AnnotationSample],
+    layout: str | None = None,
+) -> None:
+    """Persist the dataset to disk, preserving the parser schema."""
+
+    write_dataset_payload(path, dataset_payload(metadata, samples, layout))
+
+
+# Persisted keys a review can change, including mirrored canonical ones.
+_REVIEW_KEYS = REVIEW_STATE_FIELDS + (
+    "history",
+    "tag_code",
+    "human_validated",
+    "reviewer_id",
+    "review_notes",
+)
+
+
+def review_patches(
+    samples: List[AnnotationSample], rows: Iterable[int]
+) -> Dict[int, dict]:
+    """Return ``{row: review state}`` of ``rows`` for `patch_dataset`."""
+
+    patches: Dict[int, dict] = {}
+    for row in rows:
+        if 0 <= row < len(samples):
+            sample = samples[row]
+            patch = {
+                field: getattr(sample, field) for field in REVIEW_STATE_FIELDS
+            }
+            patch["id"] = sample.id
+            patch["impressao"] = content_fingerprint(sample)
+            patch["history"] = list(sample.history)
+            patches[row] = patch
+    return patches
+
+
+def patch_dataset(path: Path | str, patches: Dict[int, dict]) -> None:
+    """Write the review state in ``patches`` over the rows of ``path``.
+
+    Only the review keys of the patched rows change; every other row is
+    written back exactly as it was read. A patch whose ``id`` or content
+    fingerprint no longer matches its row is skipped.
+    """
+
+    target_path = Path(path)
+    try:
+        payload = json.loads(target_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise DatasetLoadError(f"JSON invalido em {target_path}") from exc
+    rows = payload.get("amostras", [])
+    tables = payload["paragrafos"] if is_packed(payload) else None
+    for row, patch in patches.items():
+        if not 0 <= row < len(rows) or not isinstance(rows[row], dict):
+            continue
+        raw = rows[row]
+        sample = _coerce_sample(unpack_row(raw, tables) if tables else raw)
+        if sample.id != patch["id"] or (
+            content_fingerprint(sample) != patch["impressao"]
+        ):
+            continue
+        for field in REVIEW_STATE_FIELDS:
+            setattr(sample, field, patch[field])
+        sample.history = list(patch["history"])
+        serialized = _serialize_sample(sample)
+        for key in _REVIEW_KEYS:
+            if key in serialized:
+                raw[key] = serialized[key]
+    write_dataset_payload(target_path, payload)
+
+
+def compact_journal(
+    path: Path | str,
+    samples: List[AnnotationSample],
+    journal: ReviewJournal | None = None,
+    rows: Iterable[int] = (),
+) -> None:
+    """Fold the journal of ``path`` into the dataset and truncate it.
+
+    ``samples`` must already include the journaled changes (as returned by
+    `load_dataset`). Only the journaled rows, plus ``rows``, are patched
+    into the file (see `patch_dataset`), so display-only state of other
+    samples never reaches it. Records appended after the journal offset is
+    taken are kept.
+    """
+
+    journal = journal or ReviewJournal(path)
+    offset = journal.offset()
+    touched = {record["row"] for record in read_journal(journal.path)}
+    touched.update(rows)
+    if touched:
+        patch_dataset(path, review_patches(samples, sorted(touched)))
+    journal.discard_until(offset)
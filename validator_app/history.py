@@ -0,0 +1,182 @@
+"""Audit-history coalescing and archiving for reviewed samples.
+
+Repeated actions (the same action label by the same reviewer) logged
+within a time window of the first one are merged into one entry that
+keeps the first timestamp in ``inicio``, the latest timestamp and notes,
+and the number of merged actions in ``ocorrencias``. Old entries can be
+moved to a JSONL sidecar (``<dataset stem>.history.jsonl``); a marker
+entry left in the sample's history records how many entries went there.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .models import AnnotationSample
+
+# Same-action bursts closer than this are merged into one entry.
+COALESCE_WINDOW_SECONDS = 300.0
+ARCHIVE_ACTION = "Historico arquivado"
+
+
+def history_archive_path_for(dataset_path: Path | str) -> Path:
+    """Return the history sidecar kept next to ``dataset_path``."""
+
+    dataset = Path(dataset_path)
+    return dataset.with_name(f"{dataset.stem}.history.jsonl")
+
+
+def _parse_timestamp(value: object) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _can_merge(last: dict, entry: dict, window: float) -> bool:
+    if window <= 0 or last.get("action") == ARCHIVE_ACTION:
+        return False
+    if last.get("action") != entry.get("action"):
+        return False
+    if last.get("reviewer") != entry.get("reviewer"):
+        return False
+    # Measured from the start of the burst, so a merged entry never spans
+    # more than one window however often the action repeats.
+    started = _parse_timestamp(last.get("inicio", last.get("timestamp")))
+    current = _parse_timestamp(entry.get("timestamp"))
+    if started is None or current is None:
+        return False
+    return 0 <= (current - started).total_seconds() <= window
+
+
+def merge_history_entry(
+    history: List[dict], entry: dict, window: float
+) -> bool:
+    """Fold ``entry`` into the last entry of ``history`` if it repeats it.
+
+    Returns False (and leaves ``history`` alone) when the entry has to be
+    appended instead.
+    """
+
+    if not history or not _can_merge(history[-1], entry, window):
+        return False
+    last = history[-1]
+    merged = {
+        "timestamp": entry["timestamp"],
+        "action": last["action"],
+        "inicio": last.get("inicio", last["timestamp"]),
+        "ocorrencias": int(last.get("ocorrencias", 1))
+        + int(entry.get("ocorrencias", 1)),
+    }
+    if entry.get("reviewer"):
+        merged["reviewer"] = entry["reviewer"]
+    if entry.get("notes"):
+        merged["notes"] = entry["notes"]
+    history[-1] = merged
+    return True
+
+
+def coalesce_history(
+    history: Iterable[dict], window: float = COALESCE_WINDOW_SECONDS
+) -> List[dict]:
+    """Return ``history`` with same-action bursts merged."""
+
+    result: List[dict] = []
+    for entry in history:
+        if not isinstance(entry, dict):
+            continue
+        if not merge_history_entry(result, dict(entry), window):
+            result.append(dict(entry))
+    return result
+
+
+def archive_history(
+    samples: Iterable["AnnotationSample"],
+    archive_path: Path | str,
+    keep_last: int = 10,
+    timestamp: str | None = None,
+    window: float = COALESCE_WINDOW_SECONDS,
+) -> Tuple[int, int]:
+    """Coalesce every history and move all but ``keep_last`` entries out.
+
+    Moved entries are appended to ``archive_path`` as one line per sample
+    (``{"id": ..., "historico": [...]}``) and fsync'd before the samples
+    are touched. Returns ``(samples_archived, entries_archived)``.
+    """
+
+    timestamp = timestamp or datetime.now().isoformat(timespec="seconds")
+    keep_last = max(0, keep_last)
+    archive = Path(archive_path)
+    plans = []
+    lines = []
+    for sample in samples:
+        history = coalesce_history(sample.history, window)
+        cut = max(0, len(history) - keep_last)
+        moved = [
+            entry for entry in history[:cut]
+            if entry.get("action") != ARCHIVE_ACTION
+        ]
+        plans.append((sample, history, cut, len(moved)))
+        if moved:
+            lines.append(
+                json.dumps(
+                    {"id": sample.id, "historico": moved},
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+            )
+
+    if lines:
+        archive.parent.mkdir(parents=True, exist_ok=True)
+        with archive.open("a", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    archived_samples = archived_entries = 0
+    for sample, history, cut, moved in plans:
+        if moved:
+            previous = sum(
+                int(entry.get("arquivadas", 0))
+                for entry in history[:cut]
+                if entry.get("action") == ARCHIVE_ACTION
+            )
+            marker = {
+                "timestamp": timestamp,
+                "action": ARCHIVE_ACTION,
+                "arquivadas": previous + moved,
+                "arquivo": archive.name,
+            }
+            history = [marker] + history[cut:]
+            archived_samples += 1
+            archived_entries += moved
+        sample.history = history
+    return archived_samples, archived_entries
+
+
+def read_history_archive(archive_path: Path | str) -> dict:
+    """Return archived entries per sample ID, oldest first."""
+
+    archive = Path(archive_path)
+    entries: dict = {}
+    if not archive.exists():
+        return entries
+    for line in archive.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and isinstance(
+            record.get("historico"), list
+        ):
+            entries.setdefault(str(record.get("id")), []).extend(
+                record["historico"]
+            )
+    return entries
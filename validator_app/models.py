@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import asdict, dataclass, field
 from typing import List, Optional
 
+from .history import merge_history_entry
+
 
 @dataclass
 class Metadata:
@@ -58,7 +60,14 @@ class AnnotationSample:
         reviewer: Optional[str],
         notes: Optional[str],
         timestamp: str,
+        coalesce_window: float = 0.0,
     ) -> None:
+        """Record an action in ``history``.
+
+        A repeat of the last action by the same reviewer within
+        ``coalesce_window`` seconds updates that entry instead.
+        """
+
         entry = {
             "timestamp": timestamp,
             "action": action,
@@ -67,7 +76,8 @@ class AnnotationSample:
             entry["reviewer"] = reviewer
         if notes:
             entry["notes"] = notes
-        self.history.append(entry)
+        if not merge_history_entry(self.history, entry, coalesce_window):
+            self.history.append(entry)
         self.updated_at = timestamp
         if reviewer:
             self.reviewer = reviewer
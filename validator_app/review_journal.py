@@ -0,0 +1,218 @@
+"""Append-only review journal kept next to a dataset.
+
+Every review action in VAEST appends one JSON line to
+``<dataset stem>.journal.jsonl`` and fsyncs it, so a crash loses at most the
+line being written. Records carry the absolute review state of one sample
+(plus the history entry the action added or merged into), which makes
+replaying them idempotent: a journal that was already folded into the
+dataset can be replayed again without changing anything. `data_loader`
+replays leftover records when a dataset is opened and
+`data_loader.compact_journal` folds them into the dataset JSON. A record
+only replays onto a row with the same ID and content fingerprint, so a
+journal left behind by a re-parsed dataset is ignored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .models import AnnotationSample
+
+# Sample fields a reviewer can change from the UI.
+REVIEW_STATE_FIELDS = (
+    "tag",
+    "nome",
+    "tipo_nivel",
+    "validado",
+    "necessita_revisao_humana",
+    "low_confidence",
+    "motivo_revisao",
+    "reviewer",
+    "updated_at",
+)
+
+
+def journal_path_for(dataset_path: Path | str) -> Path:
+    """Return the journal file kept next to ``dataset_path``."""
+
+    dataset = Path(dataset_path)
+    return dataset.with_name(f"{dataset.stem}.journal.jsonl")
+
+
+def discard_journal(dataset_path: Path | str) -> None:
+    """Delete the journal of ``dataset_path``, e.g. after a fresh parse."""
+
+    journal_path_for(dataset_path).unlink(missing_ok=True)
+
+
+def content_fingerprint(sample: AnnotationSample) -> str:
+    """Return a digest of the target paragraph and span of ``sample``.
+
+    IDs are positional (``PAT_0001_SL``), so a dataset parsed again can
+    give the same ID to another annotation; the fingerprint tells them
+    apart.
+    """
+
+    digest = hashlib.blake2b(digest_size=12)
+    for text in (sample.texto_paragrafo_alvo, sample.trecho_alvo):
+        digest.update((text or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def make_record(row: int, sample: AnnotationSample, action: str) -> dict:
+    return {
+        "row": row,
+        "id": sample.id,
+        "impressao": content_fingerprint(sample),
+        "acao": action,
+        "estado": {
+            field: getattr(sample, field) for field in REVIEW_STATE_FIELDS
+        },
+        "historico": sample.history[-1] if sample.history else None,
+        "historico_total": len(sample.history),
+    }
+
+
+def apply_record(sample: AnnotationSample, record: dict) -> bool:
+    """Apply ``record`` to ``sample``; False if it belongs to another one.
+
+    A record belongs to ``sample`` when both its ID and its content
+    fingerprint match.
+    """
+
+    if record.get("id") != sample.id:
+        return False
+    if record.get("impressao") != content_fingerprint(sample):
+        return False
+    state = record.get("estado")
+    if isinstance(state, dict):
+        for field in REVIEW_STATE_FIELDS:
+            if field in state:
+                setattr(sample, field, state[field])
+    entry = record.get("historico")
+    total = record.get("historico_total")
+    if isinstance(entry, dict) and isinstance(total, int) and total > 0:
+        if len(sample.history) < total:
+            sample.history.append(entry)
+        else:
+            # A coalesced action rewrote the last entry in place.
+            sample.history[total - 1] = entry
+    return True
+
+
+def read_journal(path: Path | str) -> List[dict]:
+    """Return the records of a journal file, oldest first.
+
+    Lines that do not decode (a write torn by a crash) are skipped.
+    """
+
+    journal = Path(path)
+    if not journal.exists():
+        return []
+    records: List[dict] = []
+    for line in journal.read_bytes().splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and isinstance(record.get("row"), int):
+            records.append(record)
+    return records
+
+
+def records_by_row(records: Iterable[dict]) -> Dict[int, List[dict]]:
+    grouped: Dict[int, List[dict]] = {}
+    for record in records:
+        grouped.setdefault(record["row"], []).append(record)
+    return grouped
+
+
+def replay_records(
+    samples: List[AnnotationSample], records: Iterable[dict]
+) -> Tuple[int, int]:
+    """Apply journal records to ``samples``; return (applied, skipped)."""
+
+    applied = skipped = 0
+    for record in records:
+        row = record["row"]
+        if 0 <= row < len(samples) and apply_record(samples[row], record):
+            applied += 1
+        else:
+            skipped += 1
+    return applied, skipped
+
+
+def _fsync_write(path: Path, data: bytes) -> None:
+    with path.open("wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+class ReviewJournal:
+    """Appends fsync'd review records for one dataset."""
+
+    def __init__(self, dataset_path: Path | str) -> None:
+        self.dataset_path = Path(dataset_path)
+        self.path = journal_path_for(dataset_path)
+        self._handle = None
+        self.pending = (
+            self.path.read_bytes().count(b"\n") if self.path.exists() else 0
+        )
+
+    def _open(self):
+        if self._handle is None:
+            handle = self.path.open("a+b")
+            if handle.seek(0, os.SEEK_END) > 0:
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    # Terminate a line torn by a crash before appending.
+                    handle.write(b"\n")
+            self._handle = handle
+        return self._handle
+
+    def append(self, row: int, sample: AnnotationSample, action: str) -> None:
+        line = json.dumps(
+            make_record(row, sample, action),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        handle = self._open()
+        handle.write(line.encode("utf-8") + b"\n")
+        handle.flush()
+        os.fsync(handle.fileno())
+        self.pending += 1
+
+    def offset(self) -> int:
+        """Return the journal size; pass it to `discard_until` later."""
+
+        if self._handle is not None:
+            return self._handle.seek(0, os.SEEK_END)
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def discard_until(self, offset: int) -> None:
+        """Drop the records before ``offset`` (folded by a compaction)."""
+
+        self.close()
+        if not self.path.exists():
+            self.pending = 0
+            return
+        tail = self.path.read_bytes()[offset:]
+        if not tail.strip():
+            self.path.unlink()
+            self.pending = 0
+            return
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        _fsync_write(temp_path, tail)
+        os.replace(temp_path, self.path)
+        self.pending = tail.count(b"\n")
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
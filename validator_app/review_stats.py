@@ -0,0 +1,121 @@
+"""Review progress counters behind the VAEST statistics panel.
+
+Samples are counted per ``(tag, status, reviewer)`` and each row remembers
+its key, so an edit moves one row between two counters instead of
+recounting the dataset. The rows of each ``(tag, status)`` are indexed
+once, by `row_index.NavigationIndex`.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import AnnotationSample
+
+STATUS_VALIDATED = "validado"
+STATUS_REVIEW = "revisar"
+STATUS_PENDING = "pendente"
+STATUSES = (STATUS_VALIDATED, STATUS_REVIEW, STATUS_PENDING)
+# Statuses still waiting for a reviewer's decision.
+UNRESOLVED_STATUSES = (STATUS_REVIEW, STATUS_PENDING)
+
+StatsKey = Tuple[str, str, str]
+
+
+def review_status(sample: AnnotationSample) -> str:
+    """Return the review status of ``sample`` (one of `STATUSES`)."""
+
+    if sample.validado:
+        return STATUS_VALIDATED
+    if sample.necessita_revisao_humana:
+        return STATUS_REVIEW
+    return STATUS_PENDING
+
+
+def stats_key(sample: AnnotationSample) -> StatsKey:
+    return (sample.tag or "", review_status(sample), sample.reviewer or "")
+
+
+class ReviewStats:
+    """Incremental sample counts per tag, status and reviewer."""
+
+    def __init__(self) -> None:
+        self._counts: Counter = Counter()
+        self._row_keys: List[StatsKey] = []
+
+    def __len__(self) -> int:
+        return len(self._row_keys)
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._row_keys.clear()
+
+    def rebuild(self, samples: Iterable[AnnotationSample]) -> None:
+        self.clear()
+        self.extend(samples)
+
+    def extend(self, samples: Iterable[AnnotationSample]) -> None:
+        """Count ``samples`` as the rows following the counted ones."""
+
+        for sample in samples:
+            key = stats_key(sample)
+            self._row_keys.append(key)
+            self._counts[key] += 1
+
+    def update(self, row: int, sample: AnnotationSample) -> None:
+        """Move ``row`` to the counters matching its edited sample."""
+
+        if not 0 <= row < len(self._row_keys):
+            return
+        old = self._row_keys[row]
+        new = stats_key(sample)
+        if new == old:
+            return
+        self._row_keys[row] = new
+        self._counts[old] -= 1
+        if not self._counts[old]:
+            del self._counts[old]
+        self._counts[new] += 1
+
+    def count(
+        self,
+        tag: Optional[str] = None,
+        status: Optional[str] = None,
+        reviewer: Optional[str] = None,
+    ) -> int:
+        """Count samples matching every given field (None matches all)."""
+
+        return sum(
+            amount
+            for (key_tag, key_status, key_reviewer), amount in (
+                self._counts.items()
+            )
+            if (tag is None or key_tag == tag)
+            and (status is None or key_status == status)
+            and (reviewer is None or key_reviewer == reviewer)
+        )
+
+    def by_tag(self) -> Dict[str, Dict[str, int]]:
+        """Return ``{tag: {status: count}}`` with every status present."""
+
+        table: Dict[str, Dict[str, int]] = {}
+        for (tag, status, _), amount in self._counts.items():
+            counts = table.setdefault(tag, dict.fromkeys(STATUSES, 0))
+            counts[status] += amount
+        return dict(sorted(table.items()))
+
+    def by_reviewer(self) -> Dict[str, Dict[str, int]]:
+        """Return ``{reviewer: {status: count}}``; "" has no reviewer."""
+
+        table: Dict[str, Dict[str, int]] = {}
+        for (_, status, reviewer), amount in self._counts.items():
+            counts = table.setdefault(reviewer, dict.fromkeys(STATUSES, 0))
+            counts[status] += amount
+        return dict(sorted(table.items()))
+
+    def progress(self) -> Tuple[int, int]:
+        """Return ``(validated, total)``."""
+
+        return self.count(status=STATUS_VALIDATED), len(self._row_keys)
+
@@ -0,0 +1,183 @@
+"""Sorted row sets for jumping between samples in a given state.
+
+Each set keeps its row numbers in a sorted list, so the next or previous
+row after a position is one binary search. `NavigationIndex` keeps one set
+per review flag, per tag and per ``(tag, review status)``, and moves an
+edited row between sets in place.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from typing import (
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+)
+
+from .models import AnnotationSample
+from .review_stats import UNRESOLVED_STATUSES, review_status
+
+NEEDS_REVIEW = "revisar"
+LOW_CONFIDENCE = "baixa_confianca"
+UNVALIDATED = "nao_validado"
+
+
+class SortedRows:
+    """Sorted list of distinct row numbers."""
+
+    def __init__(self, rows: Iterable[int] = ()) -> None:
+        self._rows: List[int] = sorted(set(rows))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, row: object) -> bool:
+        position = bisect_left(self._rows, row)  # type: ignore[arg-type]
+        return position < len(self._rows) and self._rows[position] == row
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def add(self, row: int) -> None:
+        if self._rows and row > self._rows[-1]:
+            self._rows.append(row)
+        elif row not in self:
+            insort(self._rows, row)
+
+    def discard(self, row: int) -> None:
+        position = bisect_left(self._rows, row)
+        if position < len(self._rows) and self._rows[position] == row:
+            del self._rows[position]
+
+    def first(self) -> Optional[int]:
+        return self._rows[0] if self._rows else None
+
+    def last(self) -> Optional[int]:
+        return self._rows[-1] if self._rows else None
+
+    def next_after(self, row: int, wrap: bool = True) -> Optional[int]:
+        """Return the smallest row greater than ``row``."""
+
+        position = bisect_right(self._rows, row)
+        if position < len(self._rows):
+            return self._rows[position]
+        return self.first() if wrap else None
+
+    def previous_before(self, row: int, wrap: bool = True) -> Optional[int]:
+        """Return the largest row smaller than ``row``."""
+
+        position = bisect_left(self._rows, row)
+        if position > 0:
+            return self._rows[position - 1]
+        return self.last() if wrap else None
+
+
+def row_keys(sample: AnnotationSample) -> FrozenSet[Hashable]:
+    """Return the navigation sets ``sample`` belongs to."""
+
+    keys: List[Hashable] = [
+        ("tag", sample.tag or ""),
+        ("status", sample.tag or "", review_status(sample)),
+    ]
+    if sample.necessita_revisao_humana:
+        keys.append(NEEDS_REVIEW)
+    if sample.low_confidence:
+        keys.append(LOW_CONFIDENCE)
+    if not sample.validado:
+        keys.append(UNVALIDATED)
+    return frozenset(keys)
+
+
+class NavigationIndex:
+    """Row sets per review flag, tag and status, updated per edit."""
+
+    def __init__(self) -> None:
+        self._sets: Dict[Hashable, SortedRows] = {}
+        self._row_keys: List[FrozenSet[Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._row_keys)
+
+    def clear(self) -> None:
+        self._sets.clear()
+        self._row_keys.clear()
+
+    def rebuild(self, samples: Iterable[AnnotationSample]) -> None:
+        self.clear()
+        self.extend(samples)
+
+    def extend(self, samples: Iterable[AnnotationSample]) -> None:
+        """Index ``samples`` as the rows following the indexed ones."""
+
+        for sample in samples:
+            row = len(self._row_keys)
+            keys = row_keys(sample)
+            self._row_keys.append(keys)
+            for key in keys:
+                self._rows(key).add(row)
+
+    def update(self, row: int, sample: AnnotationSample) -> None:
+        """Move ``row`` to the sets matching its edited sample."""
+
+        if not 0 <= row < len(self._row_keys):
+            return
+        old = self._row_keys[row]
+        new = row_keys(sample)
+        if new == old:
+            return
+        for key in old - new:
+            self._sets[key].discard(row)
+        for key in new - old:
+            self._rows(key).add(row)
+        self._row_keys[row] = new
+
+    def _rows(self, key: Hashable) -> SortedRows:
+        rows = self._sets.get(key)
+        if rows is None:
+            rows = self._sets[key] = SortedRows()
+        return rows
+
+    def rows(self, key: Hashable) -> SortedRows:
+        """Return the set for ``key``.
+
+        ``key`` is a flag, ``("tag", tag)`` or ``("status", tag, status)``.
+        """
+
+        return self._sets.get(key) or SortedRows()
+
+    def next_row(self, key: Hashable, after: int) -> Optional[int]:
+        return self.rows(key).next_after(after)
+
+    def previous_row(self, key: Hashable, before: int) -> Optional[int]:
+        return self.rows(key).previous_before(before)
+
+    def next_status_row(
+        self,
+        after: int,
+        statuses: Sequence[str] = UNRESOLVED_STATUSES,
+        tag: Optional[str] = None,
+    ) -> Optional[int]:
+        """Return the first row after ``after`` in one of ``statuses``.
+
+        Only rows of ``tag`` count when it is given. Wraps around to the
+        start; None when no row qualifies.
+        """
+
+        candidates = [
+            rows
+            for key, rows in self._sets.items()
+            if isinstance(key, tuple)
+            and key[0] == "status"
+            and key[2] in statuses
+            and (tag is None or key[1] == tag)
+        ]
+        following = [rows.next_after(after, wrap=False) for rows in candidates]
+        found = [row for row in following if row is not None]
+        if not found:
+            found = [rows.first() for rows in candidates if len(rows)]
+        return min(found) if found else None
@@ -0,0 +1,181 @@
+"""Token index behind the VAEST search box.
+
+Search text is casefolded and stripped of accents ("Revisão" and "revisao"
+match), split into word tokens and kept in an inverted index, so a query
+costs a few set intersections instead of a scan over every sample. Each
+query term must prefix-match a token of the sample; multi-term queries
+match samples containing all terms.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from .models import AnnotationSample
+
+SEARCH_FIELDS = (
+    "contexto_anotacao",
+    "trecho_alvo",
+    "trecho_fonte",
+    "texto_paragrafo_alvo",
+    "texto_paragrafo_fonte",
+    "reviewer",
+    "motivo_revisao",
+)
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold_text(text: str) -> str:
+    """Casefold ``text`` and drop combining accents."""
+
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold_text(text))
+
+
+class SearchIndex:
+    """Inverted index from folded tokens to sample rows.
+
+    Tokens point at distinct field texts and each text at the rows using it,
+    so a paragraph shared by many samples is tokenized and indexed once.
+    """
+
+    def __init__(self) -> None:
+        self._text_ids: Dict[str, int] = {}
+        self._texts: Dict[int, str] = {}
+        self._text_tokens: Dict[int, FrozenSet[str]] = {}
+        self._text_rows: Dict[int, Set[int]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._row_texts: List[FrozenSet[int]] = []
+        self._next_text_id = 0
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._row_texts)
+
+    def _text_id(self, text: str) -> int:
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = self._text_ids[text] = self._next_text_id
+            self._next_text_id += 1
+            self._texts[text_id] = text
+            tokens = frozenset(tokenize(text))
+            self._text_tokens[text_id] = tokens
+            self._text_rows[text_id] = set()
+            for token in tokens:
+                ids = self._postings.get(token)
+                if ids is None:
+                    self._postings[token] = ids = set()
+                    self._vocabulary = None
+                ids.add(text_id)
+        return text_id
+
+    def _texts_of(self, sample: AnnotationSample) -> FrozenSet[int]:
+        return frozenset(
+            self._text_id(text)
+            for text in (getattr(sample, field) for field in SEARCH_FIELDS)
+            if text
+        )
+
+    def _drop_text(self, text_id: int) -> None:
+        for token in self._text_tokens.pop(text_id):
+            ids = self._postings[token]
+            ids.discard(text_id)
+            if not ids:
+                del self._postings[token]
+                self._vocabulary = None
+        del self._text_rows[text_id]
+        del self._text_ids[self._texts.pop(text_id)]
+
+    def clear(self) -> None:
+        self._text_ids.clear()
+        self._texts.clear()
+        self._text_tokens.clear()
+        self._text_rows.clear()
+        self._postings.clear()
+        self._row_texts.clear()
+        self._vocabulary = None
+
+    def rebuild(self, samples: Iterable[AnnotationSample]) -> None:
+        self.clear()
+        self.extend(samples)
+
+    def extend(self, samples: Iterable[AnnotationSample]) -> None:
+        """Index ``samples`` as the rows following the indexed ones."""
+
+        text_rows = self._text_rows
+        for sample in samples:
+            row = len(self._row_texts)
+            texts = self._texts_of(sample)
+            for text_id in texts:
+                text_rows[text_id].add(row)
+            self._row_texts.append(texts)
+
+    def update(self, row: int, sample: AnnotationSample) -> None:
+        """Re-index one row after its sample changed."""
+
+        if not 0 <= row < len(self._row_texts):
+            return
+        old = self._row_texts[row]
+        new = self._texts_of(sample)
+        if new == old:
+            return
+        for text_id in old - new:
+            rows = self._text_rows[text_id]
+            rows.discard(row)
+            if not rows:
+                self._drop_text(text_id)
+        for text_id in new - old:
+            self._text_rows[text_id].add(row)
+        self._row_texts[row] = new
+
+    def _prefix_rows(self, term: str) -> Set[int]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        text_ids: Set[int] = set()
+        position = bisect_left(vocabulary, term)
+        while position < len(vocabulary) and vocabulary[position].startswith(
+            term
+        ):
+            text_ids |= self._postings[vocabulary[position]]
+            position += 1
+        rows: Set[int] = set()
+        for text_id in text_ids:
+            rows |= self._text_rows[text_id]
+        return rows
+
+    def row_matches(self, row: int, query: str) -> bool:
+        """Return whether ``row`` matches ``query``, looking at that row only."""
+
+        if not 0 <= row < len(self._row_texts):
+            return False
+        tokens = set().union(
+            *(self._text_tokens[text_id] for text_id in self._row_texts[row])
+        )
+        return all(
+            any(token.startswith(term) for token in tokens)
+            for term in set(tokenize(query))
+        )
+
+    def search(self, query: str) -> Optional[Set[int]]:
+        """Return the rows matching every term, or None for an empty query."""
+
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return None
+        matches: Optional[Set[int]] = None
+        for term in terms:
+            rows = self._prefix_rows(term)
+            matches = rows if matches is None else matches & rows
+            if not matches:
+                return set()
+        return matches
@@ -4,21 +4,25 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Set
 import sys
 
 from PySide6.QtCore import (
     QAbstractListModel,
     QModelIndex,
+    QObject,
     QSortFilterProxyModel,
+    QThread,
+    QTimer,
     Qt,
     Signal,
 )
-from PySide6.QtGui import QAction, QColor, QPainter, QBrush
+from PySide6.QtGui import QAction, QColor, QKeySequence, QPainter, QBrush
 from PySide6.QtWidgets import (
     QApplication,
     QCheckBox,
     QComboBox,
+    QDockWidget,
     QFileDialog,
     QHBoxLayout,
     QLabel,
@@ -28,9 +32,12 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QInputDialog,
     QPlainTextEdit,
+    QProgressBar,
     QPushButton,
     QSplitter,
     QStyle,
+    QTableWidget,
+    QTableWidgetItem,
     QTextEdit,
     QVBoxLayout,
     QWidget,
@@ -38,14 +45,17 @@ from PySide6.QtWidgets import (
     QStyleOptionViewItem,
 )
 
-from .context_utils import build_highlighted_html
+from .context_utils import ContextRenderer
 from .data_loader import (
     DEFAULT_DATASET,
     DatasetLoadError,
-    load_dataset,
+    compact_journal,
+    iter_dataset_chunks,
+    patch_dataset,
+    read_journal,
+    review_patches,
     save_dataset,
 )
-from .export_utils import export_review_markdown, export_review_txt
 from .models import AnnotationSample, Metadata
 from .project_store import (
     load_project_state,
@@ -55,13 +65,62 @@ from .project_store import (
     resolve_data_dir,
     save_project_state,
 )
+from .history import (
+    COALESCE_WINDOW_SECONDS,
+    archive_history,
+    history_archive_path_for,
+)
+from .review_journal import ReviewJournal, discard_journal
+from .review_stats import (
+    STATUSES,
+    UNRESOLVED_STATUSES,
+    ReviewStats,
+)
+from .row_index import (
+    LOW_CONFIDENCE,
+    NEEDS_REVIEW,
+    UNVALIDATED,
+    NavigationIndex,
+)
+from .search_index import SearchIndex
+
+# Journal records that trigger a background compaction into the dataset.
+COMPACT_AFTER_RECORDS = 200
+# Pause after the last keystroke before the search box filters the list.
+SEARCH_DEBOUNCE_MS = 250
+# Pause after the last keystroke before notes are logged.
+NOTES_DEBOUNCE_MS = 800
+# History entries kept in the dataset by "Arquivar historico antigo".
+ARCHIVE_KEEP_LAST = 10
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-from scripts import convert_inputs  # type: ignore
-from parser import cli as parser_cli, tag_defs as parser_tag_defs
+# The parser, the converters and the exporters load on first use so that
+# the window appears without paying for them.
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from parser import profiling as parser_profiling
+
+# "Navegar" menu: row set (None for the selected sample's tag), label and
+# key; Shift plus the key jumps backwards.
+NAVIGATION_COMMANDS = (
+    (UNVALIDATED, "nao validada", "Ctrl+J"),
+    (NEEDS_REVIEW, "a revisar", "Ctrl+R"),
+    (LOW_CONFIDENCE, "de baixa confianca", "Ctrl+L"),
+    (None, "da mesma tag", "Ctrl+T"),
+)
+
+# Parser stages in run order, with the label shown while each one runs.
+PARSER_STAGES = (
+    ("load_tag_definitions", "Lendo definicoes de tags"),
+    ("segmentation", "Segmentando paragrafos"),
+    ("lex_all", "Extraindo anotacoes"),
+    ("detect_sections", "Detectando secoes"),
+    ("align_paragraphs", "Alinhando paragrafos"),
+    ("build_samples", "Montando amostras"),
+    ("write_json", "Gravando dataset"),
+)
 
 
 class SampleListModel(QAbstractListModel):
@@ -102,6 +161,14 @@ class SampleListModel(QAbstractListModel):
         self._samples = samples
         self.endResetModel()
 
+    def append_samples(self, samples: List[AnnotationSample]) -> None:
+        if not samples:
+            return
+        first = len(self._samples)
+        self.beginInsertRows(QModelIndex(), first, first + len(samples) - 1)
+        self._samples.extend(samples)
+        self.endInsertRows()
+
     def all_tags(self) -> List[str]:
         return sorted({sample.tag for sample in self._samples})
 
@@ -111,6 +178,110 @@ class SampleListModel(QAbstractListModel):
             self.dataChanged.emit(index, index)
 
 
+class DatasetLoadWorker(QObject):
+    """Reads a dataset in chunks on a worker thread."""
+
+    chunk_loaded = Signal(int, object)
+    finished = Signal(int)
+    failed = Signal(int, str)
+
+    def __init__(self, load_id: int, path: Path) -> None:
+        super().__init__()
+        self._load_id = load_id
+        self._path = path
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def run(self) -> None:
+        try:
+            for chunk in iter_dataset_chunks(self._path):
+                if self._cancelled:
+                    break
+                self.chunk_loaded.emit(self._load_id, chunk)
+            else:
+                self.finished.emit(self._load_id)
+        except DatasetLoadError as exc:
+            self.failed.emit(self._load_id, str(exc))
+        finally:
+            self.thread().quit()
+
+
+class JournalCompactionWorker(QObject):
+    """Patches journaled review state into a dataset on a worker thread."""
+
+    finished = Signal()
+    failed = Signal(str)
+
+    def __init__(self, path: Path, patches: dict) -> None:
+        super().__init__()
+        self._path = path
+        self._patches = patches
+
+    def run(self) -> None:
+        try:
+            patch_dataset(self._path, self._patches)
+        except (OSError, DatasetLoadError) as exc:
+            self.failed.emit(str(exc))
+        else:
+            self.finished.emit()
+        finally:
+            self.thread().quit()
+
+
+class ParserWorker(QObject):
+    """Runs the parser on a worker thread, reporting each stage."""
+
+    stage_started = Signal(str)
+    finished = Signal()
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(
+        self,
+        source_path: Path,
+        target_path: Path,
+        tags_path: Path,
+        output_path: Path,
+        profiler: parser_profiling.StageProfiler | None,
+    ) -> None:
+        from parser import profiling as parser_profiling
+
+        super().__init__()
+        self._paths = (source_path, target_path, tags_path, output_path)
+        self._profiler = profiler
+        self._progress = parser_profiling.StageProgress(
+            self.stage_started.emit
+        )
+
+    def cancel(self) -> None:
+        self._progress.cancel()
+
+    def run(self) -> None:
+        from parser import cli as parser_cli
+        from parser import profiling as parser_profiling
+
+        source_path, target_path, tags_path, output_path = self._paths
+        try:
+            parser_cli.main(
+                source_path=source_path,
+                target_path=target_path,
+                tags_path=tags_path,
+                output_path=output_path,
+                profiler=self._profiler,
+                progress=self._progress,
+            )
+        except parser_profiling.ParseCancelled:
+            self.cancelled.emit()
+        except Exception as exc:  # noqa: BLE001 - reported in a dialog
+            self.failed.emit(str(exc))
+        else:
+            self.finished.emit()
+        finally:
+            self.thread().quit()
+
+
 class SampleItemDelegate(QStyledItemDelegate):
     def paint(self, painter: QPainter, option, index):  # type: ignore
         painter.save()
@@ -141,17 +312,73 @@ class SampleFilterModel(QSortFilterProxyModel):
         self._tag_filter: Optional[str] = None
         self._status_filter: Optional[str] = None
         self._search_text: str = ""
+        self._search_index = SearchIndex()
+        self._search_matches: Optional[Set[int]] = None
+
+    def setSourceModel(self, model) -> None:  # noqa: N802
+        # Connect before the proxy does, so the index is current when the
+        # proxy filters inserted or changed rows.
+        model.modelReset.connect(self._rebuild_search_index)
+        model.rowsInserted.connect(self._index_inserted_rows)
+        model.dataChanged.connect(self._index_changed_rows)
+        super().setSourceModel(model)
+        self._rebuild_search_index()
+
+    def _samples(self, first: int, last: int) -> List[AnnotationSample]:
+        model = self.sourceModel()
+        if not isinstance(model, SampleListModel):
+            return []
+        return [model.sample_at(row) for row in range(first, last + 1)]
+
+    def _refresh_search_matches(self) -> None:
+        self._search_matches = self._search_index.search(self._search_text)
+
+    def _rebuild_search_index(self) -> None:
+        model = self.sourceModel()
+        self._search_index.rebuild(
+            self._samples(0, model.rowCount() - 1) if model else []
+        )
+        self._refresh_search_matches()
+
+    def _index_inserted_rows(self, _parent, first: int, last: int) -> None:
+        if first != len(self._search_index):
+            self._rebuild_search_index()
+            return
+        self._search_index.extend(self._samples(first, last))
+        self._refresh_search_matches()
+
+    def _index_changed_rows(self, top_left, bottom_right, *_) -> None:
+        # Only the changed rows are re-checked; the proxy then re-filters
+        # those rows itself (dynamicSortFilter), so edits cost the same on
+        # any dataset size.
+        first, last = top_left.row(), bottom_right.row()
+        matches = self._search_matches
+        for row, sample in enumerate(self._samples(first, last), first):
+            self._search_index.update(row, sample)
+            if matches is None:
+                continue
+            if self._search_index.row_matches(row, self._search_text):
+                matches.add(row)
+            else:
+                matches.discard(row)
 
     def set_tag_filter(self, tag: Optional[str]) -> None:
+        if tag == self._tag_filter:
+            return
         self._tag_filter = tag
         self.invalidateFilter()
 
     def set_status_filter(self, status: Optional[str]) -> None:
+        if status == self._status_filter:
+            return
         self._status_filter = status
         self.invalidateFilter()
 
     def set_search_text(self, text: str) -> None:
-        self._search_text = text.lower().strip()
+        if text.strip() == self._search_text:
+            return
+        self._search_text = text.strip()
+        self._refresh_search_matches()
         self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row: int, source_parent):  # noqa: N802
@@ -173,19 +400,11 @@ class SampleFilterModel(QSortFilterProxyModel):
         ):
             return False
 
-        if self._search_text:
-            haystack = " ".join(
-                filter(
-                    None,
-                    [
-                        sample.contexto_anotacao,
-                        sample.trecho_alvo or "",
-                        sample.trecho_fonte or "",
-                    ],
-                )
-            ).lower()
-            if self._search_text not in haystack:
-                return False
+        if (
+            self._search_matches is not None
+            and source_row not in self._search_matches
+        ):
+            return False
 
         return True
 
@@ -229,6 +448,10 @@ class DetailPanel(QWidget):
         )
         self._force_ltr_text(self._notes_box)
         self._notes_box.textChanged.connect(self._on_notes_changed)
+        self._notes_timer = QTimer(self)
+        self._notes_timer.setSingleShot(True)
+        self._notes_timer.setInterval(NOTES_DEBOUNCE_MS)
+        self._notes_timer.timeout.connect(self._commit_notes)
 
         self._reviewer_input = QLineEdit()
         self._reviewer_input.setPlaceholderText("Revisor (iniciais)")
@@ -279,6 +502,7 @@ class DetailPanel(QWidget):
     def set_sample(
         self, sample: Optional[AnnotationSample], row: Optional[int] = None
     ) -> None:
+        self.flush_pending_notes()
         self._current_sample = sample
         self._current_row = row
         if sample is None:
@@ -325,10 +549,19 @@ class DetailPanel(QWidget):
         lines = []
         for entry in sample.history:
             timestamp = entry.get("timestamp", "?")
+            if entry.get("inicio"):
+                timestamp = f"{entry['inicio']} - {timestamp}"
             reviewer = entry.get("reviewer", "-")
             action = entry.get("action", "acao")
             note = entry.get("notes")
             line = f"[{timestamp}] {reviewer}: {action}"
+            if entry.get("ocorrencias", 1) > 1:
+                line += f" (x{entry['ocorrencias']})"
+            if entry.get("arquivadas"):
+                line += (
+                    f" | {entry['arquivadas']} entradas em "
+                    f"{entry.get('arquivo', '?')}"
+                )
             if note:
                 line += f" | {note}"
             lines.append(line)
@@ -344,6 +577,8 @@ class DetailPanel(QWidget):
     def _on_review_toggled(self, state: int) -> None:
         if self._current_sample is None:
             return
+        # The toggle logs the current notes too.
+        self._notes_timer.stop()
         self._current_sample.low_confidence = (
             state == Qt.CheckState.Checked
         )
@@ -362,6 +597,17 @@ class DetailPanel(QWidget):
         self._emit_update("review_toggle")
 
     def _on_notes_changed(self) -> None:
+        if self._current_sample is not None:
+            self._notes_timer.start()
+
+    def flush_pending_notes(self) -> None:
+        """Log notes typed less than NOTES_DEBOUNCE_MS ago right away."""
+
+        if self._notes_timer.isActive():
+            self._notes_timer.stop()
+            self._commit_notes()
+
+    def _commit_notes(self) -> None:
         if self._current_sample is None:
             return
         text = self._notes_box.toPlainText().strip()
@@ -401,11 +647,93 @@ class DetailPanel(QWidget):
             pass
 
 
+class StatsPanel(QWidget):
+    """Review progress per tag and reviewer, from `ReviewStats` counters."""
+
+    next_pending_requested = Signal(object)
+
+    _STATUS_LABELS = {
+        "validado": "Validadas",
+        "revisar": "Revisar",
+        "pendente": "Pendentes",
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._progress = QProgressBar()
+        self._progress.setFormat("%v de %m validadas (%p%)")
+        self._tag_table = self._make_table("Tag")
+        self._reviewer_table = self._make_table("Revisor")
+        self._tag_choice = QComboBox()
+        self._next_button = QPushButton("Proxima pendente")
+        self._next_button.clicked.connect(
+            lambda: self.next_pending_requested.emit(
+                self._tag_choice.currentData()
+            )
+        )
+
+        next_row = QHBoxLayout()
+        next_row.addWidget(self._tag_choice, 1)
+        next_row.addWidget(self._next_button)
+        layout = QVBoxLayout()
+        layout.addWidget(self._progress)
+        layout.addLayout(next_row)
+        layout.addWidget(QLabel("Por tag"))
+        layout.addWidget(self._tag_table, 2)
+        layout.addWidget(QLabel("Por revisor"))
+        layout.addWidget(self._reviewer_table, 1)
+        self.setLayout(layout)
+
+    def _make_table(self, first_column: str) -> QTableWidget:
+        headers = [first_column, "Total"] + [
+            self._STATUS_LABELS[status] for status in STATUSES
+        ]
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        return table
+
+    @staticmethod
+    def _fill_table(table: QTableWidget, rows: dict, blank: str) -> None:
+        table.setRowCount(len(rows))
+        for position, (name, counts) in enumerate(rows.items()):
+            values = [name or blank, str(sum(counts.values()))] + [
+                str(counts[status]) for status in STATUSES
+            ]
+            for column, value in enumerate(values):
+                table.setItem(position, column, QTableWidgetItem(value))
+        table.resizeColumnsToContents()
+
+    def refresh(self, stats: ReviewStats) -> None:
+        validated, total = stats.progress()
+        self._progress.setRange(0, max(1, total))
+        self._progress.setValue(validated)
+        by_tag = stats.by_tag()
+        self._fill_table(self._tag_table, by_tag, "(sem tag)")
+        self._fill_table(
+            self._reviewer_table, stats.by_reviewer(), "(sem revisor)"
+        )
+
+        previous = self._tag_choice.currentData()
+        self._tag_choice.blockSignals(True)
+        self._tag_choice.clear()
+        self._tag_choice.addItem("Todas as tags", None)
+        for tag, counts in by_tag.items():
+            unresolved = sum(
+                counts[status] for status in UNRESOLVED_STATUSES
+            )
+            self._tag_choice.addItem(f"{tag} ({unresolved})", tag)
+        position = self._tag_choice.findData(previous)
+        self._tag_choice.setCurrentIndex(max(0, position))
+        self._tag_choice.blockSignals(False)
+
+
 class ContextPanel(QWidget):
     def __init__(self) -> None:
         super().__init__()
-        self._fallback_source_text = ""
-        self._fallback_target_text = ""
+        self._renderer = ContextRenderer()
+        self._shown_html: dict[str, str] = {}
 
         self._source_context_box = QTextEdit()
         self._source_context_box.setReadOnly(True)
@@ -435,33 +763,31 @@ class ContextPanel(QWidget):
         source_text: str | None,
         target_text: str | None,
     ) -> None:
-        self._fallback_source_text = source_text or ""
-        self._fallback_target_text = target_text or ""
+        self._renderer.set_documents(source_text, target_text)
+        self._shown_html.clear()
 
     def set_sample(self, sample: Optional[AnnotationSample]) -> None:
         if sample is None:
             self._source_context_box.clear()
             self._target_context_box.clear()
+            self._shown_html.clear()
             return
 
-        source_text = sample.texto_paragrafo_fonte or self._fallback_source_text
-        target_text = sample.texto_paragrafo_alvo or self._fallback_target_text
-
-        source_html, source_focus = build_highlighted_html(
-            source_text,
-            sample.trecho_fonte,
-        )
-        self._source_context_box.setHtml(source_html)
-        if source_focus:
-            self._source_context_box.scrollToAnchor("focus")
+        for kind, box in (
+            ("fonte", self._source_context_box),
+            ("alvo", self._target_context_box),
+        ):
+            rendered, focus = self._renderer.render(kind, sample)
+            # Neighbouring samples often share the paragraph and highlight.
+            if self._shown_html.get(kind) != rendered:
+                box.setHtml(rendered)
+                self._shown_html[kind] = rendered
+            if focus:
+                box.scrollToAnchor("focus")
 
-        target_html, target_focus = build_highlighted_html(
-            target_text,
-            sample.trecho_alvo,
-        )
-        self._target_context_box.setHtml(target_html)
-        if target_focus:
-            self._target_context_box.scrollToAnchor("focus")
+    def prefetch(self, sample: Optional[AnnotationSample]) -> None:
+        if sample is not None:
+            self._renderer.prefetch(sample)
 
 
 class MainWindow(QMainWindow):
@@ -472,10 +798,37 @@ class MainWindow(QMainWindow):
 
         self._data_dir = resolve_data_dir()
         self._project_state = load_project_state()
-        self._tag_definitions: dict[str, dict[str, str]] = {}
+        self._tag_definitions: dict[str, dict[str, str]] | None = None
 
         self._metadata: Optional[Metadata] = None
         self._samples: List[AnnotationSample] = []
+        self._load_generation = 0
+        self._load_thread: QThread | None = None
+        self._load_worker: DatasetLoadWorker | None = None
+        self._loading = False
+        self._loading_path: Path | None = None
+        self._journal: ReviewJournal | None = None
+        self._compaction_thread: QThread | None = None
+        self._compaction_worker: JournalCompactionWorker | None = None
+        self._compaction_offset = 0
+        self._load_progress = QProgressBar()
+        self._load_progress.setRange(0, 100)
+        self._load_progress.setMaximumWidth(160)
+        self._load_progress.hide()
+        self.statusBar().addPermanentWidget(self._load_progress)
+        self._parser_thread: QThread | None = None
+        self._parser_worker: ParserWorker | None = None
+        self._parser_output: Path | None = None
+        self._parser_profiler: parser_profiling.StageProfiler | None = None
+        self._parser_progress = QProgressBar()
+        self._parser_progress.setRange(0, len(PARSER_STAGES))
+        self._parser_progress.setMaximumWidth(160)
+        self._parser_progress.hide()
+        self._parser_cancel_button = QPushButton("Cancelar parser")
+        self._parser_cancel_button.clicked.connect(self._cancel_parser)
+        self._parser_cancel_button.hide()
+        self.statusBar().addPermanentWidget(self._parser_progress)
+        self.statusBar().addPermanentWidget(self._parser_cancel_button)
 
         self._list_view = QListView()
         self._list_model = SampleListModel([])
@@ -485,6 +838,11 @@ class MainWindow(QMainWindow):
         self._list_view.setItemDelegate(SampleItemDelegate(self._list_view))
 
         self._context_panel = ContextPanel()
+        self._prefetch_row = -1
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(0)
+        self._prefetch_timer.timeout.connect(self._prefetch_next_context)
         self._detail_panel = DetailPanel()
         self._detail_panel.sample_updated.connect(self._on_sample_updated)
         self._detail_panel.prev_requested.connect(self._select_prev_row)
@@ -514,9 +872,14 @@ class MainWindow(QMainWindow):
         )
         self._search_filter = QLineEdit()
         self._search_filter.setPlaceholderText(
-            "Pesquisar por contexto, alvo ou fonte"
+            "Pesquisar por contexto, trechos, paragrafos, revisor ou notas"
         )
         self._search_filter.textChanged.connect(self._handle_search_changed)
+        self._search_filter.returnPressed.connect(self._apply_search)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_search)
 
         splitter = QSplitter()
         splitter.addWidget(self._list_view)
@@ -546,16 +909,35 @@ class MainWindow(QMainWindow):
         container.setLayout(container_layout)
         self.setCentralWidget(container)
 
+        self._stats = ReviewStats()
+        self._navigation = NavigationIndex()
+        self._stats_panel = StatsPanel()
+        self._stats_panel.next_pending_requested.connect(
+            self._select_next_unresolved
+        )
+        self._stats_dock = QDockWidget("Estatisticas de revisao", self)
+        self._stats_dock.setObjectName("stats_dock")
+        self._stats_dock.setWidget(self._stats_panel)
+        self._stats_dock.visibilityChanged.connect(self._refresh_stats)
+        self.addDockWidget(
+            Qt.DockWidgetArea.RightDockWidgetArea, self._stats_dock
+        )
+        self._stats_dock.hide()
+
         self._build_menu()
 
         self._current_path = self._resolve_initial_dataset_path(dataset_path)
-        self._refresh_tag_definitions()
-        self._refresh_associated_context()
         selection_model = self._list_view.selectionModel()
         if selection_model:
             selection_model.currentChanged.connect(
                 self._on_selection_changed
             )
+        # Context files and the dataset are read once the event loop runs,
+        # after the empty window has been shown.
+        QTimer.singleShot(0, self._finish_startup)
+
+    def _finish_startup(self) -> None:
+        self._refresh_associated_context()
         self._load_dataset(self._current_path)
 
     def _build_menu(self) -> None:
@@ -566,6 +948,9 @@ class MainWindow(QMainWindow):
         save_action = QAction("Salvar como...", self)
         save_action.triggered.connect(self._open_save_dialog)
         file_menu.addAction(save_action)
+        archive_action = QAction("Arquivar historico antigo", self)
+        archive_action.triggered.connect(self._archive_old_history)
+        file_menu.addAction(archive_action)
 
         export_md_action = QAction("Exportar revisao (Markdown)...", self)
         export_md_action.triggered.connect(
@@ -596,9 +981,33 @@ class MainWindow(QMainWindow):
         target_action.triggered.connect(self._associate_target_text)
         tools_menu.addAction(target_action)
 
-        parser_action = QAction("Executar Parser...", self)
-        parser_action.triggered.connect(self._open_parser_dialog)
-        tools_menu.addAction(parser_action)
+        self._parser_action = QAction("Executar Parser...", self)
+        self._parser_action.triggered.connect(self._open_parser_dialog)
+        tools_menu.addAction(self._parser_action)
+
+        self._profile_parser_action = QAction(
+            "Medir Desempenho do Parser", self
+        )
+        self._profile_parser_action.setCheckable(True)
+        tools_menu.addAction(self._profile_parser_action)
+
+        tools_menu.addSeparator()
+        tools_menu.addAction(self._stats_dock.toggleViewAction())
+
+        navigate_menu = self.menuBar().addMenu("Navegar")
+        for key, label, shortcut in NAVIGATION_COMMANDS:
+            for forward, prefix, sequence in (
+                (True, "Proxima", shortcut),
+                (False, "Anterior", shortcut.replace("Ctrl+", "Ctrl+Shift+")),
+            ):
+                action = QAction(f"{prefix} {label}", self)
+                action.setShortcut(QKeySequence(sequence))
+                action.triggered.connect(
+                    lambda _=False, key=key, label=label, forward=forward: (
+                        self._jump_to(key, label, forward)
+                    )
+                )
+                navigate_menu.addAction(action)
 
     def _resolve_initial_dataset_path(
         self,
@@ -618,17 +1027,27 @@ class MainWindow(QMainWindow):
         save_project_state(self._project_state)
 
     def _refresh_tag_definitions(self) -> None:
-        tags_path = self._project_state.tags_path
+        """Forget the loaded tag definitions; they reload on next use."""
+
+        self._tag_definitions = None
+
+    def _loaded_tag_definitions(self) -> dict[str, dict[str, str]]:
+        if self._tag_definitions is not None:
+            return self._tag_definitions
+        from parser import tag_defs as parser_tag_defs
+
         self._tag_definitions = {}
+        tags_path = self._project_state.tags_path
         if not tags_path:
-            return
+            return self._tag_definitions
         path = Path(tags_path)
         if not path.exists():
-            return
+            return self._tag_definitions
         try:
             self._tag_definitions = parser_tag_defs.load_tag_definitions(path)
         except Exception:
             self._tag_definitions = {}
+        return self._tag_definitions
 
     def _refresh_associated_context(self) -> None:
         source_text = self._read_text_if_exists(
@@ -822,6 +1241,8 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
+        from scripts import convert_inputs  # type: ignore
+
         input_path = Path(path)
         output_path = input_path.with_suffix(".md")
         try:
@@ -876,21 +1297,128 @@ class MainWindow(QMainWindow):
         )
         output_path = Path(output_str) if output_str else default_output
 
-        try:
-            parser_cli.main(
-                source_path=source_path,
-                target_path=target_path,
-                tags_path=tags_path,
-                output_path=output_path,
-            )
-        except Exception as exc:  # pragma: no cover - user-facing dialog
-            QMessageBox.critical(
-                self,
-                "Falha ao executar parser",
-                f"Erro ao gerar dataset: {exc}",
-            )
+        from parser import profiling as parser_profiling
+
+        profiler = (
+            parser_profiling.StageProfiler()
+            if self._profile_parser_action.isChecked()
+            else None
+        )
+        self._start_parser(
+            source_path, target_path, tags_path, output_path, profiler
+        )
+
+    def _start_parser(
+        self,
+        source_path: Path,
+        target_path: Path,
+        tags_path: Path,
+        output_path: Path,
+        profiler: parser_profiling.StageProfiler | None,
+    ) -> None:
+        """Run the parser on a worker thread; the window stays usable."""
+
+        if self._parser_thread is not None:
+            return
+        # A compaction in flight may target the same file as the parser.
+        self._wait_for_compaction()
+        thread = QThread(self)
+        worker = ParserWorker(
+            source_path, target_path, tags_path, output_path, profiler
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.stage_started.connect(self._on_parser_stage)
+        worker.finished.connect(self._on_parser_finished)
+        worker.failed.connect(self._on_parser_failed)
+        worker.cancelled.connect(self._on_parser_cancelled)
+        self._parser_thread = thread
+        self._parser_worker = worker
+        self._parser_output = output_path
+        self._parser_profiler = profiler
+        self._parser_action.setEnabled(False)
+        self._parser_progress.setValue(0)
+        self._parser_progress.show()
+        self._parser_cancel_button.setEnabled(True)
+        self._parser_cancel_button.show()
+        self.statusBar().showMessage("Executando parser...")
+        thread.start()
+
+    def _cancel_parser(self) -> None:
+        if self._parser_worker is not None:
+            self._parser_worker.cancel()
+            self._parser_cancel_button.setEnabled(False)
+            self.statusBar().showMessage("Cancelando parser...")
+
+    def _finish_parser(self) -> None:
+        if self._parser_thread is not None:
+            self._parser_thread.quit()
+            self._parser_thread.wait()
+        self._parser_thread = None
+        self._parser_worker = None
+        self._parser_action.setEnabled(True)
+        self._parser_progress.hide()
+        self._parser_cancel_button.hide()
+
+    def _on_parser_stage(self, name: str) -> None:
+        if self.sender() is not self._parser_worker:
+            return
+        names = [stage for stage, _ in PARSER_STAGES]
+        if name not in names:
             return
+        position = names.index(name)
+        self._parser_progress.setValue(position)
+        self.statusBar().showMessage(
+            f"Parser: {PARSER_STAGES[position][1]} "
+            f"({position + 1}/{len(PARSER_STAGES)})..."
+        )
+
+    def _on_parser_failed(self, message: str) -> None:
+        if self.sender() is not self._parser_worker:
+            return
+        self._finish_parser()
+        self.statusBar().clearMessage()
+        QMessageBox.critical(
+            self,
+            "Falha ao executar parser",
+            f"Erro ao gerar dataset: {message}",
+        )
+
+    def _on_parser_cancelled(self) -> None:
+        if self.sender() is not self._parser_worker:
+            return
+        self._finish_parser()
+        self.statusBar().showMessage(
+            "Parser cancelado; nenhum arquivo foi alterado.", 6000
+        )
 
+    def _on_parser_finished(self) -> None:
+        if self.sender() is not self._parser_worker:
+            return
+        self._finish_parser()
+        output_path = self._parser_output
+        profiler = self._parser_profiler
+        profile_text = ""
+        if profiler is not None:
+            from parser import profiling as parser_profiling
+
+            profile_text = (
+                "\n\nTempo por etapa:\n"
+                f"{profiler.summary()}\n"
+                f"Perfil: {parser_profiling.profile_path_for(output_path)}"
+            )
+        journal = self._journal
+        if journal is not None and (
+            journal.dataset_path.resolve() == output_path.resolve()
+        ):
+            # The fresh parse replaced the reviewed rows; folding their
+            # journal into it would patch whichever rows still match, so
+            # it is dropped instead.
+            self._drop_journal()
+        self._close_journal()
+        discard_journal(output_path)
+        self._current_path = output_path
+        self._load_dataset(self._current_path)
         QMessageBox.information(
             self,
             "Parser concluido",
@@ -898,48 +1426,249 @@ class MainWindow(QMainWindow):
                 "dataset_raw.json gerado com sucesso.\n"
                 f"Arquivo: {output_path}\n\n"
                 "Carregando o dataset no VAEST."
+                f"{profile_text}"
             ),
         )
-        self._current_path = output_path
-        self._load_dataset(self._current_path)
 
     def _load_dataset(self, path: Path) -> None:
-        try:
-            metadata, samples = load_dataset(path)
-        except DatasetLoadError as exc:
-            QMessageBox.critical(self, "Erro ao carregar", str(exc))
+        """Start loading ``path`` in chunks on a worker thread."""
+
+        self._detail_panel.flush_pending_notes()
+        if not Path(path).exists():
+            QMessageBox.critical(
+                self, "Erro ao carregar", f"Nao encontrei o arquivo: {path}"
+            )
             return
 
+        self._cancel_dataset_load()
+        self._close_journal()
+        self._journal = ReviewJournal(path)
+        self._load_generation += 1
+        self._loading = True
+        self._metadata = None
+        self._samples = []
+        self._list_model.update_samples(self._samples)
+        self._stats.clear()
+        self._navigation.clear()
+        self._refresh_stats()
+        self._filter_model.invalidate()
+        self._populate_tag_filter()
+        self._reset_filter_controls()
+        self._clear_selection()
+        self._context_panel.set_sample(None)
+        self._save_button.setEnabled(False)
+        self._load_progress.setValue(0)
+        self._load_progress.show()
+        self.statusBar().showMessage(f"Carregando {path}...")
+
+        thread = QThread(self)
+        worker = DatasetLoadWorker(self._load_generation, Path(path))
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.chunk_loaded.connect(self._on_dataset_chunk)
+        worker.finished.connect(self._on_dataset_loaded)
+        worker.failed.connect(self._on_dataset_load_failed)
+        self._load_thread = thread
+        self._load_worker = worker
+        self._loading_path = Path(path)
+        thread.start()
+
+    def _cancel_dataset_load(self) -> None:
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+        if self._load_thread is not None:
+            self._load_thread.quit()
+            self._load_thread.wait()
+        self._load_thread = None
+        self._load_worker = None
+
+    def _finish_dataset_load(self) -> None:
+        self._loading = False
+        self._load_progress.hide()
+        self._save_button.setEnabled(True)
+        self._cancel_dataset_load()
+
+    def _on_dataset_chunk(self, load_id: int, chunk) -> None:
+        if load_id != self._load_generation:
+            return
         # UX: start neutral (white). Only human actions set review/validated states.
-        for sample in samples:
+        for sample in chunk.samples:
             if (not sample.validado) and (not sample.history) and (sample.reviewer is None):
                 sample.necessita_revisao_humana = False
                 sample.low_confidence = False
 
-        self._metadata = metadata
-        self._samples = samples
+        self._metadata = chunk.metadata
+        self._list_model.append_samples(chunk.samples)
+        self._stats.extend(chunk.samples)
+        self._navigation.extend(chunk.samples)
+        self._refresh_stats()
+        percent = int(100 * chunk.position / max(1, chunk.size))
+        self._load_progress.setValue(percent)
+        self.statusBar().showMessage(
+            f"Carregando... {len(self._samples)} amostras ({percent}%)"
+        )
+
+    def _on_dataset_loaded(self, load_id: int) -> None:
+        if load_id != self._load_generation:
+            return
+        self._finish_dataset_load()
+        path = self._loading_path
+        metadata = self._metadata
         self._project_state.last_dataset_path = str(path)
         self._save_project_state()
-        self._list_model.update_samples(samples)
-        self._filter_model.invalidate()
         self._populate_tag_filter()
-        self._reset_filter_controls()
-        self._filter_model.invalidateFilter()
-        self._clear_selection()
+        replayed = getattr(metadata, "_journal_replayed", 0)
         self.statusBar().showMessage(
-            "Projeto: {proj} | Amostras: {count} | Arquivo: {file}".format(
-                proj=metadata.projeto,
-                count=len(samples),
+            "Projeto: {proj} | Amostras: {count} | Arquivo: {file}{extra}"
+            .format(
+                proj=metadata.projeto if metadata else "",
+                count=len(self._samples),
                 file=path,
+                extra=(
+                    f" | Recuperadas do diario: {replayed}"
+                    if replayed
+                    else ""
+                ),
             )
         )
-        self._detail_panel.set_sample(None)
-        self._context_panel.set_sample(None)
+        self._maybe_compact_journal()
+
+    def _on_dataset_load_failed(self, load_id: int, message: str) -> None:
+        if load_id != self._load_generation:
+            return
+        self._finish_dataset_load()
+        self._metadata = None
+        self._samples = []
+        self._list_model.update_samples(self._samples)
+        self._stats.clear()
+        self._navigation.clear()
+        self._refresh_stats()
+        self._populate_tag_filter()
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Erro ao carregar", message)
+
+    def closeEvent(self, event) -> None:  # noqa: N802
+        self._detail_panel.flush_pending_notes()
+        if self._parser_worker is not None:
+            self._parser_worker.cancel()
+        self._finish_parser()
+        self._cancel_dataset_load()
+        self._close_journal()
+        super().closeEvent(event)
+
+    def _append_journal(
+        self, row: int, sample: AnnotationSample, action: str
+    ) -> None:
+        if self._journal is None:
+            return
+        try:
+            self._journal.append(row, sample, action)
+        except OSError as exc:
+            QMessageBox.warning(
+                self,
+                "Diario de revisao",
+                f"Nao foi possivel gravar o diario: {exc}",
+            )
+            return
+        self._maybe_compact_journal()
+
+    def _parser_writes(self, path: Path) -> bool:
+        """Whether a running parse will replace ``path``."""
+
+        return (
+            self._parser_thread is not None
+            and self._parser_output is not None
+            and self._parser_output.resolve() == Path(path).resolve()
+        )
+
+    def _maybe_compact_journal(self) -> None:
+        if (
+            self._journal is None
+            or self._journal.pending < COMPACT_AFTER_RECORDS
+            or self._loading
+            or self._metadata is None
+            or self._compaction_thread is not None
+            or self._parser_writes(self._journal.dataset_path)
+        ):
+            return
+        # Snapshot the journaled rows on the GUI thread; reading, patching
+        # and writing the dataset run in the background.
+        self._compaction_offset = self._journal.offset()
+        patches = review_patches(
+            self._samples,
+            sorted(
+                {record["row"] for record in read_journal(self._journal.path)}
+            ),
+        )
+        thread = QThread(self)
+        worker = JournalCompactionWorker(self._journal.dataset_path, patches)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_compaction_finished)
+        worker.failed.connect(self._on_compaction_failed)
+        self._compaction_thread = thread
+        self._compaction_worker = worker
+        thread.start()
+
+    def _wait_for_compaction(self) -> None:
+        if self._compaction_thread is not None:
+            self._compaction_thread.quit()
+            self._compaction_thread.wait()
+        self._compaction_thread = None
+        self._compaction_worker = None
+
+    def _on_compaction_finished(self) -> None:
+        if self.sender() is not self._compaction_worker:
+            return
+        self._wait_for_compaction()
+        if self._journal is not None:
+            self._journal.discard_until(self._compaction_offset)
+            self.statusBar().showMessage(
+                f"Diario compactado em {self._journal.dataset_path}", 4000
+            )
+
+    def _on_compaction_failed(self, message: str) -> None:
+        if self.sender() is not self._compaction_worker:
+            return
+        self._wait_for_compaction()
+        self.statusBar().showMessage(
+            f"Falha ao compactar o diario: {message}", 8000
+        )
+
+    def _drop_journal(self) -> None:
+        """Close the journal without folding it into the dataset."""
+
+        self._wait_for_compaction()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _close_journal(self) -> None:
+        """Fold pending journal records into the dataset and close it."""
+
+        self._wait_for_compaction()
+        if self._journal is None:
+            return
+        journal, self._journal = self._journal, None
+        if (
+            journal.pending
+            and not self._loading
+            and self._metadata
+            and not self._parser_writes(journal.dataset_path)
+        ):
+            try:
+                compact_journal(
+                    journal.dataset_path, self._samples, journal=journal
+                )
+            except (OSError, DatasetLoadError):
+                # The records stay in the journal and replay on next open.
+                pass
+        journal.close()
 
     def _available_tags(self) -> list[str]:
         defined_tags = sorted(
             tag.strip()
-            for tag in self._tag_definitions
+            for tag in self._loaded_tag_definitions()
             if tag and tag.strip()
         )
         if defined_tags:
@@ -949,6 +1678,7 @@ class MainWindow(QMainWindow):
         return fallback
 
     def _open_change_tag_dialog(self) -> None:
+        self._detail_panel.flush_pending_notes()
         selection_model = self._list_view.selectionModel()
         if not selection_model or not selection_model.currentIndex().isValid():
             QMessageBox.information(
@@ -997,7 +1727,7 @@ class MainWindow(QMainWindow):
 
         old_tag = sample.tag
         sample.tag = selected_tag
-        tag_info = self._tag_definitions.get(selected_tag)
+        tag_info = self._loaded_tag_definitions().get(selected_tag)
         if tag_info:
             sample.nome = tag_info.get("nome", sample.nome)
             sample.tipo_nivel = tag_info.get("tipo_nivel", sample.tipo_nivel)
@@ -1007,7 +1737,6 @@ class MainWindow(QMainWindow):
             f"tag_changed:{old_tag}->{selected_tag}",
         )
         self._populate_tag_filter()
-        self._filter_model.invalidateFilter()
 
     def _handle_selection(self, index: QModelIndex) -> None:
         if not index.isValid():
@@ -1022,8 +1751,21 @@ class MainWindow(QMainWindow):
             return
         self._detail_panel.set_sample(sample, row=source_index.row())
         self._context_panel.set_sample(sample)
+        # Render the next sample's context once the event loop is idle.
+        self._prefetch_row = index.row() + 1
+        self._prefetch_timer.start()
+
+    def _prefetch_next_context(self) -> None:
+        index = self._filter_model.index(self._prefetch_row, 0)
+        if index.isValid():
+            self._context_panel.prefetch(
+                self._list_model.sample_at(
+                    self._filter_model.mapToSource(index).row()
+                )
+            )
 
     def _on_validate_clicked(self) -> None:
+        self._detail_panel.flush_pending_notes()
         selection_model = self._list_view.selectionModel()
         if not selection_model or not selection_model.currentIndex().isValid():
             QMessageBox.information(
@@ -1043,12 +1785,6 @@ class MainWindow(QMainWindow):
         sample.necessita_revisao_humana = sample.low_confidence
         sample.motivo_revisao = None if not sample.low_confidence else sample.motivo_revisao
 
-        self._list_model.refresh_row(source_index.row())
-        self._filter_model.invalidateFilter()
-        proxy_index = self._filter_model.mapFromSource(source_index)
-        if proxy_index.isValid():
-            self._list_view.update(proxy_index)
-        self._list_view.viewport().update()
         self._on_sample_updated(source_index.row(), "validated")
 
     def _select_prev_row(self) -> None:
@@ -1082,6 +1818,70 @@ class MainWindow(QMainWindow):
         )
         self._handle_selection(next_index)
 
+    def _current_source_row(self) -> int:
+        selection_model = self._list_view.selectionModel()
+        if not selection_model or not selection_model.currentIndex().isValid():
+            return -1
+        return self._filter_model.mapToSource(
+            selection_model.currentIndex()
+        ).row()
+
+    def _select_source_row(self, row: int) -> None:
+        """Select source ``row``, clearing filters that hide it."""
+
+        selection_model = self._list_view.selectionModel()
+        if not selection_model:
+            return
+        source_index = self._list_model.index(row, 0)
+        index = self._filter_model.mapFromSource(source_index)
+        if not index.isValid():
+            self._reset_filter_controls()
+            index = self._filter_model.mapFromSource(source_index)
+        selection_model.setCurrentIndex(
+            index, selection_model.SelectionFlag.ClearAndSelect
+        )
+        self._list_view.scrollTo(index)
+
+    def _select_next_unresolved(self, tag: Optional[str]) -> None:
+        row = self._navigation.next_status_row(
+            self._current_source_row(), UNRESOLVED_STATUSES, tag
+        )
+        if row is None:
+            self.statusBar().showMessage(
+                "Nenhuma amostra pendente"
+                + (f" com a tag {tag}." if tag else "."),
+                4000,
+            )
+            return
+        self._select_source_row(row)
+
+    def _jump_to(self, key, label: str, forward: bool) -> None:
+        """Select the next/previous sample in row set ``key``."""
+
+        current = self._current_source_row()
+        if key is None:
+            sample = self._list_model.sample_at(current)
+            if sample is None:
+                self.statusBar().showMessage(
+                    "Selecione uma amostra para navegar pela tag.", 4000
+                )
+                return
+            key = ("tag", sample.tag or "")
+        if forward:
+            row = self._navigation.next_row(key, current)
+        else:
+            row = self._navigation.previous_row(key, current)
+        if row is None or row == current:
+            self.statusBar().showMessage(
+                f"Nenhuma outra amostra {label}.", 4000
+            )
+            return
+        self._select_source_row(row)
+
+    def _refresh_stats(self) -> None:
+        if self._stats_dock.isVisible():
+            self._stats_panel.refresh(self._stats)
+
     def _on_sample_updated(self, row: int, action: str) -> None:
         sample = self._list_model.sample_at(row)
         if sample is None:
@@ -1103,15 +1903,16 @@ class MainWindow(QMainWindow):
             reviewer=sample.reviewer,
             notes=sample.motivo_revisao,
             timestamp=timestamp,
+            coalesce_window=COALESCE_WINDOW_SECONDS,
         )
         if 0 <= row < len(self._samples):
             self._samples[row] = sample
+        self._append_journal(row, sample, action)
+        # dataChanged repaints the row and lets the proxy re-filter just it.
         self._list_model.refresh_row(row)
-        self._filter_model.invalidateFilter()
-        proxy_index = self._filter_model.mapFromSource(self._list_model.index(row, 0))
-        if proxy_index.isValid():
-            self._list_view.update(proxy_index)
-        self._list_view.viewport().update()
+        self._stats.update(row, sample)
+        self._navigation.update(row, sample)
+        self._refresh_stats()
         if action != "notes_changed":
             self._detail_panel.set_sample(sample, row=row)
         status = (
@@ -1152,6 +1953,7 @@ class MainWindow(QMainWindow):
         self._status_filter.blockSignals(False)
         self._filter_model.set_status_filter(None)
 
+        self._search_timer.stop()
         self._search_filter.blockSignals(True)
         self._search_filter.clear()
         self._search_filter.blockSignals(False)
@@ -1164,7 +1966,11 @@ class MainWindow(QMainWindow):
         self._filter_model.set_status_filter(self._status_filter.currentData())
 
     def _handle_search_changed(self, text: str) -> None:
-        self._filter_model.set_search_text(text)
+        self._search_timer.start()
+
+    def _apply_search(self) -> None:
+        self._search_timer.stop()
+        self._filter_model.set_search_text(self._search_filter.text())
 
     def _on_selection_changed(
         self, current: QModelIndex, _: QModelIndex
@@ -1194,13 +2000,32 @@ class MainWindow(QMainWindow):
             self._save_dataset(Path(target))
 
     def _save_dataset(self, path: Path) -> None:
+        self._detail_panel.flush_pending_notes()
+        if self._loading:
+            QMessageBox.warning(
+                self,
+                "Carregando",
+                "Aguarde o fim do carregamento antes de salvar.",
+            )
+            return
         if not self._metadata:
             QMessageBox.warning(
                 self, "Sem dados", "Nenhum dataset carregado para salvar."
             )
             return
+        self._wait_for_compaction()
+        journal = self._journal
         try:
-            save_dataset(path, self._metadata, self._samples)
+            if journal is not None and (
+                path.resolve() == journal.dataset_path.resolve()
+            ):
+                # An explicit save writes every sample, so the whole journal
+                # is folded in.
+                offset = journal.offset()
+                save_dataset(path, self._metadata, self._samples)
+                journal.discard_until(offset)
+            else:
+                save_dataset(path, self._metadata, self._samples)
         except OSError as exc:
             QMessageBox.critical(
                 self, "Erro ao salvar", f"Nao foi possivel salvar: {exc}"
@@ -1212,7 +2037,53 @@ class MainWindow(QMainWindow):
             f"Alteracoes gravadas em {path}",
         )
 
+    def _archive_old_history(self) -> None:
+        self._detail_panel.flush_pending_notes()
+        if self._loading or not self._metadata or self._journal is None:
+            QMessageBox.warning(
+                self,
+                "Sem dados",
+                "Carregue um dataset antes de arquivar o historico.",
+            )
+            return
+        dataset_path = self._journal.dataset_path
+        archive_path = history_archive_path_for(dataset_path)
+        self._wait_for_compaction()
+        histories = [sample.history for sample in self._samples]
+        try:
+            archived, entries = archive_history(
+                self._samples, archive_path, keep_last=ARCHIVE_KEEP_LAST
+            )
+            # History lengths changed, so fold and truncate the journal now.
+            compact_journal(
+                dataset_path,
+                self._samples,
+                journal=self._journal,
+                rows=[
+                    row
+                    for row, sample in enumerate(self._samples)
+                    if sample.history != histories[row]
+                ],
+            )
+        except (OSError, DatasetLoadError) as exc:
+            QMessageBox.critical(
+                self,
+                "Erro ao arquivar",
+                f"Nao foi possivel arquivar o historico: {exc}",
+            )
+            return
+        self._handle_selection(self._list_view.currentIndex())
+        QMessageBox.information(
+            self,
+            "Historico arquivado",
+            (
+                f"{entries} entradas de {archived} amostras movidas para "
+                f"{archive_path}"
+            ),
+        )
+
     def _export_human_readable(self, fmt: str) -> None:
+        self._detail_panel.flush_pending_notes()
         if not self._metadata:
             QMessageBox.warning(
                 self,
@@ -1237,6 +2108,8 @@ class MainWindow(QMainWindow):
         if not output:
             return
 
+        from .export_utils import export_review_markdown, export_review_txt
+
         path = Path(output)
         try:
             if fmt == "md":